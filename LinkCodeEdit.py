@@ -27,9 +27,24 @@ Email: b2b@linkfirst.ru
    - Автор: Python Software Foundation
 """
 from __future__ import annotations
-import os, sys, re, json, base64, tempfile, random, string, webbrowser
+import os, sys, re, json, tempfile, string, time
 from typing import List, Tuple, Optional
 from pathlib import Path
+# LCE_STARTUP_TIMING=1 — вывести в stderr время этапов запуска до первой отрисовки
+STARTUP_TIMING = bool(os.environ.get("LCE_STARTUP_TIMING"))
+_startup_marks = [("start", time.perf_counter())]
+def startup_mark(name: str):
+    if STARTUP_TIMING:
+        _startup_marks.append((name, time.perf_counter()))
+def startup_report():
+    global STARTUP_TIMING
+    if not STARTUP_TIMING:
+        return
+    STARTUP_TIMING = False
+    t0 = prev = _startup_marks[0][1]
+    for name, t in _startup_marks[1:]:
+        print(f"startup: {name:<20} +{(t - prev) * 1e3:7.1f} ms  {(t - t0) * 1e3:7.1f} ms", file=sys.stderr)
+        prev = t
 def _install_crash_guard():
     import sys, traceback, tempfile
     from pathlib import Path as _Path
@@ -91,14 +106,40 @@ if PARENT_DIR not in sys.path:
 APP_ORG  = "LinkCodeEdit"
 APP_NAME = "LinkCodeEdit"
 APP_VER  = "1"
+
+import multiprocessing
+multiprocessing.freeze_support()
+
+# «LinkCodeEdit.py format …» и т.п. — консольный режим без Qt
+if __name__ == "__main__" and len(sys.argv) > 1:
+    from lce_core.cli import COMMANDS as _CLI_COMMANDS
+    if sys.argv[1] in _CLI_COMMANDS:
+        from lce_core.cli import main as _cli_main
+        sys.exit(_cli_main(sys.argv[1:]))
+
+from lce_core import (
+    detect_language, b64, append_comment,
+    STRIP_MODE_LANGS, strip_job, strip_file, FORMAT_TIERS, pretty_job, pretty_diff_job, pretty_range_job,
+    pretty_html_file, format_json_file, format_jsonl_file, minify_job, RangeCheckpoints,
+    deobfuscate_job, obfuscate_job,
+)
+from lce_core.strings import TR
+from lce_core.slug import slugify_lines
+from lce_core.robots import build_robots_txt
+from lce_core.sitemap import SITEMAP_MAX_URLS, collect_from_list, collect_from_folder, build_sitemap_xml
+from lce_core.favicon import normalize_prefix, load_image, generate_favicons
+from lce_core.pool import engine_pool, run_engine, set_enabled as set_process_pool
+from lce_core.memo import transform_cache
+startup_mark("core imports")
+
 from PySide6.QtCore import (
     Qt, QSettings, QObject, Signal, QSize, QTimer, QRect, QSignalBlocker, QUrl,
-    QThread,         
+    QThread, QThreadPool, QRunnable, QEvent,
 )
 
 from PySide6.QtGui import (
     QAction, QKeySequence, QShortcut, QFont, QTextOption, QColor, QPainter,
-    QTextCharFormat, QIcon, QDesktopServices
+    QTextCharFormat, QTextCursor, QIcon, QDesktopServices
     
 )
 
@@ -108,411 +149,13 @@ from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QSplitter, QPlainTextEdit, QMessageBox,
     QCheckBox, QPushButton, QSpinBox, QComboBox, QLineEdit,
     QFileDialog, QTextBrowser,
-    QDoubleSpinBox,     
+    QDoubleSpinBox, QProgressBar,
 )
+startup_mark("qt imports")
 
 from html.parser import HTMLParser
 
 
-TR = {
-    "ru": {        
-        "app.title": "LinkCodeEdit",
-        "menu.file": "&Файл",
-        "menu.edit": "&Правка",
-        "menu.lang": "&Язык",
-        "menu.help": "&Справка",
-        "act.open": "Открыть…",
-        "act.save": "Сохранить результат…",
-        "act.exit": "Выход",
-        "act.copy": "Копировать результат",
-        "act.paste": "Вставить во вход",
-        "act.swap": "Поменять Вход↔Выход",
-        "act.clear": "Очистить оба поля",        
-        "act.help.instructions": "Инструкция",
-        "act.about": "О программе",
-        "help.fallback": "Добро пожаловать в LinkCodeEdit. Инструкция не найдена.",        
-        "tab.clean": "🧹 Комментарии (All)",
-        "tab.format": "✨ Форматирование",
-        "tab.link": "🔗 JS-ссылка",
-        "tab.obf": "🕵️ Обфускация",
-        "tab.utm":  "🏷️ UTM-метки",
-        "tab.slug": "🔤 ЧПУ (slug)",
-        "tab.stats":"🔢 Количество символов",
-        "tab.pass": "🔐 Генератор паролей",
-        "tab.batch":"📦 Пакетная обработка",        
-        "clean.header": "Удаление комментариев",
-        "clean.mode": "Режим:",
-        "clean.mode.all": "All (все типы комментариев)",
-        "clean.mode.html": "HTML/XML",
-        "clean.mode.css": "CSS",
-        "clean.mode.js": "JavaScript",
-        "clean.mode.php": "PHP",
-        "clean.mode.json": "JSON",
-        "clean.mode.py": "Python",
-        "clean.run": "Удалить комментарии",
-        "clean.copy": "Скопировать результат",        
-        "fmt.header": "Форматирование / Минификация",
-        "fmt.tabs": "Табы",
-        "fmt.indent": "Отступ",
-        "fmt.sort": "JSON: сортировать ключи",
-        "fmt.pretty": "Форматировать",
-        "fmt.minify": "Минифицировать",        
-        "js.header": "Генератор закодированной ссылки (JS)",
-        "js.url": "URL:",
-        "js.text": "Текст:",
-        "js.view": "Вид:",
-        "js.gen": "Сгенерировать",
-        "js.open": "Проверить (открыть)",        
-        "obf.header": "Обфускация / Деобфускация",
-        "obf.method": "Метод:",
-        "obf.m.eval64": "JS: eval(Base64)",
-        "obf.m.hex": "JS: Hex-escape + eval",
-        "obf.m.container": "Base64-контейнер (по языку)",
-        "obf.comment": "Комментарий:",
-        "obf.run": "Обфусцировать",
-        "obf.deobf": "Деобфусцировать",
-        "obf.addc": "Добавить комментарий к результату",
-        "obf.test": "Тест JS в браузере",        
-        "status.copied": "Результат скопирован",
-        "status.cleared": "Очищено",
-        "tab.utm": "UTM-метки",
-        "tab.slug": "ЧПУ (slug)",
-        "tab.stats": "Количество символов",
-        "tab.pass": "Генератор паролей",
-        "tab.batch": "Пакетная обработка",
-        "utm.header": "UTM-метки",
-        "utm.url": "URL:",
-        "utm.override": "Перезаписывать существующие",
-        "utm.gen": "Сгенерировать",
-        "utm.open": "Открыть",
-        "utm.url_empty": "Укажите базовый URL",
-        "utm.link_text": "Ссылка с UTM",
-        "slug.header": "Генератор slug",
-        "slug.lower": "нижний регистр",
-        "slug.translit": "транслитерация (RU→EN)",
-        "slug.sep": "разделитель",
-        "slug.max": "макс. длина",
-        "slug.make": "Сделать slug",
-        "stats.header": "Подсчёт символов",
-        "stats.count": "Посчитать",
-        "stats.total": "Всего символов",
-        "stats.no_spaces": "Без пробельных",
-        "stats.spaces": "Пробелы",
-        "stats.tabs": "Табы",
-        "stats.newlines": "Переводы строк",
-        "stats.words": "Слова",
-        "stats.lines": "Строки",
-        "stats.letters": "Буквы",
-        "stats.digits": "Цифры",
-        "stats.punct": "Знаки препинания",
-        "stats.unique": "Уникальные символы",
-        "stats.done": "Готово",
-        "pass.header": "Генератор паролей",
-        "pass.length": "Длина",
-        "pass.count": "Кол-во",
-        "pass.lower": "строчные",
-        "pass.upper": "прописные",
-        "pass.digits": "цифры",
-        "pass.symbols": "символы",
-        "pass.no_amb": "без неоднозначных",
-        "pass.gen": "Сгенерировать",
-        "batch.header": "Пакетная обработка",
-        "batch.placeholder": "Здесь появится пакетная обработка файлов (в разработке).",        
-        "ui.lang": "Язык",
-        "ui.in": "Вход",
-        "ui.out": "Выход",
-        "ui.diff": "Разн.",
-        "act.license": "Лицензионное соглашение",
-        "utm.source": "Источник",
-        "utm.medium": "Канал",
-        "utm.campaign": "Кампания",
-        "utm.term": "Ключевое слово",
-        "utm.content": "Контент",
-        "tab.og": "🧩 OG Метатеги",
-        "og.header": "Open Graph — генератор мета-тегов",
-        "og.type": "Тип страницы",
-        "og.title": "Заголовок",
-        "og.desc": "Описание",
-        "og.image": "Картинка (URL)",
-        "og.url": "Постоянный URL",
-        "og.site_name": "Имя сайта",
-        "og.locale": "Язык (locale)",
-        "og.app_id": "ID соц. сети (fb:app_id)",
-        "og.video": "Видео (URL)",
-        "og.extra": "Доп. метаданные",
-        "og.gen": "Сгенерировать",
-        "og.bot": "Сброс OG кэша: @WebpageBot",
-        "act.donate": "Поддержать проект ❤️",
-        "about.support": "Поддержать развитие проекта:",
-        "clean.mode.custom": "Выборочно",
-        "clean.sel_types": "Удалять:",
-        "clean.type.html": "HTML <!-- -->",
-        "clean.type.cblock": "/* ... */",
-        "clean.type.cline": "// ...",
-        "clean.type.hash": "# ...",
-        "fmt.blank": "Пустые строки (макс.)",
-        "fmt.trim": "Убирать пробелы в конце строк",
-        "tab.favicon": "🖼️ Favicon",
-        "fav.header": "Генератор фавиконок",
-        "fav.src": "Источник (PNG/JPG/ICO)",
-        "fav.outdir": "Папка сохранения",
-        "fav.urlprefix": "URL-префикс (href)",
-        "fav.themecolor": "Цвет темы (#rrggbb)",
-        "fav.appname": "Имя приложения",
-        "fav.pickimg": "Выбрать...",
-        "fav.pickdir": "Папка...",
-        "fav.generate": "Сгенерировать",
-        "fav.open": "Открыть папку",
-        "fav.copy": "Скопировать сниппет",
-        "tab.sitemap": "🗺️ Sitemap",
-        "smap.header": "Sitemap — генератор карты сайта",
-        "smap.mode": "Режим",
-        "smap.mode.list": "Из списка URL/путей",
-        "smap.mode.scan": "Сканировать папку (HTML)",
-        "smap.mode.http": "Сканировать сайт (HTTP)",
-        "smap.base": "Базовый URL",
-        "smap.folder": "Папка",
-        "smap.pickdir": "Папка...",
-        "smap.freq": "changefreq",
-        "smap.prio": "priority",
-        "smap.lastmod": "lastmod",
-        "smap.lastmod.today": "Сегодня для всех",
-        "smap.lastmod.mtime": "Из mtime файлов",
-        "smap.keepquery": "С query-параметрами",
-        "smap.samehost": "Только этот хост",
-        "smap.robots": "Учитывать robots.txt",
-        "smap.maxpages": "Макс. страниц",
-        "smap.maxdepth": "Макс. глубина",
-        "smap.delay": "Задержка, мс",
-        "smap.timeout": "Таймаут, сек",
-        "smap.ua": "User-Agent",
-        "smap.generate": "Сгенерировать",
-        "smap.save": "Сохранить…",
-        "smap.copy": "Скопировать",
-        "smap.open": "Открыть папку",
-        "smap.placeholder": "Один URL или путь на строку. Пустые/с # игнорируются.",
-        "smap.base_empty": "Укажите базовый URL (например, https://example.com)",
-        "smap.scan_warn": "Укажите папку для сканирования",
-        "smap.done": "Готово",
-        "smap.too_many": "Внимание: >50 000 URL — разбейте на несколько файлов",
-        "smap.progress": "Скан: {done}/{limit}",
-        "smap.stop": "Остановить",
-        "tab.robots": "🤖 robots.txt",
-        "robots.header": "robots.txt — шаблоны",
-        "robots.preset": "Шаблон",
-        "robots.host": "Host",
-        "robots.sitemap": "Sitemap",
-        "robots.crawl": "Crawl-delay (сек.)",
-        "robots.cleanparam": "Clean-param (Яндекс)",
-        "robots.extra": "Доп. правила",
-        "robots.generate": "Сгенерировать",
-        "robots.copy": "Скопировать",
-        "robots.presets.basic": "Базовый (разрешить всё)",
-        "robots.presets.blockall": "Запретить всё",
-        "robots.presets.wordpress": "WordPress",
-        "robots.presets.bitrix": "1C-Битрикс",
-        "robots.note": "Поддерживаются: Host, Sitemap, Clean-param, Crawl-delay",
-
-    },
-    "en": {
-        "app.title": "LinkCodeEdit",
-        "menu.file": "&File",
-        "menu.edit": "&Edit",
-        "menu.lang": "&Language",
-        "menu.help": "&Help",
-        "act.open": "Open…",
-        "act.save": "Save result…",
-        "act.exit": "Exit",
-        "act.copy": "Copy result",
-        "act.paste": "Paste to input",
-        "act.swap": "Swap In↔Out",
-        "act.clear": "Clear both",
-        "act.license": "License Agreement",
-        "act.help.instructions": "Instructions",
-        "act.about": "About",
-        "help.fallback": "Welcome to LinkCodeEdit. Instructions not found.",
-        "tab.clean": "🧹 Comments (All)",
-        "tab.format": "✨ Formatting",
-        "tab.link": "🔗 JS Link",
-        "tab.obf": "🕵️ Obfuscation",
-        "tab.utm":  "🏷️ UTM Tags",
-        "tab.slug": "🔤 Slug",
-        "tab.stats":"🔢 Character Count",
-        "tab.pass": "🔐 Password Generator",
-        "tab.batch":"📦 Batch",
-        "clean.header": "Remove Comments",
-        "clean.mode": "Mode:",
-        "clean.mode.all": "All (remove all kinds)",
-        "clean.mode.html": "HTML/XML",
-        "clean.mode.css": "CSS",
-        "clean.mode.js": "JavaScript",
-        "clean.mode.php": "PHP",
-        "clean.mode.json": "JSON",
-        "clean.mode.py": "Python",
-        "clean.run": "Strip comments",
-        "clean.copy": "Copy result",
-        "fmt.header": "Formatting / Minification",
-        "fmt.tabs": "Tabs",
-        "fmt.indent": "Indent",
-        "fmt.sort": "JSON: sort keys",
-        "fmt.pretty": "Format",
-        "fmt.minify": "Minify",
-        "js.header": "Encoded Link Generator (JS)",
-        "js.url": "URL:",
-        "js.text": "Text:",
-        "js.view": "View:",
-        "js.gen": "Generate",
-        "js.open": "Open (test)",
-        "obf.header": "Obfuscation / Deobfuscation",
-        "obf.method": "Method:",
-        "obf.m.eval64": "JS: eval(Base64)",
-        "obf.m.hex": "JS: Hex-escape + eval",
-        "obf.m.container": "Base64 container (per language)",
-        "obf.comment": "Comment:",
-        "obf.run": "Obfuscate",
-        "obf.deobf": "Deobfuscate",
-        "obf.addc": "Append comment to result",
-        "obf.test": "Test JS in browser",
-        "status.copied": "Result copied",
-        "status.cleared": "Cleared",
-        "tab.utm": "UTM Tags",
-        "tab.slug": "Slug",
-        "tab.stats": "Character Count",
-        "tab.pass": "Password Generator",
-        "tab.batch": "Batch",
-        "utm.header": "UTM Tags",
-        "utm.url": "URL:",
-        "utm.override": "Override existing",
-        "utm.gen": "Generate",
-        "utm.open": "Open",
-        "utm.url_empty": "Enter base URL",
-        "utm.link_text": "Link with UTM",
-        "slug.header": "Slug Generator",
-        "slug.lower": "lowercase",
-        "slug.translit": "transliterate (RU→EN)",
-        "slug.sep": "separator",
-        "slug.max": "max length",
-        "slug.make": "Make slug",
-        "stats.header": "Character count",
-        "stats.count": "Count",
-        "stats.total": "Total chars",
-        "stats.no_spaces": "Non-whitespace",
-        "stats.spaces": "Spaces",
-        "stats.tabs": "Tabs",
-        "stats.newlines": "Newlines",
-        "stats.words": "Words",
-        "stats.lines": "Lines",
-        "stats.letters": "Letters",
-        "stats.digits": "Digits",
-        "stats.punct": "Punctuation",
-        "stats.unique": "Unique chars",
-        "stats.done": "Done",
-        "pass.header": "Password generator",
-        "pass.length": "Length",
-        "pass.count": "Count",
-        "pass.lower": "lower",
-        "pass.upper": "upper",
-        "pass.digits": "digits",
-        "pass.symbols": "symbols",
-        "pass.no_amb": "no ambiguous",
-        "pass.gen": "Generate",
-        "batch.header": "Batch processing",
-        "batch.placeholder": "Batch file processing will appear here (WIP).",        
-        "ui.lang": "Language",
-        "ui.in": "In",
-        "ui.out": "Out",
-        "ui.diff": "Diff",
-        "utm.source": "Source",
-        "utm.medium": "Medium",
-        "utm.campaign": "Campaign",
-        "utm.term": "Term",
-        "utm.content": "Content",
-        "tab.og": "🧩 OG Meta Tags",
-        "og.header": "Open Graph — meta generator",
-        "og.type": "Type",
-        "og.title": "Title",
-        "og.desc": "Description",
-        "og.image": "Image (URL)",
-        "og.url": "Canonical URL",
-        "og.site_name": "Site name",
-        "og.locale": "Locale",
-        "og.app_id": "App ID (fb:app_id)",
-        "og.video": "Video (URL)",
-        "og.extra": "Extra meta",
-        "og.gen": "Generate",
-        "og.bot": "Purge OG cache: @WebpageBot",
-        "act.donate": "Donate ❤️",
-        "about.support": "Support the project:",
-        "clean.mode.custom": "Custom",
-        "clean.sel_types": "Remove:",
-        "clean.type.html": "HTML <!-- -->",
-        "clean.type.cblock": "/* ... */",
-        "clean.type.cline": "// ...",
-        "clean.type.hash": "# ...",        
-        "fmt.blank": "Blank lines (max.)",
-        "fmt.trim": "Trim trailing spaces",
-        "tab.favicon": "🖼️ Favicon",
-        "fav.header": "Favicon Generator",
-        "fav.src": "Source (PNG/JPG/ICO)",
-        "fav.outdir": "Output folder",
-        "fav.urlprefix": "URL prefix (href)",
-        "fav.themecolor": "Theme color (#rrggbb)",
-        "fav.appname": "App name",
-        "fav.pickimg": "Browse…",
-        "fav.pickdir": "Folder…",
-        "fav.generate": "Generate",
-        "fav.open": "Open folder",
-        "fav.copy": "Copy snippet",
-        "tab.sitemap": "🗺️ Sitemap",
-        "smap.header": "Sitemap — generator",
-        "smap.mode": "Mode",
-        "smap.mode.list": "From URL/path list",
-        "smap.mode.scan": "Scan folder (HTML)",
-        "smap.mode.http": "Scan website (HTTP)",
-        "smap.base": "Base URL",
-        "smap.folder": "Folder",
-        "smap.pickdir": "Folder…",
-        "smap.freq": "changefreq",
-        "smap.prio": "priority",
-        "smap.lastmod": "lastmod",
-        "smap.lastmod.today": "Today for all",
-        "smap.lastmod.mtime": "From files mtime",
-        "smap.keepquery": "Keep query params",
-        "smap.samehost": "Same host only",
-        "smap.robots": "Respect robots.txt",
-        "smap.maxpages": "Max pages",
-        "smap.maxdepth": "Max depth",
-        "smap.delay": "Delay, ms",
-        "smap.timeout": "Timeout, s",
-        "smap.ua": "User-Agent",
-        "smap.generate": "Generate",
-        "smap.save": "Save…",
-        "smap.copy": "Copy",
-        "smap.open": "Open folder",
-        "smap.placeholder": "One URL or path per line. Blank/# lines ignored.",
-        "smap.base_empty": "Enter base URL (e.g. https://example.com)",
-        "smap.scan_warn": "Pick a folder to scan",
-        "smap.done": "Done",
-        "smap.too_many": "Warning: >50,000 URLs — split into multiple files",
-        "smap.progress": "Scan: {done}/{limit}",
-        "smap.stop": "Stop",
-        "tab.robots": "🤖 robots.txt",
-        "robots.header": "robots.txt — templates",
-        "robots.preset": "Preset",
-        "robots.host": "Host",
-        "robots.sitemap": "Sitemap",
-        "robots.crawl": "Crawl-delay (sec)",
-        "robots.cleanparam": "Clean-param (Yandex)",
-        "robots.extra": "Extra rules",
-        "robots.generate": "Generate",
-        "robots.copy": "Copy",
-        "robots.presets.basic": "Basic (allow all)",
-        "robots.presets.blockall": "Block all",
-        "robots.presets.wordpress": "WordPress",
-        "robots.presets.bitrix": "1C-Bitrix",
-        "robots.note": "Supports: Host, Sitemap, Clean-param, Crawl-delay",
-    },
-}
 class I18N(QObject):
     language_changed = Signal(str)
     def __init__(self):
@@ -556,1850 +199,7 @@ class I18N(QObject):
     def on_change(self, cb):
         self._callbacks.append(cb)
 i18n = I18N()
-VOID_HTML = {"area","base","br","col","embed","hr","img","input","link","meta","param","source","track","wbr"}
-INLINE_HTML = {"a","abbr","b","bdi","bdo","cite","code","data","dfn","em","i","kbd","label","mark","q","rp","rt","rtc","ruby","s","samp","small","span","strong","sub","sup","time","u","var","wbr"}
-def detect_language(sample: str, _limit: int = 8192) -> str:
-    s = (sample or "")
-    if len(s) > _limit:
-        s = s[:_limit]
-    s = s.strip()
-    if not s: return "Plain"
-    if s[:1] in "{[":
-        try:
-            json.loads(s); return "JSON"
-        except Exception:
-            pass
-    if s.startswith("<?php") or "<?php" in s: return "PHP"
-    if s.startswith("<"):
-        if re.match(r"^<!DOCTYPE|^<html|^<svg|^<\?xml", s, re.I): return "HTML/XML"
-        if re.match(r"^<\w+[^>]*>", s): return "HTML/XML"
-    if re.search(r"(^|\n)\s*#|^\s*(def|class)\s+\w+|^\s*import\s+\w+", s):
-        return "Python"
-    if re.search(r"\b(function|let|const|var|=>|import\s+.*from)\b", s):
-        return "JavaScript"
-    if re.search(r"[.#][\w-]+\s*\{|@media|:root\s*\{", s):
-        return "CSS"
-    return "Plain"
-def _strip_c_like(code: str, allow_hash=False, allow_backtick=True) -> str:
-    out: List[str] = []
-    i, n = 0, len(code)
-    in_str = False; delim=''; esc=False
-    in_line=False; in_block=False
-    in_bt=False; tmpl_depth=0
-    line_had_code = True
-    block_had_code_before = True
-
-    def had_code_on_line() -> bool:
-        j = len(out) - 1
-        while j >= 0 and out[j] != '\n':
-            if not out[j].isspace():
-                return True
-            j -= 1
-        return False
-
-    def pop_line_indent():
-        while out and out[-1] != '\n' and out[-1] in ' \t':
-            out.pop()
-
-    while i<n:
-        c=code[i]
-
-       
-        if in_line:
-            if c=='\n':
-                in_line=False
-                if line_had_code:
-                    out.append('\n')
-                i+=1; continue
-            i+=1; continue
-
-        if in_block:
-            if c=='*' and i+1<n and code[i+1]=='/':
-                in_block=False; i+=2
-                if not block_had_code_before:
-                  
-                    j=i
-                    while j<n and code[j] in ' \t': j+=1
-                    if j<n and code[j]=='\n':
-                        i=j+1
-                continue
-            i+=1; continue
-
-        if in_bt:
-            out.append(c)
-            if c=='\\':
-                if i+1<n:
-                    out.append(code[i+1]); i+=2; continue
-            if c=='`' and tmpl_depth==0:
-                in_bt=False; i+=1; continue
-            if c=='$' and i+1<n and code[i+1]=='{':
-                tmpl_depth+=1; out.append('{'); i+=2; continue
-            if c=='}' and tmpl_depth>0:
-                tmpl_depth-=1; i+=1; continue
-            i+=1; continue
-
-        if in_str:
-            out.append(c)
-            if esc: esc=False
-            elif c=='\\': esc=True
-            elif c==delim: in_str=False
-            i+=1; continue
-
-        if c in ('"',"'"):
-            in_str=True; delim=c; out.append(c); i+=1; continue
-        if allow_backtick and c=='`':
-            in_bt=True; tmpl_depth=0; out.append(c); i+=1; continue
-
-        
-        if c=='/' and i+1<n:
-            nxt=code[i+1]
-            if nxt=='/':
-                line_had_code = had_code_on_line()
-                if line_had_code:
-                    while out and out[-1] in ' \t': out.pop()
-                else:
-                    pop_line_indent()
-                in_line=True; i+=2; continue
-            if nxt=='*':
-                block_had_code_before = had_code_on_line()
-                if block_had_code_before:
-                    while out and out[-1] in ' \t': out.pop()
-                else:
-                    pop_line_indent()
-                in_block=True; i+=2; continue
-
-        if allow_hash and c=='#':
-            line_had_code = had_code_on_line()
-            if line_had_code:
-                while out and out[-1] in ' \t': out.pop()
-            else:
-                pop_line_indent()
-            in_line=True; i+=1; continue
-
-      
-        out.append(c); i+=1
-
-    return ''.join(out)
-
-
-def _strip_html(code: str) -> str:   
-    s = re.sub(r'(?ms)^[ \t]*<!--(?!\[if).*?-->[ \t]*(?:\r?\n|$)', '', code)   
-    s = re.sub(r'(?s)<!--(?!\[if).*?-->', '', s)   
-    s = re.sub(r'[ \t]+(?=\r?\n)', '', s)
-    return s
-
-def strip_comments_python_strict(code: str) -> str:
-    out = []
-    i = 0
-    n = len(code)
-    in_str = False
-    delim = ''
-    triple = False
-    esc = False
-
-    def only_ws_on_current_line() -> bool:
-        j = len(out) - 1
-        while j >= 0 and out[j] != '\n':
-            if not out[j].isspace():
-                return False
-            j -= 1
-        return True
-
-    def pop_line_indent():
-        while out and out[-1] != '\n' and out[-1] in ' \t':
-            out.pop()
-
-    while i < n:
-        c = code[i]
-        if in_str:
-            out.append(c)
-            if triple:
-                if c == delim and i + 2 < n and code[i+1] == delim and code[i+2] == delim:
-                    out.append(code[i+1]); out.append(code[i+2])
-                    in_str = False; triple = False
-                    i += 3
-                else:
-                    i += 1
-                continue
-            else:
-                if esc:
-                    esc = False; i += 1; continue
-                if c == '\\':
-                    esc = True; i += 1; continue
-                if c == delim:
-                    in_str = False; i += 1; continue
-                i += 1; continue
-
-        if c in ("'", '"'):
-            if i + 2 < n and code[i+1] == c and code[i+2] == c:
-                in_str = True; delim = c; triple = True
-                out.extend(c*3); i += 3; continue
-            else:
-                in_str = True; delim = c; triple = False
-                out.append(c); i += 1; continue
-
-        if c == '#':
-            full_line = only_ws_on_current_line()
-            if full_line:
-                pop_line_indent()
-            else:
-              
-                while out and out[-1] in ' \t':
-                    out.pop()
-  
-            while i < n and code[i] != '\n':
-                i += 1
-           
-            if i < n and code[i] == '\n':
-                if not full_line:
-                    out.append('\n')
-                i += 1
-            continue
-
-        out.append(c); i += 1
-
-    return ''.join(out)
-
-def _strip_by_markers(
-    code: str,
-    *,
-    rm_html=False,
-    rm_c_block=False,
-    rm_c_line=False,
-    rm_hash=False,
-    allow_backtick=True
-) -> str:
-    s = code
-    if rm_html:
-        s = _strip_html(s)
-
-    out = []
-    i = 0
-    n = len(s)
-    in_str = False
-    delim = ''
-    esc = False
-    in_bt = False
-    tmpl = 0
-    in_line = False
-    in_block = False
-    line_had_code = True
-    block_had_code_before = True
-
-    def had_code_on_line() -> bool:
-        j = len(out) - 1
-        while j >= 0 and out[j] != '\n':
-            if not out[j].isspace():
-                return True
-            j -= 1
-        return False
-
-    def pop_line_indent():
-        while out and out[-1] != '\n' and out[-1] in ' \t':
-            out.pop()
-
-    while i < n:
-        c = s[i]
-
-        if in_line:
-            if c == '\n':
-                in_line = False
-                if line_had_code:
-                    out.append('\n')
-                i += 1; continue
-            i += 1; continue
-
-        if in_block:
-            if c == '*' and i + 1 < n and s[i+1] == '/':
-                in_block = False
-                i += 2
-                if not block_had_code_before:
-                    j = i
-                    while j < n and s[j] in ' \t': j += 1
-                    if j < n and s[j] == '\n':
-                        i = j + 1
-                continue
-            i += 1; continue
-
-        if in_str:
-            out.append(c)
-            if esc: esc = False
-            else:
-                if c == '\\': esc = True
-                elif c == delim: in_str = False
-            i += 1; continue
-
-        if in_bt:
-            out.append(c)
-            if c == '\\':
-                if i + 1 < n:
-                    out.append(s[i+1]); i += 2; continue
-            if c == '`' and tmpl == 0:
-                in_bt = False; i += 1; continue
-            if c == '$' and i + 1 < n and s[i+1] == '{':
-                tmpl += 1; out.append('{'); i += 2; continue
-            if c == '}' and tmpl > 0:
-                tmpl -= 1; i += 1; continue
-            i += 1; continue
-
-        if c in ("'", '"'):
-            in_str = True; delim = c; out.append(c); i += 1; continue
-        if allow_backtick and c == '`':
-            in_bt = True; tmpl = 0; out.append(c); i += 1; continue
-
-        if rm_c_line and c == '/' and i + 1 < n and s[i+1] == '/':
-            line_had_code = had_code_on_line()
-            if line_had_code:
-                while out and out[-1] in ' \t': out.pop()
-            else:
-                pop_line_indent()
-            in_line = True; i += 2; continue
-
-        if rm_c_block and c == '/' and i + 1 < n and s[i+1] == '*':
-            block_had_code_before = had_code_on_line()
-            if block_had_code_before:
-                while out and out[-1] in ' \t': out.pop()
-            else:
-                pop_line_indent()
-            in_block = True; i += 2; continue
-
-        if rm_hash and c == '#':
-            line_had_code = had_code_on_line()
-            if line_had_code:
-                while out and out[-1] in ' \t': out.pop()
-            else:
-                pop_line_indent()
-            in_line = True; i += 1; continue
-
-        out.append(c); i += 1
-
-    return ''.join(out)
-
-def strip_comments_custom(code: str, *, html=False, c_block=False, c_line=False, py_hash=False) -> str:
-    s = code
-    if html:
-        s = _strip_html(s)
-    if c_block or c_line or py_hash:
-        s = _strip_by_markers(s, rm_c_block=c_block, rm_c_line=c_line, rm_hash=py_hash)
-    return s
-def strip_comments(code: str, lang: str) -> str:
-    if lang == "HTML/XML": return _strip_html(code)
-    if lang == "CSS": return _strip_c_like(code, allow_hash=False, allow_backtick=False)
-    if lang == "JavaScript": return _strip_c_like(code, allow_hash=False, allow_backtick=True)
-    if lang == "PHP": return _strip_c_like(code, allow_hash=True, allow_backtick=True)
-    if lang == "JSON": return _strip_c_like(code, allow_hash=False, allow_backtick=False)
-    if lang == "Python":
-        return strip_comments_python_strict(code)
-    return _strip_c_like(code, allow_hash=False, allow_backtick=False)
-def strip_comments_all(code: str) -> str:
-    s = code
-
- 
-    s = re.sub(r'(?ms)^[ \t]*<!--(?!\[if).*?-->[ \t]*(?:\r?\n|$)', '', s)  
-    s = re.sub(r'(?s)<!--(?!\[if).*?-->', '', s)
-
- 
-    s = re.sub(r'(?ms)^[ \t]*/\*.*?\*/[ \t]*(?:\r?\n|$)', '', s)         
-    s = re.sub(r'(?s)/\*.*?\*/', '', s)                              
-
-    
-    s = re.sub(r'(?m)^[ \t]*//[^\n]*(?:\r?\n|$)', '', s) 
-    s = re.sub(r'//[^\n]*', '', s)
-
-
-    s = re.sub(r'(?m)^[ \t]*#[^\n]*(?:\r?\n|$)', '', s)  
-    s = re.sub(r'(?m)(?<!["\'`])#[^\n]*', '', s)             
-
-   
-    s = re.sub(r'[ \t]+(?=\r?\n)', '', s)
-    return s
-
-def _collapse_ws_outside_strings(code: str) -> str:
-    out=[]; i=0; n=len(code); in_str=False; d=''; esc=False; ws=False
-    def push_space():
-        if not out or not (isinstance(out[-1], str) and out[-1].isspace()):
-            out.append(' ')
-    while i<n:
-        c=code[i]
-        if in_str:
-            out.append(c)
-            if esc: esc=False
-            else:
-                if c=='\\': esc=True
-                elif c==d: in_str=False
-            i+=1; continue
-        if c in ("'",'"','`'):
-            in_str=True; d=c; out.append(c); ws=False; i+=1; continue
-        if c.isspace():
-            ws=True; i+=1; continue
-        if ws: push_space(); ws=False
-        out.append(c); i+=1
-    return ''.join(out)
-def _tighten_punct_ws(code: str) -> str:
-    out=[]; i=0; n=len(code); in_str=False; d=''; esc=False
-    punct=set(";,:{}()[]=+-*/<>|&!%^?,.")
-    while i<n:
-        c=code[i]
-        if in_str:
-            out.append(c)
-            if esc: esc=False
-            else:
-                if c=='\\': esc=True
-                elif c==d: in_str=False
-            i+=1; continue
-        if c in ("'",'"','`'):
-            in_str=True; d=c; out.append(c); i+=1; continue
-        if c in punct:
-            while out and isinstance(out[-1], str) and out[-1]==' ': out.pop()
-            out.append(c)
-            j=i+1
-            while j<n and code[j]==' ': j+=1
-            i=j; continue
-        out.append(c); i+=1
-    return ''.join(out)
-def minify_code(code: str, lang: str) -> str:
-    if lang == "JSON":
-        try:
-            obj=json.loads(code)
-            return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
-        except Exception:
-            pass
-    s = strip_comments(code, lang)
-    s = _collapse_ws_outside_strings(s)
-    s = _tighten_punct_ws(s)
-    s = re.sub(r"\s*\n\s*", "", s)
-    s = re.sub(r"[ \t]{2,}", " ", s)
-    return s.strip()
-def _indent_str(use_tabs: bool, size: int) -> str:
-    return "\t" if use_tabs else (" " * max(1, size))
-
-def pretty_json(code: str, indent: str, sort_keys=False) -> Optional[str]:
-    try:
-        obj = json.loads(code)
-        
-        return json.dumps(obj, indent=4, sort_keys=sort_keys, ensure_ascii=False)
-    except Exception:
-        return None
-
-def pretty_braces(code: str, indent: str) -> str:
-    out=[]; i=0; n=len(code); in_str=False; d=''; esc=False; lvl=0; paren=0
-
-    def nl():
-        out.append('\n'); out.append(indent*lvl)
-
-    while i<n:
-        c=code[i]
-        if in_str:
-            out.append(c)
-            if esc: esc=False
-            else:
-                if c=='\\': esc=True
-                elif c==d: in_str=False
-            i+=1; continue
-
-        if c in ("'",'"','`'):
-            in_str=True; d=c; out.append(c); i+=1; continue
-
-        if c=='{':
-            out.append('{'); lvl+=1; nl(); i+=1; continue
-
-        if c=='}':
-           
-            lvl=max(0,lvl-1)
-            while out and isinstance(out[-1], str) and out[-1].strip()=="" and '\n' not in out[-1]:
-                out.pop()
-            out.append('\n'); out.append(indent*lvl); out.append('}')
-            i+=1
-
-           
-            j=i
-            while j<n and code[j].isspace(): j+=1
-
-            def copy_parens(pos: int) -> int:
-                if pos>=n or code[pos] != '(':
-                    return pos
-                depth = 0
-                k = pos
-                while k<n:
-                    ch = code[k]
-                    out.append(ch)
-                    if ch == '(':
-                        depth += 1
-                    elif ch == ')':
-                        depth -= 1
-                        if depth == 0:
-                            k += 1
-                            break
-                    k += 1
-                return k
-
-            def maybe_open_brace(pos: int) -> int:
-                nonlocal lvl
-                m = pos
-                while m<n and code[m].isspace(): m+=1
-                if m<n and code[m] == '{':
-                    out.append(' {')
-                    lvl += 1
-                    m += 1
-                    nl()
-                    return m
-                nl()
-                return pos
-
-          
-            if j<n and code.startswith('else', j):
-                out.append(' else')
-                j += 4
-                k = j
-                while k<n and code[k].isspace(): k+=1
-                if k<n and code.startswith('if', k):
-                    out.append(' if')
-                    k += 2
-                    while k<n and code[k].isspace(): k+=1
-                    if k<n and code[k]=='(':
-                        k = copy_parens(k)
-                i = maybe_open_brace(k)
-                continue
-
-         
-            if j<n and code.startswith('catch', j):
-                out.append(' catch')
-                j += 5
-                k = j
-                while k<n and code[k].isspace(): k+=1
-                if k<n and code[k]=='(':
-                    k = copy_parens(k)
-                i = maybe_open_brace(k)
-                continue
-
-      
-            if j<n and code.startswith('finally', j):
-                out.append(' finally')
-                j += 7
-                i = maybe_open_brace(j)
-                continue
-
-  
-            if j<n and code[j] in (';', ','):
-                out.append(code[j]); i = j+1
-                nl(); continue
-
-            nl(); continue
-
-        if c=='(':
-            paren+=1; out.append('('); i+=1; continue
-        if c==')':
-            paren=max(0,paren-1); out.append(')'); i+=1; continue
-
-        if c==';':
-            out.append(';'); i+=1
-            if paren==0: nl()
-            continue
-
-        if c=='\n':
-            if out and not (isinstance(out[-1], str) and out[-1].endswith('\n')):
-                out.append('\n'); out.append(indent*lvl)
-            i+=1; continue
-
-        if c.isspace():
-            if out and out[-1] != ' ' and not (isinstance(out[-1], str) and out[-1].endswith('\n')):
-                out.append(' ')
-            i+=1; continue
-
-        out.append(c); i+=1
-
-    res=''.join(out)
-
-
-    res = re.sub(r'(?m)^[ \t]*\}[ \t]*\r?\n[ \t]*(else\b(?:\s+if\b[^{\r\n]*?)?)', r'} \1', res)
-    res = re.sub(r'(?m)^[ \t]*\}[ \t]*\r?\n[ \t]*(catch\b[^{\r\n]*?)',             r'} \1', res)
-    res = re.sub(r'(?m)^[ \t]*\}[ \t]*\r?\n[ \t]*(finally\b)',                    r'} \1', res)
-
-    res = re.sub(r'(?m)\}[ \t]+(else\b(?:\s+if\b[^{\r\n]*?)?)', r'} \1', res)
-    res = re.sub(r'(?m)\}[ \t]+(catch\b[^{\r\n]*?)',             r'} \1', res)
-    res = re.sub(r'(?m)\}[ \t]+(finally\b)',                    r'} \1', res)
-
-
-    res = res.replace('}\n else',  '} else')
-    res = res.replace('}\r\n else','} else')
-
-    res = re.sub(r"\n{3,}", "\n\n", res).rstrip()
-    return res
-
-
-
-
-def pretty_html_xml(code: str, indent: str) -> str:
-    tokens = re.findall(r"(<!--.*?-->|<!\[CDATA\[.*?\]\]>|</?[^>]+>|[^<]+)", code, flags=re.S)
-    lvl = 0
-    out: list[str] = []
-    tag_stack: list[str] = []
-    inc_stack: list[bool] = []
-    raw_stack: list[str] = []
-    inline_depth = 0
-    last_was_inline_open = False
-    allow_inline_flow = False
-
-    RAW_TAGS = {"script", "style", "pre", "code", "textarea"}
-
-    def tag_name(tag: str) -> str:
-        return re.sub(r"^</?\s*([\w:-]+).*", r"\1", tag).lower()
-
-    def is_self_tag(nm: str, tok: str) -> bool:
-        return tok.endswith("/>") or nm in VOID_HTML
-
-    def append_line(txt: str):
-        nonlocal last_was_inline_open, allow_inline_flow
-        out.append(f"{indent*lvl}{txt.strip()}")
-        last_was_inline_open = False
-        allow_inline_flow = False
-
-    def append_inline(txt: str, add_space: bool):
-        nonlocal last_was_inline_open
-        txt = txt.strip()
-        if not out:
-            out.append(f"{indent*lvl}{txt}")
-        else:
-            if add_space and out[-1] and not out[-1].endswith((" ", "\t")):
-                out[-1] += " "
-            out[-1] += txt
-        last_was_inline_open = False
-
-    for t in tokens:
-        if not t:
-            continue
-
-        if t.startswith("<!--") and t.endswith("-->"):
-            append_line(t); continue
-        if t.startswith("<![CDATA["):
-            append_line(t); continue
-
-        if t.startswith("</"):
-            nm = tag_name(t)
-            if inline_depth > 0 and nm in INLINE_HTML:
-                append_inline(t, add_space=False)
-                if tag_stack and tag_stack[-1] == nm:
-                    tag_stack.pop()
-                    if inc_stack: inc_stack.pop()
-                    inline_depth = max(0, inline_depth - 1)
-                if inline_depth == 0:
-                    allow_inline_flow = True
-                continue
-
-            if raw_stack and raw_stack[-1] == nm:
-                raw_stack.pop()
-
-            if tag_stack and tag_stack[-1] == nm:
-                if inc_stack and inc_stack[-1]:
-                    lvl = max(0, lvl - 1)
-                tag_stack.pop()
-                if inc_stack: inc_stack.pop()
-            append_line(t)
-            continue
-
-        if t.startswith("<"):
-            nm = tag_name(t)
-            self_closing = is_self_tag(nm, t)
-
-            if inline_depth > 0 or nm in INLINE_HTML or allow_inline_flow:
-                add_space = not last_was_inline_open
-                append_inline(t, add_space=add_space)
-                if not self_closing:
-                    tag_stack.append(nm); inc_stack.append(False)
-                    inline_depth += 1
-                    last_was_inline_open = True
-                allow_inline_flow = inline_depth == 0
-                continue
-
-            append_line(t)
-            if not self_closing:
-                tag_stack.append(nm); inc_stack.append(True)
-                if nm in RAW_TAGS:
-                    raw_stack.append(nm)
-                lvl += 1
-            continue
-
-      
-        if raw_stack:
-            lines = t.splitlines()
-            while lines and not lines[0].strip():
-                lines.pop(0)
-            while lines and not lines[-1].strip():
-                lines.pop()
-            for ln in lines:
-                append_line(ln.rstrip())
-        else:
-            txt = t.strip()
-            if not txt:
-                continue
-            txt = re.sub(r"\s+", " ", txt)
-            if inline_depth > 0 or allow_inline_flow:
-                no_space_chars = ".,;:!?)]}"
-                add_space = not last_was_inline_open and not (txt and txt[0] in no_space_chars)
-                append_inline(txt, add_space=add_space)
-                allow_inline_flow = True
-            else:
-                append_line(txt)
-
-    return "\n".join(out).rstrip()
-
-def pretty_python(code: str, indent: str) -> str:
-    lines = code.splitlines()
-    res = []
-    lvl = 0
-
-    dedent_heads = re.compile(r"^(elif\b.*:|else:|except\b.*:|finally:)\s*$")
-
-    for raw in lines:
-        ln = raw.rstrip()
-        stripped = ln.lstrip()
-        if stripped == "":
-            continue
-        if dedent_heads.match(stripped):
-            lvl = max(0, lvl - 1)
-
-        res.append((indent * lvl) + stripped)
-
-        if stripped.endswith(":") and not stripped.strip().startswith("#"):
-            lvl += 1
-
-    return "\n".join(res).rstrip()
-
-
-
-
-
-def _jsphp_format(code: str, indent: str) -> str:
-    s = code.replace("\r\n", "\n").replace("\r", "\n")
-    out: list[str] = []
-    i = 0
-    n = len(s)
-    lvl = 0
-    paren = 0
-    bracket = 0
-    in_str = False
-    str_delim = ""
-    esc = False
-    in_line_comment = False
-    in_block_comment = False
-    in_backtick = False
-    tmpl_depth = 0
-
-    def nl():
-        if out and out[-1] != "\n":
-            out.append("\n")
-        if not out or out[-1] == "\n":
-            out.append(indent * max(0, lvl))
-
-    def prev_non_ws() -> str:
-        j = len(out) - 1
-        while j >= 0:
-            ch = out[j]
-            if ch.strip() != "":
-                return ch
-            j -= 1
-        return ""
-
-    starters = set("({[=:+-*/%&|^!~?,;<")
-    keyword_starters = {"return", "case", "throw", "delete", "typeof", "instanceof", "in", "of", "new", "do", "else"}
-
-    last_word = ""
-
-    while i < n:
-        c = s[i]
-
-        if in_line_comment:
-            out.append(c)
-            if c == "\n":
-                in_line_comment = False
-                out.append(indent * max(0, lvl))
-            i += 1
-            continue
-
-        if in_block_comment:
-            out.append(c)
-            if c == "*" and i + 1 < n and s[i+1] == "/":
-                out.append("/")
-                i += 2
-                in_block_comment = False
-            else:
-                i += 1
-            continue
-
-        if in_str:
-            out.append(c)
-            if esc:
-                esc = False
-            elif c == "\\":
-                esc = True
-            elif c == str_delim:
-                in_str = False
-            i += 1
-            continue
-
-        if in_backtick:
-            out.append(c)
-            if c == "\\":
-                i += 1
-                if i < n:
-                    out.append(s[i])
-                    i += 1
-                continue
-            if c == "`" and tmpl_depth == 0:
-                in_backtick = False
-                i += 1
-                continue
-            if c == "$" and i + 1 < n and s[i+1] == "{":
-                tmpl_depth += 1
-                i += 2
-                out.append("{")
-                continue
-            if c == "}" and tmpl_depth > 0:
-                tmpl_depth -= 1
-                i += 1
-                continue
-            i += 1
-            continue
-
-        if c in " \t":
-     
-            j = i
-            while j < n and s[j] in " \t":
-                j += 1
-            nextc = s[j] if j < n else ""
-            if out and out[-1].endswith((" ", "\n")):
-                i = j
-            else:
-                if nextc and nextc not in ")}];,.:?":
-                    out.append(" ")
-                i = j
-            continue
-
-        if c == "\n":
-            nl()
-            i += 1
-            continue
-
-        if c == "/" and i + 1 < n:
-            nx = s[i+1]
-            if nx == "/":
-                in_line_comment = True
-                out.append("//")
-                i += 2
-                continue
-            if nx == "*":
-                in_block_comment = True
-                out.append("/*")
-                i += 2
-                continue
-
-        if c in ("'", '"'):
-            in_str = True
-            str_delim = c
-            out.append(c)
-            i += 1
-            continue
-
-        if c == "`":
-            in_backtick = True
-            tmpl_depth = 0
-            out.append(c)
-            i += 1
-            continue
-
-        if c == "(":
-            paren += 1
-            out.append("(")
-            i += 1
-            continue
-        if c == ")":
-            paren = max(0, paren - 1)
-            out.append(")")
-            i += 1
-            continue
-        if c == "[":
-            bracket += 1
-            out.append("[")
-            i += 1
-            continue
-        if c == "]":
-            bracket = max(0, bracket - 1)
-            out.append("]")
-            i += 1
-            continue
-
-        if c == "{":
-            if out and out[-1] not in (" ", "\n", "(" , "[", "{"):
-                out.append(" ")
-            out.append("{")
-            lvl += 1
-            nl()
-            i += 1
-            last_word = ""
-            continue
-        if c == "}":
-            lvl = max(0, lvl - 1)
-            nl()
-            while out and out[-1] == " ":
-                out.pop()
-            if out and out[-1] != "\n":
-                nl()
-            out.append("}")
-            nl()
-            i += 1
-            last_word = ""
-            continue
-
-        if c == ";":
-            out.append(";")
-            i += 1
-            if paren == 0:
-                nl()
-            last_word = ""
-            continue
-
-        if c == ",":
-            out.append(", ")
-            i += 1
-            last_word = ""
-            continue
-
-        if c == ":":
-            out.append(":")
-            i += 1
-            if last_word == "case":
-                nl()
-                last_word = ""
-            continue
-
-        if c == "/":
-            p = prev_non_ws()
-            starts = (p in starters) or (last_word in keyword_starters) or (p == "" or p == "\n")
-            if starts:
-                out.append("/")
-                i += 1
-                esc2 = False
-                while i < n:
-                    ch = s[i]
-                    out.append(ch)
-                    if esc2:
-                        esc2 = False
-                    elif ch == "\\":
-                        esc2 = True
-                    elif ch == "/":
-                        i += 1
-                        break
-                    i += 1
-                while i < n and s[i].isalpha():
-                    out.append(s[i]); i += 1
-                last_word = ""
-                continue
-
-        if c.isalpha() or c == "_" or c == "$":
-            j = i + 1
-            while j < n and (s[j].isalnum() or s[j] in "_$"):
-                j += 1
-            word = s[i:j]
-            if out and out[-1] not in ("", " ", "\n", "(" , "[", "{", "!", "~", "."):
-                out.append(" ")
-            out.append(word)
-            last_word = word
-            i = j
-            continue
-
-        if c in "=+-*/%&|^!~<>?.":
-            if c in ".!~":
-                out.append(c)
-            else:
-                if out and out[-1] not in ("", " ", "\n", "(" , "[", "{"):
-                    out.append(" ")
-                out.append(c)
-                if i + 1 < n and s[i+1] in "=|&><*":
-                    out.append(s[i+1]); i += 1
-                    if i + 1 < n and s[i+1] == "=" and s[i] in ("=", "!", "<", ">", "*"):
-                        out.append("="); i += 1
-                out.append(" ")
-            i += 1
-            last_word = ""
-            continue
-
-        out.append(c)
-        last_word = "" if not c.isalnum() else last_word
-        i += 1
-
-    res = "".join(out)
-    res = re.sub(r"[ \t]+\n", "\n", res)
-    res = re.sub(r"\n{3,}", "\n\n", res)
-    return res.rstrip()
-
-
-def pretty_css(code: str, indent: str) -> str:
-    s = strip_comments(code, "CSS").strip()
-    tokens = re.findall(
-        r'"[^"\\]*(?:\\.[^"\\]*)*"|\'[^\'\\]*(?:\\.[^\'\\]*)*\'|[{};]|[^{};\'"]+',
-        s, flags=re.S
-    )
-
-    def norm_sel(t: str) -> str:
-        t = re.sub(r'\s+', ' ', t)
-        t = re.sub(r'\s*,\s*', ', ', t)
-        t = re.sub(r'\(\s*', '(', t)
-        t = re.sub(r'\s*\)', ')', t)
-        t = re.sub(r':\s*', ':', t)
-        return t.strip()
-
-    def norm_prop(t: str) -> str:
-        t = re.sub(r'\s+', ' ', t)
-        t = re.sub(r'\s*:\s*', ': ', t)
-        t = re.sub(r'\s*,\s*', ', ', t)
-        return t.strip()
-
-    lvl = 0
-    out: list[str] = []
-    buf: list[str] = []
-
-    for tok in tokens:
-        if not tok:
-            continue
-        if tok == '{':
-            sel = norm_sel(''.join(buf)); buf.clear()
-            out.append(f"{indent*lvl}{sel} {{")
-            lvl += 1
-        elif tok == '}':
-            if ''.join(buf).strip():
-                line = norm_prop(''.join(buf)).rstrip(';')
-                out.append(f"{indent*lvl}{line};")
-                buf.clear()
-            lvl = max(0, lvl-1)
-            out.append(f"{indent*lvl}}}")
-        elif tok == ';':
-            line = norm_prop(''.join(buf)); buf.clear()
-            out.append(f"{indent*lvl}{line};")
-        else:
-            buf.append(tok)
-
-    if ''.join(buf).strip():
-        line = norm_prop(''.join(buf)).rstrip(';')
-        out.append(f"{indent*lvl}{line};")
-
-    return "\n".join(out).rstrip()
-
-
-
-
-def tidy_whitespace(text: str, max_blank_lines: int = 1, trim_trailing: bool = True) -> str:
-    """
-    Сжимает серии пустых строк до max_blank_lines,
-    убирает хвостовые пробелы/табы и нормализует переводы строк.
-    Также убирает ведущие/замыкающие пустые строки.
-    """
-    if not text:
-        return ""
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
-
-    if trim_trailing:
-        text = re.sub(r"[ \t]+(?=\n)", "", text) 
-        text = re.sub(r"[ \t]+$", "", text, flags=re.M)
-
-    out_lines = []
-    blanks = 0
-    for ln in text.split("\n"):
-        if ln.strip() == "":
-            blanks += 1
-            if blanks <= max_blank_lines:
-                out_lines.append("")
-        else:
-            blanks = 0
-            out_lines.append(ln.rstrip())
-
-    while out_lines and out_lines[0] == "":
-        out_lines.pop(0)
-    while out_lines and out_lines[-1] == "":
-        out_lines.pop()
-
-    return "\n".join(out_lines)
-
-
-
-
-def pretty_js(code: str, indent: str) -> str:
-    """
-    JS/PHP formatter:
-    - переносы формируются только правилами форматтера (исходные \n снаружи строк/комментов игнорируются);
-    - '} else/catch/finally' — на одной строке;
-    - ';' даёт перенос только вне круглых скобок (не ломаем for(...;...;...));
-    - идемпотентность.
-    """
-    s = code.replace("\r\n", "\n").replace("\r", "\n")
-    n = len(s); i = 0
-
-    out: list[str] = []
-    lvl = 0
-    paren = 0
-    brack = 0
-
-    in_line = False
-    in_block = False
-    in_str = False
-    str_delim = ""
-    esc = False
-
-    in_backtick = False
-    tmpl_depth = 0
-
-    last_word = ""
-
-    keyword_starters = {"return", "case", "throw", "delete", "typeof", "instanceof", "in", "of", "new", "do", "else"}
-    regex_starters = set("({[=:+-*/%&|^!~?,;<")
-
-    def buf() -> str:
-        return "".join(out)
-
-    def prev_non_ws_char() -> str:
-        b = buf()
-        j = len(b) - 1
-        while j >= 0:
-            ch = b[j]
-            if ch not in " \t\n":
-                return ch
-            j -= 1
-        return ""
-
-    def drop_trailing_indent_element():
-   
-        while out and out[-1] and all(ch in " \t" for ch in out[-1]):
-            out.pop()
-
-    def ensure_nl():
-
-        if not out:
-            out.append("\n")
-        elif not out[-1].endswith("\n"):
-            out.append("\n")
-        out.append(indent * max(0, lvl))
-
-    def write(tok: str):
-        out.append(tok)
-
-    while i < n:
-        c = s[i]
-
-        
-        if in_line:
-            write(c)
-            if c == "\n":
-                in_line = False
-                ensure_nl()
-            i += 1
-            continue
-
-        if in_block:
-            write(c)
-            if c == "*" and i + 1 < n and s[i + 1] == "/":
-                write("/")
-                i += 2
-                in_block = False
-            else:
-                i += 1
-            continue
-
-    
-        if in_str:
-            write(c)
-            if esc:
-                esc = False
-            elif c == "\\":
-                esc = True
-            elif c == str_delim:
-                in_str = False
-            i += 1
-            continue
-
-   
-        if in_backtick:
-            write(c)
-            if c == "\\":
-                if i + 1 < n:
-                    i += 1
-                    write(s[i])
-                    i += 1
-                else:
-                    i += 1
-                continue
-            if c == "`" and tmpl_depth == 0:
-                in_backtick = False
-                i += 1
-                continue
-            if c == "$" and i + 1 < n and s[i + 1] == "{":
-                tmpl_depth += 1
-                i += 2
-                write("{")
-                continue
-            if c == "}" and tmpl_depth > 0:
-                tmpl_depth -= 1
-                i += 1
-                continue
-            i += 1
-            continue
-
-   
-        if c in " \t":
-            j = i
-            while j < n and s[j] in " \t":
-                j += 1
-            nextc = s[j] if j < n else ""
-            b = buf()
-            if not b or b.endswith((" ", "\n", "\t")):
-                i = j
-            else:
-                if nextc and nextc not in ")}];,.:?":
-                    write(" ")
-                i = j
-            continue
-
-        if c == "\n":
-            i += 1
-            continue
-
-        if c == "/" and i + 1 < n:
-            nx = s[i + 1]
-            if nx == "/":
-                write("//"); in_line = True; i += 2; continue
-            if nx == "*":
-                write("/*"); in_block = True; i += 2; continue
-
-  
-        if c in ("'", '"'):
-            in_str = True; str_delim = c; write(c); i += 1
-            last_word = ""
-            continue
-
-  
-        if c == "`":
-            in_backtick = True; tmpl_depth = 0; write(c); i += 1
-            last_word = ""
-            continue
-
-      
-        if c == "(":
-            if last_word in {"if", "for", "while", "switch", "catch"} and not buf().endswith((" ", "\n", "\t")):
-                write(" ")
-            paren += 1; write("("); i += 1; continue
-
-        if c == ")":
-            paren = max(0, paren - 1); write(")"); i += 1; last_word = ""; continue
-
-        if c == "[":
-            brack += 1; write("["); i += 1; continue
-
-        if c == "]":
-            brack = max(0, brack - 1); write("]"); i += 1; continue
-
-      
-        if c == "{":
-            if not buf().endswith((" ", "\n", "\t", "(", "[", "{")):
-                write(" ")
-            write("{"); lvl += 1; ensure_nl(); i += 1
-            last_word = ""
-            continue
-
-        if c == "}":
-       
-            drop_trailing_indent_element()
-       
-            if not buf().endswith("\n"):
-                out.append("\n")
-            lvl = max(0, lvl - 1)
-            out.append(indent * max(0, lvl))
-            write("}")
-            i += 1
-            ensure_nl()
-            last_word = ""
-            continue
-
-  
-        if c == ";":
-            write(";"); i += 1
-            if paren == 0:
-                ensure_nl()
-            last_word = ""
-            continue
-
-      
-        if c == ",":
-            write(","); i += 1; write(" ")
-            last_word = ""
-            continue
-
-        
-        if c == ":":
-            write(":"); i += 1
-            if last_word == "case":
-                ensure_nl(); last_word = ""
-            else:
-                write(" ")
-            continue
-
-     
-        if c == "/":
-            p = prev_non_ws_char()
-            starts = (p in regex_starters) or (last_word in keyword_starters) or (p == "" or p == "\n")
-            if starts:
-                write("/")
-                i += 1
-                esc2 = False
-                while i < n:
-                    ch = s[i]; write(ch)
-                    if esc2: esc2 = False
-                    elif ch == "\\": esc2 = True
-                    elif ch == "/":
-                        i += 1; break
-                    i += 1
-                while i < n and s[i].isalpha():
-                    write(s[i]); i += 1
-                last_word = ""
-                continue
-
-      
-        if c.isalpha() or c == "_" or c == "$":
-            j = i + 1
-            while j < n and (s[j].isalnum() or s[j] in "_$"):
-                j += 1
-            word = s[i:j]
-
-            if buf() and not buf().endswith((" ", "\n", "\t", "(", "[", "{", "!", "~", ".", "?", ":", "+", "-", "*", "/", "%", "&", "|", "^", "=")):
-                write(" ")
-
-       
-            if word in {"else", "catch", "finally"} and prev_non_ws_char() == "}":
-             
-                while out:
-                    t = out[-1]
-                    if t == "" or all(ch in " \t" for ch in t):
-                        out.pop(); continue
-                    if t.endswith("\n"):
-                        out[-1] = t.rstrip("\n")
-                        if out[-1] == "" or all(ch in " \t" for ch in out[-1]):
-                            out.pop()
-                        continue
-                    break
-                write(" ")
-
-            write(word)
-            last_word = word; i = j
-            continue
-
-     
-        if c.isdigit():
-            j = i + 1
-            while j < n and (s[j].isdigit() or s[j] in "._xXbBeE+-"):
-                j += 1
-            num = s[i:j]
-            if buf() and not buf().endswith((" ", "\n", "\t", "(", "[", "{", "+", "-", "*", "/", "%", "&", "|", "^", "!", "~", "?", ":", "=")):
-                write(" ")
-            write(num)
-            last_word = ""; i = j
-            continue
-
-
-        if c in "=!<>+-*/%&|^~?.": 
-            j = i + 1
-            op = c
-            while j < n and s[j] in "=!<>+-*/%&|^~?.:":
-                op += s[j]; j += 1
-
-            candidates = [">>>=", ">>>", ">>=", "<<=", "===", "!==", "&&", "||", ">>", "<<", "+=", "-=", "*=", "/=", "%=", "&=", "|=", "^=", "=>"]
-            matched = ""
-            for cand in candidates:
-                if op.startswith(cand):
-                    matched = cand; break
-            if not matched:
-                if op.startswith("++") or op.startswith("--"):
-                    matched = op[:2]
-                else:
-                    matched = op[:1]
-
-            if matched in (".", "?."):
-                write(matched)
-            elif matched in ("++", "--"):
-                write(matched)
-            elif matched == "=>":
-                write(" => ")
-            else:
-                if buf() and not buf().endswith((" ", "\n", "\t")):
-                    write(" ")
-                write(matched)
-                write(" ")
-
-            i += len(matched)
-            last_word = ""
-            continue
-
-     
-        write(c); i += 1
-
-    txt = buf()
-    txt = re.sub(r"[ \t]+\n", "\n", txt)
-    txt = re.sub(r"\n{3,}", "\n\n", txt)
-    txt = re.sub(r"\n[ \t]*\n([ \t]*)\}", r"\n\1}", txt)
-    return txt.rstrip()
-
-
-
-
-
-def pretty_format(code: str, lang: str, use_tabs: bool, indent_size: int, sort_json_keys=False) -> str:
-    indent = "\t" if use_tabs else (" " * max(1, indent_size))
-    if lang == "JSON":
-        r = pretty_json(code, indent, sort_json_keys)
-        if r is not None:
-            return r
-    if lang == "HTML/XML":
-        return pretty_html_xml(code, indent)
-    if lang == "CSS":
-        return pretty_css(code, indent)
-    if lang in ("JavaScript", "PHP"):
-        return pretty_js(code, indent)
-    if lang == "Python":
-        return pretty_python(code, indent)
-    return pretty_js(code, indent) 
-
-
-
-def b64(s: str) -> str:
-    return base64.b64encode(s.encode("utf-8")).decode("ascii")
-_b64_call_pat = re.compile(r"(?:atob|base64_decode|b64decode)\s*\(\s*['\"]([A-Za-z0-9+/=_-]+)['\"]\s*\)", re.I)
-_hex_byte_pat = re.compile(r"\\x([0-9A-Fa-f]{2})")
-_data_uri_pat = re.compile(r"data:[^;]+;base64,([A-Za-z0-9+/=_-]+)", re.I)
-_html_ent_pat = re.compile(r"&#(x[0-9A-Fa-f]+|\d+);")
-_css_hex_pat  = re.compile(r"\\([0-9A-Fa-f]{1,6})(?:\s)?")
-
-def _decode_html_entities(s: str) -> Optional[str]:
-    if "&#" not in s:
-        return None
-    def repl(m):
-        g = m.group(1)
-        try:
-            cp = int(g[1:], 16) if g.lower().startswith('x') else int(g)
-            return chr(cp)
-        except Exception:
-            return m.group(0)
-    out = _html_ent_pat.sub(repl, s)
-    return out if out != s else None
-
-def _decode_css_hex_escapes(s: str) -> Optional[str]:
-    if "\\" not in s:
-        return None
-    used = False
-    def repl(m):
-        nonlocal used
-        try:
-            used = True
-            return chr(int(m.group(1), 16))
-        except Exception:
-            return m.group(0)
-    out = _css_hex_pat.sub(repl, s)
-    return out if used else None
-
-_oct_pat = re.compile(r"\\([0-7]{1,3})")
-
-def _decode_c_escapes(fragment: str, *, in_double_quotes: bool = True) -> str:
-    r"""
-    Декодирует C/PHP-подобные экранирования в отдельном фрагменте строки.
-    Поддержка: \n \r \t \v \f \\ \' \" \xHH \NNN (восьмеричные, 1-3 цифры)
-    """
-  
-
-    out = []
-    i, n = 0, len(fragment)
-    while i < n:
-        c = fragment[i]
-        if c != '\\':
-            out.append(c); i += 1; continue
-        i += 1
-        if i >= n:
-            out.append('\\'); break
-        ch = fragment[i]; i += 1
-
-        if ch in "nrvtf\\'\"ab":
-            mapping = {
-                'n':'\n','r':'\r','v':'\v','t':'\t','f':'\f','\\':'\\',
-                '"':'"', "'":"'", 'a':'\a','b':'\b'
-            }
-            out.append(mapping.get(ch, ch))
-            continue
-
-        if ch in "xX": 
-            j = i
-            h = []
-            while j < n and len(h) < 2 and fragment[j] in "0123456789abcdefABCDEF":
-                h.append(fragment[j]); j += 1
-            if h:
-                out.append(chr(int(''.join(h), 16)))
-                i = j
-            else:
-                out.append('\\x')
-            continue
-
-        if ch in "01234567":  
-            j = i - 1
-            k = j + 1
-            while k < n and (k - j) <= 3 and fragment[k] in "01234567":
-                k += 1
-            try:
-                out.append(chr(int(fragment[j:k], 8)))
-            except Exception:
-                out.append(fragment[j:k])
-            i = k
-            continue
-        out.append('\\' + ch)
-    return ''.join(out)
-
-
-def _decode_php_like_string_literals(code: str) -> str:
-    r"""
-    Проходит по коду и декодирует содержимое строк:
-    - двойные кавычки: полноценные escape-последовательности (\xHH, \NNN, \n, ...)
-    - одинарные кавычки: только \\ и \'
-    Учитываем // и /* */ комментарии, чтобы не ломать структуру.
-    """
-
-    out = []
-    i, n = 0, len(code)
-    in_s = False       
-    in_d = False       
-    in_lc = False      
-    in_bc = False     
-    esc = False
-
-    while i < n:
-        c = code[i]
-        if in_lc:
-            out.append(c)
-            if c == '\n':
-                in_lc = False
-            i += 1
-            continue
-        if in_bc:
-            out.append(c)
-            if c == '*' and i + 1 < n and code[i+1] == '/':
-                out.append('/'); i += 2; in_bc = False
-            else:
-                i += 1
-            continue
-
- 
-        if in_s:
-            if esc:
-                if c in ("'", "\\"):
-                    out.append(c)
-                else:
-                    out.append('\\' + c)
-                esc = False; i += 1; continue
-            if c == '\\':
-                esc = True; i += 1; continue
-            if c == "'":
-                in_s = False; out.append(c); i += 1; continue
-            out.append(c); i += 1; continue
-
-        if in_d:
-            
-            j = i
-            buf = []
-            while j < n:
-                ch = code[j]
-                if ch == '\\':
-                    if j + 1 < n:
-                        buf.append('\\' + code[j+1]); j += 2
-                    else:
-                        buf.append('\\'); j += 1
-                    continue
-                if ch == '"':
-                    break
-                buf.append(ch); j += 1
-           
-            out.append(_decode_c_escapes(''.join(buf), in_double_quotes=True))
-            if j < n and code[j] == '"':
-                out.append('"'); in_d = False; i = j + 1
-            else:
-                i = j
-            continue
-
-      
-        if c == "'":
-            in_s = True; out.append(c); i += 1; continue
-        if c == '"':
-            in_d = True; out.append(c); i += 1; continue
-
-        if c == '/' and i + 1 < n:
-            if code[i+1] == '/':
-                in_lc = True; out.append('//'); i += 2; continue
-            if code[i+1] == '*':
-                in_bc = True; out.append('/*'); i += 2; continue
-
-        out.append(c); i += 1
-
-    return ''.join(out)
-
-_goto_stmt_re  = re.compile(r'^\s*goto\s+([A-Za-z_]\w*)\s*;\s*$', re.I)
-
-def deobfuscate_php_goto(code: str) -> Optional[str]:
-    """
-    Уплощает верхнеуровневые goto/label в PHP.
-    Не лезет внутрь функций/классов (блоки { ... } просто копируются),
-    поэтому безопасен для «спагетти» на верхнем уровне.
-    """
-    s = code.replace("\r\n", "\n").replace("\r", "\n")
-    n = len(s); i = 0
-
-
-    in_s = in_d = in_lc = in_bc = False
-    depth = 0
-
-
-    nodes: list[tuple[str, str]] = []
-    cur: list[str] = []
 
-    def flush_stmt():
-        txt = ''.join(cur)
-        if txt.strip():
-            nodes.append(("stmt", txt))
-        cur.clear()
-
-    while i < n:
-        c = s[i]
-
-       
-        if in_lc:
-            cur.append(c)
-            if c == '\n': in_lc = False
-            i += 1; continue
-        if in_bc:
-            cur.append(c)
-            if c == '*' and i+1 < n and s[i+1] == '/':
-                cur.append('/'); i += 2; in_bc = False
-            else:
-                i += 1
-            continue
-
-      
-        if in_s:
-            cur.append(c)
-            if c == '\\' and i+1 < n:
-                cur.append(s[i+1]); i += 2; continue
-            if c == "'": in_s = False
-            i += 1; continue
-
-        if in_d:
-            cur.append(c)
-            if c == '\\' and i+1 < n:
-                cur.append(s[i+1]); i += 2; continue
-            if c == '"': in_d = False
-            i += 1; continue
-
-      
-        if c == '/' and i+1 < n:
-            if s[i+1] == '/':
-                cur.append('//'); i += 2; in_lc = True; continue
-            if s[i+1] == '*':
-                cur.append('/*'); i += 2; in_bc = True; continue
-        if c == "'":
-            cur.append(c); in_s = True; i += 1; continue
-        if c == '"':
-            cur.append(c); in_d = True; i += 1; continue
-
-        
-        if c == '{':
-            depth += 1
-            cur.append(c); i += 1; continue
-        if c == '}':
-            depth = max(0, depth - 1)
-            cur.append(c); i += 1
-            if depth == 0:
-                flush_stmt()
-            continue
-
-      
-        if depth == 0 and c == ';':
-            cur.append(';'); i += 1; flush_stmt(); continue
-
-       
-        if depth == 0 and c == ':':
-            buf = ''.join(cur).rstrip()
-            m = re.search(r'([A-Za-z_]\w*)\s*$', buf)
-            if m:
-          
-                cut_at = m.start(1)
-                cur = list(buf[:cut_at])
-                flush_stmt()
-                nodes.append(("label", m.group(1)))
-                i += 1
-              
-                while i < n and s[i].isspace():
-                    i += 1
-                continue
-
-        cur.append(c); i += 1
-
-    if ''.join(cur).strip():
-        nodes.append(("stmt", ''.join(cur)))
-
-
-    label_to_idx: dict[str, int] = {}
-    for idx, (kind, val) in enumerate(nodes):
-        if kind == "label":
-            j = idx + 1
-            while j < len(nodes) and nodes[j][0] == "label":
-                j += 1
-            label_to_idx[val] = j
-
-
-    pc = 0
-    steps = 0
-    visit_count: dict[int, int] = {}
-    out: list[str] = []
-
-    while pc < len(nodes) and steps < 10000:
-        steps += 1
-        kind, val = nodes[pc]
-        if kind == "label":
-            pc += 1
-            continue
-
-        m = _goto_stmt_re.match(val.strip())
-        if m:
-            tgt = label_to_idx.get(m.group(1))
-            if tgt is None:
-                out.append(val)  
-                pc += 1
-            else:
-                visit_count[pc] = visit_count.get(pc, 0) + 1
-                if visit_count[pc] > 3:
-                 
-                    out.extend(v for k, v in nodes[pc:] if k == "stmt")
-                    break
-                pc = tgt
-        else:
-            out.append(val)
-            pc += 1
-
-    linear = ''.join(out)
-   
-    try:
-        linear = _decode_php_like_string_literals(linear)
-    except Exception:
-        pass
-
-    linear = re.sub(r'[ \t]+\n', '\n', linear)
-    linear = linear.strip()
-    return linear if linear and linear != code else None
-
-def deobfuscate(text: str) -> Optional[str]:
-    s = (text or "").strip()
-    if not s:
-        return None
-
-   
-    m = _data_uri_pat.search(s)
-    if m:
-        try:
-            raw = base64.b64decode(m.group(1) + "=" * ((-len(m.group(1))) % 4))
-            return raw.decode("utf-8", errors="replace")
-        except Exception:
-            pass
-
-  
-    m = re.search(r"eval\s*\(\s*(['\"])((?:\\x[0-9A-Fa-f]{2})+)\1\s*\)\s*;?", s)
-    if m:
-        try:
-            payload = m.group(2)
-            bs = bytes(int(payload[i+2:i+4], 16) for i in range(0, len(payload), 4))
-            return bs.decode("utf-8", errors="replace")
-        except Exception:
-            return None
-
-   
-    m = _b64_call_pat.search(s)
-    if m:
-        b = m.group(1)
-        try:
-            raw = base64.b64decode(b + "=" * ((-len(b)) % 4))
-            try:
-                return raw.decode("utf-8")
-            except Exception:
-                return raw.decode("latin1", errors="replace")
-        except Exception:
-            pass
-
-    looks_like_code = ("<?php" in s) or re.search(r"\b(function|goto|header|var|let|const|class|style|<\w+)\b", s)
-    has_escapes = ("\\x" in s) or bool(re.search(r"\\[0-7]{1,3}", s))
-    if looks_like_code and has_escapes:
-        try:
-            return _decode_php_like_string_literals(s)
-        except Exception:
-            pass
-
-
-    if re.fullmatch(r"(?:\\x[0-9A-Fa-f]{2}\s*)+", s):
-        try:
-            parts = re.findall(r"\\x([0-9A-Fa-f]{2})", s)
-            bs = bytes(int(h, 16) for h in parts)
-            return bs.decode("utf-8", errors="replace")
-        except Exception:
-            return None
-
-
-    ent = _decode_html_entities(s)
-    if ent is not None:
-        return ent
-
-
-    css = _decode_css_hex_escapes(s)
-    if css is not None:
-        return css
-
-
-    s_clean = re.sub(r"[^A-Za-z0-9+/=]", "", s)
-    if len(s_clean) >= 12 and all(ch in "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=" for ch in s_clean):
-        try:
-            raw = base64.b64decode(s_clean + "=" * ((-len(s_clean)) % 4))
-            return raw.decode("utf-8", errors="replace")
-        except Exception:
-            pass
-
-  
-    if "\\x" in s and not _hex_byte_pat.search(s):
-        return None
-
-    return None
-
-
-def slugify(text: str) -> str:
-    t=text.lower()
-    t=re.sub(r"[^\w\s-]+", "", t, flags=re.U)
-    t=re.sub(r"\s+", "-", t, flags=re.U)
-    t=re.sub(r"-{2,}", "-", t).strip("-")
-    return t
-def random_password(length=16, use_upper=True, use_digits=True, use_symbols=False) -> str:
-    chars = list(string.ascii_lowercase)
-    if use_upper: chars += list(string.ascii_uppercase)
-    if use_digits: chars += list(string.digits)
-    if use_symbols: chars += list("!@#$%^&*()_+-=[]{};:,.?/|")
-    random.SystemRandom().shuffle(chars)
-    return "".join(random.SystemRandom().choice(chars) for _ in range(max(4, length)))
-def count_chars_stats(text: str) -> dict:
-    total=len(text)
-    spaces=sum(1 for ch in text if ch == ' ')
-    tabs=sum(1 for ch in text if ch == '\t')
-    newlines=text.count('\n')
-    nonspace=sum(1 for ch in text if not ch.isspace())
-    return {
-        "total": total,
-        "spaces": spaces,
-        "tabs": tabs,
-        "newlines": newlines,
-        "nonspace": nonspace
-    }
 from PySide6.QtGui import QSyntaxHighlighter, QColor
 class CodeHighlighter(QSyntaxHighlighter):
     def __init__(self, document, language: str = "Plain"):
@@ -2566,6 +366,45 @@ class CodeEditor(QPlainTextEdit):
             hl.setDocument(self.document())
             QTimer.singleShot(0, hl.rehighlight)
 
+    def applyLineHunks(self, hunks, line_count: int) -> bool:
+        """
+        Правки строк (lce_core.line_hunks): заменить строки [a, b) на новые
+        прямо в документе — без сброса, с сохранением подсветки остальных
+        строк и прокрутки. Снизу вверх, чтобы номера строк выше оставались
+        верными. False — в документе не line_count строк (блоков), ничего
+        не тронуто.
+        """
+        doc = self.document()
+        n = doc.blockCount()
+        if n != line_count:
+            return False
+        end = doc.characterCount() - 1
+        vbar, hbar = self.verticalScrollBar(), self.horizontalScrollBar()
+        v, h = vbar.value(), hbar.value()
+        self.setUpdatesEnabled(False)
+        cur = QTextCursor(doc)
+        cur.beginEditBlock()
+        try:
+            for a, b, lines in reversed(hunks):
+                if b < n:
+                    start, stop = doc.findBlockByNumber(a).position(), doc.findBlockByNumber(b).position()
+                    text = "".join(ln + "\n" for ln in lines)
+                elif a:
+                    # до конца документа: вместе с переводом строки перед строкой a
+                    prev = doc.findBlockByNumber(a - 1)
+                    start, stop = prev.position() + prev.length() - 1, end
+                    text = "".join("\n" + ln for ln in lines)
+                else:
+                    start, stop, text = 0, end, "\n".join(lines)
+                cur.setPosition(start)
+                cur.setPosition(stop, QTextCursor.KeepAnchor)
+                cur.insertText(text)
+        finally:
+            cur.endEditBlock()
+            vbar.setValue(v); hbar.setValue(h)
+            self.setUpdatesEnabled(True)
+        return True
+
     def insertFromMimeData(self, source):
         try:
             if source and source.hasText():
@@ -2663,7 +502,95 @@ class CodeEditor(QPlainTextEdit):
             pass
 
 
+class _JobSignals(QObject):
+    done = Signal(int, object)
+    failed = Signal(int, str)
+class _TextJob(QRunnable):
+    def __init__(self, job_id: int, fn, args: tuple, signals: _JobSignals):
+        super().__init__()
+        self.job_id = job_id
+        self.fn = fn
+        self.args = args
+        self.signals = signals
+    def run(self):
+        try:
+            res = run_engine(self.fn, *self.args, token=self.job_id)
+        except Exception as e:
+            self.signals.failed.emit(self.job_id, f"{type(e).__name__}: {e}")
+            return
+        self.signals.done.emit(self.job_id, res)
+class JobRunner(QObject):
+    """
+    Общий исполнитель преобразований текста в пуле потоков Qt.
+    У каждого владельца (вкладки) актуально только последнее задание:
+    результаты устаревших и отменённых заданий отбрасываются.
+    Большие входы поток передаёт в пул процессов lce_core — такое
+    задание отмена действительно прерывает; задание, идущее в самом
+    потоке, прервать нельзя, его результат просто игнорируется.
+    """
+    busy_changed = Signal(int)
+    def __init__(self):
+        super().__init__()
+        self._pool = None
+        self._seq = 0
+        self._jobs = {}
+        self._latest = {}
+    def pool(self) -> QThreadPool:
+        if self._pool is None:
+            self._pool = QThreadPool.globalInstance()
+        return self._pool
+    def submit(self, owner, fn, *args, on_done=None, on_error=None) -> int:
+        self._seq += 1
+        job_id = self._seq
+        sig = _JobSignals()
+        sig.done.connect(self._on_done)
+        sig.failed.connect(self._on_failed)
+        self._jobs[job_id] = (owner, on_done, on_error, sig)
+        prev = self._latest.get(owner)
+        if prev is not None:
+            engine_pool.cancel(prev)
+        self._latest[owner] = job_id
+        self.pool().start(_TextJob(job_id, fn, args, sig))
+        self.busy_changed.emit(self.pending())
+        return job_id
+    def pending(self) -> int:
+        return len(self._latest)
+    def is_busy(self, owner) -> bool:
+        return owner in self._latest
+    def cancel(self, owner):
+        job_id = self._latest.pop(owner, None)
+        if job_id is not None:
+            engine_pool.cancel(job_id)
+            self.busy_changed.emit(self.pending())
+    def cancel_all(self):
+        if self._latest:
+            for job_id in self._latest.values():
+                engine_pool.cancel(job_id)
+            self._latest.clear()
+            self.busy_changed.emit(0)
+    def _finish(self, job_id: int):
+        entry = self._jobs.pop(job_id, None)
+        if entry is None or self._latest.get(entry[0]) != job_id:
+            return None
+        del self._latest[entry[0]]
+        self.busy_changed.emit(self.pending())
+        return entry
+    def _on_done(self, job_id: int, res):
+        entry = self._finish(job_id)
+        if entry and entry[1]:
+            entry[1](res)
+    def _on_failed(self, job_id: int, msg: str):
+        entry = self._finish(job_id)
+        if entry and entry[2]:
+            entry[2](msg)
+jobs = JobRunner()
 SUPPORTED_LANGS = ["HTML/XML", "CSS", "JavaScript", "PHP", "JSON", "Python", "Plain"]
+def _qt_pos(text: str, i: int) -> int:
+    """Индекс в str → позиция QTextCursor (UTF-16: символ вне BMP занимает две)."""
+    return i if text.isascii() else len(text[:i].encode("utf-16-le")) // 2
+def _py_index(text: str, pos: int) -> int:
+    """Позиция QTextCursor → индекс в str."""
+    return pos if text.isascii() else len(text.encode("utf-16-le")[:2 * pos].decode("utf-16-le", "ignore"))
 class CodePane(QWidget):
     def __init__(self, title_key: str, show_lang: bool = True, show_io_stats: bool = True):
         super().__init__()
@@ -2702,6 +629,16 @@ class CodePane(QWidget):
         self.lblLang.setText(i18n.t("ui.lang") + ":")
     def run_action(self):  
         pass
+    def run_job(self, fn, *args, on_done=None):
+        """Запускает fn(*args) в фоне; on_done(результат) вызывается в GUI-потоке."""
+        def on_error(msg: str):
+            QMessageBox.critical(self, "Error", msg)
+        return jobs.submit(self, fn, *args, on_done=on_done, on_error=on_error)
+    def show_result(self, text: str, lang: str, status_key: str):
+        self.output.setPlainTextFast(text)
+        self.output.setHighlightLanguage(lang)
+        sb = self._sb()
+        if sb: sb.showMessage(i18n.t(status_key), 1000)
     def act_open(self):
         path, _ = QFileDialog.getOpenFileName(self, i18n.t("act.open"), "", "All files (*.*)")
         if path:
@@ -2784,10 +721,11 @@ class CommentsAllTab(CodePane):
         ])
         self.btnRun  = QPushButton(i18n.t("clean.run"))
         self.btnCopy = QPushButton(i18n.t("clean.copy"))
-        for w in (self.cmbMode, self.btnRun, self.btnCopy):
+        self.btnFile = QPushButton(i18n.t("clean.file"))
+        for w in (self.cmbMode, self.btnRun, self.btnCopy, self.btnFile):
             w.setCursor(Qt.PointingHandCursor)
         row.addWidget(QLabel(i18n.t("clean.mode"))); row.addWidget(self.cmbMode); row.addStretch(1)
-        row.addWidget(self.btnRun); row.addWidget(self.btnCopy)
+        row.addWidget(self.btnRun); row.addWidget(self.btnCopy); row.addWidget(self.btnFile)
         self.layout().insertLayout(1, row)        
         self._customRowW = QWidget()
         crow = QHBoxLayout(self._customRowW); crow.setContentsMargins(0, 0, 0, 0)
@@ -2809,6 +747,7 @@ class CommentsAllTab(CodePane):
         self.cmbMode.currentIndexChanged.connect(self._on_mode_changed)
         self.btnRun.clicked.connect(self.run_action)
         self.btnCopy.clicked.connect(self.act_copy)
+        self.btnFile.clicked.connect(self.strip_file_action)
         i18n.on_change(lambda _: self.retranslate())
     def _on_mode_changed(self, idx: int):
         self._customRowW.setVisible(idx == 1)
@@ -2829,49 +768,76 @@ class CommentsAllTab(CodePane):
         self.cmbMode.setCurrentIndex(max(0, cur))
         self.btnRun.setText(i18n.t("clean.run"))
         self.btnCopy.setText(i18n.t("clean.copy"))
+        self.btnFile.setText(i18n.t("clean.file"))
         self.lblSel.setText(i18n.t("clean.sel_types"))
         self.cbHTML.setText(i18n.t("clean.type.html"))
         self.cbCBlock.setText(i18n.t("clean.type.cblock"))
         self.cbCLine.setText(i18n.t("clean.type.cline"))
         self.cbHash.setText(i18n.t("clean.type.hash"))
     def run_action(self):
-        code = self.input.toPlainText()
-        idx = self.cmbMode.currentIndex()
-        if idx == 0:  
-            res = strip_comments_all(code)
-        elif idx == 1:  
-            res = strip_comments_custom(
-                code,
-                html=self.cbHTML.isChecked(),
-                c_block=self.cbCBlock.isChecked(),
-                c_line=self.cbCLine.isChecked(),
-                py_hash=self.cbHash.isChecked(),
-            )
-        else:
-            map_lang = {
-                2: "HTML/XML", 3: "CSS", 4: "JavaScript",
-                5: "PHP", 6: "JSON", 7: "Python"
-            }
-            res = strip_comments(code, map_lang[idx])
-        use_lang = detect_language(code)
-        self.output.setPlainTextFast(res)
-        self.output.setHighlightLanguage(use_lang)
-        self.window().statusBar().showMessage(i18n.t("clean.run"), 1000)
+        self.run_job(
+            strip_job,
+            self.input.toPlainText(),
+            self.cmbMode.currentIndex(),
+            self.cbHTML.isChecked(),
+            self.cbCBlock.isChecked(),
+            self.cbCLine.isChecked(),
+            self.cbHash.isChecked(),
+            on_done=lambda r: self.show_result(r[0], r[1], "clean.run"),
+        )
+    def strip_file_action(self):
+        """Файл → файл потоком, без загрузки в редактор: для файлов в сотни МБ."""
+        lang = STRIP_MODE_LANGS.get(self.cmbMode.currentIndex())
+        if lang is None or lang == "HTML/XML":
+            QMessageBox.information(self, i18n.t("clean.file"), i18n.t("clean.file.lang"))
+            return
+        src, _ = QFileDialog.getOpenFileName(self, i18n.t("clean.file.pick"), "", "All files (*.*)")
+        if not src:
+            return
+        root, ext = os.path.splitext(src)
+        dst, _ = QFileDialog.getSaveFileName(self, i18n.t("clean.file.save"), f"{root}.nocomments{ext}",
+                                             "All files (*.*)")
+        if not dst:
+            return
+        def done(sizes):
+            sb = self._sb()
+            if sb: sb.showMessage(i18n.t("clean.file.done").format(src=sizes[0], dst=sizes[1]), 4000)
+        self.run_job(strip_file, src, dst, lang, on_done=done)
 class FormattingTab(CodePane):
+    LIVE_DELAY_MS = 400  # пауза после последней правки до живого форматирования
+
     def __init__(self):
         super().__init__("fmt.header", show_lang=True)
 
         self.cbTabs   = QCheckBox(i18n.t("fmt.tabs"))
         self.spIndent = QSpinBox(); self.spIndent.setRange(1, 12); self.spIndent.setValue(4)
         self.cbSort   = QCheckBox(i18n.t("fmt.sort"))
+        self.cbMangle = QCheckBox(i18n.t("fmt.mangle"))
+        self.cbCssOpt = QCheckBox(i18n.t("fmt.cssopt"))
         self.lblIndent = QLabel(i18n.t("fmt.indent") + ":")
         self.lblBlank  = QLabel(i18n.t("fmt.blank") + ":")
         self.spBlank   = QSpinBox(); self.spBlank.setRange(0, 10); self.spBlank.setValue(1)
         self.cbTrim    = QCheckBox(i18n.t("fmt.trim")); self.cbTrim.setChecked(True)
+        self.lblTier   = QLabel(i18n.t("fmt.tier") + ":")
+        self.cmbTier   = QComboBox(); self.cmbTier.addItems([i18n.t(f"fmt.tier.{t}") for t in FORMAT_TIERS])
+        self.cmbTier.setToolTip(i18n.t("fmt.tier.tip"))
         self.btnPretty = QPushButton(i18n.t("fmt.pretty"))
+        self.btnRange  = QPushButton(i18n.t("fmt.range")); self.btnRange.setToolTip(i18n.t("fmt.range.tip"))
+        self.btnRange.setShortcut(QKeySequence("Ctrl+Shift+F"))
+        self.cbLive    = QCheckBox(i18n.t("fmt.live")); self.cbLive.setToolTip(i18n.t("fmt.live.tip"))
         self.btnMinify = QPushButton(i18n.t("fmt.minify"))
-
-        for w in (self.cbTabs, self.cbSort, self.cbTrim, self.btnPretty, self.btnMinify):
+        self.btnFile   = QPushButton(i18n.t("clean.file"))
+        # (исходник, вывод, язык, настройки, revision() вывода) последнего форматирования —
+        # база для форматирования блока и правок вывода по строкам
+        self._fmt_last = None
+        self._range_points = RangeCheckpoints()  # точки разбора исходника для форматирования блока
+        self._live_timer = QTimer(self); self._live_timer.setSingleShot(True)
+        self._live_timer.timeout.connect(self._live_tick)
+        # вывод правится кусками при каждом живом обновлении — стек отмены не нужен (он только для чтения)
+        self.output.setUndoRedoEnabled(False)
+
+        for w in (self.cbTabs, self.cbSort, self.cbMangle, self.cbCssOpt, self.cbTrim, self.cmbTier, self.btnPretty,
+                  self.btnRange, self.cbLive, self.btnMinify, self.btnFile):
             w.setCursor(Qt.PointingHandCursor)
 
         row = QHBoxLayout()
@@ -2880,122 +846,194 @@ class FormattingTab(CodePane):
         row.addSpacing(12)
         row.addWidget(self.lblBlank); row.addWidget(self.spBlank)
         row.addWidget(self.cbTrim)
+        row.addSpacing(12)
+        row.addWidget(self.lblTier); row.addWidget(self.cmbTier)
         row.addStretch(1)
         row.addWidget(self.cbSort)
+        row.addWidget(self.cbMangle)
+        row.addWidget(self.cbCssOpt)
         row.addWidget(self.btnPretty)
+        row.addWidget(self.btnRange)
+        row.addWidget(self.cbLive)
         row.addWidget(self.btnMinify)
+        row.addWidget(self.btnFile)
         self.layout().insertLayout(1, row)
 
-        self.btnPretty.clicked.connect(self._do_pretty)
+        self.btnPretty.clicked.connect(lambda: self._do_pretty())
+        self.btnRange.clicked.connect(lambda: self._do_pretty_range())
+        self.input.textChanged.connect(self._on_live_edit)
+        for sig in (self.cbLive.toggled, self.cbTabs.toggled, self.cbSort.toggled, self.cbTrim.toggled,
+                    self.spIndent.valueChanged, self.spBlank.valueChanged, self.cmbTier.currentIndexChanged):
+            sig.connect(self._on_live_edit)
+        self.lang.currentTextChanged.connect(self._drop_base)
         self.btnMinify.clicked.connect(self._do_minify)
+        self.btnFile.clicked.connect(self._pretty_file)
         i18n.on_change(lambda _: self.retranslate())
 
     def retranslate(self):
         super().retranslate()
         self.cbTabs.setText(i18n.t("fmt.tabs"))
         self.cbSort.setText(i18n.t("fmt.sort"))
+        self.cbMangle.setText(i18n.t("fmt.mangle"))
+        self.cbCssOpt.setText(i18n.t("fmt.cssopt"))
         self.cbTrim.setText(i18n.t("fmt.trim"))
+        cur = self.cmbTier.currentIndex()
+        self.cmbTier.clear()
+        self.cmbTier.addItems([i18n.t(f"fmt.tier.{t}") for t in FORMAT_TIERS])
+        self.cmbTier.setCurrentIndex(max(0, cur))
+        self.cmbTier.setToolTip(i18n.t("fmt.tier.tip"))
+        self.lblTier.setText(i18n.t("fmt.tier") + ":")
         self.btnPretty.setText(i18n.t("fmt.pretty"))
+        self.btnRange.setText(i18n.t("fmt.range")); self.btnRange.setToolTip(i18n.t("fmt.range.tip"))
+        self.cbLive.setText(i18n.t("fmt.live")); self.cbLive.setToolTip(i18n.t("fmt.live.tip"))
         self.btnMinify.setText(i18n.t("fmt.minify"))
+        self.btnFile.setText(i18n.t("clean.file"))
         self.lblIndent.setText(i18n.t("fmt.indent") + ":")
         self.lblBlank.setText(i18n.t("fmt.blank") + ":")
 
-    def _apply_ws_options(self, text: str) -> str:
-        max_blank = self.spBlank.value()
-        trim_tail = self.cbTrim.isChecked()
-        return tidy_whitespace(text, max_blank_lines=max_blank, trim_trailing=trim_tail)
+    def _fmt_opts(self) -> tuple:
+        return (self.cbTabs.isChecked(), self.spIndent.value(), self.cbSort.isChecked(), self.spBlank.value(),
+                self.cbTrim.isChecked(), FORMAT_TIERS[max(0, self.cmbTier.currentIndex())])
 
-    def _do_pretty(self):
-        code = self.input.toPlainText()
+    def _drop_base(self, *_):
+        # другой язык — блок и строки прежнего вывода не годятся как база
+        self._fmt_last = None
 
-      
-        sel_lang = self.lang.currentText()
-        detected = detect_language(code[:8192])
-
-        def pick_lang(sel: str, det: str) -> str:
-            if sel == "Plain":
-                return det
-            if sel == "HTML/XML" and det in ("JavaScript", "CSS"):
-                return det
-            if sel in ("JavaScript", "CSS") and det == "HTML/XML":
-                return det
-            return sel
-
-        lang = pick_lang(sel_lang, detected)
-
-        res = pretty_format(
-            code,
-            lang,
-            self.cbTabs.isChecked(),
-            self.spIndent.value(),
-            self.cbSort.isChecked()
-        )
-        res = res.rstrip("\r\n")
-        res = self._apply_ws_options(res)
+    def _on_live_edit(self, *_):
+        if self.cbLive.isChecked():
+            self._live_timer.start(self.LIVE_DELAY_MS)
 
-        self.output.setPlainTextFast(res)
-        self.output.setHighlightLanguage(lang)
-        self.window().statusBar().showMessage(i18n.t("fmt.pretty"), 1000)
+    def _live_tick(self):
+        if self.cbLive.isChecked() and self.input.document().characterCount() > 1:
+            self._do_pretty_range(live=True)
 
-    def _do_minify(self):
+    def _do_pretty(self, live: bool = False):
+        """
+        Весь текст. В живом режиме при актуальной базе задание возвращает ещё
+        и правки строк прежнего вывода: документ обновляется ими, а не
+        заменой целиком, — прокрутка и подсветка остальных строк сохраняются.
+        """
+        code, opts = self.input.toPlainText(), self._fmt_opts()
+        last = self._fmt_last
+        if live and last is not None and last[4] == self.output.document().revision():
+            self.run_job(pretty_diff_job, code, self.lang.currentText(), *opts, last[1],
+                         on_done=lambda r: self._pretty_done(r, code, opts, last))
+        else:
+            self.run_job(pretty_job, code, self.lang.currentText(), *opts,
+                         on_done=lambda r: self._pretty_done(r, code, opts))
+
+    def _pretty_done(self, r, code: str, opts: tuple, last: Optional[tuple] = None):
+        doc = self.output.document()
+        if (last is not None and self._fmt_last is last and last[4] == doc.revision()
+                and self.output.applyLineHunks(r[2], last[1].count("\n") + 1)):
+            self.output.setHighlightLanguage(r[1])
+        else:
+            self.show_result(r[0], r[1], "fmt.pretty")
+        self._fmt_last = (code, r[0], r[1], opts, doc.revision())
+
+    def _do_pretty_range(self, live: bool = False):
+        """
+        Только выделение или блок вокруг курсора и правок с прошлого
+        форматирования — вклеивается в вывод правкой QTextCursor, без сброса
+        документа. Нет базы (вывод с тех пор менялся, другие настройки) или
+        блок не нашёлся — обычное форматирование всего текста.
+        """
+        last, opts = self._fmt_last, self._fmt_opts()
+        if last is None or last[3] != opts or last[4] != self.output.document().revision():
+            self._do_pretty(live)
+            return
         code = self.input.toPlainText()
+        cur = self.input.textCursor()
+        use_tabs, indent_size, _, max_blank, _, tier = opts
+        t0 = time.perf_counter()
+        self.run_job(pretty_range_job, last[0], last[1], code,
+                     _py_index(code, cur.selectionStart()), _py_index(code, cur.selectionEnd()),
+                     last[2], use_tabs, indent_size, max_blank, tier, self._range_points,
+                     on_done=lambda r: self._range_done(r, last, code, t0, live))
+
+    def _range_done(self, r, last: tuple, code: str, t0: float, live: bool):
+        doc = self.output.document()
+        if r is None or self._fmt_last is not last or last[4] != doc.revision():
+            self._do_pretty(live)
+            return
+        i, j, text = r
+        out = last[1]
+        cur = QTextCursor(doc)
+        cur.beginEditBlock()
+        cur.setPosition(_qt_pos(out, i))
+        cur.setPosition(_qt_pos(out, j), QTextCursor.KeepAnchor)
+        cur.insertText(text)
+        cur.endEditBlock()
+        self._fmt_last = (code, out[:i] + text + out[j:], last[2], last[3], doc.revision())
+        if live:
+            return  # прокрутка вывода остаётся на месте
+        self.output.setTextCursor(cur)
+        self.output.ensureCursorVisible()
+        sb = self._sb()
+        if sb:
+            sb.showMessage(i18n.t("fmt.range.done").format(
+                lines=text.count("\n") + 1, ms=(time.perf_counter() - t0) * 1000), 3000)
+
+    def _pretty_file(self):
+        """
+        XML/HTML, JSON или JSON Lines файл → файл потоком: фиды, sitemap и
+        выгрузки в сотни МБ не грузятся в редактор.
+        """
         lang = self.lang.currentText()
-        res = minify_code(code, lang).rstrip("\r\n")
-        res = self._apply_ws_options(res)
-        use_lang = detect_language(code[:8192])
-        self.output.setPlainTextFast(res)
-        self.output.setHighlightLanguage(use_lang)
-        self.window().statusBar().showMessage(i18n.t("fmt.minify"), 1000)
+        if lang not in ("HTML/XML", "JSON", "Plain"):
+            QMessageBox.information(self, i18n.t("clean.file"), i18n.t("fmt.file.lang"))
+            return
+        src, _ = QFileDialog.getOpenFileName(
+            self, i18n.t("fmt.file.pick"), "",
+            "XML/HTML, JSON (*.xml *.html *.htm *.xhtml *.svg *.json *.jsonl *.ndjson);;All files (*.*)")
+        if not src:
+            return
+        jsonl = src.lower().endswith((".jsonl", ".ndjson"))
+        root, ext = os.path.splitext(src)
+        dst, _ = QFileDialog.getSaveFileName(self, i18n.t("clean.file.save"), f"{root}.pretty{ext}",
+                                             "All files (*.*)")
+        if not dst:
+            return
+        def done(sizes):
+            sb = self._sb()
+            if sb: sb.showMessage(i18n.t("clean.file.done").format(src=sizes[0], dst=sizes[1]), 4000)
+        indent = "\t" if self.cbTabs.isChecked() else " " * self.spIndent.value()
+        if jsonl:
+            def done_jsonl(r):
+                sb = self._sb()
+                if sb: sb.showMessage(i18n.t("fmt.file.jsonl").format(lines=r[0], bad=r[1]), 4000)
+            self.run_job(format_jsonl_file, src, dst, indent, self.cbSort.isChecked(), on_done=done_jsonl)
+        elif lang == "JSON" or ext.lower() == ".json":
+            self.run_job(format_json_file, src, dst, indent, self.cbSort.isChecked(), on_done=done)
+        else:
+            self.run_job(pretty_html_file, src, dst, indent, self.spBlank.value(), on_done=done)
+
+    def _do_minify(self):
+        t0 = time.perf_counter()
+        self.run_job(
+            minify_job,
+            self.input.toPlainText(),
+            self.lang.currentText(),
+            self.spBlank.value(),
+            self.cbTrim.isChecked(),
+            self.cbMangle.isChecked(),
+            self.cbCssOpt.isChecked(),
+            on_done=lambda r: self._minify_done(r, time.perf_counter() - t0),
+        )
+
+    def _minify_done(self, r, sec: float):
+        res, lang, (n_in, n_out) = r
+        self.show_result(res, lang, "fmt.minify")
+        sb = self._sb()
+        if sb:
+            pct = 100.0 * (n_in - n_out) / n_in if n_in else 0.0
+            sb.showMessage(i18n.t("fmt.minify.stats").format(src=n_in, dst=n_out, pct=pct, ms=sec * 1000), 4000)
 
     def run_action(self):
         self._do_pretty()
 
 
 
-def obfuscate_js_eval_base64(code: str) -> str:
-    b = b64(code)
- 
-    return ("(function(){"
-            "const d=(s)=>{try{return decodeURIComponent(escape(s))}catch(e){return s}};"
-            "eval(d(atob('%s')));"
-            "})();") % b
-
-
-def obfuscate_hex_js(code: str) -> str:
-    """
-    Обфускация через \\xNN: берём UTF-8 байты исходного текста
-    и экранируем каждый байт. Так deobfuscate сможет вернуть
-    исходную строку с Unicode.
-    """
-    bs = code.encode("utf-8")
-    esc = ''.join('\\x%02x' % b for b in bs)
-  
-    return "eval('%s');" % esc
-def obfuscate_generic_base64(code: str, lang: str) -> str:
-    b = b64(code)
-    if lang == "Python":
-        return f"import base64;exec(base64.b64decode('{b}').decode('utf-8'))"
-    if lang == "PHP":
-        return f"<?php eval(base64_decode('{b}'));"
-    if lang == "HTML/XML":
-        return (f"<script>(()=>{{const s=atob('{b}');try{{document.write(decodeURIComponent(escape(s)))}}"
-                f"catch(e){{document.write(s)}}}})();</script>")
-    if lang == "CSS":
-        return (f"<script>(()=>{{const css=(()=>{{const s=atob('{b}');try{{return decodeURIComponent(escape(s))}}"
-                f"catch(e){{return s}}}})();const st=document.createElement('style');st.textContent=css;"
-                f"document.head.appendChild(st);}})();</script>")
-    return b
-def append_comment(code: str, lang: str, comment: str) -> str:
-    c = comment.strip()
-    if not c: return code
-    if lang in ("JavaScript", "PHP", "CSS", "Plain", "JSON"):
-        return f"/* {c} */\n{code}"
-    if lang == "Python":
-        lines = "\n".join(f"# {ln}" if ln.strip() else "#" for ln in c.splitlines())
-        return f"{lines}\n{code}"
-    if lang == "HTML/XML":
-        return f"<!-- {c} -->\n{code}"
-    return code
 class ObfuscateTab(CodePane):
     def __init__(self):
         super().__init__("obf.header", show_lang=True)
@@ -3036,32 +1074,25 @@ class ObfuscateTab(CodePane):
         self._lblMethod.setText(i18n.t("obf.method"))
         self._lblComment.setText(i18n.t("obf.comment"))
     def _do_obf(self):
-        code = self.input.toPlainText()
-        lang = self.lang.currentText()
-        method = self.cmbMethod.currentIndex()
-        if method == 0:
-            res = obfuscate_js_eval_base64(code); out_lang = "JavaScript"
-        elif method == 1:
-            res = obfuscate_hex_js(code); out_lang = "JavaScript"
-        else:
-            res = obfuscate_generic_base64(code, lang)
-            out_lang = "JavaScript" if lang in ("HTML/XML", "CSS") else lang
-        res = append_comment(res, out_lang, self.edComment.toPlainText())
-        self.output.setPlainTextFast(res)
-        self.output.setHighlightLanguage(out_lang)
-        self.window().statusBar().showMessage(i18n.t("obf.run"), 1000)
+        self.run_job(
+            obfuscate_job,
+            self.input.toPlainText(),
+            self.lang.currentText(),
+            self.cmbMethod.currentIndex(),
+            self.edComment.toPlainText(),
+            on_done=lambda r: self.show_result(r[0], r[1], "obf.run"),
+        )
     def _do_deobf(self):
         s = self.input.toPlainText() or self.output.toPlainText()
         if not s:
             QMessageBox.information(self, "Info", "Insert obfuscated code in input or get result first.")
             return
-        res = deobfuscate(s)
-        if res is None:
+        self.run_job(deobfuscate_job, s, on_done=self._on_deobf_done)
+    def _on_deobf_done(self, r):
+        if r is None:
             QMessageBox.information(self, "Info", "Nothing recognizable to decode.")
             return
-        self.output.setPlainTextFast(res)
-        self.output.setHighlightLanguage(detect_language(res))
-        self.window().statusBar().showMessage(i18n.t("obf.deobf"), 1000)
+        self.show_result(r[0], r[1], "obf.deobf")
     def _apply_comment_to_output(self):
         res = self.output.toPlainText()
         if not res: return
@@ -3159,7 +1190,7 @@ class JsLinkTab(CodePane):
             QMessageBox.information(self, "Info", "URL is empty.")
             return
         webbrowser.open_new_tab(url)
-import webbrowser, urllib.parse, secrets, string, unicodedata
+import webbrowser, urllib.parse, secrets
 class UtmTab(CodePane):
     def __init__(self):
         super().__init__("utm.header", show_lang=False)
@@ -3477,99 +1508,21 @@ class FaviconTab(CodePane):
         if d and os.path.isdir(d):
             QDesktopServices.openUrl(QUrl.fromLocalFile(d))
 
-  
-    def _normalize_prefix(self, p: str) -> str:
-        p = (p or "/").strip()
-        if not p.startswith("/"): p = "/" + p
-        p = p.rstrip("/")
-        return p
 
     def _load_image(self, path: str):
         try:
-            from PIL import Image
-        except Exception:
+            return load_image(path)
+        except ImportError:
             QMessageBox.critical(self, "Error", "Pillow (PIL) не установлен.\nУстановите: pip install pillow")
             return None
-        try:
-            img = Image.open(path).convert("RGBA")
-            return img
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Не удалось открыть изображение:\n{e}")
             return None
 
-    def _square_resize(self, img, size: int):
-      
-        from PIL import Image
-        w, h = img.size
-        L = max(w, h)
-        canvas = Image.new("RGBA", (L, L), (0,0,0,0))
-        canvas.paste(img, ((L - w)//2, (L - h)//2))
-        return canvas.resize((size, size), Image.LANCZOS)
-
-    def _save_png(self, img, path: str, size: int):
-        try:
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-            im = self._square_resize(img, size)
-            im.save(path, format="PNG")
-        except Exception as e:
-            raise RuntimeError(f"PNG {size}x{size}: {e}")
-
-    def _save_ico(self, img, path: str, sizes=(16, 32, 48, 64)):
-        try:
-            from PIL import Image
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-            icons = [self._square_resize(img, s) for s in sizes]
-
-            base = icons[0]
-            base.save(path, format="ICO", sizes=[(s, s) for s in sizes])
-        except Exception as e:
-            raise RuntimeError(f"ICO: {e}")
-
-    def _make_snippet(self, prefix: str, theme: str) -> str:
-        p = self._normalize_prefix(prefix)
-        lines = [
-            f'<link rel="shortcut icon" href="{p}/favicon.ico" type="image/x-icon">',
-            f'<link rel="icon" href="{p}/favicon.ico" type="image/x-icon">',
-            f'<link rel="apple-touch-icon" sizes="57x57" href="{p}/apple-icon-57x57.png">',
-            f'<link rel="apple-touch-icon" sizes="60x60" href="{p}/apple-icon-60x60.png">',
-            f'<link rel="apple-touch-icon" sizes="72x72" href="{p}/apple-icon-72x72.png">',
-            f'<link rel="apple-touch-icon" sizes="76x76" href="{p}/apple-icon-76x76.png">',
-            f'<link rel="apple-touch-icon" sizes="114x114" href="{p}/apple-icon-114x114.png">',
-            f'<link rel="apple-touch-icon" sizes="120x120" href="{p}/apple-icon-120x120.png">',
-            f'<link rel="apple-touch-icon" sizes="144x144" href="{p}/apple-icon-144x144.png">',
-            f'<link rel="apple-touch-icon" sizes="152x152" href="{p}/apple-icon-152x152.png">',
-            f'<link rel="apple-touch-icon" sizes="180x180" href="{p}/apple-icon-180x180.png">',
-            f'<link rel="icon" type="image/png" sizes="192x192"  href="{p}/android-icon-192x192.png">',
-            f'<link rel="icon" type="image/png" sizes="32x32" href="{p}/favicon-32x32.png">',
-            f'<link rel="icon" type="image/png" sizes="96x96" href="{p}/favicon-96x96.png">',
-            f'<link rel="icon" type="image/png" sizes="16x16" href="{p}/favicon-16x16.png">',
-            f'<link rel="manifest" href="{p}/manifest.json">',
-            f'<meta name="msapplication-TileColor" content="{theme}">',
-            f'<meta name="msapplication-TileImage" content="{p}/ms-icon-144x144.png">',
-            f'<meta name="theme-color" content="{theme}">',
-        ]
-        return "\n".join(lines)
-
-    def _write_manifest(self, folder: str, prefix: str, appname: str, theme: str):
-        data = {
-            "name": appname or "App",
-            "short_name": appname or "App",
-            "icons": [
-                {"src": f"{prefix}/android-icon-192x192.png", "sizes": "192x192", "type": "image/png"},
-                {"src": f"{prefix}/android-chrome-512x512.png", "sizes": "512x512", "type": "image/png"},
-            ],
-            "theme_color": theme,
-            "background_color": theme,
-            "display": "standalone"
-        }
-        path = os.path.join(folder, "manifest.json")
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-
     def _do_generate(self):
         src = (self.edSrc.text() or "").strip()
         outdir = (self.edDir.text() or "").strip()
-        pref = self._normalize_prefix(self.edPref.text())
+        pref = normalize_prefix(self.edPref.text())
         color = (self.edColor.text() or "#ffffff").strip()
         appn = (self.edName.text() or APP_NAME).strip()
 
@@ -3579,53 +1532,12 @@ class FaviconTab(CodePane):
         if not outdir:
             QMessageBox.information(self, "Info", "Укажите папку для сохранения.")
             return
-        os.makedirs(outdir, exist_ok=True)
 
         img = self._load_image(src)
         if img is None:
             return
 
-
-        apple = [57,60,72,76,114,120,144,152,180]
-        fav_png = [16,32,96]
-        android = [192]
-        chrome512 = 512
-        ms = [144]
-        ico_sizes = (16, 32, 48, 64)
-
-        errors = []
-        def try_call(fn):
-            try:
-                fn()
-            except Exception as e:
-                errors.append(str(e))
-
-   
-        try_call(lambda: self._save_ico(img, os.path.join(outdir, "favicon.ico"), sizes=ico_sizes))
-   
-        for s in fav_png:
-            try_call(lambda s=s: self._save_png(img, os.path.join(outdir, f"favicon-{s}x{s}.png"), s))
-   
-        for s in apple:
-            try_call(lambda s=s: self._save_png(img, os.path.join(outdir, f"apple-icon-{s}x{s}.png"), s))
-    
-        for s in android:
-            try_call(lambda s=s: self._save_png(img, os.path.join(outdir, f"android-icon-{s}x{s}.png"), s))
-
-        for s in ms:
-            try_call(lambda s=s: self._save_png(img, os.path.join(outdir, f"ms-icon-{s}x{s}.png"), s))
-    
-        try_call(lambda: self._save_png(img, os.path.join(outdir, "android-chrome-512x512.png"), chrome512))
-
-        try:
-            self._write_manifest(outdir, pref, appn, color)
-        except Exception as e:
-            errors.append(f"manifest.json: {e}")
-
-    
-        snippet = self._make_snippet(pref, color)
-        if errors:
-            snippet += "\n\n<!-- WARNINGS -->\n" + "\n".join(f"<!-- {e} -->" for e in errors)
+        snippet, _errors = generate_favicons(img, outdir, pref, color, appn)
 
         self.output.setPlainTextFast(snippet)
         self.output.setHighlightLanguage("HTML/XML")
@@ -3803,89 +1715,6 @@ class SitemapTab(CodePane):
         if d and os.path.isdir(d):
             QDesktopServices.openUrl(QUrl.fromLocalFile(d))
 
-    # ---------- Core helpers ----------
-    def _norm_join(self, base: str, raw: str) -> Optional[str]:
-        import urllib.parse
-        raw = (raw or "").strip()
-        if not raw or raw.startswith("#"):
-            return None
-        u = urllib.parse.urljoin(base, raw)
-        parts = list(urllib.parse.urlsplit(u))
-        parts[4] = ""  # fragment
-        # нормализуем путь/квери
-        parts[2] = urllib.parse.quote(parts[2], safe="/%._-~")
-        parts[3] = "&".join(
-            f"{urllib.parse.quote_plus(k)}={urllib.parse.quote_plus(v)}"
-            for k, v in urllib.parse.parse_qsl(parts[3], keep_blank_values=True)
-        )
-        return urllib.parse.urlunsplit(parts)
-
-    def _collect_from_list(self, base: str) -> list[str]:
-        lines = self.input.toPlainText().splitlines()
-        out, seen = [], set()
-        for ln in lines:
-            ln = ln.strip()
-            if not ln or ln.startswith("#"):
-                continue
-            if ln.startswith(("http://", "https://")):
-                u = self._norm_join("", ln)
-            else:
-                u = self._norm_join(base, ln)
-            if u and u not in seen:
-                seen.add(u); out.append(u)
-        return out
-
-    def _collect_from_folder(self, base: str, folder: str) -> list[tuple[str, Optional[str]]]:
-        import datetime
-        urls = []
-        exts = {".html", ".htm", ".xhtml"}
-        root = os.path.abspath(folder)
-        for dirpath, _dirs, files in os.walk(root):
-            for fn in files:
-                ext = os.path.splitext(fn)[1].lower()
-                if ext not in exts: continue
-                full = os.path.join(dirpath, fn)
-                rel = os.path.relpath(full, root).replace("\\", "/")
-                if fn.lower() in ("index.html", "index.htm", "index.xhtml"):
-                    rel_url = "/" + os.path.dirname(rel).strip("/").replace("\\", "/") + "/"
-                    rel_url = rel_url.replace("//", "/")
-                else:
-                    rel_url = "/" + rel
-                u = self._norm_join(base, rel_url)
-                lm = None
-                if self.cbLastmodMtime.isChecked():
-                    try:
-                        d = datetime.date.fromtimestamp(os.path.getmtime(full))
-                        lm = d.isoformat()
-                    except Exception:
-                        pass
-                if u:
-                    urls.append((u, lm))
-        urls.sort(key=lambda t: (t[0].count("/"), t[0]))
-        seen = set(); uniq=[]
-        for u,lm in urls:
-            if u in seen: continue
-            seen.add(u); uniq.append((u,lm))
-        return uniq
-
-    def _build_xml(self, items: list[tuple[str, Optional[str]]], changefreq: str, priority: Optional[float]) -> str:
-        def esc(s: str) -> str:
-            return (s.replace("&","&amp;").replace("<","&lt;").replace(">","&gt;"))
-        lines = [
-            '<?xml version="1.0" encoding="UTF-8"?>',
-            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
-        ]
-        for (loc, lastmod) in items:
-            lines.append("  <url>")
-            lines.append(f"    <loc>{esc(loc)}</loc>")
-            if lastmod:    lines.append(f"    <lastmod>{lastmod}</lastmod>")
-            if changefreq: lines.append(f"    <changefreq>{changefreq}</changefreq>")
-            if priority is not None:
-                lines.append(f"    <priority>{priority:.1f}</priority>")
-            lines.append("  </url>")
-        lines.append("</urlset>")
-        return "\n".join(lines)
-
     # ---------- HTTP crawler ----------
     def _stop_scan(self):
         if self._crawler and getattr(self._crawler, "stop", None):
@@ -3904,11 +1733,11 @@ class SitemapTab(CodePane):
         priority = prio if prio >= 0.0 else None
 
         if mode == 0:
-            urls = self._collect_from_list(base)
+            urls = collect_from_list(self.input.toPlainText(), base)
             today = datetime.date.today().isoformat() if self.cbLastmodToday.isChecked() else None
             items = [(u, today) for u in urls]
-            txt = self._build_xml(items, freq, priority)
-            if len(items) > 50000:
+            txt = build_sitemap_xml(items, freq, priority)
+            if len(items) > SITEMAP_MAX_URLS:
                 txt += f"\n<!-- {i18n.t('smap.too_many')} -->"
             self.output.setPlainTextFast(txt)
             self.output.setHighlightLanguage("HTML/XML")
@@ -3920,9 +1749,9 @@ class SitemapTab(CodePane):
             if not folder or not os.path.isdir(folder):
                 QMessageBox.information(self, "Info", i18n.t("smap.scan_warn"))
                 return
-            items = self._collect_from_folder(base, folder)
-            txt = self._build_xml(items, freq, priority)
-            if len(items) > 50000:
+            items = collect_from_folder(base, folder, self.cbLastmodMtime.isChecked())
+            txt = build_sitemap_xml(items, freq, priority)
+            if len(items) > SITEMAP_MAX_URLS:
                 txt += f"\n<!-- {i18n.t('smap.too_many')} -->"
             self.output.setPlainTextFast(txt)
             self.output.setHighlightLanguage("HTML/XML")
@@ -4108,8 +1937,8 @@ class SitemapTab(CodePane):
         def on_finished(items):
             self.btnGen.setEnabled(True); self.btnStop.setEnabled(False)
             self._lblProg.setText(i18n.t("smap.progress").format(done=len(items), limit=self.spMaxPages.value()))
-            txt = self._build_xml(items, freq, priority)
-            if len(items) > 50000:
+            txt = build_sitemap_xml(items, freq, priority)
+            if len(items) > SITEMAP_MAX_URLS:
                 txt += f"\n<!-- {i18n.t('smap.too_many')} -->"
             self.output.setPlainTextFast(txt)
             self.output.setHighlightLanguage("HTML/XML")
@@ -4219,91 +2048,16 @@ class RobotsTxtTab(CodePane):
         self.btnCopy.setText(i18n.t("robots.copy"))
 
 
-    def _preset_rules(self, preset_idx: int) -> tuple[list[str], list[str]]:
-        """
-        Возвращает (allows, disallows) для User-agent: *
-        """
-        if preset_idx == 1: 
-            return ([], ["/"])
-        if preset_idx == 2:  
-            allows = ["/wp-admin/admin-ajax.php", "/wp-content/uploads/"]
-            disallows = [
-                "/wp-admin/",
-                "/wp-includes/",
-                "/xmlrpc.php",
-                "/wp-login.php",
-                "/wp-register.php",
-                "/*?s=*",
-                "/*?replytocom=*",
-                "/?*",
-            ]
-            return (allows, disallows)
-        if preset_idx == 3: 
-            allows = ["/upload/", "/local/templates/", "/local/components/"]
-            disallows = [
-                "/bitrix/",
-                "/auth/",
-                "/search/",
-                "/upload/resize_cache/",
-                "/*?print=1",
-                "/*?utm_*",
-                "/*?PAGEN_*",
-                "/*?sort=*",
-                "/*?view=*",
-                "/*?login=yes",
-                "/*?logout=*",
-            ]
-            return (allows, disallows)
-     
-        return ([], [""])  
-
-    
     def run_action(self):
-        preset = self.cmbPreset.currentIndex()
-        allows, disallows = self._preset_rules(preset)
-
-        host = (self.edHost.text() or "").strip()
-        smap_raw = (self.edMap.text() or "").strip().replace(",", " ")
-        maps = [u for u in smap_raw.split() if u]
-
-        delay = int(self.spDelay.value() or 0)
-        clean = (self.edClean.text() or "").strip()
-
-        extra = self.edExtra.toPlainText().replace("\r\n", "\n").strip("\n")
-
-        lines = []
-        lines.append("# robots.txt generated by LinkCodeEdit")
-        lines.append("# " + i18n.t("robots.note"))
-
-        
-        lines.append("\nUser-agent: *")
-        if allows:
-            for p in allows:
-                lines.append(f"Allow: {p}")
-        if disallows:
-            for p in disallows:
-               
-                if p == "":
-                    lines.append("Disallow:")
-                else:
-                    lines.append(f"Disallow: {p}")
-        if delay > 0:
-            lines.append(f"Crawl-delay: {delay}")
-        if clean:
-            lines.append(f"Clean-param: {clean}")
-
-      
-        if host:
-            lines.append(f"Host: {host}")
-        for u in maps:
-            lines.append(f"Sitemap: {u}")
-
-       
-        if extra:
-            lines.append("")  
-            lines.append(extra)
-
-        txt = "\n".join(lines).strip() + "\n"
+        txt = build_robots_txt(
+            self.cmbPreset.currentIndex(),
+            host=self.edHost.text(),
+            sitemaps=self.edMap.text(),
+            crawl_delay=int(self.spDelay.value() or 0),
+            clean_param=self.edClean.text(),
+            extra=self.edExtra.toPlainText(),
+            note=i18n.t("robots.note"),
+        )
         self.output.setPlainTextFast(txt)
         self.output.setHighlightLanguage("Plain")
         sb = self._sb(); sb and sb.showMessage(i18n.t("robots.generate"), 1200)
@@ -4342,59 +2096,16 @@ class SlugTab(CodePane):
         self.btnMake.setText(i18n.t("slug.make"))
         self._lblSep.setText(i18n.t("slug.sep"))
         self._lblMax.setText(i18n.t("slug.max"))
-    _RU = {
-        'а':'a','б':'b','в':'v','г':'g','д':'d','е':'e','ё':'e','ж':'zh','з':'z','и':'i','й':'y','к':'k','л':'l',
-        'м':'m','н':'n','о':'o','п':'p','р':'r','с':'s','т':'t','у':'u','ф':'f','х':'h','ц':'c','ч':'ch','ш':'sh',
-        'щ':'sch','ъ':'','ы':'y','ь':'','э':'e','ю':'yu','я':'ya'
-    }
-    def _slugify(self, text: str, sep: str, lower: bool, translit: bool, maxlen: int) -> str:
-        s = text.strip()
-        if translit:
-            tmp = []
-            for ch in s:
-                lo = ch.lower()
-                if lo in self._RU:
-                    rep = self._RU[lo]
-                    tmp.append(rep.upper() if ch.isupper() else rep)
-                else:
-                    tmp.append(ch)
-            s = ''.join(tmp)
-        s = unicodedata.normalize("NFKD", s)
-        s = ''.join(c for c in s if not unicodedata.combining(c))
-        out = []
-        prev_sep = False
-        for ch in s:
-            if ch.isalnum():
-                out.append(ch)
-                prev_sep = False
-            else:
-                if not prev_sep:
-                    out.append(sep)
-                    prev_sep = True
-        res = ''.join(out).strip(sep)
-        if lower:
-            res = res.lower()
-        if len(res) > maxlen:
-            res = res[:maxlen].rstrip(sep)
-        return res
     def run_action(self):
-        sep = (self.edSep.text() or "-")[0]
-        txt = self.input.toPlainText()
-        lower = self.cbLower.isChecked()
-        translit = self.cbTrans.isChecked()
-        maxlen = self.spMax.value()
-
-        lines_out = []
-        for ln in txt.splitlines():
-            if not ln.strip():
-                continue 
-            slug = self._slugify(ln, sep, lower, translit, maxlen)
-            lines_out.append(slug)
-
-        res = "\n".join(lines_out)
-        self.output.setPlainTextFast(res)
-        self.output.setHighlightLanguage("Прочее")
-        self.window().statusBar().showMessage(i18n.t("slug.make"), 1000)
+        self.run_job(
+            slugify_lines,
+            self.input.toPlainText(),
+            (self.edSep.text() or "-")[0],
+            self.cbLower.isChecked(),
+            self.cbTrans.isChecked(),
+            self.spMax.value(),
+            on_done=lambda res: self.show_result(res, "Прочее", "slug.make"),
+        )
 
 class StatsTab(CodePane):
     def __init__(self):
@@ -4552,39 +2263,45 @@ class PasswordTab(CodePane):
         self.output.setPlainTextFast(out)
         self.output.setHighlightLanguage("Прочее")
         self.window().statusBar().showMessage(i18n.t("pass.gen"), 1000)
+TAB_CLASSES = {
+    "format":  (FormattingTab,  "tab.format"),
+    "clean":   (CommentsAllTab, "tab.clean"),
+    "og":      (OgTab,          "tab.og"),
+    "utm":     (UtmTab,         "tab.utm"),
+    "slug":    (SlugTab,        "tab.slug"),
+    "link":    (JsLinkTab,      "tab.link"),
+    "obf":     (ObfuscateTab,   "tab.obf"),
+    "stats":   (StatsTab,       "tab.stats"),
+    "pass":    (PasswordTab,    "tab.pass"),
+    "favicon": (FaviconTab,     "tab.favicon"),
+    "sitemap": (SitemapTab,     "tab.sitemap"),
+    "robots":  (RobotsTxtTab,   "tab.robots"),
+}
+class _LazyTab(QWidget):
+    """Пустая заглушка вкладки; настоящая создаётся при первой активации."""
+    def __init__(self, tid: str):
+        super().__init__()
+        self.tid = tid
+def _materialize_tab(self: "MainWindow", idx: int):
+    stub = self.tabs.widget(idx)
+    if not isinstance(stub, _LazyTab):
+        return
+    cls, key = TAB_CLASSES[stub.tid]
+    real = cls()
+    icon, text = self.tabs.tabIcon(idx), self.tabs.tabText(idx)
+    sb = QSignalBlocker(self.tabs)
+    try:
+        self.tabs.removeTab(idx)
+        self.tabs.insertTab(idx, real, icon, text)
+        self.tabs.setCurrentIndex(idx)
+    finally:
+        del sb
+    self._tab_map[stub.tid] = (real, key)
+    stub.deleteLater()
+    startup_mark(f"tab {stub.tid}")
 def _build_tabs_with_extras(self: "MainWindow"):
-    self.tabs = QTabWidget()  
-    self.tabFmt    = FormattingTab()
-    self.tabClean  = CommentsAllTab()
-    self.tabOG     = OgTab()
-    self.tabFav = FaviconTab()                         
-    self.tabs.addTab(self.tabFav, i18n.t("tab.favicon")) 
-    self.tabSmap = SitemapTab()
-    self.tabs.addTab(self.tabSmap, i18n.t("tab.sitemap"))
-    self.tabRobots = RobotsTxtTab()
-    self.tabs.addTab(self.tabRobots,i18n.t("tab.robots"))
-
-    self.tabUtm    = UtmTab()
-    self.tabSlug   = SlugTab()
-    self.tabLink   = JsLinkTab()
-    self.tabFavicon = FaviconTab()
-    self.tabObf    = ObfuscateTab()
-    self.tabStats  = StatsTab()
-    self.tabPass   = PasswordTab()   
-    self._tab_map = {
-        "format": (self.tabFmt,  "tab.format"),
-        "clean":  (self.tabClean,"tab.clean"),
-        "og":     (self.tabOG,   "tab.og"),
-        "utm":    (self.tabUtm,  "tab.utm"),
-        "slug":   (self.tabSlug, "tab.slug"),
-        "link":   (self.tabLink, "tab.link"),
-        "obf":    (self.tabObf,  "tab.obf"),
-        "stats":  (self.tabStats,"tab.stats"),
-        "pass":   (self.tabPass, "tab.pass"),
-        "favicon":(self.tabFav,  "tab.favicon"), 
-        "sitemap": (self.tabSmap, "tab.sitemap"),
-        "robots":  (self.tabRobots,"tab.robots"),
-    }
+    self.tabs = QTabWidget()
+    self._tab_map = {tid: (_LazyTab(tid), key) for tid, (_cls, key) in TAB_CLASSES.items()}
     settings = QSettings(APP_ORG, APP_NAME)
     default_ids = list(self._tab_map.keys())
     saved_ids = settings.value("ui/tab_order", default_ids)   
@@ -4610,6 +2327,8 @@ def _build_tabs_with_extras(self: "MainWindow"):
             self.tabs.addTab(w, i18n.t(key))
     self.tabs.setMovable(True)
     self.tabs.tabBar().tabMoved.connect(lambda _f, _t: self._tab_save_timer.start(200))
+    self.tabs.currentChanged.connect(self._materialize_tab)
+    self._materialize_tab(self.tabs.currentIndex())
     self.setCentralWidget(self.tabs)
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -4632,11 +2351,68 @@ class MainWindow(QMainWindow):
         self._tab_save_timer.timeout.connect(self._save_tab_order)
         self._build_menubar()
         self.setStatusBar(QStatusBar())
+        self._build_job_indicator()
         self.setStyleSheet(self._style_qss())
         self._retranslate()
         i18n.on_change(lambda _: self._retranslate())
+        if QSettings(APP_ORG, APP_NAME).value("perf/process_pool", True, bool):
+            QTimer.singleShot(0, engine_pool.start)
+        else:
+            set_process_pool(False)
     def clipboard(self):
         return self._clipboard
+    def _build_job_indicator(self):
+        sb = self.statusBar()
+        self._lblJob = QLabel(i18n.t("job.running"))
+        self._jobBar = QProgressBar(); self._jobBar.setRange(0, 0); self._jobBar.setFixedWidth(120)
+        self._btnCancelJob = QPushButton(i18n.t("job.cancel"))
+        self._btnCancelJob.setCursor(Qt.PointingHandCursor)
+        self._btnCancelJob.clicked.connect(self._cancel_jobs)
+        for w in (self._lblJob, self._jobBar, self._btnCancelJob):
+            sb.addPermanentWidget(w)
+            w.hide()
+        jobs.busy_changed.connect(self._on_jobs_changed)
+    def _on_jobs_changed(self, pending: int):
+        busy = pending > 0
+        self._lblJob.setText(i18n.t("job.running") + (f" ({pending})" if pending > 1 else ""))
+        for w in (self._lblJob, self._jobBar, self._btnCancelJob):
+            w.setVisible(busy)
+    def _set_process_pool(self, on: bool):
+        QSettings(APP_ORG, APP_NAME).setValue("perf/process_pool", on)
+        set_process_pool(on)
+        if on:
+            engine_pool.start()
+    def _show_cache_stats(self):
+        dlg = QDialog(self)
+        dlg.setWindowTitle(i18n.t("cache.title"))
+        lay = QVBoxLayout(dlg)
+        lbl = QLabel()
+        def refresh():
+            st = transform_cache.stats()
+            total = st["hits"] + st["misses"]
+            rate = f" ({100.0 * st['hits'] / total:.0f}%)" if total else ""
+            rows = [
+                ("cache.entries", str(st["entries"])),
+                ("cache.size", f"{st['bytes'] / 1048576:.1f} / {st['budget'] / 1048576:.0f} MB"),
+                ("cache.hits", f"{st['hits']}{rate}"),
+                ("cache.misses", str(st["misses"])),
+                ("cache.evicted", str(st["evicted"])),
+                ("cache.skipped", str(st["skipped"])),
+            ]
+            lbl.setText("<table>" + "".join(
+                f"<tr><td>{i18n.t(k)}:</td><td align='right'>&nbsp;&nbsp;<b>{v}</b></td></tr>" for k, v in rows
+            ) + "</table>")
+        refresh()
+        lay.addWidget(lbl)
+        btns = QDialogButtonBox(QDialogButtonBox.Close)
+        btnClear = btns.addButton(i18n.t("cache.clear"), QDialogButtonBox.ResetRole)
+        btnClear.clicked.connect(lambda: (transform_cache.clear(), refresh()))
+        btns.rejected.connect(dlg.reject)
+        lay.addWidget(btns)
+        dlg.exec()
+    def _cancel_jobs(self):
+        jobs.cancel_all()
+        self.statusBar().showMessage(i18n.t("job.cancelled"), 1000)
     def _build_tabs(self):
         self.tabs = QTabWidget()
         self.tabClean  = CommentsAllTab()
@@ -4666,6 +2442,14 @@ class MainWindow(QMainWindow):
             act = QAction(i18n.t(key), self)
             act.triggered.connect(lambda checked=False, n=name: self._call_active(n))
             editMenu.addAction(act)
+        editMenu.addSeparator()
+        actPool = QAction(i18n.t("act.process_pool"), self, checkable=True)
+        actPool.setChecked(QSettings(APP_ORG, APP_NAME).value("perf/process_pool", True, bool))
+        actPool.toggled.connect(self._set_process_pool)
+        editMenu.addAction(actPool)
+        actCache = QAction(i18n.t("act.cache_stats"), self)
+        actCache.triggered.connect(self._show_cache_stats)
+        editMenu.addAction(actCache)
         langMenu = m.addMenu(i18n.t("menu.lang"))
         self._lang_actions = {
             "ru": QAction("Русский", self, checkable=True),
@@ -4700,6 +2484,9 @@ class MainWindow(QMainWindow):
         self._retranslate()
     def _retranslate(self):
         self.setWindowTitle(i18n.t("app.title"))
+        if hasattr(self, "_btnCancelJob"):
+            self._btnCancelJob.setText(i18n.t("job.cancel"))
+            self._on_jobs_changed(jobs.pending())
         m = self.menuBar()
         m.clear()
         self._build_menubar()
@@ -4888,8 +2675,18 @@ class MainWindow(QMainWindow):
             self._save_tab_order()
         except Exception:
             pass
+        jobs.cancel_all()
+        engine_pool.shutdown()
         super().closeEvent(e)
 MainWindow._build_tabs = _build_tabs_with_extras
+MainWindow._materialize_tab = _materialize_tab
+class _FirstPaintProbe(QObject):
+    def eventFilter(self, obj, ev):
+        if ev.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            startup_mark("first paint")
+            QTimer.singleShot(0, startup_report)
+        return False
 def _ensure_eula(settings: QSettings) -> bool:
     accepted = settings.value("eula/accepted", False, bool)
     if accepted:
@@ -4942,6 +2739,7 @@ def main():
             pass
 
     app = QApplication(sys.argv)
+    startup_mark("QApplication")
 
     if APP_ICON_PATH:
         ic = QIcon(str(APP_ICON_PATH))
@@ -4957,10 +2755,14 @@ def main():
 
     if not _ensure_eula(settings):
         return  
+    startup_mark("settings/eula")
 
     w = MainWindow()
     if APP_ICON_PATH:
         w.setWindowIcon(QIcon(str(APP_ICON_PATH)))
+    startup_mark("MainWindow")
+    if STARTUP_TIMING:
+        w.installEventFilter(_FirstPaintProbe(w))
     w.show()
 
 
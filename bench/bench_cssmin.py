@@ -0,0 +1,97 @@
+"""
+Бенчмарк CSS-минификации на настоящих таблицах стилей: размер после
+нормализации (minify_css без оптимизации) и после структурной оптимизации,
+счётчики оптимизаций и скорость на склейке всего корпуса — как у больших
+сборок фреймворков (bootstrap.css, bulma.css и т. п.).
+
+Корпус — папки и файлы из аргументов; по умолчанию все .css в sys.prefix
+и /usr/share (темы jquery-ui, стили документации).
+Каждый результат проверяется: повторная оптимизация ничего не меняет,
+скобки сбалансированы.
+
+Запуск: python bench/bench_cssmin.py [ПАПКА|ФАЙЛ …]
+Код возврата 1, если корпус пуст или хоть одна проверка не прошла.
+"""
+from __future__ import annotations
+import os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lce_core.cssmin import minify_css
+from lce_core.lexer import css_tokens
+
+DEFAULT_ROOTS = (sys.prefix, "/usr/share")
+BUNDLE_MIN = 4_000_000  # склейка повторяется до такого размера
+
+
+def collect(paths) -> list[str]:
+    files = []
+    for root in paths:
+        if os.path.isfile(root):
+            files.append(root)
+            continue
+        for d, _dirs, names in os.walk(root):
+            files.extend(os.path.join(d, f) for f in names if f.endswith(".css"))
+    # одна и та же тема часто лежит в нескольких местах через симлинки
+    return sorted({os.path.realpath(f): f for f in files}.values())
+
+
+def balanced(css: str) -> bool:
+    depth = 0
+    for t in css_tokens(css):
+        if t == "{":
+            depth += 1
+        elif t == "}":
+            depth -= 1
+            if depth < 0:
+                return False
+    return depth == 0
+
+
+def main() -> int:
+    files = collect(sys.argv[1:] or [r for r in DEFAULT_ROOTS if os.path.isdir(r)])
+    if not files:
+        print("no stylesheets: pass .css files or folders")
+        return 1
+    rows, failed, texts = [], 0, []
+    total = {"in": 0, "ws": 0, "opt": 0}
+    counts: dict[str, int] = {}
+    for p in files:
+        src = open(p, encoding="utf-8", errors="replace").read()
+        if not src.strip():
+            continue
+        texts.append(src)
+        ws = minify_css(src, optimize=False)
+        c: dict[str, int] = {}
+        opt = minify_css(src, counts=c)
+        for k, v in c.items():
+            counts[k] = counts.get(k, 0) + v
+        if minify_css(opt) != opt or (balanced(src) and not balanced(opt)):
+            print(f"check failed: {p}")
+            failed += 1
+        sizes = [len(s.encode("utf-8")) for s in (src, ws, opt)]
+        for k, n in zip(total, sizes):
+            total[k] += n
+        rows.append((p, *sizes, c))
+
+    print(f"{'stylesheet':<40} {'bytes':>9} {'ws':>7} {'opt':>7}  merged/overridden/empty/colors/zeros")
+    for p, n_in, n_ws, n_opt, c in sorted(rows, key=lambda r: -r[1])[:20]:
+        name = os.path.join(os.path.basename(os.path.dirname(p)), os.path.basename(p))
+        print(f"{name[-40:]:<40} {n_in:>9} {n_ws / n_in:>7.1%} {n_opt / n_in:>7.1%}  "
+              + "/".join(str(c[k]) for k in ("merged", "overridden", "empty", "colors", "zeros")))
+    print(f"\n{len(rows)} stylesheets, {total['in']} bytes -> ws {total['ws'] / total['in']:.1%}, "
+          f"optimized {total['opt'] / total['in']:.1%}; " + ", ".join(f"{k} {v}" for k, v in counts.items()))
+
+    bundle = "\n".join(texts)
+    bundle *= max(1, -(-BUNDLE_MIN // len(bundle)))
+    print(f"\nbundle {len(bundle)} chars")
+    print(f"{'mode':<10} {'sec':>7} {'MB/s':>6} {'bytes out':>10}")
+    for mode, optimize in (("ws", False), ("optimize", True)):
+        t0 = time.perf_counter()
+        out = minify_css(bundle, optimize=optimize)
+        dt = time.perf_counter() - t0
+        print(f"{mode:<10} {dt:>7.2f} {len(bundle) / 1e6 / dt:>6.2f} {len(out):>10}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
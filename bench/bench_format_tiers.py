@@ -0,0 +1,116 @@
+"""
+Бенчмарк уровней форматирования pretty_format на настоящих .js и .css:
+full (pretty_js / pretty_css) против fast (pretty_braces).
+
+Для каждого уровня — скорость на всём корпусе и на склейке (повторяется
+до BUNDLE_MIN символов — на таких размерах auto выбирает fast) и точность:
+«токены» — файлы, где после форматирования та же последовательность
+токенов lex_js (значимых, без пробелов и переводов строк), «стабильно» —
+повторное форматирование ничего не меняет, «строки как full» — доля
+строк результата, которые дословно (без отступа) есть в выводе full.
+
+Корпус — папки и файлы из аргументов; по умолчанию sys.prefix, /usr/share
+и глобальные модули node.
+
+Запуск: python bench/bench_format_tiers.py [ПАПКА|ФАЙЛ …]
+"""
+from __future__ import annotations
+import os, shutil, sys, time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lce_core.lexer import lex_js, WS, NL
+from lce_core.pretty import FAST_FORMAT_MIN_SIZE, pretty_format
+
+EXT_LANGS = {".js": "JavaScript", ".mjs": "JavaScript", ".cjs": "JavaScript", ".css": "CSS"}
+BUNDLE_MIN = FAST_FORMAT_MIN_SIZE + 1
+INDENT = 2
+MAX_FILE = 2_000_000  # большие бандлы только тормозят полный уровень, сверять их неинтересно
+
+
+def default_roots() -> list[str]:
+    roots = [sys.prefix, "/usr/share"]
+    node = shutil.which("node")
+    if node:
+        roots.append(os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(node))), "lib", "node_modules"))
+    return [r for r in roots if os.path.isdir(r)]
+
+
+def collect(paths) -> list[str]:
+    files = []
+    for root in paths:
+        if os.path.isfile(root):
+            files.append(root)
+            continue
+        for d, _dirs, names in os.walk(root):
+            files.extend(os.path.join(d, f) for f in names if os.path.splitext(f)[1] in EXT_LANGS)
+    return sorted({os.path.realpath(f): f for f in files}.values())
+
+
+def tokens(code: str) -> list[str]:
+    # хвостовые пробелы комментария («// …  \n») — тоже пробелы
+    return [code[a:b].rstrip() for kind, a, b in lex_js(code) if kind != WS and kind != NL]
+
+
+def fmt(code: str, lang: str, tier: str) -> str:
+    return pretty_format(code, lang, False, INDENT, tier=tier)
+
+
+def main() -> int:
+    files = collect(sys.argv[1:] or default_roots())
+    docs = []
+    for p in files:
+        try:
+            if os.path.getsize(p) > MAX_FILE:
+                continue
+            src = open(p, encoding="utf-8", errors="replace").read()
+        except OSError:
+            continue
+        if src.strip():
+            docs.append((p, src, EXT_LANGS[os.path.splitext(p)[1]]))
+    if not docs:
+        print("no sources: pass .js/.css files or folders")
+        return 1
+    total = sum(len(src) for _, src, _ in docs)
+    print(f"{len(docs)} files, {total / 1e6:.1f} MB")
+
+    outs = {}
+    print(f"\n{'lang':<11} {'tier':<5} {'sec':>7} {'MB/s':>6} {'tokens':>8} {'stable':>8} {'lines as full':>14}")
+    for lang in ("JavaScript", "CSS"):
+        part = [(p, src) for p, src, lg in docs if lg == lang]
+        if not part:
+            continue
+        size = sum(len(src) for _, src in part)
+        for tier in ("full", "fast"):
+            t0 = time.perf_counter()
+            res = [fmt(src, lang, tier) for _, src in part]
+            dt = time.perf_counter() - t0
+            outs[lang, tier] = res
+            same = sum(tokens(out) == tokens(src) for (_, src), out in zip(part, res))
+            stable = sum(fmt(out, lang, tier) == out for out in res)
+            n_lines = hit = 0
+            for out, full in zip(res, outs[lang, "full"]):
+                have = Counter(ln.strip() for ln in full.split("\n"))
+                for ln in out.split("\n"):
+                    n_lines += 1
+                    if have[ln.strip()] > 0:
+                        have[ln.strip()] -= 1
+                        hit += 1
+            print(f"{lang:<11} {tier:<5} {dt:>7.2f} {size / 1e6 / dt:>6.2f} "
+                  f"{same:>4}/{len(part):<3} {stable:>4}/{len(part):<3} {hit / max(1, n_lines):>14.1%}")
+            for (p, src), out in zip(part, res):
+                if tier == "fast" and tokens(out) != tokens(src):
+                    print(f"  tokens changed: {p}")
+
+        bundle = "\n".join(src for _, src in part)
+        bundle *= BUNDLE_MIN // len(bundle) + 1
+        for tier in ("full", "fast", "auto"):
+            t0 = time.perf_counter()
+            fmt(bundle, lang, tier)
+            dt = time.perf_counter() - t0
+            print(f"{lang:<11} {tier:<5} {dt:>7.2f} {len(bundle) / 1e6 / dt:>6.2f}  bundle {len(bundle) / 1e6:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
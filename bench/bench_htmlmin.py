@@ -0,0 +1,108 @@
+"""
+Бенчмарк HTML-минификации на настоящих страницах: размер после
+minify_html (и с минификацией встроенного JS с переименованием имён)
+и скорость на склейке всего корпуса.
+
+Корпус — папки и файлы из аргументов; по умолчанию все .html/.htm в
+sys.prefix и /usr/share (документация пакетов).
+Каждый результат проверяется html.parser: повторная минификация ничего
+не меняет, теги и их атрибуты те же, содержимое <pre>/<textarea> не тронуто.
+
+Запуск: python bench/bench_htmlmin.py [ПАПКА|ФАЙЛ …]
+Код возврата 1, если корпус пуст или хоть одна проверка не прошла.
+"""
+from __future__ import annotations
+import os, sys, time
+from html.parser import HTMLParser
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lce_core.htmlmin import minify_html
+
+DEFAULT_ROOTS = (sys.prefix, "/usr/share")
+HTML_EXTS = (".html", ".htm")
+BUNDLE_MIN = 4_000_000  # склейка повторяется до такого размера
+KEEP = ("pre", "textarea")
+
+
+class _Outline(HTMLParser):
+    """Открывающие теги с атрибутами и текст внутри <pre>/<textarea>."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tags: list[tuple] = []
+        self.kept: list[str] = []
+        self.depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        self.tags.append((tag, sorted((k, v or "") for k, v in attrs)))
+        if tag in KEEP:
+            self.depth += 1
+            self.kept.append("")
+
+    def handle_endtag(self, tag):
+        if tag in KEEP and self.depth:
+            self.depth -= 1
+
+    def handle_data(self, data):
+        if self.depth:
+            self.kept[-1] += data
+
+
+def outline(html: str) -> tuple[list, list]:
+    p = _Outline()
+    p.feed(html)
+    p.close()
+    return p.tags, p.kept
+
+
+def collect(paths) -> list[str]:
+    files = []
+    for root in paths:
+        if os.path.isfile(root):
+            files.append(root)
+            continue
+        for d, _dirs, names in os.walk(root):
+            files.extend(os.path.join(d, f) for f in names if f.endswith(HTML_EXTS))
+    return sorted({os.path.realpath(f): f for f in files}.values())
+
+
+def main() -> int:
+    files = collect(sys.argv[1:] or [r for r in DEFAULT_ROOTS if os.path.isdir(r)])
+    if not files:
+        print("no pages: pass .html files or folders")
+        return 1
+    rows, failed, texts = [], 0, []
+    total = {"in": 0, "min": 0, "mangle": 0}
+    for p in files:
+        src = open(p, encoding="utf-8", errors="replace").read()
+        if not src.strip():
+            continue
+        texts.append(src)
+        out = minify_html(src)
+        mangled = minify_html(src, mangle=True)
+        if minify_html(out) != out or outline(out) != outline(src):
+            print(f"check failed: {p}")
+            failed += 1
+        sizes = [len(s.encode("utf-8")) for s in (src, out, mangled)]
+        for k, n in zip(total, sizes):
+            total[k] += n
+        rows.append((p, *sizes))
+
+    print(f"{'page':<40} {'bytes':>9} {'min':>7} {'mangle':>7}")
+    for p, n_in, n_min, n_mangle in sorted(rows, key=lambda r: -r[1])[:20]:
+        name = os.path.join(os.path.basename(os.path.dirname(p)), os.path.basename(p))
+        print(f"{name[-40:]:<40} {n_in:>9} {n_min / n_in:>7.1%} {n_mangle / n_in:>7.1%}")
+    print(f"\n{len(rows)} pages, {total['in']} bytes -> {total['min'] / total['in']:.1%}, "
+          f"with mangle {total['mangle'] / total['in']:.1%}")
+
+    bundle = "\n".join(texts)
+    bundle *= max(1, -(-BUNDLE_MIN // len(bundle)))
+    t0 = time.perf_counter()
+    out = minify_html(bundle)
+    dt = time.perf_counter() - t0
+    print(f"\nbundle {len(bundle)} chars: {dt:.2f} s, {len(bundle) / 1e6 / dt:.2f} MB/s, {len(out)} bytes out")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
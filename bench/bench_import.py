@@ -0,0 +1,89 @@
+"""
+Бенчмарк импорта lce_core: время «import» в свежем интерпретаторе
+сверх пустого запуска python. Проверяет, что ядро не тянет PySide6,
+и завершается с кодом 1, если время выходит за бюджет.
+
+Бюджеты заданы для машины, где эталонный импорт стандартных модулей
+(REFERENCE) занимает REFERENCE_MS; на более медленной они растут
+пропорционально замеру эталона, на более быстрой не уменьшаются.
+
+Запуск: python bench/bench_import.py [повторов]
+"""
+from __future__ import annotations
+import os, sys, subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Бюджет на импорт сверх пустого интерпретатора, мс (-X importtime, сумма
+# модулей верхнего уровня). Замер при эталоне ~15 мс: пакет ~1 мс,
+# minify_code ~16 мс (в основном re), набор движков ~25 мс, cli ~35 мс;
+# бюджеты — с запасом.
+REFERENCE = "import re, json, typing"
+REFERENCE_MS = 15.0
+BUDGETS_MS = {
+    "import lce_core": 6.0,
+    "from lce_core import minify_code": 30.0,
+    "from lce_core import pretty_format, strip_comments, deobfuscate, slugify": 40.0,
+    "import lce_core.cli": 60.0,
+}
+
+PROBE = (
+    "import sys\n"
+    "{stmt}\n"
+    "bad = [m for m in ('PySide6', 'shiboken6') if m in sys.modules]\n"
+    "sys.exit(3 if bad else 0)\n"
+)
+
+
+def import_ms(stmt: str) -> float:
+    """Суммарное время модулей верхнего уровня, импортированных stmt (по -X importtime)."""
+    before = _importtime("pass")
+    r = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(stmt=stmt)],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if r.returncode == 3:
+        raise SystemExit(f"{stmt!r} imported PySide6")
+    if r.returncode:
+        raise SystemExit(r.stderr)
+    total = 0
+    for name, cum in _parse(r.stderr):
+        if name not in before:
+            total += cum
+    return total / 1000.0
+
+
+def _importtime(code: str) -> set:
+    r = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                       cwd=ROOT, capture_output=True, text=True)
+    return {name for name, _cum in _parse(r.stderr)}
+
+
+def _parse(stderr: str):
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _self, cum, name = line[len("import time:"):].split("|")
+        if not cum.strip().isdigit() or name.startswith("  "):
+            continue  # заголовок и вложенные импорты (уже учтены в cumulative)
+        yield name.strip(), int(cum)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    failed = False
+    ref = min(import_ms(REFERENCE) for _ in range(runs))
+    scale = max(1.0, ref / REFERENCE_MS)
+    print(f"reference {REFERENCE!r}: {ref:.1f} ms, budgets x{scale:.2f}")
+    print(f"{'statement':<75} {'ms':>7} {'budget':>7}")
+    for stmt, budget in BUDGETS_MS.items():
+        budget *= scale
+        ms = min(import_ms(stmt) for _ in range(runs))
+        over = ms > budget
+        failed |= over
+        print(f"{stmt:<75} {ms:>7.1f} {budget:>7.1f}{'  OVER' if over else ''}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Бенчмарк минификации JavaScript на корпусе настоящих библиотек: размер и
+скорость для minify_code (только пробелы и комментарии) и minify_js без
+и с переименованием локальных имён. Если в PATH есть node, каждый
+результат проверяется «node --check».
+
+Корпус — папки и файлы из аргументов; по умолчанию пакет npm, который
+ставится вместе с node (около тысячи модулей реальных библиотек).
+
+Запуск: python bench/bench_jsmin.py [ПАПКА|ФАЙЛ …]
+Код возврата 1, если корпус пуст или хоть один результат не проходит проверку.
+"""
+from __future__ import annotations
+import os, shutil, subprocess, sys, tempfile, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lce_core.jsmin import minify_js
+from lce_core.minify import minify_code
+
+JS_EXTS = (".js", ".cjs", ".mjs")
+
+
+def default_corpus() -> list[str]:
+    node = shutil.which("node")
+    if not node:
+        return []
+    npm = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(node))), "lib", "node_modules", "npm")
+    return [npm] if os.path.isdir(npm) else []
+
+
+def collect(paths: list[str]) -> dict[str, list[str]]:
+    """Файлы по библиотекам: имя пакета (папка под node_modules) -> пути."""
+    libs: dict[str, list[str]] = {}
+    for root in paths:
+        if os.path.isfile(root):
+            libs.setdefault(os.path.basename(root), []).append(root)
+            continue
+        for d, _dirs, files in os.walk(root):
+            rel = os.path.relpath(d, root).split(os.sep)
+            name = os.path.basename(os.path.abspath(root))
+            if "node_modules" in rel:
+                k = len(rel) - 1 - rel[::-1].index("node_modules")
+                parts = rel[k + 1:k + 3]
+                name = "/".join(parts[:2] if parts and parts[0].startswith("@") else parts[:1]) or name
+            libs.setdefault(name, []).extend(os.path.join(d, f) for f in files if f.endswith(JS_EXTS))
+    return {k: v for k, v in libs.items() if v}
+
+
+def node_check(text: str, ext: str) -> bool:
+    with tempfile.NamedTemporaryFile("w", suffix=ext, delete=False, encoding="utf-8") as f:
+        f.write(text)
+    try:
+        return subprocess.run(["node", "--check", f.name], capture_output=True).returncode == 0
+    finally:
+        os.unlink(f.name)
+
+
+def main() -> int:
+    libs = collect(sys.argv[1:] or default_corpus())
+    if not libs:
+        print("no JavaScript files: pass library folders or files")
+        return 1
+    check = shutil.which("node") is not None
+    modes = (
+        ("ws", lambda s: minify_code(s, "JavaScript")),
+        ("tokens", lambda s: minify_js(s, mangle=False)),
+        ("mangle", minify_js),
+    )
+    total = {m: [0, 0.0] for m, _ in modes}
+    total_in, failed = 0, 0
+    rows = []
+    for name, files in sorted(libs.items()):
+        src = [open(p, encoding="utf-8", errors="replace").read() for p in files]
+        size_in = sum(len(s.encode("utf-8")) for s in src)
+        total_in += size_in
+        row = [name, len(files), size_in]
+        for mode, fn in modes:
+            t0 = time.perf_counter()
+            out = [fn(s) for s in src]
+            dt = time.perf_counter() - t0
+            size = sum(len(s.encode("utf-8")) for s in out)
+            total[mode][0] += size
+            total[mode][1] += dt
+            row.append(size)
+            if mode == "mangle" and check:
+                for p, s_in, s_out in zip(files, src, out):
+                    ext = os.path.splitext(p)[1]
+                    if node_check(s_out, ext) is False and node_check(s_in, ext):
+                        print(f"node --check failed after mangle: {p}")
+                        failed += 1
+        rows.append(row)
+
+    print(f"{'library':<28} {'files':>5} {'bytes':>9} {'ws':>7} {'tokens':>7} {'mangle':>7}")
+    for name, n, size_in, *sizes in sorted(rows, key=lambda r: -r[2])[:25]:
+        print(f"{name[:28]:<28} {n:>5} {size_in:>9} " + " ".join(f"{s / size_in:>7.1%}" for s in sizes))
+    print(f"\n{'mode':<8} {'bytes out':>10} {'ratio':>7} {'sec':>7} {'MB/s':>6}")
+    for mode, _fn in modes:
+        size, dt = total[mode]
+        print(f"{mode:<8} {size:>10} {size / total_in:>7.1%} {dt:>7.2f} {total_in / 1e6 / dt:>6.2f}")
+    print(f"\n{len(rows)} libraries, {sum(r[1] for r in rows)} files, {total_in} bytes"
+          + ("" if check else "; node not found, syntax check skipped"))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Бенчмарк JSON: format_json / minify_json (бэкенд — orjson, если установлен)
+против стандартного json на сгенерированном документе; тот же документ
+потоком по токенам (format_json_stream, без разбора в объекты) и JSON Lines
+потоком (format_jsonl_stream) в одном процессе и в пуле.
+Сначала — сверка вывода с orjson и без него на числах, которые бэкенды
+пишут по-разному (порядок, малые дроби, -0.0, целые длиннее 64 бит).
+
+Запуск: python bench/bench_json.py [размер_МБ]
+Код возврата 1, если вывод jsonio хоть раз разошёлся со стандартным json.
+"""
+from __future__ import annotations
+import io, json, os, random, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lce_core import jsonio
+
+
+def record(i: int, rnd: random.Random) -> dict:
+    return {
+        "id": i,
+        "name": f"item-{i}",
+        "price": round(rnd.random() * 1000, 2),
+        "tags": [rnd.choice("abcdefgh") * 3 for _ in range(4)],
+        "stock": {"warehouse": rnd.randrange(100), "shop": rnd.randrange(10), "ok": rnd.random() > 0.5},
+        "note": None if i % 3 else "описание товара",
+    }
+
+
+# Числа, на которых вывод orjson и json расходится (или мог бы)
+NUMBER_CASES = (
+    "[1e16, 1e15, 1e22, 1.7976931348623157e308, 5e-324, 1.2345678901234568e17]",
+    "[1e-5, 1.5e-7, 0.0001, 0.00012, 0.000012, -0.00001, 10.00001, 0.1, 0.5]",
+    "[-0.0, 0.0, 0, -0, 12345.678, 1E5, 2.5E-3, 9007199254740993.0]",
+    "[9223372036854775807, 9223372036854775808, 18446744073709551615, 18446744073709551616,"
+    " -9223372036854775809, 123456789012345678901234567890]",
+    '{"a": 1e16, "s": "1e16 0.00001", "n": [{"x": -1.5e-9}], "b": 1e100}',
+)
+
+
+def random_numbers(rnd: random.Random, n: int) -> str:
+    vals = [rnd.uniform(0, 1) * 10 ** rnd.randint(-30, 30) * rnd.choice((1, -1)) for _ in range(n)]
+    return json.dumps(vals)
+
+
+def check_backends(rnd: random.Random) -> int:
+    """Вывод format_json/minify_json с orjson (если есть) и без него против json: число расхождений."""
+    docs = list(NUMBER_CASES) + [random_numbers(rnd, 200) for _ in range(50)]
+    saved = jsonio._orjson_mod
+    bad = 0
+    try:
+        for backend in (None, False):  # None — как установлено, False — только json
+            jsonio._orjson_mod = backend
+            for doc in docs:
+                obj = json.loads(doc)
+                for sort_keys in (False, True):
+                    if jsonio.minify_json(doc, sort_keys) != json.dumps(
+                            obj, separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=False):
+                        bad += 1
+                    for indent in ("  ", "    ", "\t"):
+                        if jsonio.format_json(doc, indent, sort_keys) != json.dumps(
+                                obj, indent=indent, sort_keys=sort_keys, ensure_ascii=False):
+                            bad += 1
+    finally:
+        jsonio._orjson_mod = saved
+    return bad
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    res = fn(*args)
+    return res, time.perf_counter() - t0
+
+
+def main() -> int:
+    size = float(sys.argv[1]) if len(sys.argv) > 1 else 20.0
+    rnd = random.Random(1)
+    bad = check_backends(rnd)
+    print(f"backends {jsonio.backend()} and json: {'same output' if not bad else f'{bad} MISMATCHES'}")
+    rows = []
+    n = 0
+    while n < size * 1_000_000:
+        s = json.dumps(record(len(rows), rnd), ensure_ascii=False)
+        rows.append(s)
+        n += len(s) + 2
+    doc = "[" + ", ".join(rows) + "]"
+    print(f"backend: {jsonio.BACKEND}; document {len(doc)} chars, {len(rows)} records")
+
+    print(f"{'op':<16} {'stdlib s':>9} {'jsonio s':>9} {'speedup':>8}")
+    cases = (
+        ("minify", lambda: json.dumps(json.loads(doc), separators=(",", ":"), ensure_ascii=False),
+         lambda: jsonio.minify_json(doc)),
+        ("pretty indent 4", lambda: json.dumps(json.loads(doc), indent="    ", ensure_ascii=False),
+         lambda: jsonio.format_json(doc, "    ")),
+        ("pretty tab", lambda: json.dumps(json.loads(doc), indent="\t", ensure_ascii=False),
+         lambda: jsonio.format_json(doc, "\t")),
+    )
+    for name, std, fast in cases:
+        a, t_std = timed(std)
+        b, t_fast = timed(fast)
+        same = "" if a == b else "  MISMATCH"
+        bad += a != b
+        print(f"{name:<16} {t_std:>9.3f} {t_fast:>9.3f} {t_std / t_fast:>7.1f}x{same}")
+
+    print(f"\n{'stream':<16} {'sec':>9} {'MB/s':>9}")
+    for name, indent, sort_keys in (("minify", None, False), ("pretty indent 4", "    ", False),
+                                    ("pretty sort", "    ", True)):
+        out = io.StringIO()
+        _, dt = timed(jsonio.format_json_stream, io.StringIO(doc), out, indent, sort_keys)
+        same = "" if json.loads(out.getvalue()) == json.loads(doc) else "  MISMATCH"
+        print(f"{name:<16} {dt:>9.3f} {len(doc) / 1e6 / dt:>9.2f}{same}")
+
+    lines = "\n".join(rows) + "\n"
+    print(f"\nJSON Lines {len(lines)} chars, {len(rows)} lines")
+    print(f"{'workers':>7} {'sec':>8} {'MB/s':>6}")
+    for workers in sorted({1, os.cpu_count() or 1}):
+        out = io.StringIO()
+        _, dt = timed(jsonio.format_jsonl_stream, io.StringIO(lines), out, None, False, workers)
+        print(f"{workers:>7} {dt:>8.3f} {len(lines) / 1e6 / dt:>6.2f}")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Бенчмарк правок строк (line_hunks) для живого просмотра: сколько стоит
+найти разницу прежнего и нового вывода и сколько строк документа она
+трогает против замены всего текста.
+
+Исходник — склейка .js из аргументов (по умолчанию — глобальные модули
+node и /usr/share), отформатированная целиком. Затем по очереди правятся
+строки в разных местах (к строке с «;» дописывается оператор, иногда —
+вставка и удаление строк), вывод форматируется заново, правки строк
+применяются к прежнему выводу так же, как CodeEditor.applyLineHunks, и
+сверяются с новым выводом.
+
+Запуск: python bench/bench_linediff.py [ПАПКА|ФАЙЛ …]
+Код возврата 1, если применённые правки хоть раз дали не новый вывод.
+"""
+from __future__ import annotations
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lce_core.jobs import pretty_job
+from lce_core.linediff import line_hunks
+from bench_pretty_range import collect, default_roots, timed
+
+EDITS = 40
+OPTS = (False, 2, False, 1, True, "fast")  # табы, отступ, сортировка ключей, пустые строки, обрезка, уровень
+
+
+def apply(old: str, hunks) -> str:
+    lines = old.split("\n")
+    for a, b, new in reversed(hunks):
+        lines[a:b] = new
+    return "\n".join(lines)
+
+
+def main() -> int:
+    src = collect(sys.argv[1:] or default_roots())
+    if not src:
+        print("no sources: pass .js files or folders")
+        return 1
+    out, lang = pretty_job(src, "JavaScript", *OPTS)
+    print(f"{out.count(chr(10)) + 1} output lines, {len(out) / 1e6:.1f} MB")
+    print(f"{'edit':>4} {'format ms':>10} {'diff ms':>8} {'hunks':>6} {'lines':>6} {'result':>7}")
+    bad = 0
+    diff_t, touched = [], []
+    for n in range(EDITS):
+        lines = src.split("\n")
+        k = (n * 7919 + len(lines) // 3) % len(lines)
+        while ";" not in lines[k]:
+            k = (k + 1) % len(lines)
+        if n % 5 == 3:
+            lines.insert(k, "if (edited) { edited = 2; }")
+        elif n % 5 == 4:
+            del lines[k]
+        else:
+            lines[k] = lines[k].replace(";", "; edited = 1;", 1)
+        src = "\n".join(lines)
+        (new, _lang), t_fmt = timed(pretty_job, src, lang, *OPTS)
+        hunks, dt = timed(line_hunks, out, new)
+        ok = apply(out, hunks) == new
+        bad += not ok
+        diff_t.append(dt)
+        touched.append(sum(max(b - a, len(ln)) for a, b, ln in hunks))
+        if n < 10 or not ok:
+            print(f"{n:>4} {t_fmt * 1000:>10.0f} {dt * 1000:>8.1f} {len(hunks):>6} {touched[-1]:>6} "
+                  f"{'ok' if ok else 'BAD':>7}")
+        out = new
+    diff_t.sort()
+    print(f"diff median {diff_t[len(diff_t) // 2] * 1000:.1f} ms, max {diff_t[-1] * 1000:.1f} ms; "
+          f"lines touched median {sorted(touched)[len(touched) // 2]} of {out.count(chr(10)) + 1}; mismatches {bad}")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""
+Бенчмарк кэша результатов (memo.py): повтор задания через run_engine
+против первого выполнения и цена самого ключа (хэш входа).
+
+Исходник — склейка .js из аргументов (по умолчанию — глобальные модули
+node и /usr/share). Пул процессов выключен: сравнивается чистое время.
+
+Запуск: python bench/bench_memo.py [ПАПКА|ФАЙЛ …]
+Код возврата 1, если повтор вернул не тот же результат.
+"""
+from __future__ import annotations
+import os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lce_core.jobs import pretty_job, minify_job, strip_job
+from lce_core.memo import memo_key, transform_cache
+from lce_core.pool import run_engine, set_enabled
+from bench_pretty_range import collect, default_roots
+
+SIZES = (10_000, 100_000, 1_000_000, 5_000_000)
+
+
+def main(argv: list[str]) -> int:
+    set_enabled(False)
+    text = collect(argv or default_roots())
+    cases = [
+        ("pretty", pretty_job, ("JavaScript", False, 2, False, 1, True, "auto")),
+        ("minify", minify_job, ("JavaScript", 1, True)),
+        ("strip", strip_job, (4,)),
+    ]
+    bad = 0
+    print(f"{'job':<8}{'size':>10}{'first ms':>11}{'hit ms':>9}{'key ms':>9}")
+    for n in SIZES:
+        code = text[:n]
+        for name, fn, opts in cases:
+            transform_cache.clear()
+            t0 = time.perf_counter(); first = run_engine(fn, code, *opts)
+            t1 = time.perf_counter(); again = run_engine(fn, code, *opts)
+            t2 = time.perf_counter(); memo_key(fn, (code,) + opts)
+            t3 = time.perf_counter()
+            bad += again != first
+            print(f"{name:<8}{len(code):>10}{(t1 - t0) * 1e3:>11.1f}{(t2 - t1) * 1e3:>9.2f}{(t3 - t2) * 1e3:>9.2f}")
+    print(transform_cache.stats())
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
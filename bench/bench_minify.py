@@ -0,0 +1,91 @@
+"""
+Бенчмарк минификации: прежний поэтапный конвейер (удаление комментариев,
+схлопывание пробелов вне строк, пробелы у пунктуации через шаблон «\\1»,
+два прохода re.sub — каждый этап копирует весь текст) против слитого
+minify_code с одним буфером. Результаты обязаны совпадать байт в байт.
+
+Запуск: python bench/bench_minify.py [размер_МБ]   (по умолчанию 5)
+Код возврата 1, если ускорение на максимальном размере меньше 1.5x.
+"""
+from __future__ import annotations
+import os, re, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lce_core import lexer
+from lce_core.lexer import STRINGS
+from lce_core.minify import minify_code_stats
+from lce_core.strip import strip_comments
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_strip import SNIPPET as JS_SNIPPET
+
+# CSS минифицируется по дереву правил (cssmin, bench_cssmin.py) — здесь PHP
+PHP_SNIPPET = (
+    "<?php\n# Настройки\n$cfg = [ 'name' => \"Демо  сайт\", 'debug' => false ]; // флаг\n"
+    "function greet ( $who ) {\n    /* приветствие */\n    return 'Hello, ' . $who . \"!\\n\";\n}\n\n"
+)
+CASES = (("JavaScript", JS_SNIPPET), ("PHP", PHP_SNIPPET))
+MIN_SPEEDUP = 1.5
+
+_WS_RUN = re.compile(r"\s+")
+_PUNCT_WS = re.compile(r" ?([;,:{}()\[\]=+\-*/<>|&!%^?.]) ?")
+
+
+def reference_minify(code: str, lang: str) -> str:
+    s = strip_comments(code, lang)
+    out, buf = [], []
+    for kind, a, b in lexer.lex(s, lexer.spec_for(lang)):
+        if kind not in STRINGS:
+            buf.append(s[a:b]); continue
+        if buf:
+            out.append(_tighten("".join(buf)))
+            buf = []
+        out.append(s[a:b])
+    if buf:
+        out.append(_tighten("".join(buf)))
+    s = "".join(out)
+    s = re.sub(r"\s*\n\s*", "", s)
+    s = re.sub(r"[ \t]{2,}", " ", s)
+    return s.strip()
+
+
+def _tighten(t: str) -> str:
+    t = _WS_RUN.sub(" ", t)
+    if t.endswith(" "):
+        t = t[:-1]
+    return _PUNCT_WS.sub(r"\1", t)
+
+
+def best_of(fn, *args, n=3) -> float:
+    best = float("inf")
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    max_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    sizes = [s for s in (100_000, 1_000_000) if s < max_mb * 1_000_000]
+    sizes.append(int(max_mb * 1_000_000))
+    print(f"{'lang':>10} {'size':>10} {'staged s':>9} {'fused s':>8} {'speedup':>8} {'bytes in':>10} {'bytes out':>10}")
+    ok = True
+    for lang, snippet in CASES:
+        speedup = 0.0
+        for size in sizes:
+            src = (snippet * (size // len(snippet) + 1))[:size]
+            res, (n_in, n_out, _sec) = minify_code_stats(src, lang)
+            if res != reference_minify(src, lang):
+                print(f"{lang:>10} {size:>10} output differs from the staged pipeline")
+                return 1
+            t_ref = best_of(reference_minify, src, lang)
+            t_new = best_of(minify_code_stats, src, lang)
+            speedup = t_ref / t_new
+            print(f"{lang:>10} {size:>10} {t_ref:>9.3f} {t_new:>8.3f} {speedup:>7.1f}x {n_in:>10} {n_out:>10}")
+        ok = ok and speedup >= MIN_SPEEDUP
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Бенчмарк pretty_html_xml на трёх формах разметки размером 10 КБ … 20 МБ:
+плоская выгрузка (sitemap.xml из <url>), длинная строчная цепочка
+(<p> с тысячами <a>) и глубокая вложенность (поддеревья из DEPTH
+<div> друг в друге). При линейной сложности колонка «мкс/КБ» остаётся
+примерно постоянной; глубину не растим с размером — отступы в выводе
+и так растут с ней квадратично. В конце — sitemap наибольшего размера
+через pretty_html_file (файл → файл потоком).
+Сначала — сверка вывода с эталоном на внутреннем подмножестве DTD
+(<!DOCTYPE … [ … ]>) целиком и потоком мелкими кусками.
+
+Запуск: python bench/bench_pretty_html.py [макс_размер_МБ]
+Код возврата 1, если вывод разошёлся с эталоном.
+"""
+from __future__ import annotations
+import io, os, sys, tempfile, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lce_core.pretty import pretty_html_xml, pretty_html_file, pretty_html_stream
+
+URL = "<url><loc>https://example.com/p/{}</loc><lastmod>2024-01-01</lastmod><priority>0.5</priority></url>"
+LINK = '<a href="/p/{0}">item {0}</a>, '
+NEST = '<div class="n">x '
+DEPTH = 256
+
+
+def sitemap(size: int) -> str:
+    parts, n, i = ['<?xml version="1.0" encoding="UTF-8"?><urlset>'], 0, 0
+    while n < size:
+        s = URL.format(i)
+        parts.append(s)
+        n += len(s)
+        i += 1
+    parts.append("</urlset>")
+    return "".join(parts)
+
+
+def inline_chain(size: int) -> str:
+    parts, n, i = ["<p>"], 0, 0
+    while n < size:
+        s = LINK.format(i)
+        parts.append(s)
+        n += len(s)
+        i += 1
+    parts.append("</p>")
+    return "".join(parts)
+
+
+def deep(size: int) -> str:
+    tree = NEST * DEPTH + "</div>" * DEPTH
+    return tree * max(1, size // len(tree))
+
+
+CASES = (("sitemap", sitemap), ("inline", inline_chain), ("deep", deep))
+
+# (вход, эталон): объявления подмножества — на уровень глубже <!DOCTYPE, «]>» — на его уровне
+DOCTYPE_CASES = (
+    ('<?xml version="1.0"?>\n<!DOCTYPE entries [\n\t<!ELEMENT entries (entry+)>\n'
+     '<!ATTLIST entry\n\t\tcode CDATA #REQUIRED\n\t>\n]>\n<entries><entry code="a"/></entries>',
+     '<?xml version="1.0"?>\n<!DOCTYPE entries [\n  <!ELEMENT entries (entry+)>\n'
+     '  <!ATTLIST entry\n\t\tcode CDATA #REQUIRED\n\t>\n]>\n<entries>\n  <entry code="a"/>\n</entries>'),
+    ('<!DOCTYPE n SYSTEM\n"n.dtd" [<!ENTITY a "b"><!-- c -->%p;]><n><m>&a;</m></n>',
+     '<!DOCTYPE n SYSTEM\n"n.dtd" [\n  <!ENTITY a "b">\n  <!-- c -->\n  %p;\n]>\n<n>\n  <m>\n    &a;\n  </m>\n</n>'),
+    ('<!doctype html><html><body></body></html>',
+     '<!doctype html>\n<html>\n  <body>\n  </body>\n</html>'),
+)
+
+
+def check_doctype() -> int:
+    bad = 0
+    for src, want in DOCTYPE_CASES:
+        out = io.StringIO()
+        pretty_html_stream(io.StringIO(src), out, "  ", chunk_size=7)
+        for got in (pretty_html_xml(src, "  "), out.getvalue().rstrip()):
+            if got != want:
+                bad += 1
+                print(f"MISMATCH doctype:\n{got}\n--- want:\n{want}")
+    return bad
+
+
+def main() -> int:
+    bad = check_doctype()
+    print(f"doctype internal subset: {len(DOCTYPE_CASES)} cases, {'ok' if not bad else f'{bad} MISMATCHES'}")
+    max_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 20.0
+    sizes = [10_000, 100_000, 1_000_000, 5_000_000, 20_000_000]
+    sizes = [s for s in sizes if s <= max_mb * 1_000_000] or sizes[:1]
+    print(f"{'case':<8} {'size':>10} {'sec':>9} {'us/KB':>9} {'lines':>9}")
+    for name, make in CASES:
+        for size in sizes:
+            src = make(size)
+            t0 = time.perf_counter()
+            res = pretty_html_xml(src, "  ")
+            dt = time.perf_counter() - t0
+            print(f"{name:<8} {len(src):>10} {dt:>9.3f} {dt * 1e6 / (len(src) / 1000):>9.1f} {res.count(chr(10)) + 1:>9}")
+
+    with tempfile.TemporaryDirectory() as d:
+        src_path, dst_path = os.path.join(d, "sitemap.xml"), os.path.join(d, "out.xml")
+        with open(src_path, "w", encoding="utf-8") as f:
+            f.write(sitemap(sizes[-1]))
+        t0 = time.perf_counter()
+        n_in, n_out = pretty_html_file(src_path, dst_path, "  ")
+        dt = time.perf_counter() - t0
+        print(f"{'stream':<8} {n_in:>10} {dt:>9.3f} {dt * 1e6 / (n_in / 1000):>9.1f}  -> {n_out} chars on disk")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""
+Бенчмарк pretty_js: время форматирования минифицированного JS
+на размерах 10 КБ … 10 МБ. При линейной сложности колонка
+«мкс/КБ» должна оставаться примерно постоянной.
+
+Запуск: python bench/bench_pretty_js.py [макс_размер_МБ]
+"""
+from __future__ import annotations
+import os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lce_core.pretty import pretty_js
+
+SNIPPET = (
+    "function f(a,b){if(a>b){return a-b}else if(a===b){return 0}"
+    "for(var i=0;i<a;i++){b+=i;}var re=/ab+c/gi;var s='x;{y}';"
+    "try{g(`t${a}`)}catch(e){console.log(e)}finally{b=null}return b}"
+)
+
+
+def make_input(size: int) -> str:
+    reps = size // len(SNIPPET) + 1
+    return (SNIPPET * reps)[:size]
+
+
+def main():
+    max_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    sizes = [10_000, 100_000, 1_000_000, 10_000_000]
+    sizes = [s for s in sizes if s <= max_mb * 1_000_000] or sizes[:1]
+    print(f"{'size':>10} {'sec':>9} {'us/KB':>9}")
+    for size in sizes:
+        src = make_input(size)
+        t0 = time.perf_counter()
+        pretty_js(src, "    ")
+        dt = time.perf_counter() - t0
+        print(f"{size:>10} {dt:>9.3f} {dt * 1e6 / (size / 1000):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Бенчмарк форматирования Python на исходниках стандартной библиотеки:
+pretty_python (tokenize) против прежнего построчного разбора по
+двоеточиям (_pretty_python_lines). Для каждого файла проверяется, что
+результат разбирается в то же AST, что и исходник (отступ 2 пробела —
+чтобы отступы действительно менялись), и что повторное форматирование
+ничего не меняет. В конце — вся папка через CLI (format ПАПКА -o ВЫХОД)
+в один процесс и по числу ядер.
+
+Запуск: python bench/bench_pretty_python.py [ПАПКА] [макс_файлов]
+"""
+from __future__ import annotations
+import ast, os, sys, sysconfig, tempfile, time, warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lce_core.cli import main as cli_main
+from lce_core.pretty import pretty_python, _pretty_python_lines
+
+INDENT = "  "
+
+
+def same_ast(a: str, b: str) -> bool:
+    try:
+        return ast.dump(ast.parse(a)) == ast.dump(ast.parse(b))
+    except (SyntaxError, ValueError):
+        return False
+
+
+def collect(root: str, limit: int) -> list[tuple[str, str]]:
+    files = []
+    for d, dirs, names in os.walk(root):
+        dirs[:] = sorted(x for x in dirs if x not in ("site-packages", "__pycache__"))
+        for f in sorted(names):
+            if not f.endswith(".py"):
+                continue
+            p = os.path.join(d, f)
+            try:
+                src = open(p, encoding="utf-8").read()
+                ast.parse(src)
+            except (UnicodeDecodeError, SyntaxError, ValueError):
+                continue  # тестовые файлы с намеренно битым кодом
+            files.append((p, src))
+            if len(files) >= limit:
+                return files
+    return files
+
+
+def main():
+    warnings.simplefilter("ignore")  # SyntaxWarning из разбираемых исходников
+    root = sys.argv[1] if len(sys.argv) > 1 else sysconfig.get_paths()["stdlib"]
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 10 ** 9
+    files = collect(root, limit)
+    total = sum(len(src) for _, src in files)
+    print(f"{len(files)} files, {total / 1e6:.1f} MB from {root}")
+
+    print(f"{'engine':<10} {'sec':>8} {'MB/s':>6} {'same AST':>9} {'idempotent':>11}")
+    for name, fn in (("lines", _pretty_python_lines), ("tokenize", pretty_python)):
+        outs = []
+        t0 = time.perf_counter()
+        for _, src in files:
+            outs.append(fn(src, INDENT))
+        dt = time.perf_counter() - t0
+        ok = sum(same_ast(src, out) for (_, src), out in zip(files, outs))
+        stable = sum(fn(out, INDENT) == out for out in outs)
+        print(f"{name:<10} {dt:>8.2f} {total / 1e6 / dt:>6.2f} {ok / len(files):>9.1%} {stable / len(files):>11.1%}")
+        if fn is pretty_python:
+            for (p, src), out in zip(files, outs):
+                if not same_ast(src, out):
+                    print(f"  AST changed: {p}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src_dir = os.path.join(tmp, "src")
+        for p, src in files:
+            dst = os.path.join(src_dir, os.path.relpath(p, root))
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            with open(dst, "w", encoding="utf-8") as f:
+                f.write(src)
+        print(f"\n{'cli -j':>6} {'sec':>8}")
+        for jobs in sorted({1, os.cpu_count() or 1}):
+            t0 = time.perf_counter()
+            cli_main(["format", src_dir, "-o", os.path.join(tmp, f"out{jobs}"), "--indent", "2",
+                      "-j", str(jobs), "--ext", "py"])
+            print(f"{jobs:>6} {time.perf_counter() - t0:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Бенчмарк форматирования блока (pretty_range) против форматирования всего
+файла (pretty_job) — как при правках одной функции во вкладке
+«Форматирование».
+
+Исходник — склейка .js из аргументов (по умолчанию — глобальные модули
+node и /usr/share), сначала отформатированная целиком: это «файл в
+редакторе». Затем по очереди правятся строки в разных местах (к строке
+с «;» дописывается оператор), после каждой правки блок вклеивается в
+прежний вывод, а результат сверяется с форматированием всего текста.
+Первый вызов строит точки разбора исходника, следующие — миллисекунды.
+
+Перед этим — та же сверка на стилях с длинными комментариями (вывод
+короче исходника) и одинаковыми объявлениями и правилами: правится
+каждое «margin: 0;», и блок должен попасть в своё правило.
+
+Запуск: python bench/bench_pretty_range.py [ПАПКА|ФАЙЛ …]
+Код возврата 1, если вклеенный блок хоть раз разошёлся с полным форматированием.
+"""
+from __future__ import annotations
+import os, shutil, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lce_core.jobs import pretty_job, pretty_range_job
+from lce_core.pretty import RangeCheckpoints
+
+TARGET_LINES = 50_000
+EDITS = 40
+CSS_RULES = 120
+OPTS = (False, 2, False, 1, True)  # табы, отступ, сортировка ключей, пустые строки, обрезка
+
+
+def default_roots() -> list[str]:
+    roots = ["/usr/share"]
+    node = shutil.which("node")
+    if node:
+        roots.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(node))), "lib", "node_modules"))
+    return [r for r in roots if os.path.isdir(r)]
+
+
+def collect(paths) -> str:
+    parts, lines = [], 0
+    for root in paths:
+        files = [root] if os.path.isfile(root) else sorted(
+            os.path.join(d, f) for d, _dirs, names in os.walk(root) for f in names if f.endswith(".js"))
+        for p in files:
+            try:
+                src = open(p, encoding="utf-8").read()
+            except (OSError, UnicodeDecodeError):
+                continue
+            if "\n" not in src[:2000]:
+                continue  # минифицированное — одна строка, блок всегда весь файл
+            parts.append(src)
+            lines += src.count("\n")
+            if lines >= TARGET_LINES:
+                return "\n".join(parts)
+    return "\n".join(parts)
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    res = fn(*args)
+    return res, time.perf_counter() - t0
+
+
+def css_sample() -> str:
+    """Правила с «margin: 0;» (у каждого третьего тело как у соседа), комментарии, @media; отступ 4."""
+    parts = []
+    for n in range(CSS_RULES):
+        if n % 5 == 0:
+            parts.append(f"/* {'section ' * 50}{n} */")
+        body = ["margin: 0;", "padding: 0;"] if n % 3 else ["margin: 0;", f"color: #{n:03x};"]
+        rule = [f".r{n} {{"] + ["    " + d for d in body] + ["}"]
+        if n % 7 == 0:
+            rule = ["@media print {"] + ["    " + line for line in rule] + ["}"]
+        parts.extend(rule)
+    return "\n".join(parts) + "\n"
+
+
+def check_css() -> int:
+    """Число расхождений вклеенного блока с форматированием всего текста."""
+    src = css_sample()
+    out = pretty_job(src, "CSS", *OPTS, "auto")[0]
+    cp = RangeCheckpoints()
+    edits = spliced = bad = 0
+    pos = src.find("margin: 0;")
+    while pos >= 0:
+        code = src[:pos] + "margin: 2em;" + src[pos + len("margin: 0;"):]
+        r = pretty_range_job(src, out, code, pos, pos, "CSS", *OPTS[:2], OPTS[3], "auto", cp)
+        full = pretty_job(code, "CSS", *OPTS, "auto")[0]
+        edits += 1
+        if r is not None:
+            spliced += 1
+            i, j, text = r
+            if out[:i] + text + out[j:] != full:
+                bad += 1
+                print(f"MISMATCH: edit {edits} at {pos}")
+        src, out = code, full
+        pos = src.find("margin: 0;", pos)
+    print(f"CSS, repeated declarations: spliced {spliced}/{edits}, mismatches {bad}")
+    return bad
+
+
+def main() -> int:
+    bad_css = check_css()
+    raw = collect(sys.argv[1:] or default_roots())
+    if not raw:
+        print("no sources: pass .js files or folders")
+        return 1
+    for tier in ("full", "fast"):
+        src, lang = pretty_job(raw, "JavaScript", *OPTS, tier)
+        out, t_full = timed(pretty_job, src, lang, *OPTS, tier)
+        out = out[0]
+        n_lines = src.count("\n") + 1
+        print(f"\ntier {tier}: {n_lines} lines, {len(src) / 1e6:.1f} MB, whole file {t_full * 1000:.0f} ms")
+        print(f"{'edit':>4} {'line':>7} {'block ms':>9} {'result':>9}")
+        spliced = bad = 0
+        cp = RangeCheckpoints()
+        times = []
+        for n in range(EDITS):
+            lines = src.split("\n")
+            k = (n * 7919 + n_lines // 3) % n_lines
+            while ";" not in lines[k]:
+                k = (k + 1) % n_lines
+            lines[k] = lines[k].replace(";", "; edited = 1;", 1)
+            code = "\n".join(lines)
+            pos = sum(len(x) + 1 for x in lines[:k])  # курсор в начале правленой строки
+            r, dt = timed(pretty_range_job, src, out, code, pos, pos, lang, *OPTS[:2], OPTS[3], tier, cp)
+            if r is None:
+                out = pretty_job(code, lang, *OPTS, tier)[0]
+                state = "full"
+            else:
+                i, j, text = r
+                out = out[:i] + text + out[j:]
+                spliced += 1
+                times.append(dt)
+                state = "block"
+            src = code
+            if out != pretty_job(src, lang, *OPTS, tier)[0]:
+                bad += 1
+                state = "MISMATCH"
+            if n < 10 or state != "block":
+                print(f"{n:>4} {k + 1:>7} {dt * 1000:>9.1f} {state:>9}")
+        times.sort()
+        med = times[len(times) // 2] * 1000 if times else 0.0
+        print(f"spliced {spliced}/{EDITS}, block median {med:.1f} ms, mismatches {bad}")
+        if bad:
+            return 1
+    return 1 if bad_css else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
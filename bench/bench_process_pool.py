@@ -0,0 +1,51 @@
+"""
+Бенчмарк пула процессов: время заданий «на месте» и в прогретом
+процессе пула на разных размерах входа. Точка, где колонки
+пересекаются, — ориентир для lce_core.pool.PROCESS_MIN_SIZE.
+
+Запуск: python bench/bench_process_pool.py
+"""
+from __future__ import annotations
+import os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lce_core.jobs import pretty_job, minify_job
+from lce_core.pool import EnginePool, PROCESS_MIN_SIZE
+
+SNIPPET = (
+    "function f(a,b){ /* c */ if(a>b){return a-b}else if(a===b){return 0}\n"
+    "  for(var i=0;i<a;i++){b+=i;} // x\n var s='x;{y}'; return b}\n"
+)
+SIZES = [1_000, 4_000, 16_000, 32_000, 64_000, 256_000, 1_000_000]
+CASES = [
+    ("minify", minify_job, ("JavaScript", 1, True)),
+    ("pretty", pretty_job, ("JavaScript", False, 4, False, 1, True)),
+]
+
+
+def best_of(fn, *args, n=5) -> float:
+    best = float("inf")
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    pool = EnginePool(workers=1)
+    pool.start()
+    pool.call(len, "")  # дождаться импорта в процессе
+    print(f"PROCESS_MIN_SIZE = {PROCESS_MIN_SIZE}")
+    print(f"{'job':>7} {'size':>9} {'local ms':>9} {'pool ms':>9}")
+    for name, fn, rest in CASES:
+        for size in SIZES:
+            src = (SNIPPET * (size // len(SNIPPET) + 1))[:size]
+            local = best_of(fn, src, *rest)
+            remote = best_of(pool.call, fn, src, *rest)
+            print(f"{name:>7} {size:>9} {local * 1e3:>9.2f} {remote * 1e3:>9.2f}")
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
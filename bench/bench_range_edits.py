@@ -0,0 +1,108 @@
+"""
+Проверка форматирования блока (pretty_range) на правках, меняющих баланс
+скобок: в CSS «}» заменяется на «{}», в JavaScript перед «{» вставляется
+«//», и обычная правка строки для сравнения. Каждая правка применяется к
+отформатированному исходнику, блок вклеивается в прежний вывод, а
+результат сверяется с форматированием всего текста (pretty_job).
+
+Исходники — .css и .js из аргументов (по умолчанию /usr/share и глобальные
+модули node), по нескольку файлов на язык. Правки выбираются случайно с
+фиксированным зерном.
+
+Запуск: python bench/bench_range_edits.py [ПАПКА|ФАЙЛ …]
+Код возврата 1, если вклеенный блок хоть раз разошёлся с полным форматированием.
+"""
+from __future__ import annotations
+import os, sys, random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lce_core.jobs import pretty_job, pretty_range_job
+from lce_core.pretty import RangeCheckpoints
+from bench_pretty_range import default_roots
+
+FILES_PER_LANG = 8
+EDITS_PER_FILE = 80
+OPTS = (False, 2, False, 1, True)  # табы, отступ, сортировка ключей, пустые строки, обрезка
+MAX_FILE = 200_000
+
+
+def files(roots, ext: str) -> list[str]:
+    found = []
+    for root in roots:
+        walk = [(os.path.dirname(root), [], [os.path.basename(root)])] if os.path.isfile(root) else os.walk(root)
+        for d, _dirs, names in walk:
+            for n in sorted(names):
+                p = os.path.join(d, n)
+                if n.endswith(ext) and 2000 < os.path.getsize(p) < MAX_FILE:
+                    found.append(p)
+    found.sort()
+    return found[:: max(1, len(found) // FILES_PER_LANG)][:FILES_PER_LANG]
+
+
+def edit_css_brace(code: str, rnd: random.Random):
+    k = [i for i, c in enumerate(code) if c == "}"]
+    if not k:
+        return None
+    i = rnd.choice(k)
+    return code[:i] + "{}" + code[i + 1:], i
+
+
+def edit_js_comment(code: str, rnd: random.Random):
+    k = [i for i, c in enumerate(code) if c == "{"]
+    if not k:
+        return None
+    i = rnd.choice(k)
+    return code[:i] + "//" + code[i:], i
+
+
+def edit_line(code: str, rnd: random.Random):
+    k = [i for i, c in enumerate(code) if c == ";"]
+    if not k:
+        return None
+    i = rnd.choice(k)
+    return code[:i] + "; edited = 1" + code[i:], i
+
+
+CASES = [
+    ("CSS", ".css", edit_css_brace),
+    ("CSS", ".css", edit_line),
+    ("JavaScript", ".js", edit_js_comment),
+    ("JavaScript", ".js", edit_line),
+]
+
+
+def main() -> int:
+    roots = sys.argv[1:] or default_roots()
+    rnd = random.Random(1)
+    bad_total = 0
+    print(f"{'lang':<11}{'edit':<18}{'edits':>6}{'spliced':>9}{'mismatch':>9}")
+    for lang, ext, edit in CASES:
+        n = spliced = bad = 0
+        for path in files(roots, ext):
+            try:
+                raw = open(path, encoding="utf-8").read()
+            except (OSError, UnicodeDecodeError):
+                continue
+            src = pretty_job(raw, lang, *OPTS, "full")[0]
+            out = pretty_job(src, lang, *OPTS, "full")[0]
+            cp = RangeCheckpoints()
+            for _ in range(EDITS_PER_FILE):
+                e = edit(src, rnd)
+                if e is None:
+                    break
+                code, pos = e
+                n += 1
+                full = pretty_job(code, lang, *OPTS, "full")[0]
+                r = pretty_range_job(src, out, code, pos, pos, lang, *OPTS[:2], OPTS[3], "full", cp)
+                if r is not None:
+                    spliced += 1
+                    i, j, text = r
+                    if out[:i] + text + out[j:] != full:
+                        bad += 1
+        bad_total += bad
+        print(f"{lang:<11}{edit.__name__:<18}{n:>6}{spliced:>9}{bad:>9}")
+    return 1 if bad_total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
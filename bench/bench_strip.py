@@ -0,0 +1,199 @@
+"""
+Бенчмарк удаления комментариев из JS: прежний посимвольный автомат
+(копия _strip_c_like до перехода на lexer) против strip_comments с
+регулярным выражением, которое прыгает от строки к комментарию и
+копирует код срезами. Результаты обязаны совпадать байт в байт.
+
+Вторая таблица — плотные комментарии на одной длинной строке
+(комментарий каждые 10 символов; сотни тысяч комментариев после
+длинного минифицированного кода). Время на КБ должно оставаться
+постоянным: признак «на строке есть код» ведётся за O(1).
+
+Запуск: python bench/bench_strip.py [размер_МБ]   (по умолчанию 5)
+Код возврата 1, если ускорение на максимальном размере меньше 10x
+или время на КБ для плотных комментариев растёт с размером больше 2x.
+"""
+from __future__ import annotations
+import os, sys, time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lce_core.strip import strip_comments
+
+SNIPPET = (
+    "/**\n * Загрузка ресурса с повтором.\n * @param {string} url\n * @param {object} [opts]\n */\n"
+    "export async function load(url, opts = {}) {\n"
+    "    const base = 'https://example.com/api/', retries = opts.retries ?? 3;\n"
+    "    const re = /\\/+$/g, q = \"a//b /* c */\", headers = { Accept: 'application/json' };\n"
+    "    for (let attempt = 0; attempt < retries; attempt++) {\n"
+    "        // повтор при сетевой ошибке\n"
+    "        try {\n"
+    "            const res = await fetch(`${base}${url.replace(re, '')}?t=${Date.now()}`, { headers });\n"
+    "            if (!res.ok) throw new Error(\"HTTP \" + res.status + \" for \" + url);\n"
+    "            return await res.json(); /* готово */\n"
+    "        } catch (err) {\n"
+    "            if (attempt === retries - 1) throw err;\n"
+    "            await new Promise((resolve) => setTimeout(resolve, 250 * 2 ** attempt));\n"
+    "        }\n"
+    "    }\n"
+    "}\n"
+    "\n"
+    "export const isAbsolute = (u) => /^[a-z][a-z0-9+.-]*:\\/\\//i.test(u);  // схема://\n"
+    "export function join(...parts) { return parts.map((p) => String(p).replace(/^\\/+|\\/+$/g, '')).join('/'); }\n\n"
+)
+MIN_SPEEDUP = 10.0
+MAX_DENSE_GROWTH = 2.0
+
+DENSE = {
+    "every 10 chars": lambda size: ("v=10; /**/" * (size // 10 + 1))[:size],
+    "after long line": lambda size: "x" * (size // 2) + "/**/" * (size // 8),
+}
+
+
+def reference_strip(code: str, allow_hash=False, allow_backtick=True) -> str:
+    out: List[str] = []
+    i, n = 0, len(code)
+    in_str = False; delim=''; esc=False
+    in_line=False; in_block=False
+    in_bt=False; tmpl_depth=0
+    line_had_code = True
+    block_had_code_before = True
+
+    def had_code_on_line() -> bool:
+        j = len(out) - 1
+        while j >= 0 and out[j] != '\n':
+            if not out[j].isspace():
+                return True
+            j -= 1
+        return False
+
+    def pop_line_indent():
+        while out and out[-1] != '\n' and out[-1] in ' \t':
+            out.pop()
+
+    while i<n:
+        c=code[i]
+
+       
+        if in_line:
+            if c=='\n':
+                in_line=False
+                if line_had_code:
+                    out.append('\n')
+                i+=1; continue
+            i+=1; continue
+
+        if in_block:
+            if c=='*' and i+1<n and code[i+1]=='/':
+                in_block=False; i+=2
+                if not block_had_code_before:
+                  
+                    j=i
+                    while j<n and code[j] in ' \t': j+=1
+                    if j<n and code[j]=='\n':
+                        i=j+1
+                continue
+            i+=1; continue
+
+        if in_bt:
+            out.append(c)
+            if c=='\\':
+                if i+1<n:
+                    out.append(code[i+1]); i+=2; continue
+            if c=='`' and tmpl_depth==0:
+                in_bt=False; i+=1; continue
+            if c=='$' and i+1<n and code[i+1]=='{':
+                tmpl_depth+=1; out.append('{'); i+=2; continue
+            if c=='}' and tmpl_depth>0:
+                tmpl_depth-=1; i+=1; continue
+            i+=1; continue
+
+        if in_str:
+            out.append(c)
+            if esc: esc=False
+            elif c=='\\': esc=True
+            elif c==delim: in_str=False
+            i+=1; continue
+
+        if c in ('"',"'"):
+            in_str=True; delim=c; out.append(c); i+=1; continue
+        if allow_backtick and c=='`':
+            in_bt=True; tmpl_depth=0; out.append(c); i+=1; continue
+
+        
+        if c=='/' and i+1<n:
+            nxt=code[i+1]
+            if nxt=='/':
+                line_had_code = had_code_on_line()
+                if line_had_code:
+                    while out and out[-1] in ' \t': out.pop()
+                else:
+                    pop_line_indent()
+                in_line=True; i+=2; continue
+            if nxt=='*':
+                block_had_code_before = had_code_on_line()
+                if block_had_code_before:
+                    while out and out[-1] in ' \t': out.pop()
+                else:
+                    pop_line_indent()
+                in_block=True; i+=2; continue
+
+        if allow_hash and c=='#':
+            line_had_code = had_code_on_line()
+            if line_had_code:
+                while out and out[-1] in ' \t': out.pop()
+            else:
+                pop_line_indent()
+            in_line=True; i+=1; continue
+
+      
+        out.append(c); i+=1
+    return ''.join(out)
+
+
+def make_input(size: int) -> str:
+    reps = size // len(SNIPPET) + 1
+    return (SNIPPET * reps)[:size]
+
+
+def best_of(fn, *args, n=3) -> float:
+    best = float("inf")
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    max_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    sizes = [s for s in (100_000, 1_000_000, 5_000_000) if s < max_mb * 1_000_000]
+    sizes.append(int(max_mb * 1_000_000))
+    print(f"{'size':>10} {'per-char s':>11} {'chunked s':>10} {'speedup':>8}")
+    speedup = 0.0
+    for size in sizes:
+        src = make_input(size)
+        if strip_comments(src, "JavaScript") != reference_strip(src):
+            print(f"{size:>10} output differs from the per-char stripper")
+            return 1
+        t_ref = best_of(reference_strip, src)
+        t_new = best_of(strip_comments, src, "JavaScript")
+        speedup = t_ref / t_new
+        print(f"{size:>10} {t_ref:>11.3f} {t_new:>10.3f} {speedup:>7.1f}x")
+
+    print(f"\n{'dense fixture':>16} {'size':>10} {'sec':>8} {'us/KB':>8}")
+    linear = True
+    for name, make in DENSE.items():
+        per_kb = []
+        for size in sizes:
+            src = make(size)
+            dt = best_of(strip_comments, src, "JavaScript")
+            per_kb.append(dt * 1e6 / (size / 1000))
+            print(f"{name:>16} {size:>10} {dt:>8.3f} {per_kb[-1]:>8.1f}")
+        if per_kb[-1] > per_kb[0] * MAX_DENSE_GROWTH:
+            linear = False
+    return 0 if speedup >= MIN_SPEEDUP and linear else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Бенчмарк tidy_whitespace: прежняя реализация (два re.sub, список строк,
+pop(0) для ведущих пустых строк) против одного прохода tidy_lines.
+
+Сначала — сверка на случайных текстах (пробелы, табы, \\r, \\r\\n,
+юникодные пробелы, разные max_blank_lines) и на тех же текстах,
+поданных кусками случайной длины через tidy_lines. Затем время на
+тексте с N ведущими пустыми строками (у прежней реализации — квадрат),
+на обычном коде и через tidy_lines по кускам файла.
+
+Запуск: python bench/bench_tidy.py
+Код возврата 1, если результат хоть раз разошёлся с прежним.
+"""
+from __future__ import annotations
+import io, os, random, re, sys, sysconfig, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lce_core.pretty import tidy_whitespace, tidy_lines
+
+ALPHABET = ["a", "b", " ", " ", "\t", "\n", "\n", "\n", "\r", "\r\n", "\x0b", "\x0c", "\xa0", " ", "\x85", "x"]
+
+
+def reference(text: str, max_blank_lines: int = 1, trim_trailing: bool = True) -> str:
+    """tidy_whitespace до переделки."""
+    if not text:
+        return ""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    if trim_trailing:
+        text = re.sub(r"[ \t]+(?=\n)", "", text)
+        text = re.sub(r"[ \t]+$", "", text, flags=re.M)
+    out_lines = []
+    blanks = 0
+    for ln in text.split("\n"):
+        if ln.strip() == "":
+            blanks += 1
+            if blanks <= max_blank_lines:
+                out_lines.append("")
+        else:
+            blanks = 0
+            out_lines.append(ln.rstrip())
+    while out_lines and out_lines[0] == "":
+        out_lines.pop(0)
+    while out_lines and out_lines[-1] == "":
+        out_lines.pop()
+    return "\n".join(out_lines)
+
+
+def pieces(text: str, rnd: random.Random):
+    i = 0
+    while i < len(text):
+        n = rnd.choice((1, 2, 3, 7, 50, 5000))
+        yield text[i:i + n]
+        i += n
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    res = fn(*args)
+    return res, time.perf_counter() - t0
+
+
+def main() -> int:
+    rnd = random.Random(7)
+    bad = 0
+    for i in range(3000):
+        text = "".join(rnd.choice(ALPHABET) for _ in range(rnd.randrange(60)))
+        if i % 10 == 0:
+            text = " \n" * rnd.randrange(3000) + text + "\t\n" * rnd.randrange(3000)
+        for keep in (0, 1, 2, 5, 10 ** 6):
+            ref = reference(text, keep)
+            for trim in (True, False):
+                if tidy_whitespace(text, keep, trim) != ref:
+                    bad += 1
+            if "".join(tidy_lines(pieces(text, rnd), keep)) != ref:
+                bad += 1
+    print(f"random texts: {'ok' if not bad else f'{bad} mismatches'}")
+
+    # ведущие пустые строки попадают в список (и снимаются pop(0)) в пределах
+    # max_blank_lines — квадрат виден, когда предел большой
+    print(f"\n{'leading blanks':>14} {'max_blank':>9} {'old s':>9} {'new s':>9}")
+    for n in (1_000, 10_000, 50_000, 200_000):
+        text = "\n" * n + "code\n" * 1000
+        for keep in (1, 10 ** 6):
+            a, t_old = timed(reference, text, keep)
+            b, t_new = timed(tidy_whitespace, text, keep)
+            bad += a != b
+            print(f"{n:>14} {keep:>9} {t_old:>9.4f} {t_new:>9.4f}")
+
+    stdlib = sysconfig.get_paths()["stdlib"]
+    names = sorted(f for f in os.listdir(stdlib) if f.endswith(".py"))
+    code = "\n\n\n".join(open(os.path.join(stdlib, f), encoding="utf-8", errors="replace").read() for f in names)
+    a, t_old = timed(reference, code, 2)
+    b, t_new = timed(tidy_whitespace, code, 2)
+    bad += a != b
+    print(f"\nstdlib *.py {len(code) / 1e6:.1f} MB: old {t_old:.3f} s, new {t_new:.3f} s")
+
+    src = io.StringIO(code)
+    t0 = time.perf_counter()
+    out = "".join(tidy_lines(iter(lambda: src.read(1 << 16), ""), 2))
+    dt = time.perf_counter() - t0
+    bad += out != a
+    print(f"tidy_lines by 64 KB chunks: {dt:.3f} s, {len(code) / 1e6 / dt:.1f} MB/s")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
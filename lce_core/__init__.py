@@ -0,0 +1,52 @@
+"""
+Текстовые движки LinkCodeEdit без зависимости от Qt: определение языка,
+удаление комментариев, минификация, форматирование, (де)обфускация,
+slug, sitemap, robots.txt и пул процессов для тяжёлых заданий.
+
+Подмодули импортируются лениво, при первом обращении к имени:
+«from lce_core import minify_code» не тянет форматтеры и multiprocessing.
+"""
+from __future__ import annotations
+import importlib
+
+_EXPORTS = {
+    "detect": ("detect_language",),
+    "strip": ("strip_comments", "strip_comments_all", "strip_comments_custom",
+              "strip_comments_python_strict", "StreamStripper", "strip_stream", "strip_file"),
+    "minify": ("minify_code", "minify_code_stats", "minify_stats"),
+    "jsmin": ("minify_js",),
+    "cssmin": ("minify_css",),
+    "jsonio": ("format_json", "minify_json", "JsonReformatter", "format_json_stream", "format_json_file",
+               "format_jsonl_stream", "format_jsonl_file"),
+    "htmlmin": ("minify_html",),
+    "pretty": ("FORMAT_TIERS", "FAST_FORMAT_MIN_SIZE", "pretty_format", "pretty_range", "RangeCheckpoints",
+               "enclosing_block", "pretty_json", "pretty_braces", "pretty_html_xml", "pretty_python", "pretty_css", "pretty_js",
+               "tidy_whitespace", "tidy_lines", "pretty_html_stream", "pretty_html_file"),
+    "obfuscate": ("b64", "deobfuscate", "deobfuscate_php_goto", "obfuscate_js_eval_base64",
+                  "obfuscate_hex_js", "obfuscate_generic_base64", "append_comment"),
+    "jobs": ("STRIP_MODE_LANGS", "strip_job", "pick_format_lang", "pretty_job", "pretty_diff_job", "pretty_range_job",
+             "minify_job", "deobfuscate_job", "obfuscate_job"),
+    "linediff": ("line_hunks",),
+    "slug": ("slugify", "slugify_lines"),
+    "sitemap": ("collect_from_list", "collect_from_folder", "build_sitemap_xml"),
+    "robots": ("build_robots_txt",),
+    "favicon": ("generate_favicons",),
+    "memo": ("MEMO_BUDGET", "TransformCache", "transform_cache"),
+    "pool": ("PROCESS_MIN_SIZE", "WorkerLost", "PoolClosed", "engine_pool", "run_engine"),
+}
+_WHERE = {name: mod for mod, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_WHERE)
+
+
+def __getattr__(name: str):
+    mod = _WHERE.get(name)
+    if mod is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{mod}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,420 @@
+"""
+Командная строка LinkCodeEdit без GUI и без PySide6:
+
+    python -m lce_core format|minify|strip|deobf [пути…] [-o ВЫХОД | -i] [-j N]
+    python -m lce_core strip --stream -l JavaScript < дамп.js > чистый.js
+    python -m lce_core format --stream feed.xml -o feed.pretty.xml
+    python -m lce_core minify events.jsonl -o events.min.jsonl -j 4
+    python -m lce_core sitemap --base URL (--list ФАЙЛ | --dir ПАПКА) [-o sitemap.xml]
+    python -m lce_core favicon КАРТИНКА -o ПАПКА
+
+То же доступно как «LinkCodeEdit.py <команда> …» (и в собранном exe).
+Без путей или с «-» текст читается из stdin и пишется в stdout.
+strip и format для HTML/XML обрабатывают большие файлы (и stdin с
+--stream -l …) потоком кусками, с ограниченной памятью; format и minify
+так же обрабатывают большие JSON — по токенам, без разбора в объекты.
+JSON Lines (.jsonl, .ndjson) format и minify всегда обрабатывают потоком
+по строкам; для одного входа -j N — число процессов для строк.
+Результаты для файлов (с -o или -i) кэшируются на диске (diskcache.py):
+при повторном запуске неизменённые файлы не обрабатываются заново.
+"""
+from __future__ import annotations
+import os, sys, time, argparse, datetime
+from typing import Optional
+
+from .detect import detect_language
+from .diskcache import CACHE_MAX_SIZE, DiskCache, cache_key, default_cache_dir
+from .jobs import STRIP_MODE_LANGS, strip_job, pretty_job, minify_job, deobfuscate_job
+from .jsonio import SORT_LIMIT, format_json_stream, format_json_file, format_jsonl_stream, format_jsonl_file
+from .pretty import FORMAT_TIERS, FAST_FORMAT_MIN_SIZE, pretty_html_stream, pretty_html_file, _indent_str
+from .strip import strip_stream, strip_file
+
+TEXT_COMMANDS = ("format", "minify", "strip", "deobf")
+COMMANDS = TEXT_COMMANDS + ("sitemap", "favicon")
+JSONL = "JSON Lines"
+LANGS = ("HTML/XML", "CSS", "JavaScript", "PHP", "JSON", JSONL, "Python")
+
+EXT_LANGS = {
+    ".html": "HTML/XML", ".htm": "HTML/XML", ".xhtml": "HTML/XML", ".xml": "HTML/XML", ".svg": "HTML/XML",
+    ".css": "CSS",
+    ".js": "JavaScript", ".mjs": "JavaScript", ".cjs": "JavaScript",
+    ".php": "PHP",
+    ".json": "JSON",
+    ".jsonl": JSONL, ".ndjson": JSONL,
+    ".py": "Python",
+}
+_STRIP_MODES = {lang: mode for mode, lang in STRIP_MODE_LANGS.items()}
+# Параметры, от которых зависят вывод и примечание: входят в ключ кэша
+_KEY_OPTS = ("tabs", "indent", "sort_keys", "tier", "max_blank", "trim", "stats", "mangle", "optimize")
+# Файлы от этого размера (байт) обрабатываются потоком, не читаясь целиком
+STREAM_MIN_SIZE = 16 * 1024 * 1024
+STREAM_LANGS = {
+    "strip": ("CSS", "JavaScript", "PHP", "JSON", "Python"),
+    "format": ("HTML/XML", "JSON", JSONL),
+    "minify": ("JSON", JSONL),
+}
+
+
+def pick_lang(path: Optional[str], code: str, forced: Optional[str]) -> str:
+    if forced:
+        return forced
+    if path:
+        lang = EXT_LANGS.get(os.path.splitext(path)[1].lower())
+        if lang:
+            return lang
+    return detect_language(code[:8192])
+
+
+def transform(cmd: str, code: str, lang: str, opts: dict) -> tuple[str, Optional[str]]:
+    """Одно преобразование: (результат, примечание для stderr или None)."""
+    if lang == JSONL:
+        lang = "JSON"  # strip/deobf: как обычный JSON
+    if cmd == "format":
+        res, _ = pretty_job(code, lang, opts["tabs"], opts["indent"], opts["sort_keys"],
+                            opts["max_blank"], opts["trim"], opts["tier"])
+        return res + "\n", None
+    if cmd == "minify":
+        t0 = time.perf_counter()
+        res, _, sizes = minify_job(code, lang, opts["max_blank"], opts["trim"], opts["mangle"],
+                                   opts["optimize"])
+        return res + "\n", stats_note(sizes + (time.perf_counter() - t0,)) if opts["stats"] else None
+    if cmd == "strip":
+        res, _ = strip_job(code, _STRIP_MODES.get(lang, 0))
+        return res, None
+    res = deobfuscate_job(code)
+    if res is None:
+        return code, "nothing to deobfuscate"
+    return res[0], None
+
+
+def stats_note(stats: tuple[int, int, float]) -> str:
+    n_in, n_out, sec = stats
+    pct = 100.0 * (n_in - n_out) / n_in if n_in else 0.0
+    return f"{n_in} -> {n_out} bytes (-{pct:.1f}%), {sec * 1000:.1f} ms"
+
+
+def stream_lang(cmd: str, path: Optional[str], forced: Optional[str], force_stream: bool) -> Optional[str]:
+    """Язык для потоковой обработки или None, если файл обрабатывается целиком."""
+    lang = forced or (EXT_LANGS.get(os.path.splitext(path)[1].lower()) if path else None)
+    if lang not in STREAM_LANGS.get(cmd, ()):
+        return None
+    if force_stream or lang == JSONL:
+        return lang
+    try:
+        return lang if path and os.path.getsize(path) >= STREAM_MIN_SIZE else None
+    except OSError:
+        return None
+
+
+def _json_indent(cmd: str, opts: dict) -> Optional[str]:
+    return _indent_str(opts["tabs"], opts["indent"]) if cmd == "format" else None
+
+
+def run_stream(cmd: str, src, dst, lang: str, opts: dict):
+    """Потоковая обработка открытых текстовых потоков src → dst."""
+    if lang == JSONL:
+        return format_jsonl_stream(src, dst, _json_indent(cmd, opts), opts["sort_keys"], opts["line_jobs"])
+    if lang == "JSON":
+        return format_json_stream(src, dst, _json_indent(cmd, opts), opts["sort_keys"])
+    if cmd == "format":
+        return pretty_html_stream(src, dst, _indent_str(opts["tabs"], opts["indent"]), opts["max_blank"])
+    return strip_stream(src, dst, lang)
+
+
+def run_stream_file(cmd: str, src: str, dst: str, lang: str, opts: dict):
+    if lang == JSONL:
+        return format_jsonl_file(src, dst, _json_indent(cmd, opts), opts["sort_keys"], opts["line_jobs"])
+    if lang == "JSON":
+        return format_json_file(src, dst, _json_indent(cmd, opts), opts["sort_keys"])
+    if cmd == "format":
+        return pretty_html_file(src, dst, _indent_str(opts["tabs"], opts["indent"]), opts["max_blank"])
+    return strip_file(src, dst, lang)
+
+
+def _read_text(data: bytes) -> str:
+    """Как open(…, "r", encoding="utf-8", errors="replace").read(), но из уже прочитанных байт."""
+    code = data.decode("utf-8", "replace")
+    if "\r" in code:
+        code = code.replace("\r\n", "\n").replace("\r", "\n")
+    return code
+
+
+def _transform_cached(cmd: str, src: str, forced: Optional[str], opts: dict) -> tuple[str, Optional[str], Optional[bool]]:
+    """transform файла через дисковый кэш: (вывод, примечание, попадание; None — без кэша)."""
+    with open(src, "rb") as f:
+        data = f.read()
+    cache = DiskCache(opts["cache"], opts["cache_size"]) if opts["cache"] else None
+    if cache is None:
+        code = _read_text(data)
+        out, note = transform(cmd, code, pick_lang(src, code, forced), opts)
+        return out, note, None
+    key = cache_key(data, cmd, forced, os.path.splitext(src)[1].lower(), *(opts[k] for k in _KEY_OPTS))
+    hit = cache.get(key)
+    if hit is not None:
+        out, note = hit
+        return out, note and f"{note} (cached)", True
+    code = _read_text(data)
+    out, note = transform(cmd, code, pick_lang(src, code, forced), opts)
+    cache.put(key, out, note)
+    return out, note, False
+
+
+def _run_file(task) -> tuple[str, Optional[str], Optional[str], Optional[bool]]:
+    """Задание для процесса: (путь, примечание, ошибка, попадание в кэш). Пишет dst сам."""
+    cmd, src, dst, forced, opts = task
+    try:
+        lang = stream_lang(cmd, src, forced, opts["stream"])
+        if lang and dst is not None:
+            d = os.path.dirname(dst)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            run_stream_file(cmd, src, dst, lang, opts)
+            return src, None, None, None
+        out, note, cached = _transform_cached(cmd, src, forced, opts)
+        if dst is None:
+            return src, note, None, cached
+        d = os.path.dirname(dst)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        with open(dst, "w", encoding="utf-8") as f:
+            f.write(out)
+        return src, note, None, cached
+    except Exception as e:
+        return src, None, f"{type(e).__name__}: {e}", None
+
+
+def iter_inputs(paths: list[str], exts: set[str]):
+    """(файл, относительный путь): файлы как есть, папки — рекурсивно по расширениям."""
+    for p in paths:
+        if os.path.isdir(p):
+            for dirpath, dirs, files in os.walk(p):
+                dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+                for fn in sorted(files):
+                    if os.path.splitext(fn)[1].lower() in exts:
+                        full = os.path.join(dirpath, fn)
+                        yield full, os.path.relpath(full, p)
+        else:
+            yield p, os.path.basename(p)
+
+
+def _add_text_options(sp: argparse.ArgumentParser, cmd: str):
+    sp.add_argument("paths", nargs="*", help="файлы и папки; без путей или «-» — stdin")
+    sp.add_argument("-o", "--output", help="файл (для одного входа) или папка для результатов")
+    sp.add_argument("-i", "--in-place", action="store_true", help="перезаписать исходные файлы")
+    sp.add_argument("-j", "--jobs", type=int, default=1, help="число процессов (0 — по числу ядер)")
+    sp.add_argument("-l", "--lang", choices=LANGS, help="язык вместо определения по расширению/содержимому")
+    sp.add_argument("--ext", help="расширения для обхода папок через запятую (по умолчанию все известные)")
+    sp.add_argument("--no-cache", action="store_true", help="не использовать дисковый кэш результатов")
+    sp.add_argument("--cache-dir", help="папка кэша (по умолчанию LCE_CACHE_DIR или кэш пользователя)")
+    sp.add_argument("--cache-size", type=int, default=CACHE_MAX_SIZE >> 20,
+                    help="лимит размера кэша, МБ; сверх него удаляются давно не использованные записи")
+    sp.add_argument("--cache-stats", action="store_true", help="сводка по кэшу в stderr")
+    if cmd in STREAM_LANGS:
+        sp.add_argument("--stream", action="store_true",
+                        help=f"обрабатывать потоком кусками (по умолчанию — файлы от {STREAM_MIN_SIZE >> 20} МБ; "
+                             f"языки: {', '.join(STREAM_LANGS[cmd])})")
+    if cmd in ("format", "minify"):
+        sp.add_argument("--max-blank", type=int, default=1, help="максимум пустых строк подряд")
+        sp.add_argument("--no-trim", action="store_true", help="не удалять пробелы в конце строк")
+    if cmd == "minify":
+        sp.add_argument("--stats", action="store_true", help="размер до/после и время в stderr")
+        sp.add_argument("--mangle", action="store_true",
+                        help="JavaScript: сокращать имена локальных переменных и параметров")
+        sp.add_argument("--optimize", action="store_true",
+                        help="CSS: сливать одинаковые селекторы, удалять перекрытые объявления и пустые правила")
+    if cmd == "format":
+        sp.add_argument("--indent", type=int, default=4, help="ширина отступа")
+        sp.add_argument("--tabs", action="store_true", help="отступ табуляцией")
+        sp.add_argument("--sort-keys", action="store_true",
+                        help=f"сортировать ключи JSON (при потоковой обработке — в поддеревьях до {SORT_LIMIT >> 20} МБ)")
+        sp.add_argument("--tier", choices=FORMAT_TIERS, default="auto",
+                        help="JavaScript/PHP/CSS: full — полный разбор, fast — только по {} и «;» "
+                             f"(auto — fast для файлов от {FAST_FORMAT_MIN_SIZE >> 20} МБ и неизвестных языков)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="linkcodeedit", description="LinkCodeEdit без GUI")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    helps = {
+        "format": "форматирование кода",
+        "minify": "минификация",
+        "strip": "удаление комментариев",
+        "deobf": "деобфускация (base64/eval/goto)",
+    }
+    for cmd in TEXT_COMMANDS:
+        _add_text_options(sub.add_parser(cmd, help=helps[cmd]), cmd)
+
+    sp = sub.add_parser("sitemap", help="sitemap.xml из списка URL или папки с HTML")
+    sp.add_argument("--base", required=True, help="адрес сайта, напр. https://example.com")
+    src = sp.add_mutually_exclusive_group(required=True)
+    src.add_argument("--list", help="файл со списком URL/путей («-» — stdin)")
+    src.add_argument("--dir", help="папка сайта (html/htm/xhtml)")
+    sp.add_argument("--changefreq", default="",
+                    choices=["", "always", "hourly", "daily", "weekly", "monthly", "yearly", "never"])
+    sp.add_argument("--priority", type=float, default=0.5)
+    sp.add_argument("--lastmod", choices=["today", "mtime", "none"], default="today")
+    sp.add_argument("-o", "--output", help="файл результата (по умолчанию stdout)")
+
+    sp = sub.add_parser("favicon", help="набор иконок, favicon.ico и manifest.json")
+    sp.add_argument("image", help="исходное изображение (PNG/JPG/ICO)")
+    sp.add_argument("-o", "--output", required=True, help="папка для иконок")
+    sp.add_argument("--prefix", default="/", help="URL-префикс иконок")
+    sp.add_argument("--theme", default="#ffffff", help="цвет темы")
+    sp.add_argument("--name", default="LinkCodeEdit", help="имя приложения в manifest.json")
+    return ap
+
+
+def _text_opts(a) -> dict:
+    return {
+        "tabs": getattr(a, "tabs", False),
+        "indent": getattr(a, "indent", 4),
+        "sort_keys": getattr(a, "sort_keys", False),
+        "tier": getattr(a, "tier", "auto"),
+        "max_blank": getattr(a, "max_blank", 1),
+        "trim": not getattr(a, "no_trim", False),
+        "stream": getattr(a, "stream", False),
+        "stats": getattr(a, "stats", False),
+        "mangle": getattr(a, "mangle", False),
+        "optimize": getattr(a, "optimize", False),
+        "line_jobs": 1,  # процессов на строки JSON Lines: -j, если вход один
+        "cache": None,  # папка дискового кэша: только для файлов с -o/-i
+        "cache_size": max(0, getattr(a, "cache_size", CACHE_MAX_SIZE >> 20)) << 20,
+    }
+
+
+def _run_text(a) -> int:
+    opts = _text_opts(a)
+    jobs = a.jobs if a.jobs > 0 else (os.cpu_count() or 1)
+    paths = [p for p in a.paths if p != "-"]
+    if not paths:
+        opts["line_jobs"] = jobs
+        lang = stream_lang(a.cmd, None, a.lang, opts["stream"])
+        if lang:
+            if a.output:
+                with open(a.output, "w", encoding="utf-8") as f:
+                    run_stream(a.cmd, sys.stdin, f, lang, opts)
+            else:
+                run_stream(a.cmd, sys.stdin, sys.stdout, lang, opts)
+            return 0
+        code = sys.stdin.read()
+        out, note = transform(a.cmd, code, pick_lang(None, code, a.lang), opts)
+        if note:
+            print(f"<stdin>: {note}", file=sys.stderr)
+        if a.output:
+            with open(a.output, "w", encoding="utf-8") as f:
+                f.write(out)
+        else:
+            sys.stdout.write(out)
+        return 0
+
+    exts = {("." + e.strip().lstrip(".")).lower() for e in a.ext.split(",")} if a.ext else set(EXT_LANGS)
+    inputs = list(iter_inputs(paths, exts))
+    many = len(inputs) > 1 or any(os.path.isdir(p) for p in paths)
+    if many and not (a.output or a.in_place):
+        print("linkcodeedit: several inputs need -o DIR or --in-place", file=sys.stderr)
+        return 2
+
+    tasks = []
+    for src, rel in inputs:
+        if a.in_place:
+            dst = src
+        elif a.output:
+            dst = os.path.join(a.output, rel) if many else a.output
+        else:
+            dst = None
+        tasks.append((a.cmd, src, dst, a.lang, opts))
+    if len(tasks) == 1:
+        opts["line_jobs"] = jobs
+    if (a.output or a.in_place) and not a.no_cache:
+        opts["cache"] = a.cache_dir or default_cache_dir()
+
+    if len(tasks) == 1 and tasks[0][2] is None:
+        cmd, src, _dst, forced, _ = tasks[0]
+        lang = stream_lang(cmd, src, forced, opts["stream"])
+        if lang:
+            with open(src, "r", encoding="utf-8", errors="replace") as f:
+                run_stream(cmd, f, sys.stdout, lang, opts)
+            return 0
+        with open(src, "r", encoding="utf-8", errors="replace") as f:
+            code = f.read()
+        out, note = transform(cmd, code, pick_lang(src, code, forced), opts)
+        if note:
+            print(f"{src}: {note}", file=sys.stderr)
+        sys.stdout.write(out)
+        return 0
+
+    workers = min(jobs, len(tasks)) or 1
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(_run_file, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    else:
+        results = [_run_file(t) for t in tasks]
+
+    failed = hits = misses = 0
+    for src, note, err, cached in results:
+        if err:
+            failed += 1
+            print(f"{src}: {err}", file=sys.stderr)
+        elif note:
+            print(f"{src}: {note}", file=sys.stderr)
+        if cached is not None:
+            hits += cached
+            misses += not cached
+    if opts["cache"]:
+        entries, size, removed = DiskCache(opts["cache"], opts["cache_size"]).evict()
+        if a.cache_stats:
+            print(f"cache: {hits} hits, {misses} misses, {entries} entries, {size / 1048576:.1f} of "
+                  f"{opts['cache_size'] >> 20} MB, {removed} evicted ({opts['cache']})", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def _run_sitemap(a) -> int:
+    from .sitemap import SITEMAP_MAX_URLS, collect_from_list, collect_from_folder, build_sitemap_xml
+    if a.list:
+        if a.list == "-":
+            text = sys.stdin.read()
+        else:
+            with open(a.list, "r", encoding="utf-8") as f:
+                text = f.read()
+        today = datetime.date.today().isoformat() if a.lastmod == "today" else None
+        items = [(u, today) for u in collect_from_list(text, a.base)]
+    else:
+        if not os.path.isdir(a.dir):
+            print(f"linkcodeedit: not a directory: {a.dir}", file=sys.stderr)
+            return 2
+        items = collect_from_folder(a.base, a.dir, a.lastmod == "mtime")
+    priority = a.priority if a.priority >= 0.0 else None
+    txt = build_sitemap_xml(items, a.changefreq, priority) + "\n"
+    if len(items) > SITEMAP_MAX_URLS:
+        print(f"linkcodeedit: {len(items)} URLs, sitemap limit is {SITEMAP_MAX_URLS}", file=sys.stderr)
+    if a.output:
+        with open(a.output, "w", encoding="utf-8") as f:
+            f.write(txt)
+    else:
+        sys.stdout.write(txt)
+    return 0
+
+
+def _run_favicon(a) -> int:
+    from .favicon import load_image, generate_favicons
+    try:
+        img = load_image(a.image)
+    except ImportError:
+        print("linkcodeedit: Pillow is required: pip install pillow", file=sys.stderr)
+        return 2
+    except Exception as e:
+        print(f"linkcodeedit: cannot open image: {e}", file=sys.stderr)
+        return 2
+    snippet, errors = generate_favicons(img, a.output, a.prefix, a.theme, a.name)
+    sys.stdout.write(snippet + "\n")
+    return 1 if errors else 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    a = build_parser().parse_args(argv)
+    if a.cmd == "sitemap":
+        return _run_sitemap(a)
+    if a.cmd == "favicon":
+        return _run_favicon(a)
+    return _run_text(a)
@@ -0,0 +1,347 @@
+"""
+Структурная оптимизация CSS для минификации: дерево правил строится на
+токенах pretty_css (lexer.css_tokens), затем одинаковые селекторы
+сливаются, перекрытые объявления и пустые правила удаляются, цвета и
+нулевые длины сокращаются.
+
+Порядок каскада сохраняется: правило переносится к своему дублю, только
+если между ними никто не задаёт те же свойства (с учётом шорткатов и
+вендорных алиасов), а объявление-запасной вариант вида
+«display:-webkit-box;display:flex» остаётся.
+"""
+from __future__ import annotations
+import re
+from bisect import bisect_right, insort
+from typing import Optional
+
+from .lexer import css_tokens
+from .strip import strip_comments
+
+# Пробельные символы CSS; \s не годится — неразрывный пробел допустим в именах
+_S = r"[ \t\n\r\f]"
+_WS = re.compile(_S + "+")
+_SEL_COMB = re.compile(rf"{_S}*(?<!\\)([,>~+]){_S}*")
+_OPEN_WS = re.compile(rf"\({_S}+")
+_CLOSE_WS = re.compile(rf"{_S}+\)")
+_AT_COMMA = re.compile(rf"{_S}*,{_S}*")
+# (max-width : 1px) -> (max-width:1px); в @supports selector(a :hover) пробел значим
+_AT_FEATURE = re.compile(rf"(?<!selector)\(([\w-]+){_S}*:{_S}*")
+_VAL_TIGHT = re.compile(rf"{_S}*([,/]){_S}*")
+_IMPORTANT = re.compile(rf"{_S}*!{_S}*important{_S}*$", re.I)
+# Строки и url(…) внутри значения не трогаются
+_VAL_SKIP = re.compile(r"""("(?:[^"\\]|\\[\s\S])*"?|'(?:[^'\\]|\\[\s\S])*'?"""
+                       r"""|\burl\(\s*(?:"(?:[^"\\]|\\[\s\S])*"|'(?:[^'\\]|\\[\s\S])*'|[^)]*)\s*\)?)""", re.I)
+_HEX = re.compile(r"(?<![\w\\])#([0-9a-fA-F]{3,8})(?![\w-])")
+_ZERO = re.compile(r"(?<![\w.#\\-])(?:0+\.?0*|\.0+)(?:px|em|rem|ex|ch|vw|vh|vmin|vmax|cm|mm|in|pt|pc|q)(?![\w%(-])",
+                   re.I)
+_LEAD_ZERO = re.compile(r"(?<![\w.#\\])0+(?=\.\d)")
+# В calc() и т. п. «0» без единицы недопустим; flex: 1 0px ≠ flex: 1 0
+_CALC = re.compile(r"(?:calc|min|max|clamp)\(", re.I)
+_NO_ZERO = frozenset(("flex", "-webkit-flex", "-ms-flex"))
+# IE-фильтры и expression() требуют значения как есть
+_LEGACY = re.compile(r"progid:|expression\(", re.I)
+# Значение-запасной вариант: функция, вендорный префикс или хак \9
+_FALLBACK = re.compile(r"[(\\]|(?<![\w-])-(?:webkit|moz|ms|o)-", re.I)
+_VENDOR = re.compile(r"^[*_]?-(?:webkit|moz|ms|o|khtml)-")
+_KEYFRAMES = re.compile(r"@(?:-\w+-)?keyframes\b", re.I)
+# «all» — @-инструкция или свойство all: конфликтует с любым элементом («*»)
+_ALL = frozenset(("all",))
+_STAR = frozenset(("*",))
+_ANY = frozenset(("all", "*"))
+
+# Корень свойства -> группа: шорткаты и алиасы, которые задают одно и то же
+_GROUPS = {
+    "row": "gap", "column": "gap", "columns": "gap", "grid": "gap",
+    "top": "inset", "right": "inset", "bottom": "inset", "left": "inset",
+    "line": "font",
+    "place": "align", "justify": "align",
+    "word": "overflow", "white": "text", "page": "break",
+    "width": "size", "height": "size", "block": "size", "inline": "size", "min": "size", "max": "size",
+}
+
+
+def _group(key: str) -> str:
+    if key.startswith("--"):
+        return key
+    k = _VENDOR.sub("", key).lstrip("*_")
+    root = k.split("-", 1)[0]
+    return _GROUPS.get(root, root)
+
+
+class _Decl:
+    __slots__ = ("prop", "key", "value", "important")
+
+    def __init__(self, prop: str, value: str, important: bool):
+        self.prop = prop
+        self.key = prop if prop.startswith("--") else prop.lower()
+        self.value = value
+        self.important = important
+
+
+class _Block:
+    """Правило или @-блок: head — селектор/прелюдия, items — _Decl, _Block и @-инструкции (str)."""
+    __slots__ = ("head", "items", "groups")
+
+    def __init__(self, head: str):
+        self.head = head
+        self.items: list = []
+        self.groups: Optional[frozenset] = None
+
+
+class _Opt:
+    """Один проход оптимизации; счётчики — для отчёта (counts в minify_css)."""
+
+    def __init__(self):
+        self.counts = {"merged": 0, "overridden": 0, "empty": 0, "colors": 0, "zeros": 0}
+
+    # ---- нормализация ----
+
+    def _outside(self, text: str, fn) -> str:
+        """fn — к частям вне строк и url(…)."""
+        if '"' not in text and "'" not in text and "url(" not in text.lower():
+            return fn(text)
+        parts = _VAL_SKIP.split(text)
+        for k in range(0, len(parts), 2):
+            parts[k] = fn(parts[k])
+        return "".join(parts)
+
+    def selector(self, text: str) -> str:
+        def fn(t: str) -> str:
+            t = _SEL_COMB.sub(r"\1", _WS.sub(" ", t))
+            return _CLOSE_WS.sub(")", _OPEN_WS.sub("(", t))
+        return self._outside(text, fn).strip()
+
+    def prelude(self, text: str) -> str:
+        def fn(t: str) -> str:
+            t = _AT_COMMA.sub(",", _WS.sub(" ", t))
+            t = _CLOSE_WS.sub(")", _OPEN_WS.sub("(", t))
+            return _AT_FEATURE.sub(r"(\1:", t)
+        return self._outside(text, fn).strip()
+
+    def _hex(self, m: re.Match) -> str:
+        h = m.group(1)
+        if len(h) not in (3, 4, 6, 8):
+            return m.group()
+        h = h.lower()
+        if len(h) == 6 and h[0] == h[1] and h[2] == h[3] and h[4] == h[5]:
+            h = h[0] + h[2] + h[4]
+        if h != m.group(1):
+            self.counts["colors"] += 1
+        return "#" + h
+
+    def value(self, text: str, key: str) -> str:
+        legacy = _LEGACY.search(text) is not None
+        # --x: 0px может попасть в calc() через var()
+        zeros = not legacy and key not in _NO_ZERO and key[:2] != "--" and _CALC.search(text) is None
+
+        def fn(t: str) -> str:
+            t = _VAL_TIGHT.sub(r"\1", _WS.sub(" ", t))
+            t = _CLOSE_WS.sub(")", _OPEN_WS.sub("(", t))
+            if legacy:
+                return t
+            if "#" in t:
+                t = _HEX.sub(self._hex, t)
+            if "0" in t:
+                if zeros:
+                    t, k = _ZERO.subn("0", t)
+                    self.counts["zeros"] += k
+                t = _LEAD_ZERO.sub("", t)
+            return t
+        return self._outside(text, fn).strip()
+
+    def item(self, text: str):
+        text = text.strip()
+        if text[0] == "@":
+            return self.prelude(text)
+        prop, colon, val = text.partition(":")
+        prop = prop.strip()
+        if not colon or not prop:
+            return _WS.sub(" ", text)
+        m = _IMPORTANT.search(val)
+        if m:
+            val = val[:m.start()]
+        d = _Decl(prop, "", m is not None)
+        # пустое значение допустимо только у --x, и то как пробел
+        d.value = self.value(val, d.key) or (" " if d.key[:2] == "--" else "")
+        return d
+
+    # ---- дерево ----
+
+    def parse(self, s: str) -> _Block:
+        root = _Block("")
+        stack = [root]
+        buf: list[str] = []
+        depth = 0  # скобки: «;» внутри url(data:…;base64,…) — часть значения
+        for tok in css_tokens(s):
+            c = tok[0]
+            if c == '"' or c == "'":
+                buf.append(tok)
+                continue
+            if c in "{};" and len(tok) == 1 and not (depth and c == ";"):
+                text = "".join(buf)
+                buf.clear()
+                depth = 0
+                if c == "{":
+                    text = text.strip()
+                    b = _Block(self.prelude(text) if text[:1] == "@" else self.selector(text))
+                    stack[-1].items.append(b)
+                    stack.append(b)
+                    continue
+                if text.strip():
+                    stack[-1].items.append(self.item(text))
+                if c == "}" and len(stack) > 1:
+                    stack.pop()
+                continue
+            if "(" in tok or ")" in tok:
+                depth = max(0, depth + tok.count("(") - tok.count(")"))
+            buf.append(tok)
+        text = "".join(buf)
+        if text.strip():
+            stack[-1].items.append(self.item(text))
+        return root
+
+    def groups(self, it) -> frozenset:
+        """Группы свойств, которые задаёт элемент списка; @-инструкция — барьер («all»)."""
+        if type(it) is _Decl:
+            return frozenset((_group(it.key),))
+        if type(it) is str:
+            return frozenset(("all",))
+        if it.groups is None:
+            g = set()
+            for x in it.items:
+                g |= self.groups(x)
+            it.groups = frozenset(g)
+        return it.groups
+
+    def merge(self, items: list) -> list[_Block]:
+        """
+        Слияние правил с одинаковым селектором, если никто между дублями не
+        задаёт те же группы свойств. Позиции групп ведутся отсортированными
+        списками, проверка пары — бинарный поиск, а не обход всего между ними.
+        Возвращает получившиеся правила (в них бывают перекрытия).
+        """
+        seen: dict[str, int] = {}
+        where: dict[str, list[int]] = {}  # группа -> позиции; «*» — все элементы
+        merged: list[_Block] = []
+
+        def busy(groups: frozenset, i: int, j: int) -> bool:
+            keys = groups | _ANY if "all" in groups else groups | _ALL
+            for g in keys:
+                lst = where.get(g)
+                if lst:
+                    k = bisect_right(lst, i)
+                    if k < len(lst) and lst[k] < j:
+                        return True
+            return False
+
+        for j, r in enumerate(items):
+            if type(r) is _Block and r.head[:1] != "@" and all(type(x) is _Decl for x in r.items):
+                i = seen.get(r.head)
+                if i is not None:
+                    prev = items[i]
+                    if not busy(self.groups(prev), i, j):
+                        # объявления prev переезжают вперёд, в r (старые позиции prev
+                        # остаются в where — это только лишняя осторожность)
+                        r.items[:0] = prev.items
+                        r.groups = None
+                        items[i] = None
+                        merged.append(r)
+                        self.counts["merged"] += 1
+                    elif not busy(self.groups(r), i, j):
+                        # объявления r переезжают назад, в prev
+                        new = self.groups(r) - self.groups(prev)
+                        prev.items += r.items
+                        prev.groups = None
+                        items[j] = None
+                        merged.append(prev)
+                        self.counts["merged"] += 1
+                        for g in new:
+                            insort(where.setdefault(g, []), i)
+                        continue
+                seen[r.head] = j
+            for g in self.groups(r) | _STAR:
+                where.setdefault(g, []).append(j)
+        items[:] = [x for x in items if x is not None]
+        return merged
+
+    def dedupe(self, items: list):
+        """Удаление перекрытых объявлений; запасные значения (функции, префиксы, хаки) остаются."""
+        kept: dict[str, list[_Decl]] = {}
+        drop: set[int] = set()
+        for d in reversed(items):
+            if type(d) is not _Decl:
+                continue
+            later = kept.setdefault(d.key, [])
+            plain = _FALLBACK.search(d.value) is None
+            dead = False
+            for w in later:
+                if not (w.value == d.value or (plain and _FALLBACK.search(w.value) is None)):
+                    continue
+                if w.important or not d.important:
+                    dead = True
+                else:
+                    drop.add(id(w))
+                    later.remove(w)
+                break
+            if dead:
+                drop.add(id(d))
+            else:
+                later.append(d)
+        if drop:
+            self.counts["overridden"] += len(drop)
+            items[:] = [x for x in items if id(x) not in drop]
+
+    def optimize(self, block: _Block):
+        """Снизу вверх: вложенные блоки, перекрытые объявления, пустые правила, затем слияние."""
+        items = block.items
+        for it in items:
+            if type(it) is _Block:
+                self.optimize(it)
+        self.dedupe(items)
+        n = len(items)
+        # пустой @layer задаёт порядок слоёв — его не трогаем
+        items[:] = [x for x in items if type(x) is not _Block or x.items or x.head[:6].lower() == "@layer"]
+        self.counts["empty"] += n - len(items)
+        if _KEYFRAMES.match(block.head) or all(type(x) is not _Block for x in items):
+            return
+        # слияние убирает правила между дублями — следующий круг находит новые пары
+        merged = self.merge(items)
+        while merged:
+            for r in merged:
+                self.dedupe(r.items)
+            merged = self.merge(items)
+
+    def emit(self, items: list, out: list):
+        for it in items:
+            t = type(it)
+            if t is _Decl:
+                out.append(f"{it.prop}:{it.value}!important;" if it.important else f"{it.prop}:{it.value};")
+            elif t is str:
+                out.append(it + ";")
+            else:
+                out.append(it.head + "{")
+                k = len(out)
+                self.emit(it.items, out)
+                if len(out) > k and out[-1][-1] == ";":
+                    out[-1] = out[-1][:-1]
+                out.append("}")
+
+
+def minify_css(code: str, optimize: bool = True, counts: Optional[dict] = None) -> str:
+    """
+    Минификация CSS по дереву правил. optimize=False — только нормализация
+    пробелов, цветов и нулей, без слияния и удаления правил.
+    counts (если передан) пополняется счётчиками: merged, overridden, empty, colors, zeros.
+    """
+    opt = _Opt()
+    root = opt.parse(strip_comments(code, "CSS"))
+    if optimize:
+        opt.optimize(root)
+    out: list[str] = []
+    opt.emit(root.items, out)
+    if out and out[-1][-1] == ";":
+        out[-1] = out[-1][:-1]
+    if counts is not None:
+        for k, v in opt.counts.items():
+            counts[k] = counts.get(k, 0) + v
+    return "".join(out)
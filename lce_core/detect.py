@@ -0,0 +1,29 @@
+"""Определение языка фрагмента кода по эвристикам."""
+from __future__ import annotations
+import re
+
+from . import jsonio
+
+
+def detect_language(sample: str, _limit: int = 8192) -> str:
+    s = (sample or "")
+    if len(s) > _limit:
+        s = s[:_limit]
+    s = s.strip()
+    if not s: return "Plain"
+    if s[:1] in "{[":
+        try:
+            jsonio.loads(s); return "JSON"
+        except Exception:
+            pass
+    if s.startswith("<?php") or "<?php" in s: return "PHP"
+    if s.startswith("<"):
+        if re.match(r"^<!DOCTYPE|^<html|^<svg|^<\?xml", s, re.I): return "HTML/XML"
+        if re.match(r"^<\w+[^>]*>", s): return "HTML/XML"
+    if re.search(r"(^|\n)\s*#|^\s*(def|class)\s+\w+|^\s*import\s+\w+", s):
+        return "Python"
+    if re.search(r"\b(function|let|const|var|=>|import\s+.*from)\b", s):
+        return "JavaScript"
+    if re.search(r"[.#][\w-]+\s*\{|@media|:root\s*\{", s):
+        return "CSS"
+    return "Plain"
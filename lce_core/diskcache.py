@@ -0,0 +1,168 @@
+"""
+Кэш результатов пакетной обработки на диске (python -m lce_core … -o/-i).
+
+Одно и то же дерево файлов при каждой сборке форматируется или
+минифицируется заново, хотя почти все файлы не менялись. Ключ записи —
+хэш (blake2b) содержимого файла, отпечатка движков (исходников lce_core)
+и параметров команды; запись — готовый вывод и примечание для stderr.
+Записи пишутся атомарно (временный файл и os.replace), поэтому процессы
+-j N пользуются кэшем одновременно. Сверх лимита размера удаляются
+записи, к которым дольше всего не обращались (по mtime: попадание его
+обновляет).
+"""
+from __future__ import annotations
+import os, sys, time, hashlib
+from typing import Optional
+
+from . import jsonio
+
+# Версия формата вывода: поднимать, если результат движков меняется
+# без правки исходников lce_core (например, в собранном exe).
+ENGINE_VERSION = "1"
+CACHE_MAX_SIZE = 256 * 1024 * 1024
+# Запись крупнее max_size // CACHE_ENTRY_SHARE не сохраняется (как в memo.py)
+CACHE_ENTRY_SHARE = 8
+# Временный файл старше (секунд) — остаток прерванной записи, а не запись соседнего процесса
+TMP_MAX_AGE = 300
+
+_fingerprint: Optional[bytes] = None
+
+
+def engine_fingerprint() -> bytes:
+    """
+    ENGINE_VERSION, бэкенд JSON (orjson и его версия или json) и хэш
+    исходников lce_core: правка любого движка сбрасывает кэш.
+    """
+    global _fingerprint
+    if _fingerprint is None:
+        h = hashlib.blake2b(f"{ENGINE_VERSION}\0{jsonio.backend()}".encode(), digest_size=16)
+        here = os.path.dirname(os.path.abspath(__file__))
+        try:
+            names = sorted(n for n in os.listdir(here) if n.endswith(".py"))
+        except OSError:
+            names = []  # собранный exe: только ENGINE_VERSION
+        for n in names:
+            try:
+                with open(os.path.join(here, n), "rb") as f:
+                    h.update(n.encode() + b"\0" + f.read())
+            except OSError:
+                pass
+        _fingerprint = h.digest()
+    return _fingerprint
+
+
+def default_cache_dir() -> str:
+    """LCE_CACHE_DIR, иначе папка кэша пользователя."""
+    env = os.environ.get("LCE_CACHE_DIR")
+    if env:
+        return env
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "LinkCodeEdit", "cache")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "linkcodeedit")
+
+
+def cache_key(data: bytes, *params) -> str:
+    """Ключ: содержимое файла, отпечаток движков и параметры (repr каждого)."""
+    h = hashlib.blake2b(engine_fingerprint(), digest_size=20)
+    for p in params:
+        h.update(repr(p).encode("utf-8") + b"\0")
+    h.update(data)
+    return h.hexdigest()
+
+
+class DiskCache:
+    """Запись — файл ПАПКА/ab/cdef…: первая строка — примечание, дальше — вывод (UTF-8)."""
+
+    def __init__(self, root: str, max_size: int = CACHE_MAX_SIZE):
+        self.root = root
+        self.max_size = max_size
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:])
+
+    def get(self, key: str) -> Optional[tuple[str, Optional[str]]]:
+        """(вывод, примечание) или None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        note, _, out = data.partition(b"\n")
+        return out.decode("utf-8"), note.decode("utf-8") or None
+
+    def put(self, key: str, out: str, note: Optional[str]) -> bool:
+        data = (note or "").encode("utf-8") + b"\n" + out.encode("utf-8")
+        if len(data) > self.max_size // CACHE_ENTRY_SHARE:
+            return False
+        import tempfile  # random, shutil…: не в бюджет импорта cli
+        path = self._path(key)
+        d = os.path.dirname(path)
+        tmp = None
+        try:
+            os.makedirs(d, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=d, prefix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+            return False
+        return True
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        """Записи (mtime, размер, путь); попутно удаляет .tmp* старше TMP_MAX_AGE."""
+        found = []
+        try:
+            subdirs = os.listdir(self.root)
+        except OSError:
+            return found
+        stale = time.time() - TMP_MAX_AGE
+        for sub in subdirs:
+            d = os.path.join(self.root, sub)
+            if len(sub) != 2 or not os.path.isdir(d):
+                continue
+            for e in os.scandir(d):
+                try:
+                    if not e.is_file():
+                        continue
+                    st = e.stat()
+                    if not e.name.startswith(".tmp"):
+                        found.append((st.st_mtime, st.st_size, e.path))
+                    elif st.st_mtime < stale:
+                        os.remove(e.path)
+                except OSError:
+                    pass  # удалена соседним процессом
+        return found
+
+    def evict(self) -> tuple[int, int, int]:
+        """Удаляет давно не использованные записи сверх max_size: (записей, байт, удалено)."""
+        entries = self._entries()
+        total = sum(size for _t, size, _p in entries)
+        removed = 0
+        if total > self.max_size:
+            entries.sort()
+            for _t, size, path in entries:
+                if total <= self.max_size:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+        return len(entries) - removed, total, removed
+
+    def clear(self):
+        for _t, _size, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,127 @@
+"""
+Генерация набора иконок сайта, favicon.ico, manifest.json и HTML-сниппета.
+Нужен Pillow: pip install pillow
+"""
+from __future__ import annotations
+import os, json
+
+APPLE_SIZES = (57, 60, 72, 76, 114, 120, 144, 152, 180)
+FAVICON_PNG_SIZES = (16, 32, 96)
+ANDROID_SIZES = (192,)
+MS_SIZES = (144,)
+CHROME_SIZE = 512
+ICO_SIZES = (16, 32, 48, 64)
+
+
+def normalize_prefix(p: str) -> str:
+    p = (p or "/").strip()
+    if not p.startswith("/"): p = "/" + p
+    p = p.rstrip("/")
+    return p
+
+
+def load_image(path: str):
+    """Открывает изображение как RGBA. ImportError — если нет Pillow."""
+    from PIL import Image
+    return Image.open(path).convert("RGBA")
+
+
+def square_resize(img, size: int):
+    from PIL import Image
+    w, h = img.size
+    L = max(w, h)
+    canvas = Image.new("RGBA", (L, L), (0,0,0,0))
+    canvas.paste(img, ((L - w)//2, (L - h)//2))
+    return canvas.resize((size, size), Image.LANCZOS)
+
+
+def save_png(img, path: str, size: int):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        im = square_resize(img, size)
+        im.save(path, format="PNG")
+    except Exception as e:
+        raise RuntimeError(f"PNG {size}x{size}: {e}")
+
+
+def save_ico(img, path: str, sizes=ICO_SIZES):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        icons = [square_resize(img, s) for s in sizes]
+        base = icons[0]
+        base.save(path, format="ICO", sizes=[(s, s) for s in sizes])
+    except Exception as e:
+        raise RuntimeError(f"ICO: {e}")
+
+
+def make_snippet(prefix: str, theme: str) -> str:
+    p = normalize_prefix(prefix)
+    lines = [
+        f'<link rel="shortcut icon" href="{p}/favicon.ico" type="image/x-icon">',
+        f'<link rel="icon" href="{p}/favicon.ico" type="image/x-icon">',
+    ]
+    lines += [f'<link rel="apple-touch-icon" sizes="{s}x{s}" href="{p}/apple-icon-{s}x{s}.png">' for s in APPLE_SIZES]
+    lines += [
+        f'<link rel="icon" type="image/png" sizes="192x192"  href="{p}/android-icon-192x192.png">',
+        f'<link rel="icon" type="image/png" sizes="32x32" href="{p}/favicon-32x32.png">',
+        f'<link rel="icon" type="image/png" sizes="96x96" href="{p}/favicon-96x96.png">',
+        f'<link rel="icon" type="image/png" sizes="16x16" href="{p}/favicon-16x16.png">',
+        f'<link rel="manifest" href="{p}/manifest.json">',
+        f'<meta name="msapplication-TileColor" content="{theme}">',
+        f'<meta name="msapplication-TileImage" content="{p}/ms-icon-144x144.png">',
+        f'<meta name="theme-color" content="{theme}">',
+    ]
+    return "\n".join(lines)
+
+
+def write_manifest(folder: str, prefix: str, appname: str, theme: str):
+    data = {
+        "name": appname or "App",
+        "short_name": appname or "App",
+        "icons": [
+            {"src": f"{prefix}/android-icon-192x192.png", "sizes": "192x192", "type": "image/png"},
+            {"src": f"{prefix}/android-chrome-512x512.png", "sizes": "512x512", "type": "image/png"},
+        ],
+        "theme_color": theme,
+        "background_color": theme,
+        "display": "standalone"
+    }
+    path = os.path.join(folder, "manifest.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def generate_favicons(img, outdir: str, prefix: str, theme: str, appname: str) -> tuple[str, list[str]]:
+    """
+    Пишет все иконки и manifest.json в outdir. Возвращает (сниппет, ошибки):
+    сбой одного размера не останавливает остальные.
+    """
+    pref = normalize_prefix(prefix)
+    os.makedirs(outdir, exist_ok=True)
+    errors = []
+    def try_call(fn):
+        try:
+            fn()
+        except Exception as e:
+            errors.append(str(e))
+
+    try_call(lambda: save_ico(img, os.path.join(outdir, "favicon.ico")))
+    for s in FAVICON_PNG_SIZES:
+        try_call(lambda s=s: save_png(img, os.path.join(outdir, f"favicon-{s}x{s}.png"), s))
+    for s in APPLE_SIZES:
+        try_call(lambda s=s: save_png(img, os.path.join(outdir, f"apple-icon-{s}x{s}.png"), s))
+    for s in ANDROID_SIZES:
+        try_call(lambda s=s: save_png(img, os.path.join(outdir, f"android-icon-{s}x{s}.png"), s))
+    for s in MS_SIZES:
+        try_call(lambda s=s: save_png(img, os.path.join(outdir, f"ms-icon-{s}x{s}.png"), s))
+    try_call(lambda: save_png(img, os.path.join(outdir, f"android-chrome-{CHROME_SIZE}x{CHROME_SIZE}.png"), CHROME_SIZE))
+
+    try:
+        write_manifest(outdir, pref, appname, theme)
+    except Exception as e:
+        errors.append(f"manifest.json: {e}")
+
+    snippet = make_snippet(pref, theme)
+    if errors:
+        snippet += "\n\n<!-- WARNINGS -->\n" + "\n".join(f"<!-- {e} -->" for e in errors)
+    return snippet, errors
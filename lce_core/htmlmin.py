@@ -0,0 +1,273 @@
+"""
+Минификация HTML одним проходом по токенам разметки: комментарии
+удаляются, пробелы у блочных тегов исчезают, в строке — схлопываются,
+у простых значений атрибутов снимаются кавычки, необязательные
+закрывающие теги (</li>, </p>, </td> … по правилам HTML) опускаются.
+
+Теги из RAW_TAGS (pre, code, textarea) выводятся как есть, встроенные
+<script>/<style> проходят через minify_js / minify_css. Внутри svg/math
+и в XML (<?xml …?> или корень — не HTML-тег) кавычки, «/>» и закрывающие теги остаются.
+"""
+from __future__ import annotations
+import re
+
+from .cssmin import minify_css
+from .jsmin import minify_js
+from .jsonio import minify_json
+from .pretty import INLINE_HTML, RAW_TAGS, VOID_HTML
+
+_TOKEN = re.compile(
+    r"(<!--[\s\S]*?(?:-->|\Z))"                                       # 1 комментарий
+    r"|(<!\[CDATA\[[\s\S]*?(?:\]\]>|\Z)|<![^>]*>|<\?[\s\S]*?(?:\?>|\Z))"  # 2 CDATA, doctype, <?…?>
+    r"|</([A-Za-z][^\s/>]*)[^>]*>"                                    # 3 закрывающий тег
+    r"|<([A-Za-z][^\s/>]*)((?:\"[^\"]*\"|'[^']*'|[^'\">])*)>"         # 4 тег, 5 атрибуты
+    r"|([^<]+|<)")                                                    # 6 текст
+_ATTR = re.compile(r"""([^\s"'>/=][^\s"'>/=]*)(?:[ \t\n\r\f]*=[ \t\n\r\f]*("[^"]*"|'[^']*'|[^\s>]+))?|(/)""")
+_UNQUOTED = re.compile(r"[^\s\"'=<>`]+")  # \s, а не только ASCII: _ATTR и html.parser делят значение и по \xa0
+_TYPE = re.compile(r"""(?:^|[ \t\n\r\f])type[ \t\n\r\f]*=[ \t\n\r\f]*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.I)
+_FIRST = re.compile(r"(?:[ \t\n\r\f\ufeff]+|<!--[\s\S]*?-->)*<(!doctype[ \t\n\r\f]+html\b|\?xml|[A-Za-z][^\s/>]*)", re.I)
+_WS = re.compile(r"[ \t\n\r\f]+")
+_SPACES = " \t\n\r\f"
+
+# Содержимое — текст до </имя>, а не разметка
+_RAWTEXT = {"script", "style", "textarea", "title", "xmp", "iframe", "noembed", "noframes"}
+_KEEP_WS = RAW_TAGS - {"script", "style"}
+_FOREIGN = {"svg", "math"}
+_JS_TYPES = {"", "text/javascript", "application/javascript", "text/ecmascript", "application/ecmascript", "module"}
+_JSON_TYPES = {"application/json", "application/ld+json", "importmap", "speculationrules"}
+
+# Пробел рядом с этими тегами не виден (строчные из INLINE_HTML, img, input … — видят)
+_BLOCK = {
+    "address", "article", "aside", "base", "blockquote", "body", "caption", "center", "col", "colgroup",
+    "dd", "details", "dialog", "dir", "div", "dl", "dt", "fieldset", "figcaption", "figure", "footer",
+    "form", "frame", "frameset", "h1", "h2", "h3", "h4", "h5", "h6", "head", "header", "hgroup", "hr",
+    "html", "legend", "li", "link", "main", "menu", "meta", "nav", "ol", "optgroup", "option", "p",
+    "param", "pre", "search", "section", "source", "summary", "table", "tbody", "td", "tfoot", "th",
+    "thead", "title", "tr", "track", "ul",
+} - INLINE_HTML
+
+# Необязательные закрывающие теги: после каких открывающих их можно опустить
+_P_FOLLOW = {
+    "address", "article", "aside", "blockquote", "details", "dialog", "div", "dl", "fieldset",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hgroup",
+    "hr", "main", "menu", "nav", "ol", "p", "pre", "search", "section", "table", "ul",
+}
+_FOLLOW = {
+    "li": {"li"}, "dt": {"dt", "dd"}, "dd": {"dt", "dd"}, "p": _P_FOLLOW,
+    "rt": {"rt", "rp"}, "rp": {"rt", "rp"}, "optgroup": {"optgroup", "hr"}, "option": {"option", "optgroup", "hr"},
+    "thead": {"tbody", "tfoot"}, "tbody": {"tbody", "tfoot"}, "tfoot": set(),
+    "tr": {"tr"}, "td": {"td", "th"}, "th": {"td", "th"},
+    "head": {"body"}, "body": set(), "html": set(),
+}
+# … и какие можно опустить в конце родителя
+_END_OK = {"li", "dd", "p", "rt", "rp", "optgroup", "option", "tbody", "tfoot", "tr", "td", "th", "body", "html"}
+# </p> в конце этих родителей обязателен
+_P_KEEP = {"a", "audio", "del", "ins", "map", "noscript", "video"}
+
+# Корень HTML-документа или фрагмента; с другого тега начинается XML
+_HTML_ROOTS = _BLOCK | INLINE_HTML | VOID_HTML | _RAWTEXT | {
+    "button", "canvas", "del", "iframe", "img", "ins", "noscript", "object", "picture", "select", "template", "video",
+}
+
+OPEN, CLOSE, TEXT, OTHER, EOF = range(5)
+_RAW_END: dict[str, re.Pattern] = {}
+
+
+def _raw_end(name: str) -> re.Pattern:
+    rx = _RAW_END.get(name)
+    if rx is None:
+        rx = _RAW_END[name] = re.compile(rf"</{name}(?=[\s/>])", re.I)
+    return rx
+
+
+def _tag(name: str, attrs: str, html: bool) -> str:
+    """Тег с нормализованными пробелами; в HTML — без лишних кавычек и «/>»."""
+    if not attrs.strip(_SPACES):
+        return f"<{name}>"
+    parts = [name]
+    closing = False
+    for m in _ATTR.finditer(attrs):
+        if m.group(3):
+            closing = True
+            continue
+        closing = False
+        an, v = m.group(1), m.group(2)
+        if v is None:
+            parts.append(an)
+            continue
+        if html and v[0] in "\"'":
+            if len(v) == 2:
+                parts.append(an)  # a="" — то же, что a
+                continue
+            if _UNQUOTED.fullmatch(v, 1, len(v) - 1):
+                v = v[1:-1]
+        parts.append(f"{an}={v}")
+    s = " ".join(parts)
+    if closing and not html:
+        s += "/" if s[-1] in "\"'" or len(parts) == 1 else " /"
+    return f"<{s}>"
+
+
+def _script_type(attrs: str) -> str:
+    m = _TYPE.search(attrs)
+    if m is None:
+        return ""
+    return (m.group(1) or m.group(2) or m.group(3) or "").strip(_SPACES).lower()
+
+
+def _embedded(name: str, attrs: str, body: str, mangle: bool, optimize: bool) -> str:
+    """Содержимое <script>/<style>; при любом сомнении — как было."""
+    if "<!--" in body or "<![CDATA[" in body or not body.strip(_SPACES):
+        return body
+    try:
+        if name == "style":
+            res = minify_css(body, optimize)
+        else:
+            kind = _script_type(attrs)
+            if kind in _JS_TYPES:
+                res = minify_js(body, mangle=mangle)
+            elif kind in _JSON_TYPES:
+                res = minify_json(body).replace("</", "<\\/")
+            else:
+                return body
+    except Exception:
+        return body
+    return body if _raw_end(name).search(res) else res
+
+
+def _is_xml(code: str) -> bool:
+    m = _FIRST.match(code)
+    if m is None:
+        return False
+    first = m.group(1).lower()
+    return first == "?xml" or not first.startswith("!") and first not in _HTML_ROOTS
+
+
+def minify_html(code: str, mangle: bool = False, optimize: bool = False) -> str:
+    """
+    mangle / optimize передаются минификаторам встроенных <script> и <style>.
+    Результат пишется в один список кусков по ходу токенов; решение о пробеле
+    и о необязательном закрывающем теге откладывается до следующего токена.
+    """
+    xml = _is_xml(code)
+    out: list[str] = []
+    add = out.append
+    stack: list[str] = []  # открытые элементы, имена в нижнем регистре
+    keep_ws = foreign = head = 0
+    space = False  # после текста отложен пробел
+    block = True  # последним выведен блочный тег: пробел после него не нужен
+    pend = None  # отложенный необязательный </имя>: (имя, как написано, родитель)
+
+    def flush(kind: int, name):
+        nonlocal pend, space
+        if pend is not None:
+            nm, raw, parent = pend
+            pend = None
+            if kind == OPEN:
+                omit = name in _FOLLOW[nm]
+            elif kind == CLOSE or kind == EOF:
+                omit = (nm in _END_OK and (kind == EOF or name == parent)
+                        and not (nm == "p" and parent is not None and (parent in _P_KEEP or "-" in parent)))
+            else:
+                omit = False
+            if space or not omit:
+                add(f"</{raw}>")
+        if space:
+            space = False
+            if kind == TEXT or kind == OTHER or (kind != EOF and not (head or name in _BLOCK)):
+                add(" ")
+
+    def pop_to(nm: str):
+        nonlocal keep_ws, foreign, head
+        while stack:
+            top = stack.pop()
+            keep_ws -= top in _KEEP_WS
+            foreign -= top in _FOREIGN
+            head -= top == "head"
+            if top == nm:
+                return
+
+    pos, n = 0, len(code)
+    while pos < n:
+        m = _TOKEN.match(code, pos)
+        pos = m.end()
+        text = m.group(6)
+        if text is not None:
+            if keep_ws:
+                flush(TEXT, None)
+                add(text)
+                block = False
+                continue
+            t = _WS.sub(" ", text)
+            if t == " ":
+                if not block and not xml:
+                    space = True
+                continue
+            if t[0] == " " and not block:
+                space = True
+            flush(TEXT, None)
+            add(t.strip(" "))
+            space = t[-1] == " "
+            block = False
+            continue
+
+        name = m.group(4)
+        if name is not None:
+            nm = name.lower()
+            flush(OPEN, nm)
+            if nm == "body" and head:
+                pop_to("head")  # </head> мог быть опущен
+            if not xml and not foreign:
+                # <li> закрывает открытый <li> и т. п.: иначе опущенный при первом проходе
+                # </li> даёт при повторном другой стек, чем явный
+                while stack and nm in _FOLLOW.get(stack[-1], ()):
+                    pop_to(stack[-1])
+            attrs = m.group(5)
+            self_closing = attrs.rstrip(_SPACES).endswith("/")
+            # <div/> в HTML — просто открывающий тег, но скорее это XML-фрагмент: как было
+            html = not xml and not foreign and nm not in _FOREIGN and (nm in VOID_HTML or not self_closing)
+            add(_tag(name, attrs, html))
+            block = head > 0 or nm in _BLOCK
+            if nm in VOID_HTML and not xml or self_closing and (xml or foreign or nm in _FOREIGN):
+                continue
+            stack.append(nm)
+            keep_ws += nm in _KEEP_WS
+            foreign += nm in _FOREIGN
+            head += nm == "head"
+            if nm in _RAWTEXT and not xml and not foreign:
+                e = _raw_end(nm).search(code, pos)
+                end = e.start() if e else n
+                body = code[pos:end]
+                if nm == "script" or nm == "style":
+                    body = _embedded(nm, attrs, body, mangle, optimize)
+                add(body)
+                block = False
+                pos = end
+            continue
+
+        name = m.group(3)
+        if name is not None:
+            nm = name.lower()
+            flush(CLOSE, nm)
+            if nm in stack:
+                top = stack[-1] == nm
+                pop_to(nm)
+                if top and not xml and not foreign and nm in _FOLLOW:
+                    pend = (nm, name, stack[-1] if stack else None)
+                    block = head > 0 or nm in _BLOCK
+                    continue
+            add(f"</{name}>")
+            block = head > 0 or nm in _BLOCK
+            continue
+
+        keep = m.group(2)
+        if keep is None:
+            keep = m.group(1)
+            # условные комментарии IE — разметка, а не комментарий
+            if not keep.startswith(("<!--[if", "<!--<![endif]", "<!--[endif]")):
+                continue
+        flush(OTHER, None)
+        add(keep)
+        block = keep.startswith("<!") and not keep.startswith("<![CDATA[")
+    flush(EOF, None)
+    return "".join(out)
@@ -0,0 +1,104 @@
+"""
+Готовые действия вкладок без виджетов: принимают значения контролов
+и возвращают (результат, язык подсветки). Выполняются в фоновом
+потоке или в процессе пула, поэтому должны оставаться чистыми.
+"""
+from __future__ import annotations
+from typing import Optional
+
+from .detect import detect_language
+from .strip import strip_comments, strip_comments_all, strip_comments_custom
+from .minify import minify_code, utf8_size
+from .pretty import RangeCheckpoints, pretty_format, pretty_python, pretty_range, tidy_whitespace, _indent_str
+from .linediff import line_hunks
+from .obfuscate import (
+    deobfuscate, obfuscate_js_eval_base64, obfuscate_hex_js,
+    obfuscate_generic_base64, append_comment,
+)
+
+
+STRIP_MODE_LANGS = {2: "HTML/XML", 3: "CSS", 4: "JavaScript", 5: "PHP", 6: "JSON", 7: "Python"}
+
+def strip_job(code: str, mode: int, html=False, c_block=False, c_line=False, py_hash=False) -> tuple[str, str]:
+    """Удаление комментариев для вкладки «Комментарии»: (результат, язык подсветки)."""
+    if mode == 0:
+        res = strip_comments_all(code)
+    elif mode == 1:
+        res = strip_comments_custom(code, html=html, c_block=c_block, c_line=c_line, py_hash=py_hash)
+    else:
+        res = strip_comments(code, STRIP_MODE_LANGS[mode])
+    return res, detect_language(code)
+
+def pick_format_lang(sel: str, det: str) -> str:
+    if sel == "Plain":
+        return det
+    if sel == "HTML/XML" and det in ("JavaScript", "CSS"):
+        return det
+    if sel in ("JavaScript", "CSS") and det == "HTML/XML":
+        return det
+    return sel
+
+def pretty_job(code: str, sel_lang: str, use_tabs: bool, indent_size: int, sort_keys: bool,
+               max_blank: int, trim: bool, tier: str = "auto") -> tuple[str, str]:
+    """Форматирование для вкладки «Форматирование»: (результат, язык подсветки)."""
+    lang = pick_format_lang(sel_lang, detect_language(code[:8192]))
+    if lang == "Python":
+        # pretty_python чистит пробелы сам: не трогает пустые строки и хвосты внутри """…"""
+        return pretty_python(code, _indent_str(use_tabs, indent_size), max_blank, trim), lang
+    res = pretty_format(code, lang, use_tabs, indent_size, sort_keys, tier)
+    res = tidy_whitespace(res.rstrip("\r\n"), max_blank_lines=max_blank, trim_trailing=trim)
+    return res, lang
+
+def pretty_diff_job(code: str, sel_lang: str, use_tabs: bool, indent_size: int, sort_keys: bool,
+                    max_blank: int, trim: bool, tier: str, old_out: str) -> tuple[str, str, list]:
+    """pretty_job и правки строк (line_hunks), превращающие прежний вывод old_out в результат."""
+    res, lang = pretty_job(code, sel_lang, use_tabs, indent_size, sort_keys, max_blank, trim, tier)
+    return res, lang, line_hunks(old_out, res)
+
+def pretty_range_job(src: str, out: str, code: str, start: int, end: int, lang: str, use_tabs: bool,
+                     indent_size: int, max_blank: int, tier: str = "auto",
+                     checkpoints: Optional[RangeCheckpoints] = None) -> Optional[tuple[int, int, str]]:
+    """
+    Форматирование блока вокруг выделения code[start:end] и правок с прошлого
+    pretty_job (src → out): (i, j, текст) — заменить out[i:j]; None — pretty_job целиком.
+    """
+    return pretty_range(src, out, code, start, end, lang, use_tabs, indent_size, max_blank, tier, checkpoints)
+
+def _in_thread(*_args) -> int:
+    # работа — миллисекунды над блоком, а пересылка в процесс — три копии
+    # текста; к тому же точки разбора (RangeCheckpoints) вкладки — в этом процессе
+    return 0
+pretty_range_job.input_size = _in_thread
+
+def minify_job(code: str, lang: str, max_blank: int, trim: bool, mangle: bool = False,
+               optimize: bool = False) -> tuple[str, str, tuple[int, int]]:
+    """
+    (результат, язык исходника, байт до и после в UTF-8). Время замеряет
+    вызывающий: результат кэшируется (memo), и время первого запуска
+    при повторе было бы неправдой.
+    """
+    res = minify_code(code, lang, mangle, optimize).rstrip("\r\n")
+    if not (mangle and lang == "JavaScript" or lang == "HTML/XML"):
+        # minify_js оставляет шаблонные строки `…` как есть, minify_html — <pre> и <textarea>
+        res = tidy_whitespace(res, max_blank_lines=max_blank, trim_trailing=trim)
+    return res, detect_language(code[:8192]), (utf8_size(code), utf8_size(res))
+
+def deobfuscate_job(text: str) -> Optional[tuple[str, str]]:
+    res = deobfuscate(text)
+    if res is None:
+        return None
+    return res, detect_language(res)
+
+# Чистые функции текста и значений контролов: результат кэшируется (memo.py)
+for _job in (strip_job, pretty_job, minify_job, deobfuscate_job):
+    _job.memo = True
+
+def obfuscate_job(code: str, lang: str, method: int, comment: str) -> tuple[str, str]:
+    if method == 0:
+        res = obfuscate_js_eval_base64(code); out_lang = "JavaScript"
+    elif method == 1:
+        res = obfuscate_hex_js(code); out_lang = "JavaScript"
+    else:
+        res = obfuscate_generic_base64(code, lang)
+        out_lang = "JavaScript" if lang in ("HTML/XML", "CSS") else lang
+    return append_comment(res, out_lang, comment), out_lang
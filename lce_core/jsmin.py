@@ -0,0 +1,523 @@
+"""
+Минификация JavaScript по токенам lex_js (тот же поток, что у pretty_js):
+комментарии и пробелы убираются, перевод строки остаётся только там, где
+без него изменится автоматическая вставка ';' (ASI), а локальные
+переменные и параметры функций получают короткие имена с учётом областей
+видимости. Глобальные имена, свойства и ключи объектов не меняются;
+функции с eval/with и все охватывающие их области не переименовываются.
+"""
+from __future__ import annotations
+import re
+from typing import Optional
+
+from .lexer import lex_js, WS, NL, LINE_COMMENT, BLOCK_COMMENT, STR, TMPL, REGEX, PUNCT, WORD, NUM, OP
+
+_RESERVED = frozenset("""
+    break case catch class const continue debugger default delete do else enum export extends finally
+    for function if import in instanceof new return switch throw try typeof var void while with
+""".split())
+_VALUE_WORDS = frozenset(("this", "super", "true", "false", "null"))
+# Контекстные слова могут быть именами, но не переименовываются и не выдаются как новые имена.
+_CONTEXTUAL = frozenset(("let", "static", "yield", "await", "async", "get", "set", "of", "from", "as",
+                         "arguments", "eval", "implements", "interface", "package", "private",
+                         "protected", "public"))
+_KEYWORDS = _RESERVED | _VALUE_WORDS | _CONTEXTUAL
+# После этих слов перевод строки всегда завершает инструкцию.
+_RESTRICTED = frozenset(("return", "break", "continue", "throw", "yield", "async", "let"))
+_OBJECT_AFTER = frozenset(("return", "typeof", "void", "delete", "in", "of", "instanceof", "new", "yield",
+                           "await", "case", "throw", "extends"))
+_MODIFIERS = frozenset(("get", "set", "async", "static"))
+
+_OPS = sorted("""
+    >>>= ... === !== **= <<= >>= >>> &&= ||= ??= => == != <= >= && || ?? ?. ** ++ -- += -= *= /= %=
+    &= |= ^= << >> = ! < > + - * / % & | ^ ~ ? .
+""".split(), key=len, reverse=True)
+_OP_RE = re.compile("|".join(r"\?\.(?!\d)" if o == "?." else re.escape(o) for o in _OPS))
+_NUM_RE = re.compile(r"0[xX][\da-fA-F_]+n?|0[oO][0-7_]+n?|0[bB][01_]+n?|\d[\d_]*\.?[\d_]*(?:[eE][+-]?\d[\d_]*)?n?")
+_WORD_RE = re.compile(r"[^\W\d][\w$]*|\$[\w$]*")
+
+_FIRST = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_$"
+_REST = _FIRST + "0123456789"
+
+
+def _short_name(k: int) -> str:
+    name = _FIRST[k % len(_FIRST)]
+    k //= len(_FIRST)
+    while k:
+        k -= 1
+        name += _REST[k % len(_REST)]
+        k //= len(_REST)
+    return name
+
+
+# ---------- Токены ----------
+
+def _push_ops(code: str, a: int, b: int, nl: bool, kinds: list, texts: list, nls: list):
+    """Серия слитных операторов code[a:b] — по длиннейшему совпадению из полного списка JS."""
+    while a < b:
+        m = _OP_RE.match(code, a)
+        end = m.end() if m and m.end() <= b else a + 1
+        kinds.append(OP); texts.append(code[a:end]); nls.append(nl)
+        nl = False
+        a = end
+
+
+def _tokens(code: str) -> tuple[list[int], list[str], list[bool]]:
+    """
+    Значимые токены lex_js: (виды, тексты, был ли перед токеном перевод строки).
+    Слитные операторы пересобираются по полному списку JS (?. ?? ... **),
+    числа — по грамматике JS: «0xFF» склеивается, «1+e» делится обратно.
+    """
+    kinds: list[int] = []
+    texts: list[str] = []
+    nls: list[bool] = []
+    nl = run_nl = False
+    run_a = run_b = skip_to = -1
+    for kind, a, b in lex_js(code):
+        if a < skip_to:
+            # продолжение числа, которое lex_js разрезал (0xFF, 0o777, 1_000)
+            if b > skip_to:
+                k2, t2, n2 = _tokens(code[skip_to:b])
+                kinds += k2; texts += t2; nls += n2
+            continue
+        if kind == OP and a == run_b:
+            run_b = b
+            continue
+        if run_b >= 0:
+            _push_ops(code, run_a, run_b, run_nl, kinds, texts, nls)
+            run_b = -1
+        if kind == OP:
+            run_a, run_b, run_nl = a, b, nl
+            nl = False
+        elif kind == WS:
+            pass
+        elif kind == NL:
+            nl = True
+        elif kind == LINE_COMMENT or kind == BLOCK_COMMENT:
+            if code.find("\n", a, b) >= 0:
+                nl = True
+        elif kind == NUM:
+            e = _NUM_RE.match(code, a).end()
+            kinds.append(NUM); texts.append(code[a:e]); nls.append(nl)
+            nl = False
+            if e < b:
+                k2, t2, n2 = _tokens(code[e:b])
+                kinds += k2; texts += t2; nls += n2
+            skip_to = e
+        else:
+            kinds.append(kind); texts.append(code[a:b]); nls.append(nl)
+            nl = False
+    if run_b >= 0:
+        _push_ops(code, run_a, run_b, run_nl, kinds, texts, nls)
+    return kinds, texts, nls
+
+
+def _brackets(kinds: list[int], texts: list[str]) -> Optional[list[int]]:
+    """Парные скобки: индекс закрывающей для открывающей и наоборот; None, если баланс нарушен."""
+    match = [-1] * len(texts)
+    stack: list[int] = []
+    for i, t in enumerate(texts):
+        if kinds[i] != PUNCT:
+            continue
+        if t in "([{":
+            stack.append(i)
+        elif t in ")]}":
+            if not stack or "([{".index(texts[stack[-1]]) != ")]}".index(t):
+                return None
+            j = stack.pop()
+            match[i], match[j] = j, i
+    return None if stack else match
+
+
+def _ends_expr(kind: int, t: str) -> bool:
+    if kind == WORD:
+        return t not in _RESERVED
+    return kind in (NUM, STR, TMPL, REGEX) or t in (")", "]", "}", "++", "--")
+
+
+def _continues(kind: int, t: str) -> bool:
+    """Может ли токен продолжать выражение с предыдущей строки (тогда ';' не вставляется)."""
+    if kind == PUNCT:
+        return t != "{"
+    if kind == OP:
+        return t not in ("!", "~", "++", "--")
+    return kind == TMPL or t in ("in", "instanceof")
+
+
+def _keeps_newline(kinds: list[int], texts: list[str], i: int) -> bool:
+    """Нужен ли перевод строки перед токеном i (если он был в исходнике) ради ASI."""
+    p, pk = texts[i - 1], kinds[i - 1]
+    if texts[i] in ("++", "--"):
+        return True
+    if pk == WORD:
+        if i > 1 and texts[i - 2] in (".", "?."):
+            return not _continues(kinds[i], texts[i])       # имя свойства, даже a.return
+        if p in _RESTRICTED:
+            return True
+    return _ends_expr(pk, p) and not _continues(kinds[i], texts[i])
+
+
+def _is_id(c: str) -> bool:
+    return c.isalnum() or c in "_$\\" or c > "\x7f"
+
+
+def _needs_space(pk: int, p: str, t: str) -> bool:
+    """Слипнутся ли соседние токены в другой токен (или комментарий) без пробела."""
+    a, b = p[-1], t[0]
+    if _is_id(a) and _is_id(b):
+        return True
+    if (a == "+" or a == "-") and b == a:
+        return True
+    if a == "/" and (b == "/" or b == "*"):
+        return True
+    if pk == REGEX and _is_id(b) or pk == NUM and b == ".":
+        return True
+    return a == "<" and t.startswith("!--") or a == "-" and b == ">"
+
+
+# ---------- Области видимости ----------
+
+class _Var:
+    __slots__ = ("name", "toks", "fixed", "new")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.toks: list[int] = []
+        self.fixed = False
+        self.new = name
+
+
+class _Scope:
+    __slots__ = ("parent", "is_func", "vars", "children", "unsafe", "through")
+
+    def __init__(self, parent: Optional["_Scope"], is_func: bool):
+        self.parent = parent
+        self.is_func = is_func
+        self.vars: dict[str, _Var] = {}
+        self.children: list[_Scope] = []
+        self.unsafe = False
+        # переменные внешних областей (и свободные имена), видимые изнутри этой
+        self.through: set = set()
+        if parent is not None:
+            parent.children.append(self)
+
+    def func_scope(self) -> "_Scope":
+        s = self
+        while not s.is_func:
+            s = s.parent
+        return s
+
+    def declare(self, name: str, i: int):
+        if name in _KEYWORDS:
+            return
+        v = self.vars.get(name)
+        if v is None:
+            v = self.vars[name] = _Var(name)
+        v.toks.append(i)
+
+
+class _Frame:
+    """
+    Открытая скобка (или тело стрелки без скобок). kind: block, obj, class,
+    paren, params, brack, arrow, heritage (от class до тела: имя класса-выражения
+    видно и в extends). binding — внутри шаблона деструктуризации или списка
+    параметров (имена объявляются в target), default — после '=' в нём;
+    decl — область для имён var/let/const, decl_init — идёт инициализатор;
+    value — у obj/class: позиция значения, а не ключа.
+    """
+    __slots__ = ("kind", "scope", "tern", "value", "binding", "target", "default", "decl", "decl_init")
+
+    def __init__(self, kind: str, scope: _Scope, target: Optional[_Scope] = None):
+        self.kind = kind
+        self.scope = scope
+        self.tern = 0
+        self.value = False
+        self.binding = target is not None
+        self.target = target
+        self.default = False
+        self.decl: Optional[_Scope] = None
+        self.decl_init = False
+
+
+def _mark_unsafe(s: Optional[_Scope]):
+    while s is not None:
+        s.unsafe = True
+        s = s.parent
+
+
+def _analyze(kinds: list[int], texts: list[str], nls: list[bool]) -> Optional[tuple[list, set]]:
+    """
+    Разбор областей видимости и выбор коротких имён. Возвращает новое имя для
+    каждого токена (None — без изменений) и индексы сокращённых свойств {a},
+    которые при переименовании раскрываются в {a:b}; None — разбор невозможен.
+    """
+    match = _brackets(kinds, texts)
+    if match is None or "\\" in texts:
+        return None
+    n = len(texts)
+    program = _Scope(None, True)
+    frames = [_Frame("block", program)]
+    refs: list[tuple[_Scope, str, int]] = []
+    shorthand: set[int] = set()
+    pending_body: Optional[_Scope] = None      # тело функции ждёт '{' или '=>'
+    pending_catch: Optional[_Scope] = None
+    pending_func: Optional[_Scope] = None      # параметры после 'function'
+    pending_class: Optional[tuple[_Scope, int]] = None
+    last_colon = ""
+    skip = -1
+
+    def stmt_start(i: int) -> bool:
+        if i == 0:
+            return True
+        p = texts[i - 1]
+        if p in (";", "{", "}", ")") and kinds[i - 1] == PUNCT or p in ("export", "default", "else", "do"):
+            return True
+        if p == ":":
+            return last_colon == "label"
+        return nls[i] and _keeps_newline(kinds, texts, i)
+
+    def object_start(i: int) -> bool:
+        pk, p = kinds[i - 1], texts[i - 1]
+        if pk == PUNCT:
+            return p in "([," or p == ":" and last_colon != "label"
+        if pk == OP:
+            return p not in ("++", "--", "=>")
+        return pk == WORD and p in _OBJECT_AFTER and not (p == "return" and nls[i])
+
+    for i in range(n):
+        k, t = kinds[i], texts[i]
+        f = frames[-1]
+        brk = i > 0 and nls[i] and _keeps_newline(kinds, texts, i)
+        while f.kind == "arrow" and (k == PUNCT and (t in ",;)]}" or t == ":" and f.tern == 0) or brk):
+            frames.pop()
+            f = frames[-1]
+        if brk:
+            f.decl = None
+            if f.kind == "class":
+                f.value = False
+        if pending_body is not None and t != "{" and t != "=>":
+            pending_body = None
+        if pending_catch is not None and t != "{":
+            pending_catch = None
+        scope = f.scope
+
+        if k == PUNCT:
+            if t == "(":
+                if pending_func is not None:
+                    fr = _Frame("params", pending_func, pending_func)
+                    pending_func = None
+                elif f.kind in ("obj", "class") and not f.value or texts[match[i] + 1:match[i] + 2] == ["=>"]:
+                    s = _Scope(scope, True)
+                    fr = _Frame("params", s, s)
+                elif i > 0 and texts[i - 1] == "catch" and kinds[i - 1] == WORD and texts[i - 2:i - 1] != ["."]:
+                    s = _Scope(scope, False)
+                    fr = _Frame("paren", s, s)
+                else:
+                    fr = _Frame("paren", scope)
+                frames.append(fr)
+            elif t == "[":
+                pattern = f.binding and not f.default and (f.kind != "obj" or f.value) \
+                    or f.decl is not None and not f.decl_init
+                frames.append(_Frame("brack", scope, (f.target if f.binding else f.decl) if pattern else None))
+            elif t == "{":
+                if pending_body is not None:
+                    fr = _Frame("block", pending_body)
+                    pending_body = None
+                elif pending_class is not None and pending_class[1] == len(frames):
+                    frames.pop()                    # extends … видит имя класса
+                    fr = _Frame("class", pending_class[0])
+                    pending_class = None
+                elif pending_catch is not None:
+                    fr = _Frame("block", pending_catch)
+                    pending_catch = None
+                elif f.binding and not f.default and (f.kind != "obj" or f.value):
+                    fr = _Frame("obj", scope, f.target)
+                elif f.decl is not None and not f.decl_init:
+                    fr = _Frame("obj", scope, f.decl)
+                elif i > 0 and object_start(i):
+                    fr = _Frame("obj", scope)
+                else:
+                    fr = _Frame("block", _Scope(scope, False))
+                frames.append(fr)
+            elif t in ")]}":
+                fr = frames.pop()
+                if fr.kind == "params":
+                    pending_body = fr.target
+                elif fr.kind == "paren" and fr.binding:
+                    pending_catch = fr.target
+            elif t == ",":
+                f.value = f.default = f.decl_init = False
+            elif t == ":":
+                if f.tern > 0:
+                    f.tern -= 1
+                    last_colon = "tern"
+                elif f.kind == "obj":
+                    f.value = True
+                    last_colon = "obj"
+                else:
+                    last_colon = "label"
+            elif t == ";":
+                f.decl = None
+                f.value = False
+            continue
+
+        if k == OP:
+            if t == "?":
+                f.tern += 1
+            elif t == "=":
+                if f.binding:
+                    f.default = True
+                if f.decl is not None:
+                    f.decl_init = True
+                if f.kind in ("obj", "class"):
+                    f.value = True
+            elif t == "..." and f.kind == "obj":
+                f.value = True                      # {...expr}: дальше выражение, не ключ
+            elif t == "=>" and pending_body is not None and texts[i + 1:i + 2] != ["{"]:
+                frames.append(_Frame("arrow", pending_body))
+                pending_body = None
+            continue
+
+        if k == TMPL:
+            # имена внутри ${…} не переименовываются: привязываем их как есть
+            j = t.find("${")
+            if j >= 0:
+                refs.extend((scope, w, -1) for w in _WORD_RE.findall(t, j) if w not in _KEYWORDS)
+            continue
+
+        if k != WORD or i == skip:
+            continue
+        prev = texts[i - 1] if i else ""
+        nxt = texts[i + 1] if i + 1 < n else ""
+        if prev in (".", "?.", "#"):
+            continue
+        if f.kind in ("obj", "class") and not f.value:
+            if t in _MODIFIERS and (kinds[i + 1:i + 2] in ([WORD], [STR], [NUM]) or nxt in ("[", "*", "#", "{")):
+                continue
+            if f.kind == "class" or nxt in (":", "("):
+                continue
+            shorthand.add(i)
+        elif t in _KEYWORDS:
+            if t == "var":
+                f.decl, f.decl_init = scope.func_scope(), False
+            elif t == "const" or t == "let" and (kinds[i + 1:i + 2] == [WORD] or nxt in ("[", "{")):
+                f.decl, f.decl_init = scope, False
+            elif t == "function":
+                s = _Scope(scope, True)
+                j = i + 2 if nxt == "*" else i + 1
+                if j < n and kinds[j] == WORD:
+                    if stmt_start(i - 1 if prev == "async" else i):
+                        scope.func_scope().declare(texts[j], j)
+                    else:
+                        s.declare(texts[j], j)
+                    skip = j
+                pending_func = s
+            elif t == "class":
+                s = _Scope(scope, False)
+                if kinds[i + 1:i + 2] == [WORD] and nxt != "extends":
+                    (scope if stmt_start(i) else s).declare(nxt, i + 1)
+                    skip = i + 1
+                frames.append(_Frame("heritage", s))
+                pending_class = (s, len(frames))
+            elif t in ("with", "eval"):
+                _mark_unsafe(scope)
+            elif t in ("break", "continue"):
+                if kinds[i + 1:i + 2] == [WORD] and not nls[i + 1]:
+                    skip = i + 1
+            elif t in ("in", "of") and f.decl is not None and not f.decl_init:
+                f.decl = None
+            continue
+        if nxt == "=>":
+            s = _Scope(scope, True)
+            s.declare(t, i)
+            pending_body = s
+        elif nxt == ":" and f.kind == "block" and f.tern == 0 and prev != "case":
+            pass                                    # метка
+        elif f.binding and not f.default:
+            f.target.declare(t, i)
+        elif f.decl is not None and not f.decl_init:
+            f.decl.declare(t, i)
+        else:
+            refs.append((scope, t, i))
+
+    return _assign(program, refs, n), shorthand
+
+
+def _assign(program: _Scope, refs: list, n: int) -> list:
+    """Связывает ссылки с объявлениями и раздаёт короткие имена сверху вниз."""
+    free: set[str] = set()
+    for scope, name, i in refs:
+        s = scope
+        path = []
+        while s is not None and name not in s.vars:
+            path.append(s)
+            s = s.parent
+        if s is None:
+            free.add(name)
+            key = name
+        else:
+            key = s.vars[name]
+            if i >= 0:
+                key.toks.append(i)
+            else:
+                key.fixed = True
+        for x in path:
+            x.through.add(key)
+
+    scopes = [program]
+    for s in scopes:
+        scopes.extend(s.children)
+    avoid = set(_KEYWORDS) | free
+    for s in scopes:
+        for v in s.vars.values():
+            if s is program or s.unsafe or v.fixed:
+                v.fixed = True
+                avoid.add(v.name)
+
+    names: list[Optional[str]] = [None] * n
+    for s in scopes:                            # родители раньше детей
+        taken = {x.new if isinstance(x, _Var) else x for x in s.through}
+        k = 0
+        for v in sorted((v for v in s.vars.values() if not v.fixed), key=lambda v: -len(v.toks)):
+            while True:
+                name = _short_name(k)
+                k += 1
+                if name not in taken and name not in avoid:
+                    break
+            v.new = name
+            for i in v.toks:
+                names[i] = name
+    return names
+
+
+def minify_js(code: str, mangle: bool = True) -> str:
+    """
+    Минифицированный JS. mangle — переименовать локальные переменные и
+    параметры; если скобки не сбалансированы или в именах есть \\u-escape,
+    имена остаются прежними.
+    """
+    head = ""
+    if code.startswith("#!"):
+        k = code.find("\n")
+        head, code = (code, "") if k < 0 else (code[:k + 1], code[k + 1:])
+    kinds, texts, nls = _tokens(code)
+    names: list = []
+    shorthand: set = set()
+    if mangle:
+        res = _analyze(kinds, texts, nls)
+        if res is not None:
+            names, shorthand = res
+    out: list[str] = []
+    pk, p = 0, ""
+    for i, t in enumerate(texts):
+        nm = names[i] if names else None
+        if nm is not None and nm != t:
+            t = f"{t}:{nm}" if i in shorthand else nm
+        if p:
+            if nls[i] and _keeps_newline(kinds, texts, i):
+                out.append("\n")
+            elif _needs_space(pk, p, t):
+                out.append(" ")
+        out.append(t)
+        pk, p = kinds[i], t
+    return head + "".join(out)
@@ -0,0 +1,409 @@
+"""
+JSON: разбор, форматирование и минификация. Если установлен orjson — через
+него (разбор и вывод в разы быстрее стандартного json; отступ в 2 пробела
+переводится в заданный). Всё, что orjson не принимает — NaN/Infinity, целые
+длиннее 64 бит, одиночные суррогаты, — идёт через стандартный json,
+так что принимаемый вход от наличия orjson не зависит. Вывод тоже: если
+в нём есть числа, которые orjson пишет иначе, чем repr (1e16 вместо
+1e+16, 0.00001 вместо 1e-05), документ выводится через json. orjson
+импортируется при первом разборе, не при импорте модуля.
+
+JSON Lines обрабатываются потоком по строкам, пачками в пуле процессов.
+Документы, которые не стоит разбирать в объекты целиком (выгрузки в сотни
+МБ), переформатируются потоком по токенам — JsonReformatter.
+"""
+from __future__ import annotations
+import json, re
+from collections import deque
+
+from .strip import STREAM_CHUNK, _stream_file, _source_size
+
+JSONL_BATCH = 2000  # строк JSON Lines в одном задании пула
+SORT_LIMIT = 1 << 20  # JsonReformatter: поддеревья длиннее (символов вывода) не сортируются
+
+_INDENT2 = re.compile(rb"^(?:  )+", re.M)
+_REINDENT_DEPTH = 32  # глубже — отступ переводится regex'ом, а не проходами replace
+# orjson молча читает целые за пределами int64/uint64 как float, а такое число
+# выводится с порядком e18 и больше. Ищем такой порядок в выводе (заодно
+# попадутся настоящие большие float и похожий текст в строках — это лишь
+# откат на стандартный json, результат тот же)
+_BIG_EXP = re.compile(rb"e(?:1[89]|[2-9]\d|\d{3})")
+# Где вывод orjson может разойтись с json: любой порядок (у json — «e+16»,
+# «e-07») и дробь с четырьмя нулями после точки (json пишет её с порядком).
+# Большие целые, прочитанные как float, тоже выводятся с порядком.
+# Два шаблона с буквы, а не один с альтернативой: так re ищет по литере (в ~20 раз быстрее).
+_EXP_NUM = re.compile(rb"e(?<=\de)")
+_SMALL_FRAC = re.compile(rb"0\.0000(?<![\d.]0\.0000)")
+_orjson_mod = None
+
+
+def _orjson():
+    """Модуль orjson или None; импорт — при первом вызове (~15 мс, не в бюджет импорта)."""
+    global _orjson_mod
+    if _orjson_mod is None:
+        try:
+            import orjson
+        except ImportError:  # необязательная зависимость: pip install orjson
+            orjson = False
+        _orjson_mod = orjson
+    return _orjson_mod or None
+
+
+def backend() -> str:
+    """«orjson ВЕРСИЯ» или «json» — чем разбирается и выводится JSON."""
+    orjson = _orjson()
+    return f"orjson {orjson.__version__}" if orjson is not None else "json"
+
+
+def __getattr__(name: str):
+    if name == "BACKEND":
+        return "orjson" if _orjson() is not None else "json"
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _orjson_dumps(code: str, sort_keys: bool, indent2: bool) -> bytes | None:
+    """Вывод orjson (компактный или с отступом в 2 пробела) или None — тогда нужен json."""
+    orjson = _orjson()
+    if orjson is None:
+        return None
+    opt = (orjson.OPT_SORT_KEYS if sort_keys else 0) | (orjson.OPT_INDENT_2 if indent2 else 0)
+    try:
+        out = orjson.dumps(orjson.loads(code), option=opt)
+    except (ValueError, TypeError):
+        return None
+    return None if _EXP_NUM.search(out) or _SMALL_FRAC.search(out) else out
+
+
+def _reindent(out: bytes, step: bytes) -> bytes:
+    """
+    Отступ в 2 пробела (вывод orjson) → step. В выводе JSON строки не
+    переносятся, так что ведущие пробелы — всегда отступ, а сырых табов нет
+    (в строках они экранированы): пары пробелов заменяются табами от
+    глубоких уровней к мелким — по проходу bytes.replace на уровень, — потом
+    таб заменяется на step. Для очень глубоких документов — regex по строкам.
+    """
+    depth = 1
+    while depth <= _REINDENT_DEPTH and b"\n" + b"  " * depth in out:
+        depth += 1
+    if depth > _REINDENT_DEPTH:
+        return _INDENT2.sub(lambda m: step * (len(m.group()) >> 1), out)
+    for k in range(depth - 1, 0, -1):
+        out = out.replace(b"\n" + b"  " * k, b"\n" + b"\t" * k)
+    return out if step == b"\t" else out.replace(b"\t", step)
+
+
+def loads(s: str):
+    orjson = _orjson()
+    if orjson is not None:
+        try:
+            obj = orjson.loads(s)
+        except ValueError:
+            pass
+        else:
+            if not _BIG_EXP.search(orjson.dumps(obj)):
+                return obj
+    return json.loads(s)
+
+
+def minify_json(code: str, sort_keys: bool = False) -> str:
+    """Компактный JSON; ValueError, если это не JSON."""
+    out = _orjson_dumps(code, sort_keys, False)
+    if out is not None:
+        return out.decode()
+    return json.dumps(json.loads(code), separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=False)
+
+
+def format_json(code: str, indent: str = "    ", sort_keys: bool = False) -> str:
+    """JSON с отступом indent (строка: пробелы или таб); ValueError, если это не JSON."""
+    out = _orjson_dumps(code, sort_keys, True)
+    if out is not None:
+        if indent != "  ":
+            out = _reindent(out, indent.encode())
+        return out.decode()
+    return json.dumps(json.loads(code), indent=indent, sort_keys=sort_keys, ensure_ascii=False)
+
+
+# ---------- Потоковое форматирование по токенам ----------
+
+# пробелы перед токеном не отдельный токен (их в отформатированном JSON столько
+# же, сколько токенов); группа 1 — токен: строка (группа 2 пуста — строка не
+# закрыта до конца куска) | скобка | , | : | число, true/false/null и прочее
+_JSON_TOKEN = re.compile(r'[ \t\r\n]*("(?:[^"\\]|\\.)*("?)|[{}\[\],:]|[^ \t\r\n{}\[\],:"]+)', re.S)
+_JSON_WS = " \t\r\n"
+_STR_REST = re.compile(r'(?:[^"\\]|\\.)*("?)', re.S)
+
+
+class JsonReformatter:
+    """
+    Форматирование (indent — строка отступа) или минификация (indent=None)
+    JSON без построения объектов: текст подаётся кусками (feed), память не
+    зависит от размера документа, время линейно. Строки и числа копируются
+    как есть, меняются только пробелы вне строк; вывод совпадает с
+    format_json/minify_json с точностью до записи чисел и \\u-экранирования.
+    Вход не проверяется: у битого JSON переформатируются те же токены.
+
+    sort_keys: поддерево (объект или массив), чей вывод не длиннее
+    sort_limit символов, по закрытии разбирается и выводится заново с
+    сортировкой ключей; в более длинных ключи остаются в порядке входа,
+    а вложенные небольшие поддеревья сортируются. Память — до sort_limit
+    плюс кусок.
+    """
+
+    def __init__(self, indent: str | None = None, sort_keys: bool = False, sort_limit: int = SORT_LIMIT):
+        self.indent = indent
+        self.sort_keys = sort_keys
+        self.sort_limit = sort_limit
+        self.parts: list[str] = []  # вывод; при sort_keys в нём же ждут открытые поддеревья
+        self.base = 0               # абсолютный номер parts[0] (сколько частей уже отдано)
+        self.stack: list = []       # sort_keys: [номер части «{»/«[», глубина, [(номер, глубина) детей]]
+        self.depth = 0
+        self.pending = False        # indent: после { или [ перенос строки ещё не выведен
+        self.last = ""              # "v" — конец значения, "o" — открывающая скобка, "," или ":"
+        self.ws = False             # перед следующим токеном были пробелы
+        self.in_str = False         # кусок кончился внутри строки
+        self.carry = ""             # одиночный \\ в конце куска внутри строки
+        self._pads = ["\n"]
+
+    def feed(self, text: str) -> str:
+        """Обрабатывает очередной кусок; возвращает готовую часть результата."""
+        s = self.carry + text
+        self.carry = ""
+        self._run(s)
+        return self._flush()
+
+    def close(self) -> str:
+        """Конец входа; незакрытые скобки и строки остаются незакрытыми."""
+        if self.carry:
+            self.parts.append(self.carry)
+            self.carry = ""
+        while self.stack:
+            self._sort_children(self.stack.pop()[2])
+        if self.last:
+            self.parts.append("\n")
+        return self._flush()
+
+    def _pad(self, depth: int) -> str:
+        pads = self._pads
+        while len(pads) <= depth:
+            pads.append("\n" + self.indent * len(pads))
+        return pads[depth]
+
+    def _run(self, s: str):
+        parts = self.parts
+        emit = parts.append
+        pos = 0
+        if self.in_str:
+            m = _STR_REST.match(s)
+            emit(m.group())
+            if not m.group(1):
+                self.carry = s[m.end():]
+                return
+            self.in_str = False
+            self.last = "v"
+            pos = m.end()
+        ind = self.indent
+        pads = self._pads
+        sort = self.sort_keys
+        stack = self.stack
+        depth, pending, last, ws = self.depth, self.pending, self.last, self.ws
+        for m in _JSON_TOKEN.finditer(s, pos):
+            t = m.group(1)
+            c = t[0]
+            if c in "}]":
+                if depth:
+                    depth -= 1
+                if pending or ind is None:
+                    emit(c)
+                    pending = False
+                else:
+                    emit((pads[depth] if depth < len(pads) else self._pad(depth)) + c)
+                last = "v"
+                if stack and stack[-1][1] == depth:
+                    self._close_subtree(depth)
+            elif c == "," or c == ":":
+                if pending:
+                    emit(pads[depth] if depth < len(pads) else self._pad(depth))
+                    pending = False
+                if ind is None:
+                    emit(c)
+                elif c == ",":
+                    emit("," + (pads[depth] if depth < len(pads) else self._pad(depth)))
+                else:
+                    emit(": ")
+                last = c
+            else:
+                if pending:
+                    emit(pads[depth] if depth < len(pads) else self._pad(depth))
+                    pending = False
+                elif last == "v" and (ws or m.start(1) > m.start()):
+                    emit(" " if depth else "\n")  # значения подряд: несколько документов или битый JSON
+                if c == "{" or c == "[":
+                    if sort:
+                        stack.append([self.base + len(parts), depth, []])
+                    emit(c)
+                    depth += 1
+                    pending = ind is not None
+                    last = "o"
+                else:
+                    emit(t)
+                    last = "v"
+                    if c == '"' and not m.group(2):
+                        self.in_str = True
+                        self.carry = s[m.end():]
+                        break
+            ws = False
+        else:
+            # пробелы в конце куска достаются следующему
+            if s and s[-1] in _JSON_WS:
+                ws = True
+        self.depth, self.pending, self.last, self.ws = depth, pending, last, ws
+
+    def _sorted(self, text: str, depth: int) -> str:
+        try:
+            if self.indent is None:
+                return minify_json(text, True)
+            res = format_json(text, self.indent, True)
+        except (ValueError, RecursionError):
+            return text
+        return res.replace("\n", self._pad(depth)) if depth else res
+
+    def _sort_children(self, children):
+        parts, base = self.parts, self.base
+        for idx, depth in children:
+            parts[idx - base] = self._sorted(parts[idx - base], depth)
+
+    def _close_subtree(self, depth: int):
+        """sort_keys: поддерево закрылось — склеить в одну часть; сортировать его или отложить до родителя."""
+        idx, _, children = self.stack.pop()
+        i = idx - self.base
+        parts = self.parts
+        if sum(map(len, parts[i:])) > self.sort_limit:
+            self._sort_children(children)
+            return
+        text = "".join(parts[i:])
+        del parts[i:]
+        if self.stack:
+            # родитель ещё может уложиться в предел — тогда он отсортирует всё разом
+            parts.append(text)
+            self.stack[-1][2].append((idx, depth))
+        else:
+            parts.append(self._sorted(text, depth))
+
+    def _flush(self) -> str:
+        parts, stack = self.parts, self.stack
+        while stack and sum(map(len, parts[stack[0][0] - self.base:])) > self.sort_limit:
+            self._sort_children(stack.pop(0)[2])
+        k = stack[0][0] - self.base if stack else len(parts)
+        done = "".join(parts[:k])
+        del parts[:k]
+        self.base += k
+        return done
+
+
+def format_json_stream(src, dst, indent: str | None = None, sort_keys: bool = False,
+                       chunk_size: int = STREAM_CHUNK, progress=None,
+                       sort_limit: int = SORT_LIMIT) -> tuple[int, int]:
+    """
+    JSON из текстового потока src в dst через JsonReformatter кусками по
+    chunk_size символов: indent=None — минификация. progress(символов_прочитано)
+    — после каждого куска. Возвращает (символов на входе, символов на выходе).
+    """
+    fmt = JsonReformatter(indent, sort_keys, sort_limit)
+    n_in = n_out = 0
+    while True:
+        text = src.read(chunk_size)
+        if not text:
+            break
+        n_in += len(text)
+        res = fmt.feed(text)
+        dst.write(res); n_out += len(res)
+        if progress is not None:
+            progress(n_in)
+    res = fmt.close()
+    dst.write(res); n_out += len(res)
+    return n_in, n_out
+
+
+def format_json_file(src_path: str, dst_path: str, indent: str | None = None,
+                     sort_keys: bool = False) -> tuple[int, int]:
+    """format_json_stream для файлов; dst_path может совпадать с src_path."""
+    return _stream_file(src_path, dst_path, lambda src, dst: format_json_stream(src, dst, indent, sort_keys))
+
+
+# ---------- JSON Lines ----------
+
+def _jsonl_batch(lines: list[str], indent, sort_keys: bool) -> tuple[str, int]:
+    """Пачка строк JSON Lines: (текст результата, число строк не-JSON — они остаются как были)."""
+    out = []
+    bad = 0
+    for ln in lines:
+        body = ln.strip()
+        if body:
+            try:
+                ln = minify_json(body, sort_keys) if indent is None else format_json(body, indent, sort_keys)
+            except (ValueError, RecursionError):
+                bad += 1
+        out.append(ln.rstrip("\r\n"))
+    out.append("")
+    return "\n".join(out), bad
+
+
+def format_jsonl_stream(src, dst, indent=None, sort_keys: bool = False, workers: int = 1,
+                        batch: int = JSONL_BATCH, progress=None) -> tuple[int, int]:
+    """
+    JSON Lines из потока src в dst: каждая запись минифицируется (indent=None —
+    результат остаётся JSON Lines) или форматируется с отступом indent.
+    Пустые строки и строки не-JSON выводятся как были. При workers > 1 пачки
+    по batch строк идут в пул процессов; в работе не больше 2*workers пачек,
+    порядок строк сохраняется. progress(строк_прочитано) — после каждой пачки.
+    Возвращает (строк, строк не-JSON).
+    """
+    n_lines = n_bad = 0
+
+    def batches():
+        nonlocal n_lines
+        buf = []
+        for ln in src:
+            buf.append(ln)
+            if len(buf) >= batch:
+                n_lines += len(buf)
+                yield buf
+                buf = []
+        if buf:
+            n_lines += len(buf)
+            yield buf
+
+    def write(res: tuple[str, int]):
+        nonlocal n_bad
+        dst.write(res[0])
+        n_bad += res[1]
+        if progress is not None:
+            progress(n_lines)
+
+    if workers <= 1:
+        for b in batches():
+            write(_jsonl_batch(b, indent, sort_keys))
+        return n_lines, n_bad
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        window: deque = deque()
+        for b in batches():
+            window.append(ex.submit(_jsonl_batch, b, indent, sort_keys))
+            if len(window) >= 2 * workers:
+                write(window.popleft().result())
+        while window:
+            write(window.popleft().result())
+    return n_lines, n_bad
+
+
+def format_jsonl_file(src_path: str, dst_path: str, indent=None, sort_keys: bool = False,
+                      workers: int = 1) -> tuple[int, int]:
+    """format_jsonl_stream для файлов; dst_path может совпадать с src_path."""
+    return _stream_file(src_path, dst_path,
+                        lambda src, dst: format_jsonl_stream(src, dst, indent, sort_keys, workers))
+
+
+# для pool.run_engine: объём работы — размер файла
+format_json_file.input_size = _source_size
+format_jsonl_file.input_size = _source_size
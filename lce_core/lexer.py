@@ -0,0 +1,358 @@
+"""
+Общий лексер. Один проход по тексту даёт поток токенов (вид, начало,
+конец) — смещения в исходной строке, без копий подстрок.
+На нём построены удаление комментариев, минификация, pretty_js и
+декодирование строк при деобфускации.
+
+Правила строк/комментариев повторяют прежние автоматы: строки '…' и "…"
+с экранированием обратной косой, шаблоны `…${…}…` со счётчиком глубины
+(вложенный ` внутри ${} — часть шаблона), тройные кавычки Python без
+экранирования, незакрытые строки и комментарии тянутся до конца текста.
+"""
+from __future__ import annotations
+import re
+from functools import cached_property
+
+CODE, STR, TMPL, LINE_COMMENT, BLOCK_COMMENT, WS, NL, WORD, NUM, OP, PUNCT, REGEX, OTHER = range(13)
+STRINGS = (STR, TMPL)
+COMMENTS = (LINE_COMMENT, BLOCK_COMMENT)
+
+Token = tuple  # (kind, start, end)
+
+
+def _none_of(chars: str) -> str:
+    """
+    Класс «любой символ, кроме chars» в виде диапазонов: sre проверяет
+    [^abc] перебором литералов, а диапазоны — в разы быстрее.
+    """
+    parts, lo = [], 0
+    for c in sorted(set(map(ord, chars))):
+        if lo < c:
+            parts.append((lo, c - 1))
+        lo = c + 1
+    parts.append((lo, 0x10FFFF))
+    return "[" + "".join(f"\\U{a:08x}" if a == b else f"\\U{a:08x}-\\U{b:08x}" for a, b in parts) + "]"
+
+
+def _quoted_body_re(q: str) -> str:
+    body = _none_of(q + "\\")
+    return rf"{body}*(?:\\[\s\S]{body}*)*"
+
+
+def _quoted_re(q: str) -> str:
+    """'…' с экранированием; незакрытая строка (и одиночная \\ в конце) — до конца текста."""
+    e = re.escape(q)
+    return rf"{e}{_quoted_body_re(q)}(?:{e}|[\s\S]*)"
+
+
+class _Lazy(dict):
+    """
+    Регулярки по ключу, компилируются при первом обращении: класс _none_of
+    (диапазоны до U+10FFFF) sre собирает несколько миллисекунд, а импорт
+    лексера не должен платить за языки, которые не понадобятся.
+    """
+    __slots__ = ("make",)
+
+    def __init__(self, make):
+        super().__init__()
+        self.make = make
+
+    def __missing__(self, key):
+        rx = self[key] = re.compile(self.make(key))
+        return rx
+
+
+_QUOTED = _Lazy(_quoted_re)
+# Тело строки без открывающей кавычки: до закрывающей кавычки или до конца текста
+QUOTED_BODY = _Lazy(_quoted_body_re)
+TMPL_STOP = re.compile(r"[\\`$}]")
+# Шаблон без вложенных ${…${…}…}: разбирается одним совпадением, иначе — счётчик глубины
+_TMPL_FLAT_RE = ("`(?:" + _none_of("`\\$") + r"+|\\[\s\S]|\$(?!\{)"
+                 r"|\$\{(?:" + _none_of("\\$}") + r"+|\\[\s\S]|\$(?!\{))*+\})*+`")
+_RX = _Lazy({
+    "tmpl_flat": _TMPL_FLAT_RE,
+    "css": "|".join((_quoted_re('"'), _quoted_re("'"), "[{};]", _none_of("{};'\"") + "+")),
+}.__getitem__)
+
+
+def scan_quoted(s: str, i: int, n: int) -> int:
+    """'…' или "…" с экранированием; конец — за закрывающей кавычкой."""
+    return _QUOTED[s[i]].match(s, i).end()
+
+
+def scan_template(s: str, i: int, n: int) -> int:
+    m = _RX["tmpl_flat"].match(s, i)
+    if m is not None:
+        return m.end()
+    j = i + 1; depth = 0
+    stop = TMPL_STOP.search
+    while True:
+        m = stop(s, j)
+        if m is None:
+            return n
+        j = m.start()
+        c = s[j]
+        if c == '\\':
+            j += 2; continue
+        if c == '`':
+            if depth == 0:
+                return j + 1
+        elif c == '$':
+            if j + 1 < n and s[j + 1] == '{':
+                depth += 1; j += 2; continue
+        elif depth > 0:
+            depth -= 1
+        j += 1
+
+
+def scan_py_string(s: str, i: int, n: int) -> int:
+    q = s[i]
+    if s.startswith(q * 3, i):
+        k = s.find(q * 3, i + 3)
+        return n if k < 0 else k + 3
+    return scan_quoted(s, i, n)
+
+
+def scan_line_comment(s: str, i: int, n: int) -> int:
+    """До перевода строки включительно."""
+    k = s.find('\n', i)
+    return n if k < 0 else k + 1
+
+
+def scan_block_comment(s: str, i: int, n: int) -> int:
+    k = s.find('*/', i + 2)
+    return n if k < 0 else k + 2
+
+
+def quoted_closed(s: str, a: int, b: int) -> bool:
+    """Закрыта ли строка-токен s[a:b] своей кавычкой (а не обрезана концом текста)."""
+    if b < len(s):
+        return True
+    if b - a < 2 or s[b - 1] != s[a]:
+        return False
+    k = b - 2
+    while k > a and s[k] == '\\':
+        k -= 1
+    return (b - 2 - k) % 2 == 0
+
+
+class LexSpec:
+    """
+    Набор правил одного языка, собранный в одно регулярное выражение:
+    альтернативы «строка | шаблон | комментарий», каждая в своей группе.
+    Поиск прыгает прямо к следующему токену, код между ними не перебирается
+    посимвольно в Python. Шаблон `…` отдаётся scan_template (счётчик ${}).
+    Выражения компилируются при первом использовании.
+    """
+    def __init__(self, *, quotes: str = "'\"", backtick: str = "", c_line=False, c_block=False,
+                 hash_line=False, python=False):
+        alts: list[tuple[int, str, str]] = []  # (вид, первый символ, выражение)
+        for q in quotes:
+            if python:
+                e = re.escape(q * 3)
+                alts.append((STR, q, rf"{e}(?:[\s\S]*?{e}|[\s\S]*)"))
+            alts.append((STR, q, _quoted_re(q)))
+        if backtick == "template":
+            alts.append((TMPL, "`", "`"))
+        elif backtick == "string":
+            alts.append((STR, "`", _quoted_re("`")))
+        if c_line:
+            alts.append((LINE_COMMENT, "/", r"//[^\n]*\n?"))
+        if c_block:
+            alts.append((BLOCK_COMMENT, "/", r"/\*(?:[\s\S]*?\*/|[\s\S]*)"))
+        if hash_line:
+            alts.append((LINE_COMMENT, "#", r"#[^\n]*\n?"))
+        leads = "".join(dict.fromkeys(c for _, c, _ in alts))
+        lead = re.escape(leads)
+        self.python = python
+        # kinds[номер группы] -> вид токена
+        self.kinds = (None,) + tuple(k for k, _, _ in alts)
+        self._pattern = f"(?=[{lead}])(?:" + "|".join(f"({rx})" for _, _, rx in alts) + ")"
+
+        # Для удаления комментариев: группа 1 — код вместе со строками и
+        # простыми шаблонами до следующего комментария, дальше — сам стоп-токен
+        # (шаблон с вложенными ${} тоже стоп: его разбирает scan_template).
+        keep = [rx for k, _, rx in alts if k == STR]
+        if backtick == "template":
+            keep.append(_TMPL_FLAT_RE)
+        if c_line or c_block:
+            keep.append("/(?!" + "|".join((["/"] if c_line else []) + ([r"\*"] if c_block else [])) + ")")
+        plain = _none_of(leads) + "*+"
+        stops = [(k, rx) for k, _, rx in alts if k != STR]
+        self.chunk_kinds = (None, CODE) + tuple(k for k, _ in stops)
+        body = f"{plain}(?:(?:{'|'.join(keep)}){plain})*+" if keep else plain
+        self._chunk = f"({body})(?:" + "".join(f"({rx})|" for _, rx in stops) + r"\Z)"
+
+    @cached_property
+    def pattern(self) -> re.Pattern:
+        return re.compile(self._pattern)
+
+    @cached_property
+    def chunk(self) -> re.Pattern:
+        return re.compile(self._chunk)
+
+
+# Наборы правил по языкам вкладки «Комментарии» / минификации
+SPECS = {
+    # в CSS нет строчных комментариев: «//» бывает в url(http://…)
+    "CSS":        LexSpec(c_block=True),
+    "JSON":       LexSpec(c_line=True, c_block=True),
+    "JavaScript": LexSpec(backtick="template", c_line=True, c_block=True),
+    "PHP":        LexSpec(backtick="template", c_line=True, c_block=True, hash_line=True),
+    "Python":     LexSpec(python=True, hash_line=True),
+    "Plain":      LexSpec(c_line=True, c_block=True),
+}
+# Строки и комментарии PHP-кода при деобфускации
+PHP_STRINGS_SPEC = LexSpec(c_line=True, c_block=True)
+
+
+def css_tokens(s: str) -> list[str]:
+    """Токены CSS (pretty_css, cssmin): строка | «{», «}» или «;» | кусок кода без них."""
+    return _RX["css"].findall(s)
+
+
+def spec_for(lang: str) -> LexSpec:
+    return SPECS.get(lang, SPECS["Plain"])
+
+
+def lex(s: str, spec: LexSpec) -> list[Token]:
+    """Строки/шаблоны/комментарии по spec, всё между ними — токены CODE."""
+    toks: list[Token] = []
+    append = toks.append
+    search = spec.pattern.search
+    kinds = spec.kinds
+    n = len(s)
+    start = 0
+    m = search(s)
+    while m is not None:
+        i = m.start()
+        kind = kinds[m.lastindex]
+        end = scan_template(s, i, n) if kind == TMPL else m.end()
+        if start < i:
+            append((CODE, start, i))
+        append((kind, i, end))
+        start = end
+        m = search(s, end)
+    if start < n:
+        append((CODE, start, n))
+    return toks
+
+
+# ---------- Подробный поток для форматирования JS/PHP ----------
+
+JS_OP_CHARS = frozenset("=!<>+-*/%&|^~?.")
+JS_OP_TAIL = frozenset("=!<>+-*/%&|^~?.:")
+JS_OPS = (">>>=", ">>>", ">>=", "<<=", "===", "!==", "&&", "||", ">>", "<<", "+=", "-=", "*=", "/=",
+          "%=", "&=", "|=", "^=", "=>")
+JS_PUNCT = frozenset("()[]{};,:")
+JS_KEYWORD_STARTERS = frozenset(("return", "case", "throw", "delete", "typeof", "instanceof", "in", "of",
+                                 "new", "do", "else"))
+JS_REGEX_STARTERS = frozenset("({[=:+-*/%&|^!~?,;<>")
+_NUM_TAIL = frozenset("._xXbBeE+-")
+
+
+def js_resets_word(kind: int, s: str, a: int, last_word: str) -> bool:
+    """Сбрасывает ли токен «последнее слово» (нужно для регэкспов, case:, if ( …)."""
+    if kind in (STR, TMPL, REGEX, NUM, OP):
+        return True
+    if kind == PUNCT:
+        c = s[a]
+        return c in "){};," or (c == ":" and last_word == "case")
+    return False
+
+
+def _match_op(s: str, i: int, n: int) -> int:
+    j = i + 1
+    # длиннейший оператор — 4 символа (">>>="), дальше смотреть незачем
+    while j < n and j - i < 4 and s[j] in JS_OP_TAIL:
+        j += 1
+    op = s[i:j]
+    for cand in JS_OPS:
+        if op.startswith(cand):
+            return i + len(cand)
+    if op.startswith("++") or op.startswith("--"):
+        return i + 2
+    return i + 1
+
+
+def _scan_regex(s: str, i: int, n: int) -> int:
+    j = i + 1; esc = False; in_class = False
+    while j < n:
+        ch = s[j]
+        if esc: esc = False
+        elif ch == "\\": esc = True
+        elif ch == "[": in_class = True
+        elif ch == "]": in_class = False
+        elif ch == "/" and not in_class:
+            j += 1; break
+        j += 1
+    while j < n and s[j].isalpha():
+        j += 1
+    return j
+
+
+def lex_js(s: str) -> list[Token]:
+    """
+    Поток токенов JS/PHP для pretty_js: пробелы, переводы строк, слова,
+    числа, операторы (с тем же жадным выбором), пунктуация, строки,
+    шаблоны, комментарии и регэкспы. Регэксп отличается от деления по
+    последнему непробельному символу и последнему слову перед '/'.
+    """
+    toks: list[Token] = []
+    i, n = 0, len(s)
+    last_nws = ""
+    last_word = ""
+    while i < n:
+        c = s[i]
+        if c == " " or c == "\t":
+            j = i + 1
+            while j < n and (s[j] == " " or s[j] == "\t"):
+                j += 1
+            toks.append((WS, i, j)); i = j
+            continue
+        if c == "\n":
+            toks.append((NL, i, i + 1)); i += 1
+            continue
+        kind = None
+        if c == "/" and i + 1 < n:
+            nx = s[i + 1]
+            if nx == "/":
+                kind, j = LINE_COMMENT, scan_line_comment(s, i, n)
+            elif nx == "*":
+                kind, j = BLOCK_COMMENT, scan_block_comment(s, i, n)
+        if kind is None:
+            if c == "'" or c == '"':
+                kind, j = STR, scan_quoted(s, i, n)
+            elif c == "`":
+                kind, j = TMPL, scan_template(s, i, n)
+            elif c in JS_PUNCT:
+                kind, j = PUNCT, i + 1
+            elif c == "/" and (last_nws in JS_REGEX_STARTERS or last_word in JS_KEYWORD_STARTERS
+                               or last_nws == ""):
+                kind, j = REGEX, _scan_regex(s, i, n)
+            elif c.isalpha() or c == "_" or c == "$":
+                j = i + 1
+                while j < n and (s[j].isalnum() or s[j] in "_$"):
+                    j += 1
+                kind = WORD
+            elif c.isdigit():
+                j = i + 1
+                while j < n and (s[j].isdigit() or s[j] in _NUM_TAIL):
+                    j += 1
+                kind = NUM
+            elif c in JS_OP_CHARS:
+                kind, j = OP, _match_op(s, i, n)
+            else:
+                kind, j = OTHER, i + 1
+        toks.append((kind, i, j))
+        if kind == WORD:
+            last_word = s[i:j]
+        elif js_resets_word(kind, s, i, last_word):
+            last_word = ""
+        k = j - 1
+        while k >= i and s[k] in " \t\n":
+            k -= 1
+        if k >= i:
+            last_nws = s[k]
+        i = j
+    return toks
@@ -0,0 +1,56 @@
+"""
+Построчная разница двух текстов для обновления вывода правками вместо
+замены всего документа (живой просмотр во вкладке «Форматирование»).
+"""
+from __future__ import annotations
+from difflib import SequenceMatcher
+
+# Средняя часть (после общих начала и конца) длиннее — одна правка целиком:
+# SequenceMatcher на ней дороже, чем вставка строк
+DIFF_MAX_LINES = 4000
+
+
+def _common_prefix(x, y, step: int = 1 << 12) -> int:
+    """Длина общего начала строк или списков; сравнение кусками по step — в C."""
+    n = min(len(x), len(y))
+    i = 0
+    while i < n:
+        j = min(n, i + step)
+        if x[i:j] != y[i:j]:
+            while x[i] == y[i]:
+                i += 1
+            return i
+        i = j
+    return n
+
+
+def _common_suffix(x, y, limit: int, step: int = 1 << 12) -> int:
+    """Длина общего конца, не больше limit (чтобы не заходить на общее начало)."""
+    lx, ly = len(x), len(y)
+    i = 0
+    while i < limit:
+        j = min(limit, i + step)
+        if x[lx - j:lx - i] != y[ly - j:ly - i]:
+            while x[lx - 1 - i] == y[ly - 1 - i]:
+                i += 1
+            return i
+        i = j
+    return limit
+
+
+def line_hunks(old: str, new: str, max_lines: int = DIFF_MAX_LINES) -> list[tuple[int, int, list[str]]]:
+    """
+    Правки, превращающие old в new: (a, b, строки) — заменить строки
+    old.split("\\n")[a:b] на строки. По возрастанию a, не пересекаются;
+    пустой список — тексты равны.
+    """
+    x, y = old.split("\n"), new.split("\n")
+    p = _common_prefix(x, y)
+    s = _common_suffix(x, y, min(len(x), len(y)) - p)
+    mx, my = x[p:len(x) - s], y[p:len(y) - s]
+    if not mx and not my:
+        return []
+    if not mx or not my or len(mx) > max_lines or len(my) > max_lines:
+        return [(p, len(x) - s, my)]
+    return [(p + i1, p + i2, my[j1:j2])
+            for tag, i1, i2, j1, j2 in SequenceMatcher(None, mx, my).get_opcodes() if tag != "equal"]
@@ -0,0 +1,101 @@
+"""
+Кэш результатов заданий в памяти процесса (LRU с бюджетом в байтах).
+
+Одно и то же действие часто повторяется над тем же текстом с теми же
+параметрами: переключение вкладок, повтор после «Поменять местами».
+Ключ — имя задания, хэш (blake2b) и длина каждого текстового аргумента
+и остальные аргументы как есть (язык, отступ, флаги), так что сам текст
+в кэше не хранится. Кэшируются задания, помеченные атрибутом memo
+(см. jobs.py); run_engine обращается к кэшу до пула процессов, поэтому
+повтор большого задания не доходит и до пересылки.
+"""
+from __future__ import annotations
+import sys, hashlib, threading
+from collections import OrderedDict
+
+# Бюджет кэша (байт памяти под результаты, по sys.getsizeof).
+MEMO_BUDGET = 64 * 1024 * 1024
+# Результат крупнее budget // MEMO_ENTRY_SHARE не кэшируется: один большой
+# документ вытеснил бы все остальные записи, а попадание по нему редкость.
+MEMO_ENTRY_SHARE = 8
+MISS = object()
+
+
+def _digest(s: str) -> bytes:
+    return hashlib.blake2b(s.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def memo_key(fn, args: tuple) -> tuple:
+    """Ключ задания fn(*args): строки заменяются на (длина, хэш)."""
+    return (fn.__module__, fn.__qualname__) + tuple(
+        (len(a), _digest(a)) if isinstance(a, str) else a for a in args
+    )
+
+
+def _size(value) -> int:
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class TransformCache:
+    """LRU результатов; get/put потокобезопасны (задания идут из пула потоков)."""
+
+    def __init__(self, budget: int = MEMO_BUDGET):
+        self.budget = budget
+        self._lock = threading.Lock()
+        self._items: OrderedDict = OrderedDict()  # ключ → (результат, байт)
+        self.size = 0
+        self.hits = self.misses = self.evicted = self.skipped = 0
+
+    def get(self, key, default=MISS):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value):
+        size = _size(value)
+        with self._lock:
+            if size > self.budget // MEMO_ENTRY_SHARE:
+                self.skipped += 1
+                return
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self._items[key] = (value, size)
+            self.size += size
+            while self.size > self.budget:
+                _k, (_v, s) = self._items.popitem(last=False)
+                self.size -= s
+                self.evicted += 1
+
+    def call(self, fn, *args):
+        """fn(*args) с кэшем."""
+        key = memo_key(fn, args)
+        res = self.get(key)
+        if res is MISS:
+            res = fn(*args)
+            self.put(key, res)
+        return res
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        """Счётчики для окна диагностики."""
+        with self._lock:
+            return {
+                "entries": len(self._items), "bytes": self.size, "budget": self.budget,
+                "hits": self.hits, "misses": self.misses,
+                "evicted": self.evicted, "skipped": self.skipped,
+            }
+
+
+transform_cache = TransformCache()
@@ -0,0 +1,130 @@
+"""Минификация кода: комментарии, пробелы, пробелы вокруг пунктуации."""
+from __future__ import annotations
+import re, time
+
+from . import lexer
+from .lexer import TMPL, LINE_COMMENT, BLOCK_COMMENT, scan_template
+from .strip import _StripOut
+
+_PUNCT = r"[;,:{}()\[\]=+\-*/<>|&!%^?.]"
+_WS_RUN = re.compile(r"\s+")
+_NL_RUN = re.compile(r"\s*\n\s*")
+_BLANK_RUN = re.compile(r"[ \t]{2,}")
+# Кандидаты на метку строки в буфере кода: берётся первый, которого нет в тексте.
+_HOLES = "\x00" + "".join(map(chr, range(0xE000, 0xF900)))
+
+
+def _hole_for(code: str) -> str:
+    for h in _HOLES:
+        if h not in code:
+            return h
+    raise ValueError("no free placeholder character")
+
+
+def _tighten_re(hole: str) -> re.Pattern:
+    """
+    Лишний пробел (после схлопывания серий): перед пунктуацией, после неё,
+    перед строкой-меткой и в конце. Замена на пустую строку идёт без шаблона «\\1».
+    """
+    return re.compile(f" (?=[{re.escape(hole)}]|{_PUNCT}|\\Z)|(?<={_PUNCT}) ")
+
+
+def _scan(code: str, spec: lexer.LexSpec, hole: str) -> tuple[str, list[str]]:
+    """
+    Один проход лексера: комментарии удаляются по правилам strip_comments,
+    код пишется в общий буфер, каждая строка/шаблон заменяется в нём меткой.
+    """
+    out = _StripOut()
+    add = out.add
+    strs: list[str] = []
+    search = spec.pattern.search
+    kinds = spec.kinds
+    n = len(code)
+    start = skip_to = 0
+    m = search(code)
+    while m is not None:
+        i = m.start()
+        kind = kinds[m.lastindex]
+        end = scan_template(code, i, n) if kind == TMPL else m.end()
+        a = start if start > skip_to else skip_to
+        if a < i:
+            add(code[a:i])
+        if kind == LINE_COMMENT or kind == BLOCK_COMMENT:
+            skip_to = out.drop_comment(code, kind, end)
+        else:
+            strs.append(code[i:end])
+            add(hole)
+        start = end
+        m = search(code, end)
+    a = start if start > skip_to else skip_to
+    if a < n:
+        add(code[a:])
+    return "".join(out.parts), strs
+
+
+def _minify_fused(code: str, lang: str) -> str:
+    hole = _hole_for(code)
+    text, strs = _scan(code, lexer.spec_for(lang), hole)
+    text = _tighten_re(hole).sub("", _WS_RUN.sub(" ", text))
+    if not strs:
+        return text.strip()
+    # Код после схлопывания не содержит переводов строк и двойных пробелов,
+    # а строки начинаются и кончаются кавычкой: финальные правила — только внутри строк.
+    code_parts = text.split(hole)
+    out = [code_parts[0]]
+    for t, c in zip(strs, code_parts[1:]):
+        if '\n' in t:
+            t = _NL_RUN.sub("", t)
+        if '\t' in t or '  ' in t:
+            t = _BLANK_RUN.sub(" ", t)
+        out.append(t)
+        out.append(c)
+    out[0] = out[0].lstrip()
+    k = len(out) - 1
+    while k > 0 and not out[k]:
+        k -= 1
+    out[k] = out[k].rstrip()
+    return "".join(out)
+
+
+def minify_code(code: str, lang: str, mangle: bool = False, optimize: bool = False) -> str:
+    """
+    mangle — для JavaScript: минификация по токенам с короткими локальными именами (jsmin).
+    CSS минифицируется по дереву правил (cssmin); optimize — ещё и слияние
+    селекторов, удаление перекрытых объявлений и пустых правил.
+    HTML/XML — по токенам разметки (htmlmin); встроенные <script>/<style>
+    минифицируются с теми же mangle и optimize.
+    """
+    # движки по языку импортируются при первом вызове: не в бюджет импорта minify_code
+    if mangle and lang == "JavaScript":
+        from .jsmin import minify_js
+        return minify_js(code)
+    if lang == "CSS":
+        from .cssmin import minify_css
+        return minify_css(code, optimize)
+    if lang == "HTML/XML":
+        from .htmlmin import minify_html  # тянет ещё и pretty
+        return minify_html(code, mangle, optimize)
+    if lang == "JSON":
+        from .jsonio import minify_json
+        try:
+            return minify_json(code)
+        except Exception:
+            pass
+    return _minify_fused(code, lang)
+
+
+def utf8_size(s: str) -> int:
+    return len(s.encode("utf-8", "surrogatepass"))
+
+
+def minify_stats(code: str, res: str, seconds: float) -> tuple[int, int, float]:
+    """Отчёт о минификации: (байт на входе, байт на выходе, секунд) в UTF-8."""
+    return utf8_size(code), utf8_size(res), seconds
+
+
+def minify_code_stats(code: str, lang: str, mangle: bool = False,
+                      optimize: bool = False) -> tuple[str, tuple[int, int, float]]:
+    t0 = time.perf_counter()
+    res = minify_code(code, lang, mangle, optimize)
+    return res, minify_stats(code, res, time.perf_counter() - t0)
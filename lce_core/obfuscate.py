@@ -0,0 +1,408 @@
+"""Обфускация (Base64/hex-контейнеры) и деобфускация."""
+from __future__ import annotations
+import re, base64
+from typing import Optional
+
+from . import lexer
+
+
+def b64(s: str) -> str:
+    return base64.b64encode(s.encode("utf-8")).decode("ascii")
+_b64_call_pat = re.compile(r"(?:atob|base64_decode|b64decode)\s*\(\s*['\"]([A-Za-z0-9+/=_-]+)['\"]\s*\)", re.I)
+_hex_byte_pat = re.compile(r"\\x([0-9A-Fa-f]{2})")
+_data_uri_pat = re.compile(r"data:[^;]+;base64,([A-Za-z0-9+/=_-]+)", re.I)
+_html_ent_pat = re.compile(r"&#(x[0-9A-Fa-f]+|\d+);")
+_css_hex_pat  = re.compile(r"\\([0-9A-Fa-f]{1,6})(?:\s)?")
+
+def _decode_html_entities(s: str) -> Optional[str]:
+    if "&#" not in s:
+        return None
+    def repl(m):
+        g = m.group(1)
+        try:
+            cp = int(g[1:], 16) if g.lower().startswith('x') else int(g)
+            return chr(cp)
+        except Exception:
+            return m.group(0)
+    out = _html_ent_pat.sub(repl, s)
+    return out if out != s else None
+
+def _decode_css_hex_escapes(s: str) -> Optional[str]:
+    if "\\" not in s:
+        return None
+    used = False
+    def repl(m):
+        nonlocal used
+        try:
+            used = True
+            return chr(int(m.group(1), 16))
+        except Exception:
+            return m.group(0)
+    out = _css_hex_pat.sub(repl, s)
+    return out if used else None
+
+_oct_pat = re.compile(r"\\([0-7]{1,3})")
+
+def _decode_c_escapes(fragment: str, *, in_double_quotes: bool = True) -> str:
+    r"""
+    Декодирует C/PHP-подобные экранирования в отдельном фрагменте строки.
+    Поддержка: \n \r \t \v \f \\ \' \" \xHH \NNN (восьмеричные, 1-3 цифры)
+    """
+  
+
+    out = []
+    i, n = 0, len(fragment)
+    while i < n:
+        c = fragment[i]
+        if c != '\\':
+            out.append(c); i += 1; continue
+        i += 1
+        if i >= n:
+            out.append('\\'); break
+        ch = fragment[i]; i += 1
+
+        if ch in "nrvtf\\'\"ab":
+            mapping = {
+                'n':'\n','r':'\r','v':'\v','t':'\t','f':'\f','\\':'\\',
+                '"':'"', "'":"'", 'a':'\a','b':'\b'
+            }
+            out.append(mapping.get(ch, ch))
+            continue
+
+        if ch in "xX": 
+            j = i
+            h = []
+            while j < n and len(h) < 2 and fragment[j] in "0123456789abcdefABCDEF":
+                h.append(fragment[j]); j += 1
+            if h:
+                out.append(chr(int(''.join(h), 16)))
+                i = j
+            else:
+                out.append('\\x')
+            continue
+
+        if ch in "01234567":  
+            j = i - 1
+            k = j + 1
+            while k < n and (k - j) <= 3 and fragment[k] in "01234567":
+                k += 1
+            try:
+                out.append(chr(int(fragment[j:k], 8)))
+            except Exception:
+                out.append(fragment[j:k])
+            i = k
+            continue
+        out.append('\\' + ch)
+    return ''.join(out)
+
+
+_single_quote_esc = re.compile(r"\\(.?)", re.S)
+
+
+def _single_quote_unescape(m) -> str:
+    ch = m.group(1)
+    return ch if ch in ("'", "\\", "") else "\\" + ch
+
+
+def _decode_php_like_string_literals(code: str) -> str:
+    r"""
+    Проходит по коду и декодирует содержимое строк:
+    - двойные кавычки: полноценные escape-последовательности (\xHH, \NNN, \n, ...)
+    - одинарные кавычки: только \\ и \'
+    Строки и // /* */ комментарии размечает общий лексер (lexer.lex).
+    """
+
+    out = []
+    for kind, a, b in lexer.lex(code, lexer.PHP_STRINGS_SPEC):
+        if kind != lexer.STR:
+            out.append(code[a:b]); continue
+        q = code[a]
+        closed = lexer.quoted_closed(code, a, b)
+        body = code[a + 1:b - 1 if closed else b]
+        out.append(q)
+        if q == "'":
+            out.append(_single_quote_esc.sub(_single_quote_unescape, body))
+        else:
+            out.append(_decode_c_escapes(body, in_double_quotes=True))
+        if closed:
+            out.append(q)
+    return ''.join(out)
+
+
+_goto_stmt_re  = re.compile(r'^\s*goto\s+([A-Za-z_]\w*)\s*;\s*$', re.I)
+
+def deobfuscate_php_goto(code: str) -> Optional[str]:
+    """
+    Уплощает верхнеуровневые goto/label в PHP.
+    Не лезет внутрь функций/классов (блоки { ... } просто копируются),
+    поэтому безопасен для «спагетти» на верхнем уровне.
+    """
+    s = code.replace("\r\n", "\n").replace("\r", "\n")
+    n = len(s); i = 0
+
+
+    in_s = in_d = in_lc = in_bc = False
+    depth = 0
+
+
+    nodes: list[tuple[str, str]] = []
+    cur: list[str] = []
+
+    def flush_stmt():
+        txt = ''.join(cur)
+        if txt.strip():
+            nodes.append(("stmt", txt))
+        cur.clear()
+
+    while i < n:
+        c = s[i]
+
+       
+        if in_lc:
+            cur.append(c)
+            if c == '\n': in_lc = False
+            i += 1; continue
+        if in_bc:
+            cur.append(c)
+            if c == '*' and i+1 < n and s[i+1] == '/':
+                cur.append('/'); i += 2; in_bc = False
+            else:
+                i += 1
+            continue
+
+      
+        if in_s:
+            cur.append(c)
+            if c == '\\' and i+1 < n:
+                cur.append(s[i+1]); i += 2; continue
+            if c == "'": in_s = False
+            i += 1; continue
+
+        if in_d:
+            cur.append(c)
+            if c == '\\' and i+1 < n:
+                cur.append(s[i+1]); i += 2; continue
+            if c == '"': in_d = False
+            i += 1; continue
+
+      
+        if c == '/' and i+1 < n:
+            if s[i+1] == '/':
+                cur.append('//'); i += 2; in_lc = True; continue
+            if s[i+1] == '*':
+                cur.append('/*'); i += 2; in_bc = True; continue
+        if c == "'":
+            cur.append(c); in_s = True; i += 1; continue
+        if c == '"':
+            cur.append(c); in_d = True; i += 1; continue
+
+        
+        if c == '{':
+            depth += 1
+            cur.append(c); i += 1; continue
+        if c == '}':
+            depth = max(0, depth - 1)
+            cur.append(c); i += 1
+            if depth == 0:
+                flush_stmt()
+            continue
+
+      
+        if depth == 0 and c == ';':
+            cur.append(';'); i += 1; flush_stmt(); continue
+
+       
+        if depth == 0 and c == ':':
+            buf = ''.join(cur).rstrip()
+            m = re.search(r'([A-Za-z_]\w*)\s*$', buf)
+            if m:
+          
+                cut_at = m.start(1)
+                cur = list(buf[:cut_at])
+                flush_stmt()
+                nodes.append(("label", m.group(1)))
+                i += 1
+              
+                while i < n and s[i].isspace():
+                    i += 1
+                continue
+
+        cur.append(c); i += 1
+
+    if ''.join(cur).strip():
+        nodes.append(("stmt", ''.join(cur)))
+
+
+    label_to_idx: dict[str, int] = {}
+    for idx, (kind, val) in enumerate(nodes):
+        if kind == "label":
+            j = idx + 1
+            while j < len(nodes) and nodes[j][0] == "label":
+                j += 1
+            label_to_idx[val] = j
+
+
+    pc = 0
+    steps = 0
+    visit_count: dict[int, int] = {}
+    out: list[str] = []
+
+    while pc < len(nodes) and steps < 10000:
+        steps += 1
+        kind, val = nodes[pc]
+        if kind == "label":
+            pc += 1
+            continue
+
+        m = _goto_stmt_re.match(val.strip())
+        if m:
+            tgt = label_to_idx.get(m.group(1))
+            if tgt is None:
+                out.append(val)  
+                pc += 1
+            else:
+                visit_count[pc] = visit_count.get(pc, 0) + 1
+                if visit_count[pc] > 3:
+                 
+                    out.extend(v for k, v in nodes[pc:] if k == "stmt")
+                    break
+                pc = tgt
+        else:
+            out.append(val)
+            pc += 1
+
+    linear = ''.join(out)
+   
+    try:
+        linear = _decode_php_like_string_literals(linear)
+    except Exception:
+        pass
+
+    linear = re.sub(r'[ \t]+\n', '\n', linear)
+    linear = linear.strip()
+    return linear if linear and linear != code else None
+
+def deobfuscate(text: str) -> Optional[str]:
+    s = (text or "").strip()
+    if not s:
+        return None
+
+   
+    m = _data_uri_pat.search(s)
+    if m:
+        try:
+            raw = base64.b64decode(m.group(1) + "=" * ((-len(m.group(1))) % 4))
+            return raw.decode("utf-8", errors="replace")
+        except Exception:
+            pass
+
+  
+    m = re.search(r"eval\s*\(\s*(['\"])((?:\\x[0-9A-Fa-f]{2})+)\1\s*\)\s*;?", s)
+    if m:
+        try:
+            payload = m.group(2)
+            bs = bytes(int(payload[i+2:i+4], 16) for i in range(0, len(payload), 4))
+            return bs.decode("utf-8", errors="replace")
+        except Exception:
+            return None
+
+   
+    m = _b64_call_pat.search(s)
+    if m:
+        b = m.group(1)
+        try:
+            raw = base64.b64decode(b + "=" * ((-len(b)) % 4))
+            try:
+                return raw.decode("utf-8")
+            except Exception:
+                return raw.decode("latin1", errors="replace")
+        except Exception:
+            pass
+
+    looks_like_code = ("<?php" in s) or re.search(r"\b(function|goto|header|var|let|const|class|style|<\w+)\b", s)
+    has_escapes = ("\\x" in s) or bool(re.search(r"\\[0-7]{1,3}", s))
+    if looks_like_code and has_escapes:
+        try:
+            return _decode_php_like_string_literals(s)
+        except Exception:
+            pass
+
+
+    if re.fullmatch(r"(?:\\x[0-9A-Fa-f]{2}\s*)+", s):
+        try:
+            parts = re.findall(r"\\x([0-9A-Fa-f]{2})", s)
+            bs = bytes(int(h, 16) for h in parts)
+            return bs.decode("utf-8", errors="replace")
+        except Exception:
+            return None
+
+
+    ent = _decode_html_entities(s)
+    if ent is not None:
+        return ent
+
+
+    css = _decode_css_hex_escapes(s)
+    if css is not None:
+        return css
+
+
+    s_clean = re.sub(r"[^A-Za-z0-9+/=]", "", s)
+    if len(s_clean) >= 12 and all(ch in "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=" for ch in s_clean):
+        try:
+            raw = base64.b64decode(s_clean + "=" * ((-len(s_clean)) % 4))
+            return raw.decode("utf-8", errors="replace")
+        except Exception:
+            pass
+
+  
+    if "\\x" in s and not _hex_byte_pat.search(s):
+        return None
+
+    return None
+
+
+def obfuscate_js_eval_base64(code: str) -> str:
+    b = b64(code)
+ 
+    return ("(function(){"
+            "const d=(s)=>{try{return decodeURIComponent(escape(s))}catch(e){return s}};"
+            "eval(d(atob('%s')));"
+            "})();") % b
+
+
+def obfuscate_hex_js(code: str) -> str:
+    """
+    Обфускация через \\xNN: берём UTF-8 байты исходного текста
+    и экранируем каждый байт. Так deobfuscate сможет вернуть
+    исходную строку с Unicode.
+    """
+    bs = code.encode("utf-8")
+    esc = ''.join('\\x%02x' % b for b in bs)
+  
+    return "eval('%s');" % esc
+def obfuscate_generic_base64(code: str, lang: str) -> str:
+    b = b64(code)
+    if lang == "Python":
+        return f"import base64;exec(base64.b64decode('{b}').decode('utf-8'))"
+    if lang == "PHP":
+        return f"<?php eval(base64_decode('{b}'));"
+    if lang == "HTML/XML":
+        return (f"<script>(()=>{{const s=atob('{b}');try{{document.write(decodeURIComponent(escape(s)))}}"
+                f"catch(e){{document.write(s)}}}})();</script>")
+    if lang == "CSS":
+        return (f"<script>(()=>{{const css=(()=>{{const s=atob('{b}');try{{return decodeURIComponent(escape(s))}}"
+                f"catch(e){{return s}}}})();const st=document.createElement('style');st.textContent=css;"
+                f"document.head.appendChild(st);}})();</script>")
+    return b
+def append_comment(code: str, lang: str, comment: str) -> str:
+    c = comment.strip()
+    if not c: return code
+    if lang in ("JavaScript", "PHP", "CSS", "Plain", "JSON"):
+        return f"/* {c} */\n{code}"
+    if lang == "Python":
+        lines = "\n".join(f"# {ln}" if ln.strip() else "#" for ln in c.splitlines())
+        return f"{lines}\n{code}"
+    if lang == "HTML/XML":
+        return f"<!-- {c} -->\n{code}"
+    return code
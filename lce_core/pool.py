@@ -0,0 +1,253 @@
+"""
+Пул процессов для тяжёлых текстовых движков.
+
+Движки lce_core — чистый Python и держат GIL, поэтому даже в фоновом
+потоке большой ввод подтормаживает интерфейс. Пул держит прогретые
+процессы (lce_core уже импортирован, PySide6 — нет) и выполняет задания
+в них. Маленькие входы по-прежнему выполняются на месте.
+"""
+from __future__ import annotations
+import os, sys, types, queue, atexit, threading
+import multiprocessing as mp
+from contextlib import contextmanager
+
+from .memo import MISS, memo_key, transform_cache
+
+# Порог (символов во входе), с которого задание уходит в процесс.
+# Замер bench/bench_process_pool.py: пересылка в прогретый процесс стоит
+# ~0.1-0.3 мс и несколько процентов на больших входах, т.е. по чистому
+# времени пул почти ничего не теряет. Но до ~32 КБ задание короче
+# 20-40 мс и поток с GIL не успевает заметно притормозить интерфейс —
+# такие входы выгоднее выполнять на месте, не занимая процесс.
+PROCESS_MIN_SIZE = 32_000
+
+
+class WorkerLost(RuntimeError):
+    """Процесс-исполнитель завершился, не вернув результат (отмена или сбой)."""
+
+
+class PoolClosed(RuntimeError):
+    """Пул остановлен (shutdown) до или во время задания; start() открывает его снова."""
+
+
+def _worker_main(conn):
+    from . import jobs  # прогрев: все движки импортируются при старте процесса
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break
+        if msg is None:
+            break
+        fn, args = msg
+        try:
+            res = (True, fn(*args))
+        except Exception as e:
+            res = (False, e)
+        try:
+            conn.send(res)
+        except Exception as e:
+            conn.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+@contextmanager
+def _detached_main():
+    """
+    В режиме spawn дочерний процесс заново импортирует __main__ родителя,
+    а это GUI-скрипт с PySide6. На время запуска подменяем его пустым модулем.
+    """
+    main = sys.modules.get("__main__")
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        if main is not None:
+            sys.modules["__main__"] = main
+
+
+class EnginePool:
+    def __init__(self, workers: int = 0):
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self._ctx = mp.get_context("spawn")
+        self._idle: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+        self._busy = {}
+        self._waiting = set()
+        self._cancelled = set()
+
+    def start(self):
+        """
+        Запускает процессы заранее, чтобы первое задание не ждало импорта.
+        После shutdown открывает пул заново — с новой очередью свободных
+        процессов (в старой осталась метка остановки для ждущих вызовов).
+        """
+        with self._lock:
+            if self._closed:
+                self._idle = queue.Queue()
+                self._closed = False
+            self._start_locked()
+
+    def _start_locked(self):
+        if not self._started:
+            self._started = True
+            for _ in range(self.workers):
+                self._idle.put(self._spawn())
+
+    def _release(self, idle: queue.Queue, worker):
+        """Вернуть процесс в очередь idle; если пул с тех пор остановлен — завершить его."""
+        with self._lock:
+            if idle is self._idle and not self._closed:
+                idle.put(worker)
+                return
+        proc, conn = worker
+        try:
+            conn.send(None)
+        except Exception:
+            proc.terminate()
+
+    def _spawn(self):
+        parent, child = self._ctx.Pipe()
+        with _detached_main():
+            proc = self._ctx.Process(target=_worker_main, args=(child,), daemon=True)
+            proc.start()
+        child.close()
+        return proc, parent
+
+    def call(self, fn, *args, token=None):
+        """
+        Выполняет fn(*args) в свободном процессе; блокирует вызывающий поток.
+        PoolClosed — пул остановлен до задания или во время него.
+        """
+        with self._lock:
+            if self._closed:
+                raise PoolClosed("engine pool is shut down")
+            self._start_locked()
+            idle = self._idle
+            if token is not None:
+                self._waiting.add(token)
+        worker = idle.get()
+        if worker is None:
+            idle.put(None)  # метка shutdown — разбудить и следующего ждущего
+            with self._lock:
+                self._waiting.discard(token)
+                self._cancelled.discard(token)
+            raise PoolClosed("engine pool is shut down")
+        with self._lock:
+            self._waiting.discard(token)
+            if token in self._cancelled:
+                self._cancelled.discard(token)
+                cancelled = True
+            else:
+                cancelled = False
+                if token is not None:
+                    self._busy[token] = worker
+        if cancelled:
+            self._release(idle, worker)
+            raise WorkerLost("cancelled")
+        proc, conn = worker
+        try:
+            conn.send((fn, args))
+            ok, res = conn.recv()
+        except (EOFError, OSError):
+            conn.close()
+            with self._lock:
+                closed = self._closed or idle is not self._idle
+            if closed:
+                raise PoolClosed("engine pool was shut down during the call")
+            self._release(idle, self._spawn())
+            raise WorkerLost("worker process exited")
+        finally:
+            with self._lock:
+                self._busy.pop(token, None)
+        self._release(idle, worker)
+        if not ok:
+            raise res
+        return res
+
+    def cancel(self, token):
+        """Отменяет задание: ждущее — снимается, выполняющееся — процесс убивается."""
+        with self._lock:
+            worker = self._busy.pop(token, None)
+            if worker is None and token in self._waiting:
+                self._cancelled.add(token)
+        if worker is not None:
+            worker[0].terminate()
+
+    def shutdown(self):
+        """
+        Останавливает процессы. Ждущие свободного процесса и выполняющиеся
+        вызовы call получают PoolClosed; новые — тоже, пока не вызван start().
+        """
+        with self._lock:
+            if not self._started:
+                return
+            self._started = False
+            self._closed = True
+            busy = list(self._busy.values())
+            self._busy.clear()
+            idle = self._idle
+        for proc, _conn in busy:
+            proc.terminate()
+        while True:
+            try:
+                worker = idle.get_nowait()
+            except queue.Empty:
+                break
+            if worker is None:
+                continue
+            proc, conn = worker
+            try:
+                conn.send(None)
+            except Exception:
+                proc.terminate()
+            proc.join(0.5)
+        idle.put(None)
+
+
+engine_pool = EnginePool()
+_enabled = True
+atexit.register(engine_pool.shutdown)
+
+
+def set_enabled(on: bool):
+    global _enabled
+    _enabled = bool(on)
+    if not _enabled:
+        engine_pool.shutdown()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def _input_size(fn, args) -> int:
+    """Длина строковых аргументов; функция над файлами сама сообщает объём (fn.input_size)."""
+    sized = getattr(fn, "input_size", None)
+    if sized is not None:
+        return sized(*args)
+    return sum(len(a) for a in args if isinstance(a, str))
+
+
+def run_engine(fn, *args, token=None):
+    """
+    fn(*args) в пуле процессов, если пул включён, функция из lce_core
+    (её можно импортировать в процессе без Qt) и вход не меньше
+    PROCESS_MIN_SIZE; иначе — прямо в вызывающем потоке.
+    Результаты заданий с атрибутом memo берутся из transform_cache и
+    кладутся в него в вызывающем процессе.
+    """
+    key = memo_key(fn, args) if getattr(fn, "memo", False) else None
+    if key is not None:
+        res = transform_cache.get(key)
+        if res is not MISS:
+            return res
+    if (_enabled and getattr(fn, "__module__", "").split(".")[0] == __package__
+            and _input_size(fn, args) >= PROCESS_MIN_SIZE):
+        res = engine_pool.call(fn, *args, token=token)
+    else:
+        res = fn(*args)
+    if key is not None:
+        transform_cache.put(key, res)
+    return res
@@ -0,0 +1,1291 @@
+"""Форматтеры: JSON, HTML/XML, CSS, JS/PHP, Python и чистка пробелов."""
+from __future__ import annotations
+import re
+from bisect import bisect_left, bisect_right
+from typing import Callable, Optional
+
+from .jsonio import format_json
+from .linediff import _common_prefix, _common_suffix
+from .strip import STREAM_CHUNK, strip_comments, _stream_file, _source_size
+from .lexer import css_tokens, lex_js, WS, NL, LINE_COMMENT, BLOCK_COMMENT, STR, TMPL, REGEX, PUNCT, WORD, NUM, OTHER
+
+VOID_HTML = {"area","base","br","col","embed","hr","img","input","link","meta","param","source","track","wbr"}
+INLINE_HTML = {"a","abbr","b","bdi","bdo","cite","code","data","dfn","em","i","kbd","label","mark","q","rp","rt","rtc","ruby","s","samp","small","span","strong","sub","sup","time","u","var","wbr"}
+# Содержимое выводится как есть: код, предформатированный текст, поле ввода
+RAW_TAGS = {"script", "style", "pre", "code", "textarea"}
+
+def _indent_str(use_tabs: bool, size: int) -> str:
+    return "\t" if use_tabs else (" " * max(1, size))
+
+def pretty_json(code: str, indent: str, sort_keys=False) -> Optional[str]:
+    try:
+        return format_json(code, indent, sort_keys)
+    except Exception:
+        return None
+
+# Токены pretty_braces: группа 1 — строка (незакрытая — до конца строки или
+# текста; в шаблоне `…` — подстановки ${…} с одним уровнем вложенных строк,
+# шаблонов и {}), 2 — комментарий, 3 — регэксп после оператора, «(,=:[» и т.п.,
+# после return/typeof/case и в начале строки (вместе с отступом); дальше
+# перевод строки, скобки и «;», «/» и серия прочих символов — вместе с
+# пробелами внутри строки, так что токены крупные
+_BRACE_TOKEN = re.compile(r"""
+    ( "(?:[^"\\\n]|\\.)*"? | '(?:[^'\\\n]|\\.)*'?
+    | `(?:[^`\\$]|\\.|\$(?!\{)
+         |\$\{(?:[^{}`'"]|'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*"
+                |`(?:[^`\\$]|\\.|\$(?!\{)|\$\{[^{}]*\})*`|\{[^{}]*\})*\})*`? )
+  | (//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?:(?<=[(,=:\[!&|?{};+\-*%<>~^])|(?<=[(,=:\[!&|?{};+\-*%<>~^][ \t])
+       |(?<=\breturn[ \t])|(?<=\btypeof[ \t])|(?<=\bcase[ \t])|(?<=\n)[ \t]*)
+    (/(?![/*])(?:[^/\\\n\[]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*)
+  | \n | [{}();] | [^"'`{}();/\n]+ | /
+""", re.S | re.X)
+_BRACE_JOIN = (";", ",", ")")              # после «}» остаются на её строке
+_BRACE_WORDS = ("else", "catch", "finally")  # и «} else», «} elseif», «} catch», «} finally»
+
+
+def pretty_braces(code: str, indent: str) -> str:
+    """
+    Быстрый форматтер по фигурным скобкам и «;» — уровень «fast» в
+    pretty_format: для огромных файлов и неизвестных языков. Меняются
+    только отступы и переносы: отступ строки — indent * глубина {}, после
+    «{», «}» и «;» (вне круглых скобок своего блока) — перенос; на строке
+    «}» остаются else/catch/finally и «;», «,», «)», на строке «{» и «;» —
+    комментарий. Исходные переносы сохраняются, пустых строк подряд — не
+    больше одной, пробелы внутри строки — как были. Строки, комментарии и
+    регэкспы копируются как есть; шаблон `…` распознаётся с одним уровнем
+    вложенных ${…} — глубже могут сдвинуться отступы внутри него. Один
+    проход finditer по крупным токенам.
+    """
+    parts: list[str] = []
+    emit = parts.append
+    pads = [""]
+    lvl = paren = 0
+    parens: list[int] = []  # счётчики круглых скобок внешних блоков
+    bol = True              # начало строки: отступ ещё не выведен
+    space = ""              # пробелы перед следующим токеном
+    brk = ""                # «{», «}» или «;»: перед следующим токеном — перенос (с исключениями)
+    nls = 0                 # исходных переводов строки после последнего токена
+    for m in _BRACE_TOKEN.finditer(code):
+        t = m.group()
+        c = t[0]
+        g = m.lastindex
+        if c == "\n":
+            nls += 1
+            if brk:
+                pass
+            elif not bol:
+                if parts[-1][-1] in " \t":
+                    parts[-1] = parts[-1].rstrip(" \t")
+                emit("\n")
+                bol = True
+            elif nls == 2:
+                emit("\n")
+            space = ""
+            continue
+        if c.isspace():
+            body = t.lstrip()
+            space = t[:len(t) - len(body)]
+            if not body:
+                continue
+            t = body
+            c = t[0]
+
+        opened = False
+        if brk:
+            if g == 2 and not nls:
+                same = True
+            elif brk == "{":
+                same = opened = c == "}" and not g
+            elif brk == "}":
+                same = not g and (t in _BRACE_JOIN or t.startswith(_BRACE_WORDS))
+            else:
+                same = False
+            if not same:
+                emit("\n")
+                if nls >= 2:
+                    emit("\n")
+                bol = True
+            brk = ""
+        nls = 0
+
+        if not g and c == "}":
+            if lvl:
+                lvl -= 1
+            paren = parens.pop() if parens else 0
+            if not bol and not opened:
+                if parts[-1][-1] in " \t":
+                    parts[-1] = parts[-1].rstrip(" \t")
+                emit("\n")
+                bol = True
+        if bol:
+            if lvl >= len(pads):
+                pads.extend(indent * k for k in range(len(pads), lvl + 1))
+            emit(pads[lvl])
+            bol = False
+        elif space:
+            emit(space)
+        emit(t)
+        space = ""
+        if not g:
+            if c == "{":
+                lvl += 1
+                parens.append(paren)
+                paren = 0
+                brk = "{"
+            elif c == "}":
+                brk = "}"
+            elif c == ";":
+                if not paren:
+                    brk = ";"
+            elif c == "(":
+                paren += 1
+            elif c == ")" and paren:
+                paren -= 1
+    res = "".join(parts)
+    return res.rstrip()
+
+
+# Токены разметки: комментарий, CDATA | <!DOCTYPE … [ (начало внутреннего
+# подмножества DTD), <!…> и <?…?> | тег: «/» и имя сразу в группах | текст
+_MARKUP_TOKEN = re.compile(
+    r"(<!--.*?-->|<!\[CDATA\[.*?\]\]>)"
+    r"|(<!(?i:DOCTYPE)[^>\[]*\[|<[!?][^>]*>)"
+    r"|<(/?)\s*([\w:-]*)[^>]*>"
+    r"|[^<]+|<", re.S)
+_WS_RUN = re.compile(r"\s+")
+_OUT_BUFFER = 1 << 16  # символов вывода, копящихся перед записью в файл
+
+
+def _markup_lines(tokens, indent: str):
+    """
+    Строки отформатированной разметки по токенам _MARKUP_TOKEN (совпадениям).
+    Готовые строки отдаются сразу, в памяти — только стеки тегов и текущая
+    строка, которая копится кусками (длинные строчные цепочки — за линейное время).
+    """
+    lvl = 0
+    out: list[str] = []  # готовые, ещё не отданные строки
+    line: list[str] = []  # куски последней строки
+    tag_stack: list[str] = []
+    inc_stack: list[bool] = []
+    raw_stack: list[str] = []
+    inline_depth = 0
+    last_was_inline_open = False
+    allow_inline_flow = False
+    in_subset = False  # внутри <!DOCTYPE … [ … ]>: объявления — на уровень глубже
+
+    def append_line(txt: str):
+        nonlocal last_was_inline_open, allow_inline_flow
+        if line:
+            out.append("".join(line))
+            line.clear()
+        line.append(f"{indent*lvl}{txt.strip()}")
+        last_was_inline_open = False
+        allow_inline_flow = False
+
+    def append_inline(txt: str, add_space: bool):
+        nonlocal last_was_inline_open
+        txt = txt.strip()
+        if not line:
+            line.append(f"{indent*lvl}{txt}")
+        else:
+            if add_space and line[-1] and not line[-1].endswith((" ", "\t")):
+                line.append(" ")
+            line.append(txt)
+        last_was_inline_open = False
+
+    for m in tokens:
+        if out:
+            yield from out
+            out.clear()
+        t = m.group()
+        if m.group(1) or m.group(2):
+            # комментарий, CDATA, <!DOCTYPE>, <?xml?> — отдельной строкой, без вложенности;
+            # только «<!DOCTYPE … [» открывает уровень до «]>»
+            append_line(t)
+            if t[-1] == "[" and m.group(2):
+                in_subset = True
+                lvl += 1
+            continue
+
+        slash = m.group(3)
+        if in_subset and slash is None and "]" in t:
+            # текст подмножества: ссылки %имя; и закрывающая «]>»
+            k = t.index("]")
+            if t[:k].strip():
+                append_line(t[:k])
+            lvl = max(0, lvl - 1)
+            in_subset = False
+            append_line(t[k:]); continue
+        if slash is not None and len(t) > 2:
+            nm = m.group(4).lower() or t.lower()
+            if slash:
+                if inline_depth > 0 and nm in INLINE_HTML:
+                    append_inline(t, add_space=False)
+                    if tag_stack and tag_stack[-1] == nm:
+                        tag_stack.pop()
+                        if inc_stack: inc_stack.pop()
+                        inline_depth = max(0, inline_depth - 1)
+                    if inline_depth == 0:
+                        allow_inline_flow = True
+                    continue
+
+                if raw_stack and raw_stack[-1] == nm:
+                    raw_stack.pop()
+
+                if tag_stack and tag_stack[-1] == nm:
+                    if inc_stack and inc_stack[-1]:
+                        lvl = max(0, lvl - 1)
+                    tag_stack.pop()
+                    if inc_stack: inc_stack.pop()
+                append_line(t)
+                continue
+
+            self_closing = t.endswith("/>") or nm in VOID_HTML
+
+            if inline_depth > 0 or nm in INLINE_HTML or allow_inline_flow:
+                add_space = not last_was_inline_open
+                append_inline(t, add_space=add_space)
+                if not self_closing:
+                    tag_stack.append(nm); inc_stack.append(False)
+                    inline_depth += 1
+                    last_was_inline_open = True
+                allow_inline_flow = inline_depth == 0
+                continue
+
+            append_line(t)
+            if not self_closing:
+                tag_stack.append(nm); inc_stack.append(True)
+                if nm in RAW_TAGS:
+                    raw_stack.append(nm)
+                lvl += 1
+            continue
+
+        if raw_stack:
+            lines = t.splitlines()
+            while lines and not lines[0].strip():
+                lines.pop(0)
+            while lines and not lines[-1].strip():
+                lines.pop()
+            for ln in lines:
+                append_line(ln.rstrip())
+        else:
+            txt = t.strip()
+            if not txt:
+                continue
+            txt = _WS_RUN.sub(" ", txt)
+            if inline_depth > 0 or allow_inline_flow:
+                no_space_chars = ".,;:!?)]}"
+                add_space = not last_was_inline_open and not (txt and txt[0] in no_space_chars)
+                append_inline(txt, add_space=add_space)
+                allow_inline_flow = True
+            else:
+                append_line(txt)
+
+    yield from out
+    if line:
+        yield "".join(line)
+
+
+def pretty_html_xml(code: str, indent: str) -> str:
+    return "\n".join(_markup_lines(_MARKUP_TOKEN.finditer(code), indent)).rstrip()
+
+
+def _markup_stream_tokens(src, chunk_size: int, progress=None):
+    """
+    Токены _MARKUP_TOKEN текстового потока, читаемого кусками. Незаконченный
+    в конце куска токен (текст, «<» без «>», комментарий или CDATA без конца)
+    переносится в следующий; пока не пришла подстрока, которая может его
+    закончить, куски копятся без повторного разбора.
+    """
+    carry: list[str] = []  # начало незаконченного токена и куски за ним
+    stop = ""
+    n_in = 0
+    finditer = _MARKUP_TOKEN.finditer
+    while True:
+        text = src.read(chunk_size)
+        if not text:
+            break
+        n_in += len(text)
+        if progress is not None:
+            progress(n_in)
+        if stop:
+            tail = carry[-1][1 - len(stop):] if len(stop) > 1 else ""
+            carry.append(text)
+            if stop not in tail + text:
+                continue
+            s = "".join(carry)
+        else:
+            s = text
+        carry.clear()
+        stop = ""
+        n = len(s)
+        for m in finditer(s):
+            if m.group(3) is None:
+                t = m.group()
+                if m.group(2) is not None:
+                    if t.startswith("<!--"):
+                        stop = "-->"
+                    elif t.startswith("<![CDATA["):
+                        stop = "]]>"
+                elif m.group(1) is None:
+                    if t == "<":
+                        stop = ">"
+                    elif m.end() == n:
+                        stop = "<"
+                if stop:
+                    carry.append(s[m.start():])
+                    break
+            yield m
+    if carry:
+        yield from finditer("".join(carry))
+
+
+def pretty_html_stream(src, dst, indent: str, max_blank_lines: int = 1,
+                       chunk_size: int = STREAM_CHUNK, progress=None) -> tuple[int, int]:
+    """
+    pretty_html_xml для потока src → dst кусками по chunk_size символов, с
+    чисткой tidy_whitespace по ходу: результат — как у pretty_job (плюс
+    перевод строки в конце), в памяти — только незаконченный токен и строка.
+    progress(символов_прочитано) вызывается после каждого куска.
+    Возвращает (символов на входе, символов на выходе).
+    """
+    counted = [0]
+
+    def seen(n: int):
+        counted[0] = n
+        if progress is not None:
+            progress(n)
+
+    def batches():
+        buf: list[str] = []
+        size = 0
+        for item in _markup_lines(_markup_stream_tokens(src, chunk_size, seen), indent):
+            buf.append(item)
+            size += len(item)
+            if size >= _OUT_BUFFER:
+                yield "\n".join(buf) + "\n"
+                buf.clear(); size = 0
+        if buf:
+            yield "\n".join(buf)
+
+    n_out = 0
+    for res in tidy_lines(batches(), max_blank_lines):
+        dst.write(res); n_out += len(res)
+    dst.write("\n")
+    return counted[0], n_out + 1
+
+
+def pretty_html_file(src_path: str, dst_path: str, indent: str, max_blank_lines: int = 1,
+                     chunk_size: int = STREAM_CHUNK) -> tuple[int, int]:
+    """pretty_html_stream для файлов; dst_path может совпадать с src_path."""
+    return _stream_file(src_path, dst_path,
+                        lambda src, dst: pretty_html_stream(src, dst, indent, max_blank_lines, chunk_size))
+
+
+# для pool.run_engine: объём работы — размер файла
+pretty_html_file.input_size = _source_size
+
+def _pretty_python_lines(code: str, indent: str) -> str:
+    """Отступы по двоеточиям в конце строк — для кода, который tokenize не разбирает."""
+    lines = code.splitlines()
+    res = []
+    lvl = 0
+
+    dedent_heads = re.compile(r"^(elif\b.*:|else:|except\b.*:|finally:)\s*$")
+
+    for raw in lines:
+        ln = raw.rstrip()
+        stripped = ln.lstrip()
+        if stripped == "":
+            continue
+        if dedent_heads.match(stripped):
+            lvl = max(0, lvl - 1)
+
+        res.append((indent * lvl) + stripped)
+
+        if stripped.endswith(":") and not stripped.strip().startswith("#"):
+            lvl += 1
+
+    return "\n".join(res).rstrip()
+
+
+# Разметка строк для pretty_python
+_PY_CODE, _PY_CONT, _PY_COMMENT, _PY_BLANK = range(4)
+
+
+def _py_lines(lines: list[str]):
+    """
+    Разбор tokenize: для каждой физической строки — вид (начало логической
+    строки, продолжение в скобках или после «\\», строка-комментарий, пустая),
+    уровень блока для начал логических строк, номер начала для продолжений
+    и флаги «начало»/«конец» строки внутри многострочного токена (строки
+    \"\"\"…\"\"\"). Ошибки tokenize (IndentationError, TokenError) — наружу.
+    """
+    import tokenize
+    n = len(lines)
+    kind = [_PY_BLANK] * n
+    level = [0] * n
+    anchor = [0] * n
+    head_in_str = [False] * n   # ведущие пробелы — содержимое строки
+    tail_in_str = [False] * n   # хвостовые пробелы — содержимое строки
+    depth = 0
+    start = -1                  # начало текущей логической строки или -1
+    it = iter(lines)
+    for tok in tokenize.generate_tokens(lambda: next(it, "")):
+        t = tok.type
+        if t == tokenize.INDENT:
+            depth += 1
+        elif t == tokenize.DEDENT:
+            depth -= 1
+        elif t == tokenize.NEWLINE:
+            for r in range(start + 1, tok.start[0]):
+                kind[r] = _PY_CONT
+                anchor[r] = start
+            start = -1
+        elif t == tokenize.COMMENT and start < 0:
+            kind[tok.start[0] - 1] = _PY_COMMENT
+        elif t not in (tokenize.NL, tokenize.COMMENT, tokenize.ENDMARKER):
+            if start < 0:
+                start = tok.start[0] - 1
+                kind[start] = _PY_CODE
+                level[start] = depth
+            if tok.end[0] > tok.start[0]:
+                for r in range(tok.start[0], tok.end[0]):
+                    head_in_str[r] = True
+                    tail_in_str[r - 1] = True
+    return kind, level, anchor, head_in_str, tail_in_str
+
+
+def _lead(s: str) -> str:
+    return s[:len(s) - len(s.lstrip(" \t\f"))]
+
+
+def pretty_python(code: str, indent: str, max_blank_lines: int = 1, trim_trailing: bool = True) -> str:
+    """
+    Отступы Python по tokenize: уровень блока каждой логической строки —
+    по INDENT/DEDENT, отступ — indent * уровень. Продолжения в скобках и
+    после «\\» сдвигаются вместе со своей первой строкой (выравнивание
+    внутри сохраняется), содержимое многострочных строк не меняется вовсе.
+    Комментарий на отдельной строке получает уровень следующего оператора,
+    а если стоял вровень с одним из открытых блоков — уровень этого блока.
+    Пустые строки вне строк сжимаются до max_blank_lines, хвостовые пробелы
+    срезаются (trim_trailing). Если tokenize не принимает код — прежний
+    построчный разбор по двоеточиям.
+    """
+    import tokenize
+    lines = code.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    try:
+        kind, level, anchor, head_in_str, tail_in_str = _py_lines([ln + "\n" for ln in lines])
+    except (SyntaxError, tokenize.TokenError):
+        return tidy_whitespace(_pretty_python_lines(code, indent), max_blank_lines, trim_trailing)
+
+    n = len(lines)
+    # уровень и колонка следующего оператора — для комментариев
+    next_code = [-1] * n
+    nxt = -1
+    for i in range(n - 1, -1, -1):
+        next_code[i] = nxt
+        if kind[i] == _PY_CODE:
+            nxt = i
+
+    pads = [""]
+    new_lead = [""] * n  # новый отступ начал логических строк — для их продолжений
+    out: list[str] = []
+    blanks = 0
+    open_blocks: list[tuple[int, int]] = []  # (колонка, уровень) операторов открытых блоков
+    for i, ln in enumerate(lines):
+        k = kind[i]
+        if head_in_str[i]:
+            pass
+        elif k == _PY_BLANK and not ln.strip():
+            blanks += 1
+            if blanks > max_blank_lines or not out:
+                continue
+            out.append("")
+            continue
+        elif k == _PY_CONT:
+            a = anchor[i]
+            old = _lead(lines[a])
+            if ln.startswith(old):
+                ln = new_lead[a] + ln[len(old):]
+        else:
+            lead = _lead(ln)
+            col = len(lead.expandtabs(8))
+            if k == _PY_CODE:
+                lvl = level[i]
+                while open_blocks and open_blocks[-1][0] >= col:
+                    open_blocks.pop()
+                open_blocks.append((col, lvl))
+            else:
+                j = next_code[i]
+                lvl = level[j] if j >= 0 else 0
+                if j < 0 or len(_lead(lines[j]).expandtabs(8)) != col:
+                    for c, l in reversed(open_blocks):
+                        if c <= col:
+                            if c == col:
+                                lvl = l
+                            break
+            while len(pads) <= lvl:
+                pads.append(indent * len(pads))
+            new_lead[i] = pads[lvl]
+            ln = pads[lvl] + ln[len(lead):]
+        blanks = 0
+        if trim_trailing and not tail_in_str[i]:
+            ln = ln.rstrip(" \t\f")
+        out.append(ln)
+    while out and out[-1] == "":
+        out.pop()
+    return "\n".join(out)
+
+
+def pretty_css(code: str, indent: str) -> str:
+    s = strip_comments(code, "CSS").strip()
+    tokens = css_tokens(s)
+
+    def norm_sel(t: str) -> str:
+        t = re.sub(r'\s+', ' ', t)
+        t = re.sub(r'\s*,\s*', ', ', t)
+        t = re.sub(r'\(\s*', '(', t)
+        t = re.sub(r'\s*\)', ')', t)
+        t = re.sub(r':\s*', ':', t)
+        return t.strip()
+
+    def norm_prop(t: str) -> str:
+        t = re.sub(r'\s+', ' ', t)
+        t = re.sub(r'\s*:\s*', ': ', t)
+        t = re.sub(r'\s*,\s*', ', ', t)
+        return t.strip()
+
+    lvl = 0
+    out: list[str] = []
+    buf: list[str] = []
+
+    for tok in tokens:
+        if not tok:
+            continue
+        if tok == '{':
+            sel = norm_sel(''.join(buf)); buf.clear()
+            out.append(f"{indent*lvl}{sel} {{")
+            lvl += 1
+        elif tok == '}':
+            if ''.join(buf).strip():
+                line = norm_prop(''.join(buf)).rstrip(';')
+                out.append(f"{indent*lvl}{line};")
+                buf.clear()
+            lvl = max(0, lvl-1)
+            out.append(f"{indent*lvl}}}")
+        elif tok == ';':
+            line = norm_prop(''.join(buf)); buf.clear()
+            out.append(f"{indent*lvl}{line};")
+        else:
+            buf.append(tok)
+
+    if ''.join(buf).strip():
+        line = norm_prop(''.join(buf)).rstrip(';')
+        out.append(f"{indent*lvl}{line};")
+
+    return "\n".join(out).rstrip()
+
+
+
+
+# Хвостовые пробелы строки (любые пробельные, кроме \n): совпадение
+# начинается только в начале серии — каждая серия просматривается один раз
+_TRAIL_WS = re.compile(r"(?<![^\S\n])[^\S\n]+(?=\n)")
+_BLANK_RUNS: dict[int, re.Pattern] = {}
+_CARRY_MAX = 4096  # длиннее — хвост пробелов между кусками сжимается
+
+
+def _squeeze_carry(carry: str, keep: int) -> str:
+    """Хвост из одних пробелов: переводов строк больше keep не нужно, пробелы до последнего не нужны."""
+    cr = carry.endswith("\r")  # «\r» в конце куска может оказаться половиной «\r\n»
+    c = (carry[:-1] if cr else carry).replace("\r\n", "\n").replace("\r", "\n")
+    i = c.rfind("\n")
+    if i < 0:
+        return carry
+    return "\n" * min(c.count("\n"), keep) + c[i + 1:] + ("\r" if cr else "")
+
+
+def tidy_lines(pieces, max_blank_lines: int = 1):
+    """
+    tidy_whitespace звеном конвейера: pieces — куски текста любой длины
+    (куски файла, строки), на выход идут готовые куски результата; склейка
+    выхода равна tidy_whitespace от склейки входа. Между кусками в памяти —
+    только хвост из пробелов и переводов строк.
+    """
+    keep = min(max(0, max_blank_lines), 1 << 30) + 1
+    blank_run = _BLANK_RUNS.get(keep)
+    if blank_run is None:
+        blank_run = _BLANK_RUNS[keep] = re.compile("\n{%d,}" % (keep + 1))
+    nl = "\n" * keep if keep <= _CARRY_MAX else (lambda m: m.group()[:keep])
+    carry = ""
+    started = False
+    for piece in pieces:
+        if len(carry) > _CARRY_MAX:
+            carry = _squeeze_carry(carry, keep)
+        s = carry + piece if carry else piece
+        # хвост куска из пробелов решится только со следующим куском
+        body = s.rstrip()
+        carry = s[len(body):]
+        if not body:
+            continue
+        if "\r" in body:
+            body = body.replace("\r\n", "\n").replace("\r", "\n")
+        body = blank_run.sub(nl, _TRAIL_WS.sub("", body))
+        if not started:
+            body = body.lstrip("\n")
+            started = True
+        yield body
+
+
+def tidy_whitespace(text: str, max_blank_lines: int = 1, trim_trailing: bool = True) -> str:
+    """
+    Сжимает серии пустых строк до max_blank_lines,
+    убирает хвостовые пробелы/табы и нормализует переводы строк.
+    Также убирает ведущие/замыкающие пустые строки.
+    Хвостовые пробелы срезаются и при trim_trailing=False — как и прежде
+    (параметр оставлен для совместимости вызовов). Один линейный проход
+    tidy_lines, без списка строк.
+    """
+    if not text:
+        return ""
+    return "".join(tidy_lines((text,), max_blank_lines))
+
+
+def pretty_js(code: str, indent: str) -> str:
+    """
+    JS/PHP formatter:
+    - переносы формируются только правилами форматтера (исходные \n снаружи строк/комментов игнорируются);
+    - '} else/catch/finally' — на одной строке;
+    - ';' даёт перенос только вне круглых скобок своего блока {} (не ломаем
+      for(...;...;...), но тело колбэка или IIFE внутри (...) — ломаем);
+    - идемпотентность.
+    Токены даёт общий лексер (lexer.lex_js); последний выведенный символ и
+    последний непробельный символ ведутся инкрементально — проход линейный.
+    """
+    s = code.replace("\r\n", "\n").replace("\r", "\n")
+    n = len(s)
+
+    out: list[str] = []
+    lvl = 0
+    paren = 0
+    parens: list[int] = []  # счётчики круглых скобок внешних блоков
+    brack = 0
+
+    last_word = ""
+
+    last_ch = ""
+    last_nws = ""
+
+    ws_tail = (" ", "\n", "\t")
+    brace_tail = (" ", "\n", "\t", "(", "[", "{")
+    word_tail = frozenset((" ", "\n", "\t", "(", "[", "{", "!", "~", ".", "?", ":", "+", "-", "*", "/", "%", "&", "|", "^", "="))
+    num_tail = frozenset((" ", "\n", "\t", "(", "[", "{", "+", "-", "*", "/", "%", "&", "|", "^", "!", "~", "?", ":", "="))
+
+    def refresh_last_ch():
+        nonlocal last_ch
+        j = len(out) - 1
+        while j >= 0 and not out[j]:
+            j -= 1
+        last_ch = out[j][-1] if j >= 0 else ""
+
+    def drop_trailing_indent_element():
+   
+        while out and out[-1] and all(ch in " \t" for ch in out[-1]):
+            out.pop()
+        refresh_last_ch()
+
+    def write(tok: str):
+        nonlocal last_ch, last_nws
+        out.append(tok)
+        if tok:
+            last_ch = tok[-1]
+            if last_ch not in " \t\n":
+                last_nws = last_ch
+            else:
+                t = tok.rstrip(" \t\n")
+                if t:
+                    last_nws = t[-1]
+
+    def ensure_nl():
+
+        if not out or not out[-1].endswith("\n"):
+            write("\n")
+        write(indent * max(0, lvl))
+
+    # Строки, шаблоны, комментарии и регэкспы лексер отдаёт целиком — они копируются срезом
+    for kind, i, j in lex_js(s):
+
+        if kind == WS:
+            if last_ch and last_ch not in ws_tail:
+                nextc = s[j] if j < n else ""
+                if nextc and nextc not in ")}];,.:?":
+                    write(" ")
+            continue
+
+        if kind == NL:
+            continue
+
+        if kind == LINE_COMMENT:
+            write(s[i:j])
+            if s[j - 1] == "\n":
+                ensure_nl()
+            continue
+
+        if kind == BLOCK_COMMENT or kind == OTHER:
+            write(s[i:j])
+            continue
+
+        if kind == STR or kind == TMPL or kind == REGEX:
+            write(s[i:j])
+            last_word = ""
+            continue
+
+        if kind == PUNCT:
+            c = s[i]
+
+            if c == "(":
+                if last_word in {"if", "for", "while", "switch", "catch"} and last_ch not in ws_tail:
+                    write(" ")
+                paren += 1; write("("); continue
+
+            if c == ")":
+                paren = max(0, paren - 1); write(")"); last_word = ""; continue
+
+            if c == "[":
+                brack += 1; write("["); continue
+
+            if c == "]":
+                brack = max(0, brack - 1); write("]"); continue
+
+          
+            if c == "{":
+                if last_ch not in brace_tail:
+                    write(" ")
+                write("{"); lvl += 1; ensure_nl()
+                parens.append(paren); paren = 0
+                last_word = ""
+                continue
+
+            if c == "}":
+           
+                drop_trailing_indent_element()
+           
+                if last_ch != "\n":
+                    write("\n")
+                lvl = max(0, lvl - 1)
+                paren = parens.pop() if parens else 0
+                write(indent * max(0, lvl))
+                write("}")
+                ensure_nl()
+                last_word = ""
+                continue
+
+      
+            if c == ";":
+                write(";")
+                if paren == 0:
+                    ensure_nl()
+                last_word = ""
+                continue
+
+          
+            if c == ",":
+                write(","); write(" ")
+                last_word = ""
+                continue
+
+            
+            write(":")
+            if last_word == "case":
+                ensure_nl(); last_word = ""
+            else:
+                write(" ")
+            continue
+
+      
+        if kind == WORD:
+            word = s[i:j]
+
+            if last_ch and last_ch not in word_tail:
+                write(" ")
+
+       
+            if word in {"else", "catch", "finally"} and last_nws == "}":
+             
+                while out:
+                    t = out[-1]
+                    if t == "" or all(ch in " \t" for ch in t):
+                        out.pop(); continue
+                    if t.endswith("\n"):
+                        out[-1] = t.rstrip("\n")
+                        if out[-1] == "" or all(ch in " \t" for ch in out[-1]):
+                            out.pop()
+                        continue
+                    break
+                write(" ")
+
+            write(word)
+            last_word = word
+            continue
+
+     
+        if kind == NUM:
+            if last_ch and last_ch not in num_tail:
+                write(" ")
+            write(s[i:j])
+            last_word = ""
+            continue
+
+
+        matched = s[i:j]
+        if matched in (".", "?."):
+            write(matched)
+        elif matched in ("++", "--"):
+            write(matched)
+        elif matched == "=>":
+            write(" => ")
+        else:
+            if last_ch and last_ch not in ws_tail:
+                write(" ")
+            write(matched)
+            write(" ")
+        last_word = ""
+
+    txt = "".join(out)
+    txt = re.sub(r"[ \t]+\n", "\n", txt)
+    txt = re.sub(r"\n{3,}", "\n\n", txt)
+    txt = re.sub(r"\n[ \t]*\n([ \t]*)\}", r"\n\1}", txt)
+    return txt.rstrip()
+
+
+# Уровни форматирования: auto — fast для неизвестных языков и для JS/PHP/CSS
+# от FAST_FORMAT_MIN_SIZE символов, full — всегда полный разбор, fast —
+# pretty_braces для всего, кроме JSON, HTML/XML и Python (у них свои движки)
+FORMAT_TIERS = ("auto", "full", "fast")
+FAST_FORMAT_MIN_SIZE = 4 * 1024 * 1024
+_FAST_TIER_LANGS = ("JavaScript", "PHP", "CSS")
+
+
+def _fast_tier(lang: str, tier: str, size: int) -> bool:
+    if lang in _FAST_TIER_LANGS:
+        return tier == "fast" or tier == "auto" and size >= FAST_FORMAT_MIN_SIZE
+    return tier != "full"
+
+
+def pretty_format(code: str, lang: str, use_tabs: bool, indent_size: int, sort_json_keys=False,
+                  tier: str = "auto") -> str:
+    indent = "\t" if use_tabs else (" " * max(1, indent_size))
+    if lang == "JSON":
+        r = pretty_json(code, indent, sort_json_keys)
+        if r is not None:
+            return r
+    if lang == "HTML/XML":
+        return pretty_html_xml(code, indent)
+    if lang == "Python":
+        return pretty_python(code, indent)
+    if _fast_tier(lang, tier, len(code)):
+        return pretty_braces(code, indent)
+    if lang == "CSS":
+        return pretty_css(code, indent)
+    return pretty_js(code, indent)
+
+
+# Форматирование блока: вместо всего текста — только изменённый/выделенный
+# блок, результат вклеивается в прежний вывод. Блоки больше RANGE_MAX_SIZE
+# и прочие языки (JSON — один документ, Python — отступы, PHP — многострочные
+# строки и heredoc) форматируются целиком.
+RANGE_MAX_SIZE = 256 * 1024
+RANGE_LANGS = ("JavaScript", "CSS", "HTML/XML")
+_RANGE_WRAP = {"HTML/XML": ("<div>", "<br>", "</div>")}  # обёртка, заглушка; остальные — «{ x; }»
+_CLOSE_LINE = ("}", ")", "]", "</")
+
+
+def _line_end(code: str, a: int) -> int:
+    b = code.find("\n", a)
+    return len(code) if b < 0 else b
+
+
+def _line_indent(code: str, a: int, b: int) -> Optional[int]:
+    """Ширина отступа строки code[a:b]; None — пустая строка."""
+    line = code[a:b]
+    body = line.lstrip(" \t")
+    return len(line) - len(body) if body else None
+
+
+def _unclosed(m: re.Match) -> bool:
+    """Токен _BRACE_TOKEN — незакрытый комментарий, строка или шаблон."""
+    c = m.group()
+    if m.lastindex == 2:
+        return c.startswith("/*") and not (len(c) >= 4 and c.endswith("*/"))
+    return m.lastindex == 1 and (len(c) < 2 or c[-1] != c[0])
+
+
+def _balanced(text: str, html: bool) -> bool:
+    depth = 0
+    if html:
+        for m in _MARKUP_TOKEN.finditer(text):
+            name = m.group(4)
+            if not name:
+                continue
+            if m.group(3):
+                depth -= 1
+            elif name.lower() not in VOID_HTML and not m.group().endswith("/>"):
+                depth += 1
+            if depth < 0:
+                return False
+        return depth == 0
+    for m in _BRACE_TOKEN.finditer(text):
+        c = m.group()
+        if m.lastindex:
+            if _unclosed(m):
+                return False  # блок кончается внутри комментария, строки или шаблона
+            continue
+        if c == "{" or c == "(":
+            depth += 1
+        elif c == "}" or c == ")":
+            depth -= 1
+            if depth < 0:
+                return False
+    return depth == 0
+
+
+def enclosing_block(code: str, start: int, end: int, html: bool = False) -> tuple[int, int]:
+    """
+    Наименьший блок целых строк вокруг code[start:end] с парными скобками
+    (html — тегами): начинается строкой наименьшего в области отступа, идёт
+    до следующей строки с таким же или меньшим отступом — закрывающие «}»,
+    «)», «]», «</» того же отступа входят в блок. Если скобки не сходятся —
+    расширяется до внешнего блока, в худшем случае до всего текста.
+    """
+    a = code.rfind("\n", 0, start) + 1
+    b = _line_end(code, max(a, end - 1) if end > start else start)
+    base = None
+    i = a
+    while i <= b:
+        j = _line_end(code, i)
+        ind = _line_indent(code, i, j)
+        if ind is not None and (base is None or ind < base):
+            base = ind
+        i = j + 1
+    if base is None:
+        return a, b
+    while base >= 0:
+        # вверх — до строки с отступом не больше base, не закрывающей скобку
+        while True:
+            j = _line_end(code, a)
+            ind = _line_indent(code, a, j)
+            if ind is not None and ind <= base:
+                base = ind
+                if not code.startswith(_CLOSE_LINE, a + ind):
+                    break
+            if a == 0:
+                break
+            a = code.rfind("\n", 0, a - 1) + 1
+        # вниз — пока строки глубже base или закрывают скобки на уровне base
+        last = b
+        while b < len(code):
+            j = _line_end(code, b + 1)
+            ind = _line_indent(code, b + 1, j)
+            if ind is not None:
+                if ind < base or ind == base and not code.startswith(_CLOSE_LINE, b + 1 + ind):
+                    break
+                last = j
+            b = j
+        b = last
+        if _balanced(code[a:b], html):
+            return a, b
+        base -= 1
+    return 0, len(code)
+
+
+def _in_raw_html(code: str, a: int) -> bool:
+    """
+    Похоже ли, что позиция a — внутри <!-- … --> или <pre>/<script>/…
+    Проверка rfind-ами без разбора с начала файла — с запасом.
+    """
+    if code.rfind("<!--", 0, a) > code.rfind("-->", 0, a):
+        return True
+    return any(max(code.rfind(f"<{t}", 0, a), code.rfind(f"<{t.upper()}", 0, a))
+               > max(code.rfind(f"</{t}", 0, a), code.rfind(f"</{t.upper()}", 0, a))
+               for t in RAW_TAGS)
+
+
+_CHECKPOINT_STEP = 1 << 12
+_NO_POINTS: tuple[str, list[int], list[int], list[int], list[int]] = ("", [0], [0], [0], [])
+
+
+class RangeCheckpoints:
+    """
+    Начала строк вне строк, комментариев и шаблонов (по токенам pretty_braces)
+    примерно через _CHECKPOINT_STEP символов и число «{» и «}» перед каждым —
+    для последних исходника и вывода, чтобы pretty_range не разбирал их
+    с начала, и начала строк в кавычках, не закрытых до конца строки.
+    Сдвигаются после вклейки блока. Хранит вызывающий (вкладка) и передаёт
+    в pretty_range; вызов читает каждое состояние (текст, точки, «{», «}»,
+    незакрытые строки) один раз и заменяет его целиком, поэтому параллельные
+    вызовы с одним объектом в худшем случае строят точки заново.
+    """
+
+    def __init__(self):
+        self.src = self.out = _NO_POINTS
+
+
+def _points(cp: RangeCheckpoints, name: str, text: str) -> tuple[str, list[int], list[int], list[int], list[int]]:
+    """Состояние cp.src или cp.out для text; для другого текста строится заново."""
+    state = getattr(cp, name)
+    if state[0] is text:
+        return state
+    if state[0] == text:  # вывод после вклейки — равная, но другая строка
+        state = (text,) + state[1:]
+    else:
+        points, opens, closes = [0], [0], [0]
+        o = c = 0
+        loose = []
+        nxt = _CHECKPOINT_STEP
+        for m in _BRACE_TOKEN.finditer(text):
+            t = m.group()
+            if t == "{":
+                o += 1
+            elif t == "}":
+                c += 1
+            elif t == "\n":
+                if m.end() >= nxt:
+                    points.append(m.end())
+                    opens.append(o)
+                    closes.append(c)
+                    nxt = m.end() + _CHECKPOINT_STEP
+            elif m.lastindex == 1 and t[0] in "'\"" and _unclosed(m):
+                loose.append(m.start())
+        state = (text, points, opens, closes, loose)
+    setattr(cp, name, state)
+    return state
+
+
+def _runs_on(text: str, q: int, lang: str) -> bool:
+    """
+    Строка в кавычках с q не закрыта до конца строки и у лексера форматтера
+    (pretty_css, pretty_js) — тот читает её дальше, до следующей кавычки.
+    Токены _BRACE_TOKEN ошибаются и сами (регэксп с кавычкой в ${…}), поэтому
+    строка разбирается заново — в JS дважды: «/» в её начале после прошлой
+    строки может быть и регэкспом, и делением.
+    """
+    ls = text.rfind("\n", 0, q) + 1
+    line = text[ls:_line_end(text, q)]
+    if lang == "CSS":
+        strings = [t for t in css_tokens(line) if t[0] in "'\""]
+    else:
+        strings = [s[i:j] for s in (line, "x " + line) for kind, i, j in lex_js(s) if kind == STR]
+    return any(len(t) < 2 or t[-1] != t[0] for t in strings)
+
+
+def _brace_counts(cp: RangeCheckpoints, name: str, text: str, a: int,
+                  lexer: Optional[str]) -> Optional[tuple[int, int]]:
+    """
+    («{», «}») в text[:a]; None — a не начало токена или выше него
+    незакрытая строка: форматтер языка lexer читает её до следующей кавычки
+    через строки, а токены здесь — до конца строки, и дальше они расходятся.
+    lexer None — форматтер pretty_braces, у него те же токены.
+    """
+    _text, points, opens, closes, loose = _points(cp, name, text)
+    for q in loose:
+        if q >= a or lexer is None:
+            break
+        if _runs_on(text, q, lexer):
+            return None
+    k = bisect_right(points, a) - 1
+    o, c = opens[k], closes[k]
+    for m in _BRACE_TOKEN.finditer(text, points[k]):
+        if m.end() > a:
+            return (o, c) if m.start() == a else None
+        t = m.group()
+        o += t == "{"
+        c += t == "}"
+    return o, c
+
+
+def _counts_are(cp: RangeCheckpoints, text: str, a: int, counts: tuple[int, int], lexer: Optional[str]) -> bool:
+    """
+    _brace_counts(cp, "out", text, a, lexer) == counts; участок между
+    точками, где столько скобок быть не может, не разбирается.
+    """
+    _text, points, opens, closes, _loose = _points(cp, "out", text)
+    k = bisect_right(points, a) - 1
+    if opens[k] > counts[0] or closes[k] > counts[1]:
+        return False
+    if k + 1 < len(points) and (opens[k + 1] < counts[0] or closes[k + 1] < counts[1]):
+        return False
+    return _brace_counts(cp, "out", text, a, lexer) == counts
+
+
+def _prev_token(cp: RangeCheckpoints, text: str, a: int) -> Optional[str]:
+    """Последний значимый токен text[:a] (по точкам cp.src); None — его нет."""
+    points = cp.src[1]
+    prev = None
+    k = bisect_right(points, a) - 1
+    while prev is None and k >= 0:
+        for prev in _sig_tokens(text, points[k], a):
+            pass
+        k -= 1
+    return prev
+
+
+def _sig_tokens(code: str, pos: int, endpos: int):
+    """Токены code[pos:endpos] без пробелов и комментариев."""
+    for m in _BRACE_TOKEN.finditer(code, pos, endpos):
+        t = m.group().strip()
+        if t and m.lastindex != 2:
+            yield t
+
+
+def _hard_edge(before: Optional[str], after: Optional[str]) -> bool:
+    """
+    Граница между токенами before и after — конец оператора, и форматтер
+    не сольёт строки по обе стороны от неё (как «x» без «;» со следующей
+    строкой или «}» с «else»/«;»/«)» после неё).
+    """
+    if before is None or after is None:
+        return True
+    return before in (";", "{", "}") and not (after in _BRACE_JOIN or after.startswith(_BRACE_WORDS))
+
+
+def _shift_points(state: tuple[str, list[int], list[int], list[int], list[int]], text: str, a: int,
+                  b_old: int, grow: int) -> tuple[str, list[int], list[int], list[int], list[int]]:
+    """
+    Точки state для text — того же текста с заменой участка [a:b_old]:
+    точки внутри него выпадают, дальше сдвигаются; grow — на сколько больше
+    в нём стало пар «{ }» (участок сбалансирован до и после замены, так что
+    незакрытых строк в нём нет).
+    """
+    old, points, opens, closes, loose = state
+    delta = len(text) - len(old)
+    i, j = bisect_right(points, a), bisect_left(points, b_old)
+    return (text, points[:i] + [c + delta for c in points[j:]],
+            opens[:i] + [c + grow for c in opens[j:]], closes[:i] + [c + grow for c in closes[j:]],
+            [q if q < a else q + delta for q in loose])
+
+
+def _format_block(text: str, lang: str, use_tabs: bool, indent_size: int, depth: int,
+                  max_blank: int, tier: str) -> Optional[str]:
+    """
+    Блок на глубине depth: текст оборачивается в depth пар «{ }» (в HTML —
+    <div>), чтобы отступы и всё внутри (шаблоны, <pre>) получились как при
+    форматировании всего файла; обёртка затем срезается. Какой она выходит
+    у форматтера, показывает та же обёртка вокруг заглушки. None — если
+    у блока она вышла другой.
+    """
+    opener, stub, closer = _RANGE_WRAP.get(lang, ("{", "x;", "}"))
+
+    def run(body: str) -> list[str]:
+        wrapped = (opener + "\n") * depth + body + ("\n" + closer) * depth
+        res = pretty_format(wrapped, lang, use_tabs, indent_size, tier=tier)
+        return tidy_whitespace(res.rstrip("\r\n"), max_blank).split("\n")
+
+    lines = run(text)
+    if not depth:
+        return "\n".join(lines)
+    frame = run(stub)
+    if (len(frame) != 2 * depth + 1 or len(lines) <= 2 * depth
+            or lines[:depth] != frame[:depth] or lines[-depth:] != frame[-depth:]):
+        return None
+    return "\n".join(lines[depth:-depth])
+
+
+def _find_lines(text: str, part: str, fits: Optional[Callable[[int], bool]] = None) -> int:
+    """
+    Единственное вхождение part целыми строками (из тех, что проходят
+    fits); -1 — его нет или их несколько: какое из них от блока, по тексту
+    не понять. Пустой part (блок из одних комментариев CSS) не ищется.
+    """
+    if not part:
+        return -1
+    found = -1
+    i = text.find(part)
+    while i >= 0:
+        if ((i == 0 or text[i - 1] == "\n") and (i + len(part) == len(text) or text[i + len(part)] == "\n")
+                and (fits is None or fits(i))):
+            if found >= 0:
+                return -1
+            found = i
+        i = text.find(part, i + 1)
+    return found
+
+
+def pretty_range(src: str, out: str, code: str, start: int, end: int, lang: str, use_tabs: bool,
+                 indent_size: int, max_blank_lines: int = 1, tier: str = "auto",
+                 checkpoints: Optional[RangeCheckpoints] = None) -> Optional[tuple[int, int, str]]:
+    """
+    Переформатировать блок вместо всего текста. src — исходник, из которого
+    получен вывод out (тем же языком и настройками), code — текущий исходник,
+    code[start:end] — выделение (или позиция курсора). Блок — enclosing_block
+    вокруг выделения и всех правок относительно src.
+    Результат — (i, j, text): заменить out[i:j] на text; None — блок не
+    найден в out однозначно, слишком велик, правка меняет баланс скобок
+    блока или язык не подходит: форматировать всё. checkpoints — точки разбора прошлого
+    вызова для того же текста (RangeCheckpoints), иначе строятся заново.
+    """
+    if lang not in RANGE_LANGS or not out:
+        return None
+    tier = "fast" if _fast_tier(lang, tier, len(code)) else "full"
+    lexer = None if tier == "fast" else lang
+    p = _common_prefix(src, code)
+    s = _common_suffix(src, code, min(len(src), len(code)) - p)
+    if p < len(code) - s or len(src) != len(code):
+        start, end = min(start, p), max(end, len(code) - s)
+    html = lang == "HTML/XML"
+    cp = checkpoints if checkpoints is not None else RangeCheckpoints()
+    indent = _indent_str(use_tabs, indent_size)
+    a, b = enclosing_block(code, start, end, html)
+    while True:
+        if a >= b or b - a > RANGE_MAX_SIZE:
+            return None
+        b_old = len(src) - (len(code) - b)
+        if b_old <= a or not _balanced(src[a:b_old], html):
+            return None  # до правки тот же участок — не блок: старый вывод в out не найти
+        fits = None
+        if html:
+            if _in_raw_html(code, a):
+                return None
+            # глубина — по отступу первой строки блока до правки
+            lead = _line_indent(src, a, _line_end(src, a)) or 0
+            depth = lead // len(indent)
+            if src[a:a + lead] != indent * depth:
+                return None  # отступы исходника не в настройках вывода — блок в нём не найти
+        else:
+            # Глубина — по скобкам: отступы исходника могут не совпадать с выводом.
+            # Форматирование сохраняет «{» и «}», так что в out перед старым
+            # выводом блока их столько же, сколько в src перед ним.
+            counts = _brace_counts(cp, "src", src, a, lexer)
+            if counts is None or counts[0] < counts[1]:
+                return None
+            depth = counts[0] - counts[1]
+            old_tokens = list(_sig_tokens(src, a, b_old)) or [None]
+            new_tokens = list(_sig_tokens(code, a, b)) or [None]
+            prev, nxt = _prev_token(cp, src, a), next(_sig_tokens(code, b, len(code)), None)
+            if not all(_hard_edge(prev, t[0]) and _hard_edge(t[-1], nxt) for t in (old_tokens, new_tokens)):
+                # оператор продолжается за блоком: форматтер склеил бы его с соседней строкой
+                if a == 0:
+                    return None
+                a, b = enclosing_block(code, a - 1, b, html)
+                continue
+            fits = lambda i: _counts_are(cp, out, i, counts, lexer)
+        old = _format_block(src[a:b_old], lang, use_tabs, indent_size, depth,
+                            max_blank_lines, tier)
+        new = _format_block(code[a:b], lang, use_tabs, indent_size, depth, max_blank_lines, tier)
+        if old is None or new is None:
+            return None
+        i = _find_lines(out, old, fits)
+        if i >= 0:
+            break
+        # старый вывод блока не найден или повторяется («margin: 0;» в одном
+        # правиле): вместе со строкой выше — внешний блок, пока не станет однозначным
+        if a == 0:
+            return None
+        a, b = enclosing_block(code, a - 1, b, html)
+    if not html:
+        grow = new_tokens.count("{") - old_tokens.count("{")
+        cp.src = _shift_points(_points(cp, "src", src), code, a, b_old, grow)
+        cp.out = _shift_points(_points(cp, "out", out), out[:i] + new + out[i + len(old):],
+                               i, i + len(old), grow)
+    return i, i + len(old), new
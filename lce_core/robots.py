@@ -0,0 +1,84 @@
+"""Сборка robots.txt по пресетам (Basic / Block all / WordPress / 1C-Bitrix)."""
+from __future__ import annotations
+
+ROBOTS_PRESETS = ("basic", "blockall", "wordpress", "bitrix")
+
+
+def preset_rules(preset_idx: int) -> tuple[list[str], list[str]]:
+    """
+    Возвращает (allows, disallows) для User-agent: *
+    """
+    if preset_idx == 1:
+        return ([], ["/"])
+    if preset_idx == 2:
+        allows = ["/wp-admin/admin-ajax.php", "/wp-content/uploads/"]
+        disallows = [
+            "/wp-admin/",
+            "/wp-includes/",
+            "/xmlrpc.php",
+            "/wp-login.php",
+            "/wp-register.php",
+            "/*?s=*",
+            "/*?replytocom=*",
+            "/?*",
+        ]
+        return (allows, disallows)
+    if preset_idx == 3:
+        allows = ["/upload/", "/local/templates/", "/local/components/"]
+        disallows = [
+            "/bitrix/",
+            "/auth/",
+            "/search/",
+            "/upload/resize_cache/",
+            "/*?print=1",
+            "/*?utm_*",
+            "/*?PAGEN_*",
+            "/*?sort=*",
+            "/*?view=*",
+            "/*?login=yes",
+            "/*?logout=*",
+        ]
+        return (allows, disallows)
+    return ([], [""])
+
+
+def build_robots_txt(preset_idx: int, host: str = "", sitemaps: str = "", crawl_delay: int = 0,
+                     clean_param: str = "", extra: str = "", note: str = "") -> str:
+    """
+    sitemaps — адреса через пробел или запятую; extra — произвольные строки
+    в конец файла; note — строка-комментарий под заголовком.
+    """
+    allows, disallows = preset_rules(preset_idx)
+    maps = [u for u in (sitemaps or "").strip().replace(",", " ").split() if u]
+    host = (host or "").strip()
+    clean = (clean_param or "").strip()
+    extra = (extra or "").replace("\r\n", "\n").strip("\n")
+
+    lines = []
+    lines.append("# robots.txt generated by LinkCodeEdit")
+    if note:
+        lines.append("# " + note)
+
+    lines.append("\nUser-agent: *")
+    for p in allows:
+        lines.append(f"Allow: {p}")
+    for p in disallows:
+        if p == "":
+            lines.append("Disallow:")
+        else:
+            lines.append(f"Disallow: {p}")
+    if crawl_delay > 0:
+        lines.append(f"Crawl-delay: {crawl_delay}")
+    if clean:
+        lines.append(f"Clean-param: {clean}")
+
+    if host:
+        lines.append(f"Host: {host}")
+    for u in maps:
+        lines.append(f"Sitemap: {u}")
+
+    if extra:
+        lines.append("")
+        lines.append(extra)
+
+    return "\n".join(lines).strip() + "\n"
@@ -0,0 +1,93 @@
+"""
+Сборка sitemap.xml: нормализация URL, список из текста или обход папки
+с HTML-файлами, генерация XML. HTTP-обход сайта живёт во вкладке GUI.
+"""
+from __future__ import annotations
+import os, datetime, urllib.parse
+from typing import Optional
+
+SITEMAP_MAX_URLS = 50000
+HTML_EXTS = {".html", ".htm", ".xhtml"}
+
+
+def norm_join(base: str, raw: str) -> Optional[str]:
+    raw = (raw or "").strip()
+    if not raw or raw.startswith("#"):
+        return None
+    u = urllib.parse.urljoin(base, raw)
+    parts = list(urllib.parse.urlsplit(u))
+    parts[4] = ""  # fragment
+    # нормализуем путь/квери
+    parts[2] = urllib.parse.quote(parts[2], safe="/%._-~")
+    parts[3] = "&".join(
+        f"{urllib.parse.quote_plus(k)}={urllib.parse.quote_plus(v)}"
+        for k, v in urllib.parse.parse_qsl(parts[3], keep_blank_values=True)
+    )
+    return urllib.parse.urlunsplit(parts)
+
+
+def collect_from_list(text: str, base: str) -> list[str]:
+    """URL и пути по одному в строке; пустые строки и #-комментарии пропускаются."""
+    out, seen = [], set()
+    for ln in text.splitlines():
+        ln = ln.strip()
+        if not ln or ln.startswith("#"):
+            continue
+        if ln.startswith(("http://", "https://")):
+            u = norm_join("", ln)
+        else:
+            u = norm_join(base, ln)
+        if u and u not in seen:
+            seen.add(u); out.append(u)
+    return out
+
+
+def collect_from_folder(base: str, folder: str, lastmod_mtime: bool = False) -> list[tuple[str, Optional[str]]]:
+    urls = []
+    root = os.path.abspath(folder)
+    for dirpath, _dirs, files in os.walk(root):
+        for fn in files:
+            ext = os.path.splitext(fn)[1].lower()
+            if ext not in HTML_EXTS: continue
+            full = os.path.join(dirpath, fn)
+            rel = os.path.relpath(full, root).replace("\\", "/")
+            if fn.lower() in ("index.html", "index.htm", "index.xhtml"):
+                rel_url = "/" + os.path.dirname(rel).strip("/").replace("\\", "/") + "/"
+                rel_url = rel_url.replace("//", "/")
+            else:
+                rel_url = "/" + rel
+            u = norm_join(base, rel_url)
+            lm = None
+            if lastmod_mtime:
+                try:
+                    d = datetime.date.fromtimestamp(os.path.getmtime(full))
+                    lm = d.isoformat()
+                except Exception:
+                    pass
+            if u:
+                urls.append((u, lm))
+    urls.sort(key=lambda t: (t[0].count("/"), t[0]))
+    seen = set(); uniq=[]
+    for u,lm in urls:
+        if u in seen: continue
+        seen.add(u); uniq.append((u,lm))
+    return uniq
+
+
+def build_sitemap_xml(items: list[tuple[str, Optional[str]]], changefreq: str, priority: Optional[float]) -> str:
+    def esc(s: str) -> str:
+        return (s.replace("&","&amp;").replace("<","&lt;").replace(">","&gt;"))
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+    ]
+    for (loc, lastmod) in items:
+        lines.append("  <url>")
+        lines.append(f"    <loc>{esc(loc)}</loc>")
+        if lastmod:    lines.append(f"    <lastmod>{lastmod}</lastmod>")
+        if changefreq: lines.append(f"    <changefreq>{changefreq}</changefreq>")
+        if priority is not None:
+            lines.append(f"    <priority>{priority:.1f}</priority>")
+        lines.append("  </url>")
+    lines.append("</urlset>")
+    return "\n".join(lines)
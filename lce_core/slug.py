@@ -0,0 +1,51 @@
+"""Генерация ЧПУ (slug) из строк с транслитерацией кириллицы."""
+from __future__ import annotations
+import unicodedata
+
+TRANSLIT_RU = {
+    'а':'a','б':'b','в':'v','г':'g','д':'d','е':'e','ё':'e','ж':'zh','з':'z','и':'i','й':'y','к':'k','л':'l',
+    'м':'m','н':'n','о':'o','п':'p','р':'r','с':'s','т':'t','у':'u','ф':'f','х':'h','ц':'c','ч':'ch','ш':'sh',
+    'щ':'sch','ъ':'','ы':'y','ь':'','э':'e','ю':'yu','я':'ya'
+}
+
+
+def slugify(text: str, sep: str = "-", lower: bool = True, translit: bool = True, maxlen: int = 80) -> str:
+    s = text.strip()
+    if translit:
+        tmp = []
+        for ch in s:
+            lo = ch.lower()
+            if lo in TRANSLIT_RU:
+                rep = TRANSLIT_RU[lo]
+                tmp.append(rep.upper() if ch.isupper() else rep)
+            else:
+                tmp.append(ch)
+        s = ''.join(tmp)
+    s = unicodedata.normalize("NFKD", s)
+    s = ''.join(c for c in s if not unicodedata.combining(c))
+    out = []
+    prev_sep = False
+    for ch in s:
+        if ch.isalnum():
+            out.append(ch)
+            prev_sep = False
+        else:
+            if not prev_sep:
+                out.append(sep)
+                prev_sep = True
+    res = ''.join(out).strip(sep)
+    if lower:
+        res = res.lower()
+    if len(res) > maxlen:
+        res = res[:maxlen].rstrip(sep)
+    return res
+
+
+def slugify_lines(txt: str, sep: str = "-", lower: bool = True, translit: bool = True, maxlen: int = 80) -> str:
+    """По slug на каждую непустую строку."""
+    lines_out = []
+    for ln in txt.splitlines():
+        if not ln.strip():
+            continue
+        lines_out.append(slugify(ln, sep, lower, translit, maxlen))
+    return "\n".join(lines_out)
@@ -0,0 +1,476 @@
+"""Строки интерфейса (ru/en). Файлы assets/i18n_*.json перекрывают их."""
+
+TR = {
+    "ru": {        
+        "app.title": "LinkCodeEdit",
+        "menu.file": "&Файл",
+        "menu.edit": "&Правка",
+        "menu.lang": "&Язык",
+        "menu.help": "&Справка",
+        "act.open": "Открыть…",
+        "act.save": "Сохранить результат…",
+        "act.exit": "Выход",
+        "act.copy": "Копировать результат",
+        "act.paste": "Вставить во вход",
+        "act.swap": "Поменять Вход↔Выход",
+        "act.clear": "Очистить оба поля",        
+        "act.help.instructions": "Инструкция",
+        "act.about": "О программе",
+        "help.fallback": "Добро пожаловать в LinkCodeEdit. Инструкция не найдена.",        
+        "tab.clean": "🧹 Комментарии (All)",
+        "tab.format": "✨ Форматирование",
+        "tab.link": "🔗 JS-ссылка",
+        "tab.obf": "🕵️ Обфускация",
+        "tab.utm":  "🏷️ UTM-метки",
+        "tab.slug": "🔤 ЧПУ (slug)",
+        "tab.stats":"🔢 Количество символов",
+        "tab.pass": "🔐 Генератор паролей",
+        "tab.batch":"📦 Пакетная обработка",        
+        "clean.header": "Удаление комментариев",
+        "clean.mode": "Режим:",
+        "clean.mode.all": "All (все типы комментариев)",
+        "clean.mode.html": "HTML/XML",
+        "clean.mode.css": "CSS",
+        "clean.mode.js": "JavaScript",
+        "clean.mode.php": "PHP",
+        "clean.mode.json": "JSON",
+        "clean.mode.py": "Python",
+        "clean.run": "Удалить комментарии",
+        "clean.copy": "Скопировать результат",        
+        "fmt.header": "Форматирование / Минификация",
+        "fmt.tabs": "Табы",
+        "fmt.indent": "Отступ",
+        "fmt.sort": "JSON: сортировать ключи",
+        "fmt.mangle": "JS: сокращать имена",
+        "fmt.cssopt": "CSS: оптимизировать правила",
+        "fmt.pretty": "Форматировать",
+        "fmt.minify": "Минифицировать",        
+        "js.header": "Генератор закодированной ссылки (JS)",
+        "js.url": "URL:",
+        "js.text": "Текст:",
+        "js.view": "Вид:",
+        "js.gen": "Сгенерировать",
+        "js.open": "Проверить (открыть)",        
+        "obf.header": "Обфускация / Деобфускация",
+        "obf.method": "Метод:",
+        "obf.m.eval64": "JS: eval(Base64)",
+        "obf.m.hex": "JS: Hex-escape + eval",
+        "obf.m.container": "Base64-контейнер (по языку)",
+        "obf.comment": "Комментарий:",
+        "obf.run": "Обфусцировать",
+        "obf.deobf": "Деобфусцировать",
+        "obf.addc": "Добавить комментарий к результату",
+        "obf.test": "Тест JS в браузере",        
+        "status.copied": "Результат скопирован",
+        "status.cleared": "Очищено",
+        "tab.utm": "UTM-метки",
+        "tab.slug": "ЧПУ (slug)",
+        "tab.stats": "Количество символов",
+        "tab.pass": "Генератор паролей",
+        "tab.batch": "Пакетная обработка",
+        "utm.header": "UTM-метки",
+        "utm.url": "URL:",
+        "utm.override": "Перезаписывать существующие",
+        "utm.gen": "Сгенерировать",
+        "utm.open": "Открыть",
+        "utm.url_empty": "Укажите базовый URL",
+        "utm.link_text": "Ссылка с UTM",
+        "slug.header": "Генератор slug",
+        "slug.lower": "нижний регистр",
+        "slug.translit": "транслитерация (RU→EN)",
+        "slug.sep": "разделитель",
+        "slug.max": "макс. длина",
+        "slug.make": "Сделать slug",
+        "stats.header": "Подсчёт символов",
+        "stats.count": "Посчитать",
+        "stats.total": "Всего символов",
+        "stats.no_spaces": "Без пробельных",
+        "stats.spaces": "Пробелы",
+        "stats.tabs": "Табы",
+        "stats.newlines": "Переводы строк",
+        "stats.words": "Слова",
+        "stats.lines": "Строки",
+        "stats.letters": "Буквы",
+        "stats.digits": "Цифры",
+        "stats.punct": "Знаки препинания",
+        "stats.unique": "Уникальные символы",
+        "stats.done": "Готово",
+        "pass.header": "Генератор паролей",
+        "pass.length": "Длина",
+        "pass.count": "Кол-во",
+        "pass.lower": "строчные",
+        "pass.upper": "прописные",
+        "pass.digits": "цифры",
+        "pass.symbols": "символы",
+        "pass.no_amb": "без неоднозначных",
+        "pass.gen": "Сгенерировать",
+        "batch.header": "Пакетная обработка",
+        "batch.placeholder": "Здесь появится пакетная обработка файлов (в разработке).",        
+        "ui.lang": "Язык",
+        "ui.in": "Вход",
+        "ui.out": "Выход",
+        "ui.diff": "Разн.",
+        "act.license": "Лицензионное соглашение",
+        "utm.source": "Источник",
+        "utm.medium": "Канал",
+        "utm.campaign": "Кампания",
+        "utm.term": "Ключевое слово",
+        "utm.content": "Контент",
+        "tab.og": "🧩 OG Метатеги",
+        "og.header": "Open Graph — генератор мета-тегов",
+        "og.type": "Тип страницы",
+        "og.title": "Заголовок",
+        "og.desc": "Описание",
+        "og.image": "Картинка (URL)",
+        "og.url": "Постоянный URL",
+        "og.site_name": "Имя сайта",
+        "og.locale": "Язык (locale)",
+        "og.app_id": "ID соц. сети (fb:app_id)",
+        "og.video": "Видео (URL)",
+        "og.extra": "Доп. метаданные",
+        "og.gen": "Сгенерировать",
+        "og.bot": "Сброс OG кэша: @WebpageBot",
+        "act.donate": "Поддержать проект ❤️",
+        "about.support": "Поддержать развитие проекта:",
+        "clean.mode.custom": "Выборочно",
+        "clean.sel_types": "Удалять:",
+        "clean.type.html": "HTML <!-- -->",
+        "clean.type.cblock": "/* ... */",
+        "clean.type.cline": "// ...",
+        "clean.type.hash": "# ...",
+        "clean.file": "Файл → файл…",
+        "clean.file.pick": "Файл для удаления комментариев",
+        "clean.file.save": "Сохранить результат как",
+        "clean.file.lang": "Потоковая обработка файла доступна для режимов CSS, JavaScript, PHP, JSON и Python.",
+        "clean.file.done": "Готово: {src} → {dst} символов",
+        "fmt.blank": "Пустые строки (макс.)",
+        "fmt.minify.stats": "Минификация: {src} → {dst} байт (−{pct:.1f}%), {ms:.0f} мс",
+        "fmt.trim": "Убирать пробелы в конце строк",
+        "fmt.file.pick": "XML/HTML, JSON или JSON Lines файл для форматирования",
+        "fmt.file.lang": "Потоковое форматирование файла доступно для HTML/XML, JSON и JSON Lines.",
+        "fmt.file.jsonl": "Готово: {lines} строк, не JSON: {bad}",
+        "fmt.tier": "Движок",
+        "fmt.tier.auto": "Авто",
+        "fmt.tier.full": "Полный",
+        "fmt.tier.fast": "Быстрый",
+        "fmt.range": "Блок",
+        "fmt.range.tip": "Переформатировать только выделение или блок вокруг курсора и правок "
+                         "с прошлого форматирования (Ctrl+Shift+F). Если блок не найти — весь текст.",
+        "fmt.range.done": "Блок переформатирован: {lines} строк, {ms:.0f} мс",
+        "fmt.live": "Живой просмотр",
+        "fmt.live.tip": "Форматировать после каждой паузы в правках: вывод обновляется только "
+                        "в изменившихся строках, прокрутка и подсветка остаются.",
+        "fmt.tier.tip": "JS/PHP/CSS: «Полный» разбирает код целиком, «Быстрый» расставляет отступы "
+                        "только по {} и «;» (в разы быстрее). «Авто» — быстрый для файлов от 4 МБ "
+                        "и неизвестных языков.",
+        "tab.favicon": "🖼️ Favicon",
+        "fav.header": "Генератор фавиконок",
+        "fav.src": "Источник (PNG/JPG/ICO)",
+        "fav.outdir": "Папка сохранения",
+        "fav.urlprefix": "URL-префикс (href)",
+        "fav.themecolor": "Цвет темы (#rrggbb)",
+        "fav.appname": "Имя приложения",
+        "fav.pickimg": "Выбрать...",
+        "fav.pickdir": "Папка...",
+        "fav.generate": "Сгенерировать",
+        "fav.open": "Открыть папку",
+        "fav.copy": "Скопировать сниппет",
+        "tab.sitemap": "🗺️ Sitemap",
+        "smap.header": "Sitemap — генератор карты сайта",
+        "smap.mode": "Режим",
+        "smap.mode.list": "Из списка URL/путей",
+        "smap.mode.scan": "Сканировать папку (HTML)",
+        "smap.mode.http": "Сканировать сайт (HTTP)",
+        "smap.base": "Базовый URL",
+        "smap.folder": "Папка",
+        "smap.pickdir": "Папка...",
+        "smap.freq": "changefreq",
+        "smap.prio": "priority",
+        "smap.lastmod": "lastmod",
+        "smap.lastmod.today": "Сегодня для всех",
+        "smap.lastmod.mtime": "Из mtime файлов",
+        "smap.keepquery": "С query-параметрами",
+        "smap.samehost": "Только этот хост",
+        "smap.robots": "Учитывать robots.txt",
+        "smap.maxpages": "Макс. страниц",
+        "smap.maxdepth": "Макс. глубина",
+        "smap.delay": "Задержка, мс",
+        "smap.timeout": "Таймаут, сек",
+        "smap.ua": "User-Agent",
+        "smap.generate": "Сгенерировать",
+        "smap.save": "Сохранить…",
+        "smap.copy": "Скопировать",
+        "smap.open": "Открыть папку",
+        "smap.placeholder": "Один URL или путь на строку. Пустые/с # игнорируются.",
+        "smap.base_empty": "Укажите базовый URL (например, https://example.com)",
+        "smap.scan_warn": "Укажите папку для сканирования",
+        "smap.done": "Готово",
+        "smap.too_many": "Внимание: >50 000 URL — разбейте на несколько файлов",
+        "smap.progress": "Скан: {done}/{limit}",
+        "smap.stop": "Остановить",
+        "tab.robots": "🤖 robots.txt",
+        "robots.header": "robots.txt — шаблоны",
+        "robots.preset": "Шаблон",
+        "robots.host": "Host",
+        "robots.sitemap": "Sitemap",
+        "robots.crawl": "Crawl-delay (сек.)",
+        "robots.cleanparam": "Clean-param (Яндекс)",
+        "robots.extra": "Доп. правила",
+        "robots.generate": "Сгенерировать",
+        "robots.copy": "Скопировать",
+        "robots.presets.basic": "Базовый (разрешить всё)",
+        "robots.presets.blockall": "Запретить всё",
+        "robots.presets.wordpress": "WordPress",
+        "robots.presets.bitrix": "1C-Битрикс",
+        "robots.note": "Поддерживаются: Host, Sitemap, Clean-param, Crawl-delay",
+        "job.running": "Обработка…",
+        "job.cancel": "Отмена",
+        "job.cancelled": "Отменено",
+        "act.process_pool": "Большие файлы — в отдельных процессах",
+        "act.cache_stats": "Кэш результатов…",
+        "cache.title": "Кэш результатов",
+        "cache.entries": "Записей",
+        "cache.size": "Занято",
+        "cache.hits": "Попаданий",
+        "cache.misses": "Промахов",
+        "cache.evicted": "Вытеснено",
+        "cache.skipped": "Не кэшировано (слишком большие)",
+        "cache.clear": "Очистить",
+
+    },
+    "en": {
+        "app.title": "LinkCodeEdit",
+        "menu.file": "&File",
+        "menu.edit": "&Edit",
+        "menu.lang": "&Language",
+        "menu.help": "&Help",
+        "act.open": "Open…",
+        "act.save": "Save result…",
+        "act.exit": "Exit",
+        "act.copy": "Copy result",
+        "act.paste": "Paste to input",
+        "act.swap": "Swap In↔Out",
+        "act.clear": "Clear both",
+        "act.license": "License Agreement",
+        "act.help.instructions": "Instructions",
+        "act.about": "About",
+        "help.fallback": "Welcome to LinkCodeEdit. Instructions not found.",
+        "tab.clean": "🧹 Comments (All)",
+        "tab.format": "✨ Formatting",
+        "tab.link": "🔗 JS Link",
+        "tab.obf": "🕵️ Obfuscation",
+        "tab.utm":  "🏷️ UTM Tags",
+        "tab.slug": "🔤 Slug",
+        "tab.stats":"🔢 Character Count",
+        "tab.pass": "🔐 Password Generator",
+        "tab.batch":"📦 Batch",
+        "clean.header": "Remove Comments",
+        "clean.mode": "Mode:",
+        "clean.mode.all": "All (remove all kinds)",
+        "clean.mode.html": "HTML/XML",
+        "clean.mode.css": "CSS",
+        "clean.mode.js": "JavaScript",
+        "clean.mode.php": "PHP",
+        "clean.mode.json": "JSON",
+        "clean.mode.py": "Python",
+        "clean.run": "Strip comments",
+        "clean.copy": "Copy result",
+        "fmt.header": "Formatting / Minification",
+        "fmt.tabs": "Tabs",
+        "fmt.indent": "Indent",
+        "fmt.sort": "JSON: sort keys",
+        "fmt.mangle": "JS: shorten names",
+        "fmt.cssopt": "CSS: optimize rules",
+        "fmt.pretty": "Format",
+        "fmt.minify": "Minify",
+        "js.header": "Encoded Link Generator (JS)",
+        "js.url": "URL:",
+        "js.text": "Text:",
+        "js.view": "View:",
+        "js.gen": "Generate",
+        "js.open": "Open (test)",
+        "obf.header": "Obfuscation / Deobfuscation",
+        "obf.method": "Method:",
+        "obf.m.eval64": "JS: eval(Base64)",
+        "obf.m.hex": "JS: Hex-escape + eval",
+        "obf.m.container": "Base64 container (per language)",
+        "obf.comment": "Comment:",
+        "obf.run": "Obfuscate",
+        "obf.deobf": "Deobfuscate",
+        "obf.addc": "Append comment to result",
+        "obf.test": "Test JS in browser",
+        "status.copied": "Result copied",
+        "status.cleared": "Cleared",
+        "tab.utm": "UTM Tags",
+        "tab.slug": "Slug",
+        "tab.stats": "Character Count",
+        "tab.pass": "Password Generator",
+        "tab.batch": "Batch",
+        "utm.header": "UTM Tags",
+        "utm.url": "URL:",
+        "utm.override": "Override existing",
+        "utm.gen": "Generate",
+        "utm.open": "Open",
+        "utm.url_empty": "Enter base URL",
+        "utm.link_text": "Link with UTM",
+        "slug.header": "Slug Generator",
+        "slug.lower": "lowercase",
+        "slug.translit": "transliterate (RU→EN)",
+        "slug.sep": "separator",
+        "slug.max": "max length",
+        "slug.make": "Make slug",
+        "stats.header": "Character count",
+        "stats.count": "Count",
+        "stats.total": "Total chars",
+        "stats.no_spaces": "Non-whitespace",
+        "stats.spaces": "Spaces",
+        "stats.tabs": "Tabs",
+        "stats.newlines": "Newlines",
+        "stats.words": "Words",
+        "stats.lines": "Lines",
+        "stats.letters": "Letters",
+        "stats.digits": "Digits",
+        "stats.punct": "Punctuation",
+        "stats.unique": "Unique chars",
+        "stats.done": "Done",
+        "pass.header": "Password generator",
+        "pass.length": "Length",
+        "pass.count": "Count",
+        "pass.lower": "lower",
+        "pass.upper": "upper",
+        "pass.digits": "digits",
+        "pass.symbols": "symbols",
+        "pass.no_amb": "no ambiguous",
+        "pass.gen": "Generate",
+        "batch.header": "Batch processing",
+        "batch.placeholder": "Batch file processing will appear here (WIP).",        
+        "ui.lang": "Language",
+        "ui.in": "In",
+        "ui.out": "Out",
+        "ui.diff": "Diff",
+        "utm.source": "Source",
+        "utm.medium": "Medium",
+        "utm.campaign": "Campaign",
+        "utm.term": "Term",
+        "utm.content": "Content",
+        "tab.og": "🧩 OG Meta Tags",
+        "og.header": "Open Graph — meta generator",
+        "og.type": "Type",
+        "og.title": "Title",
+        "og.desc": "Description",
+        "og.image": "Image (URL)",
+        "og.url": "Canonical URL",
+        "og.site_name": "Site name",
+        "og.locale": "Locale",
+        "og.app_id": "App ID (fb:app_id)",
+        "og.video": "Video (URL)",
+        "og.extra": "Extra meta",
+        "og.gen": "Generate",
+        "og.bot": "Purge OG cache: @WebpageBot",
+        "act.donate": "Donate ❤️",
+        "about.support": "Support the project:",
+        "clean.mode.custom": "Custom",
+        "clean.sel_types": "Remove:",
+        "clean.type.html": "HTML <!-- -->",
+        "clean.type.cblock": "/* ... */",
+        "clean.type.cline": "// ...",
+        "clean.type.hash": "# ...",
+        "clean.file": "File → file…",
+        "clean.file.pick": "File to strip comments from",
+        "clean.file.save": "Save result as",
+        "clean.file.lang": "Streaming file mode is available for CSS, JavaScript, PHP, JSON and Python.",
+        "clean.file.done": "Done: {src} → {dst} characters",
+        "fmt.blank": "Blank lines (max.)",
+        "fmt.minify.stats": "Minified: {src} → {dst} bytes (−{pct:.1f}%), {ms:.0f} ms",
+        "fmt.trim": "Trim trailing spaces",
+        "fmt.file.pick": "XML/HTML, JSON or JSON Lines file to format",
+        "fmt.file.lang": "Streaming file formatting is available for HTML/XML, JSON and JSON Lines.",
+        "fmt.file.jsonl": "Done: {lines} lines, not JSON: {bad}",
+        "fmt.tier": "Engine",
+        "fmt.tier.auto": "Auto",
+        "fmt.tier.full": "Full",
+        "fmt.tier.fast": "Fast",
+        "fmt.range": "Block",
+        "fmt.range.tip": "Reformat only the selection or the block around the cursor and the edits "
+                         "since the last format (Ctrl+Shift+F). Falls back to the whole text.",
+        "fmt.range.done": "Block reformatted: {lines} lines, {ms:.0f} ms",
+        "fmt.live": "Live preview",
+        "fmt.live.tip": "Format after each pause in editing: only the changed lines of the output "
+                        "are updated, scroll position and highlighting stay.",
+        "fmt.tier.tip": "JS/PHP/CSS: \"Full\" parses the whole code, \"Fast\" indents by {} and \";\" only "
+                        "(several times faster). \"Auto\" uses fast for files from 4 MB and unknown languages.",
+        "tab.favicon": "🖼️ Favicon",
+        "fav.header": "Favicon Generator",
+        "fav.src": "Source (PNG/JPG/ICO)",
+        "fav.outdir": "Output folder",
+        "fav.urlprefix": "URL prefix (href)",
+        "fav.themecolor": "Theme color (#rrggbb)",
+        "fav.appname": "App name",
+        "fav.pickimg": "Browse…",
+        "fav.pickdir": "Folder…",
+        "fav.generate": "Generate",
+        "fav.open": "Open folder",
+        "fav.copy": "Copy snippet",
+        "tab.sitemap": "🗺️ Sitemap",
+        "smap.header": "Sitemap — generator",
+        "smap.mode": "Mode",
+        "smap.mode.list": "From URL/path list",
+        "smap.mode.scan": "Scan folder (HTML)",
+        "smap.mode.http": "Scan website (HTTP)",
+        "smap.base": "Base URL",
+        "smap.folder": "Folder",
+        "smap.pickdir": "Folder…",
+        "smap.freq": "changefreq",
+        "smap.prio": "priority",
+        "smap.lastmod": "lastmod",
+        "smap.lastmod.today": "Today for all",
+        "smap.lastmod.mtime": "From files mtime",
+        "smap.keepquery": "Keep query params",
+        "smap.samehost": "Same host only",
+        "smap.robots": "Respect robots.txt",
+        "smap.maxpages": "Max pages",
+        "smap.maxdepth": "Max depth",
+        "smap.delay": "Delay, ms",
+        "smap.timeout": "Timeout, s",
+        "smap.ua": "User-Agent",
+        "smap.generate": "Generate",
+        "smap.save": "Save…",
+        "smap.copy": "Copy",
+        "smap.open": "Open folder",
+        "smap.placeholder": "One URL or path per line. Blank/# lines ignored.",
+        "smap.base_empty": "Enter base URL (e.g. https://example.com)",
+        "smap.scan_warn": "Pick a folder to scan",
+        "smap.done": "Done",
+        "smap.too_many": "Warning: >50,000 URLs — split into multiple files",
+        "smap.progress": "Scan: {done}/{limit}",
+        "smap.stop": "Stop",
+        "tab.robots": "🤖 robots.txt",
+        "robots.header": "robots.txt — templates",
+        "robots.preset": "Preset",
+        "robots.host": "Host",
+        "robots.sitemap": "Sitemap",
+        "robots.crawl": "Crawl-delay (sec)",
+        "robots.cleanparam": "Clean-param (Yandex)",
+        "robots.extra": "Extra rules",
+        "robots.generate": "Generate",
+        "robots.copy": "Copy",
+        "robots.presets.basic": "Basic (allow all)",
+        "robots.presets.blockall": "Block all",
+        "robots.presets.wordpress": "WordPress",
+        "robots.presets.bitrix": "1C-Bitrix",
+        "robots.note": "Supports: Host, Sitemap, Clean-param, Crawl-delay",
+        "job.running": "Processing…",
+        "job.cancel": "Cancel",
+        "job.cancelled": "Cancelled",
+        "act.process_pool": "Process large inputs in worker processes",
+        "act.cache_stats": "Result cache…",
+        "cache.title": "Result cache",
+        "cache.entries": "Entries",
+        "cache.size": "Used",
+        "cache.hits": "Hits",
+        "cache.misses": "Misses",
+        "cache.evicted": "Evicted",
+        "cache.skipped": "Not cached (too large)",
+        "cache.clear": "Clear",
+    },
+}
@@ -0,0 +1,426 @@
+"""Удаление комментариев: C-подобные языки, HTML/XML, Python, выборочно."""
+from __future__ import annotations
+import os, re
+from typing import List, Optional
+
+from . import lexer
+from .lexer import CODE, STR, TMPL, LINE_COMMENT, BLOCK_COMMENT, scan_template
+
+
+class _StripOut:
+    """
+    Буфер результата удаления комментариев. Признак «на текущей строке
+    уже есть код» ведётся при добавлении кусков, поэтому решение по
+    комментарию стоит O(1), а не просмотр вывода назад до перевода строки.
+    """
+    __slots__ = ("parts", "kinds", "line_code")
+
+    def __init__(self, with_kinds: bool = False):
+        self.parts: List[str] = []
+        self.kinds: Optional[List[int]] = [] if with_kinds else None
+        self.line_code = False
+
+    def add(self, t: str, kind: int = CODE):
+        self.parts.append(t)
+        if self.kinds is not None:
+            self.kinds.append(kind)
+        k = t.rfind('\n')
+        if k >= 0:
+            self.line_code = k + 1 < len(t) and not t[k + 1:].isspace()
+        elif not self.line_code:
+            self.line_code = not t.isspace()
+
+    def pop_blanks(self):
+        """Пробелы/табы в конце вывода (отступ или хвост перед комментарием)."""
+        parts = self.parts
+        while parts and parts[-1][-1] in ' \t':
+            t = parts[-1].rstrip(' \t')
+            if t:
+                parts[-1] = t
+                return
+            parts.pop()
+            if self.kinds is not None:
+                self.kinds.pop()
+
+    def drop_comment(self, code: str, kind: int, end: int) -> int:
+        """
+        Комментарий на отдельной строке исчезает вместе со строкой, после кода —
+        вместе с пробелами перед ним. Возвращает, с какой позиции копировать дальше.
+        """
+        had = self.line_code
+        self.pop_blanks()
+        if kind == LINE_COMMENT:
+            if had and code[end - 1] == '\n':
+                self.add('\n')
+            return end
+        if not had:
+            j, n = end, len(code)
+            while j < n and code[j] in ' \t': j += 1
+            if j < n and code[j] == '\n':
+                return j + 1
+        return end
+
+
+def strip_chunked(code: str, spec: lexer.LexSpec) -> str:
+    """
+    Быстрый путь удаления комментариев: spec.chunk одним совпадением
+    проходит код вместе со строками до следующего комментария, и весь
+    этот кусок копируется срезом. Python-цикл крутится только на
+    комментариях и шаблонах `…`, а не на каждом символе или токене.
+    """
+    out = _StripOut()
+    add = out.add
+    match = spec.chunk.match
+    kinds = spec.chunk_kinds
+    n = len(code)
+    pos = 0
+    while pos < n:
+        m = match(code, pos)
+        a, b = m.span(1)
+        if a < b:
+            add(code[a:b])
+        g = m.lastindex
+        if g == 1:
+            break
+        kind = kinds[g]
+        if kind == TMPL:
+            pos = scan_template(code, b, n)
+            add(code[b:pos])
+        else:
+            pos = out.drop_comment(code, kind, m.end())
+    return ''.join(out.parts)
+
+
+def _strip_html(code: str) -> str:   
+    s = re.sub(r'(?ms)^[ \t]*<!--(?!\[if).*?-->[ \t]*(?:\r?\n|$)', '', code)   
+    s = re.sub(r'(?s)<!--(?!\[if).*?-->', '', s)   
+    s = re.sub(r'[ \t]+(?=\r?\n)', '', s)
+    return s
+
+def strip_comments_python_strict(code: str) -> str:
+    return strip_chunked(code, lexer.SPECS["Python"])
+
+def _strip_by_markers(
+    code: str,
+    *,
+    rm_html=False,
+    rm_c_block=False,
+    rm_c_line=False,
+    rm_hash=False,
+    allow_backtick=True
+) -> str:
+    s = code
+    if rm_html:
+        s = _strip_html(s)
+    spec = lexer.LexSpec(backtick="template" if allow_backtick else "",
+                         c_line=rm_c_line, c_block=rm_c_block, hash_line=rm_hash)
+    return strip_chunked(s, spec)
+
+def strip_comments_custom(code: str, *, html=False, c_block=False, c_line=False, py_hash=False) -> str:
+    s = code
+    if html:
+        s = _strip_html(s)
+    if c_block or c_line or py_hash:
+        s = _strip_by_markers(s, rm_c_block=c_block, rm_c_line=c_line, rm_hash=py_hash)
+    return s
+def strip_comments(code: str, lang: str) -> str:
+    if lang == "HTML/XML": return _strip_html(code)
+    return strip_chunked(code, lexer.spec_for(lang))
+def strip_comments_all(code: str) -> str:
+    s = code
+
+ 
+    s = re.sub(r'(?ms)^[ \t]*<!--(?!\[if).*?-->[ \t]*(?:\r?\n|$)', '', s)  
+    s = re.sub(r'(?s)<!--(?!\[if).*?-->', '', s)
+
+ 
+    s = re.sub(r'(?ms)^[ \t]*/\*.*?\*/[ \t]*(?:\r?\n|$)', '', s)         
+    s = re.sub(r'(?s)/\*.*?\*/', '', s)                              
+
+    
+    s = re.sub(r'(?m)^[ \t]*//[^\n]*(?:\r?\n|$)', '', s) 
+    s = re.sub(r'//[^\n]*', '', s)
+
+
+    s = re.sub(r'(?m)^[ \t]*#[^\n]*(?:\r?\n|$)', '', s)  
+    s = re.sub(r'(?m)(?<!["\'`])#[^\n]*', '', s)             
+
+   
+    s = re.sub(r'[ \t]+(?=\r?\n)', '', s)
+    return s
+
+
+# ---------- Потоковое удаление комментариев ----------
+
+STREAM_CHUNK = 1 << 20
+
+
+class StreamStripper:
+    """
+    strip_comments для текста, который подаётся кусками (feed) и не
+    помещается в память целиком. Между кусками переносится состояние:
+    открытая строка/шаблон (с глубиной ${}), блочный или строчный
+    комментарий, «был ли код на строке» и хвост пробелов вывода, который
+    ещё может быть срезан следующим комментарием. Результат совпадает со
+    strip_comments на всём тексте. HTML/XML не поддерживается.
+    """
+
+    def __init__(self, lang: str):
+        if lang == "HTML/XML":
+            raise ValueError("streaming is not supported for HTML/XML")
+        self.spec = lexer.spec_for(lang)
+        self.out = _StripOut()
+        self.carry = ""         # необработанный хвост входа (неоднозначное начало токена)
+        self.mode = CODE        # CODE | STR | TMPL | LINE_COMMENT | BLOCK_COMMENT
+        self.quote = ""         # для STR: ' " ` или тройная кавычка Python
+        self.depth = 0          # для TMPL: вложенность ${
+        self.had = False        # для комментария: был ли код на строке перед ним
+        self.skip_ws = False    # после блочного комментария на пустой строке
+
+    def feed(self, text: str) -> str:
+        """Обрабатывает очередной кусок; возвращает готовую часть результата."""
+        self._run(self.carry + text, False)
+        parts = self.out.parts
+        done = ''.join(parts)
+        keep = done.rstrip(' \t')
+        parts[:] = [done[len(keep):]] if len(keep) < len(done) else []
+        return keep
+
+    def close(self) -> str:
+        """Конец входа: незакрытые строки и комментарии тянутся до конца, как в strip_comments."""
+        self._run(self.carry, True)
+        self.carry = ""
+        done = ''.join(self.out.parts)
+        self.out.parts.clear()
+        return done
+
+    def _emit(self, t: str, kind: int = CODE):
+        if t:
+            self.out.add(t, kind)
+
+    def _comment_start(self):
+        self.had = self.out.line_code
+        self.out.pop_blanks()
+
+    def _run(self, s: str, final: bool):
+        self.carry = ""
+        n = len(s)
+        pos = 0
+        search = self.spec.pattern.search
+        kinds = self.spec.kinds
+        while pos < n:
+            mode = self.mode
+
+            if self.skip_ws:
+                j = pos
+                while j < n and s[j] in ' \t': j += 1
+                if j == n and not final:
+                    self.carry = s[pos:]
+                    return
+                self.skip_ws = False
+                if j < n and s[j] == '\n':
+                    pos = j + 1
+                continue
+
+            if mode == STR:
+                q = self.quote
+                if len(q) == 3:
+                    k = s.find(q, pos)
+                    if k < 0:
+                        cut = n if final else max(pos, n - 2)
+                        self._emit(s[pos:cut], STR)
+                        self.carry = s[cut:]
+                        return
+                    self._emit(s[pos:k + 3], STR)
+                    pos = k + 3
+                else:
+                    e = lexer.QUOTED_BODY[q].match(s, pos).end()
+                    if e < n and s[e] == q:
+                        self._emit(s[pos:e + 1], STR)
+                        pos = e + 1
+                    else:
+                        # до конца куска; одиночная \ в конце ждёт следующий символ
+                        if final:
+                            e = n
+                        self._emit(s[pos:e], STR)
+                        self.carry = s[e:]
+                        return
+                self.mode = CODE
+                continue
+
+            if mode == TMPL:
+                j = pos
+                while True:
+                    m = lexer.TMPL_STOP.search(s, j)
+                    if m is None:
+                        self._emit(s[pos:], TMPL)
+                        return
+                    j = m.start()
+                    c = s[j]
+                    if (c == '\\' or c == '$') and j + 1 == n and not final:
+                        self._emit(s[pos:j], TMPL)
+                        self.carry = s[j:]
+                        return
+                    if c == '\\':
+                        j += 2
+                    elif c == '`' and self.depth == 0:
+                        break
+                    elif c == '$' and j + 1 < n and s[j + 1] == '{':
+                        self.depth += 1; j += 2
+                    else:
+                        if c == '}' and self.depth > 0:
+                            self.depth -= 1
+                        j += 1
+                    if j >= n:
+                        self._emit(s[pos:], TMPL)
+                        return
+                self._emit(s[pos:j + 1], TMPL)
+                pos = j + 1
+                self.mode = CODE
+                continue
+
+            if mode == LINE_COMMENT:
+                k = s.find('\n', pos)
+                if k < 0:
+                    return
+                if self.had:
+                    self.out.add('\n')
+                pos = k + 1
+                self.mode = CODE
+                continue
+
+            if mode == BLOCK_COMMENT:
+                k = s.find('*/', pos)
+                if k < 0:
+                    if not final and n - 1 >= pos and s[-1] == '*':
+                        self.carry = '*'
+                    return
+                pos = k + 2
+                self.mode = CODE
+                self.skip_ws = not self.had
+                continue
+
+            m = search(s, pos)
+            if m is None:
+                end = n
+                if not final and s.endswith('/') and n - 1 >= pos:
+                    end = n - 1
+                self._emit(s[pos:end])
+                self.carry = s[end:]
+                return
+            i = m.start()
+            self._emit(s[pos:i])
+            kind = kinds[m.lastindex]
+            end = m.end()
+            if end == n and not final and n - i < 3:
+                self.carry = s[i:]
+                return
+            if kind == TMPL:
+                self._emit('`', TMPL)
+                self.mode, self.depth = TMPL, 0
+                pos = i + 1
+            elif kind == STR:
+                q = s[i]
+                if self.spec.python and s.startswith(q * 3, i):
+                    q *= 3
+                if end == n and not final and not self._closed_at_end(s, i, q):
+                    self._emit(q, STR)
+                    self.mode, self.quote = STR, q
+                    pos = i + len(q)
+                else:
+                    self._emit(s[i:end], STR)
+                    pos = end
+            elif kind == LINE_COMMENT:
+                self._comment_start()
+                if s[end - 1] != '\n':
+                    if final:
+                        return
+                    self.mode = LINE_COMMENT
+                    pos = end
+                else:
+                    if self.had:
+                        self.out.add('\n')
+                    pos = end
+            else:
+                self._comment_start()
+                if end - i >= 4 and s.endswith('*/', 0, end):
+                    pos = end
+                    self.skip_ws = not self.had
+                elif final:
+                    return
+                else:
+                    self.mode = BLOCK_COMMENT
+                    pos = i + 2
+
+    @staticmethod
+    def _closed_at_end(s: str, i: int, q: str) -> bool:
+        if len(q) == 3:
+            return len(s) - i >= 6 and s.endswith(q)
+        return lexer.quoted_closed(s, i, len(s))
+
+
+def strip_stream(src, dst, lang: str, chunk_size: int = STREAM_CHUNK, progress=None) -> tuple[int, int]:
+    """
+    Удаляет комментарии из текстового потока src в dst кусками по chunk_size
+    символов. progress(символов_прочитано) вызывается после каждого куска.
+    Возвращает (символов на входе, символов на выходе).
+    """
+    st = StreamStripper(lang)
+    n_in = n_out = 0
+    while True:
+        text = src.read(chunk_size)
+        if not text:
+            break
+        n_in += len(text)
+        res = st.feed(text)
+        dst.write(res); n_out += len(res)
+        if progress is not None:
+            progress(n_in)
+    res = st.close()
+    dst.write(res); n_out += len(res)
+    return n_in, n_out
+
+
+def strip_file(src_path: str, dst_path: str, lang: str, chunk_size: int = STREAM_CHUNK) -> tuple[int, int]:
+    """
+    strip_stream для файлов. Если dst_path — это src_path, результат
+    пишется во временный файл рядом и затем подменяет исходный.
+    """
+    return _stream_file(src_path, dst_path, lambda src, dst: strip_stream(src, dst, lang, chunk_size))
+
+
+def _stream_file(src_path: str, dst_path: str, run) -> tuple[int, int]:
+    """run(src, dst) над открытыми файлами; запись на место исходного — через временный файл."""
+    in_place = os.path.exists(dst_path) and os.path.samefile(src_path, dst_path)
+    if in_place:
+        import shutil, tempfile  # ~10 мс с lzma/random: не в бюджет импорта strip_comments
+        fd, out_path = tempfile.mkstemp(prefix=".lce-", dir=os.path.dirname(os.path.abspath(dst_path)))
+        os.close(fd)
+        shutil.copymode(src_path, out_path)
+    else:
+        out_path = dst_path
+    try:
+        with open(src_path, "r", encoding="utf-8", errors="replace") as src, \
+                open(out_path, "w", encoding="utf-8") as dst:
+            sizes = run(src, dst)
+        if in_place:
+            os.replace(out_path, dst_path)
+    except BaseException:
+        if in_place:
+            try:
+                os.unlink(out_path)
+            except OSError:
+                pass
+        raise
+    return sizes
+
+
+def _source_size(src_path: str, *_args) -> int:
+    try:
+        return os.path.getsize(src_path)
+    except OSError:
+        return 0
+
+
+# для pool.run_engine: объём работы — размер файла, а не длина аргументов-путей
+strip_file.input_size = _source_size